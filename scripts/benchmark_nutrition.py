@@ -0,0 +1,140 @@
+"""
+Mesure le pipeline de la page Nutrition (`build_nutrition_frame` puis `clean_data`)
+face à l'implémentation précédente, et vérifie que les deux produisent le même
+DataFrame.
+
+Sans fichiers RAW_recipes.csv / RAW_interactions.csv dans le répertoire indiqué,
+des données synthétiques au volume du jeu complet (231 637 recettes, 1 132 367
+interactions) sont générées.
+
+Usage :
+    python -m scripts.benchmark_nutrition [--dataset-dir DIR] [--repeat N]
+"""
+import argparse
+import ast
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.process.nutrition_preprocess import (INTERACTIONS_COLUMNS, NUTRITION_VALUES, RECIPES_COLUMNS,
+                                              build_nutrition_frame, clean_data)
+
+N_RECIPES = 231637
+N_INTERACTIONS = 1132367
+
+
+def legacy_build_nutrition_frame(df_recipes, df_interactions):
+    """Implémentation précédente : deux `groupby`, deux fusions, `literal_eval` par ligne."""
+    df_mean_rating = df_interactions[['recipe_id', 'rating']].groupby(['recipe_id']).mean().round(2)
+    df_count_rating = df_interactions[['recipe_id', 'rating']].groupby(['recipe_id']).count()
+    merged_df = df_recipes[['id', 'name', 'nutrition']].merge(
+        df_mean_rating, left_on='id', right_on='recipe_id').merge(
+        df_count_rating, left_on='id', right_on='recipe_id')
+    merged_df.rename(columns={'rating_x': 'Moyenne des notes', 'rating_y': 'Nombre de notes'}, inplace=True)
+    merged_df['nutrition'] = merged_df['nutrition'].apply(ast.literal_eval)
+    valeurs_df = pd.DataFrame(merged_df['nutrition'].tolist(), index=merged_df.index)
+    valeurs_df.columns = NUTRITION_VALUES
+    nutrition_df = merged_df.drop(columns=['nutrition', 'id']).join(valeurs_df)
+    nutrition_df[NUTRITION_VALUES] = nutrition_df[NUTRITION_VALUES].apply(pd.to_numeric)
+    return nutrition_df
+
+
+def legacy_clean_data(df):
+    """Implémentation précédente : un `drop` par colonne."""
+    df = df[(df['Nombre de notes'] >= 5)]
+    for column in ['Graisses', 'Graisse_saturées', 'Sucre', 'Sodium', 'Protéines', 'Glucides']:
+        df = df.drop(df[df[column] > 100].index)
+    return df.drop(df[df['Calories'] > 800].index)
+
+
+def rated_ids(df_recipes, df_interactions):
+    """Identifiants des recettes notées, dans l'ordre des recettes : l'index de `build_nutrition_frame`."""
+    return pd.Index(df_recipes['id'][df_recipes['id'].isin(df_interactions['recipe_id'])].to_numpy(), name='id')
+
+
+def synthetic_data(n_recipes=N_RECIPES, n_interactions=N_INTERACTIONS, seed=0):
+    """
+    Génère des recettes et interactions ayant la forme des fichiers RAW_*.csv.
+
+    Args:
+        n_recipes (int, optional): Nombre de recettes.
+        n_interactions (int, optional): Nombre d'interactions.
+        seed (int, optional): Graine aléatoire.
+
+    Returns:
+        tuple: (recettes, interactions).
+    """
+    rng = np.random.default_rng(seed)
+    ids = rng.permutation(n_recipes * 2)[:n_recipes]
+    values = np.round(rng.gamma(1.5, 30, (n_recipes, len(NUTRITION_VALUES))), 1)
+    nutrition = ["[" + ", ".join(map(repr, row)) + "]" for row in values.tolist()]
+    recipes = pd.DataFrame({'id': ids, 'name': [f"recipe {i}" for i in ids], 'nutrition': nutrition})
+    # Chaque recette est notée au moins une fois, avec une popularité très inégale
+    popularity = np.concatenate([np.arange(n_recipes),
+                                 rng.zipf(1.6, max(n_interactions - n_recipes, 0)) % n_recipes])
+    interactions = pd.DataFrame({'recipe_id': ids[popularity],
+                                 'rating': rng.integers(0, 6, n_interactions)})
+    return recipes, interactions
+
+
+def load_sources(dataset_dir):
+    """
+    Charge les fichiers du jeu de données, ou génère des données synthétiques s'ils sont absents.
+
+    Args:
+        dataset_dir (str): Répertoire contenant RAW_recipes.csv et RAW_interactions.csv.
+
+    Returns:
+        tuple: (recettes, interactions).
+    """
+    recipes_path = os.path.join(dataset_dir or "", "RAW_recipes.csv")
+    interactions_path = os.path.join(dataset_dir or "", "RAW_interactions.csv")
+    try:
+        return (pd.read_csv(recipes_path, usecols=RECIPES_COLUMNS),
+                pd.read_csv(interactions_path, usecols=INTERACTIONS_COLUMNS))
+    except (OSError, ValueError, pd.errors.ParserError) as e:
+        logging.info(f"Jeu de données indisponible ({e}) : génération de données synthétiques.")
+        return synthetic_data()
+
+
+def best_time(fn, repeat):
+    """Meilleure durée (s) de `repeat` appels et résultat du dernier appel."""
+    durations, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        durations.append(time.perf_counter() - start)
+    return min(durations), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline nutritionnel.")
+    parser.add_argument("--dataset-dir", default=os.getenv("DIR_DATASET"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    recipes, interactions = load_sources(args.dataset_dir)
+    print(f"{len(recipes)} recettes, {len(interactions)} interactions")
+    clean = clean_data.__wrapped__ if hasattr(clean_data, "__wrapped__") else clean_data
+
+    legacy_build, expected = best_time(lambda: legacy_build_nutrition_frame(recipes, interactions), args.repeat)
+    build, result = best_time(lambda: build_nutrition_frame(recipes, interactions), args.repeat)
+    expected.index = rated_ids(recipes, interactions)
+    pd.testing.assert_frame_equal(result, expected)
+    print(f"{len(result)} recettes notées")
+    legacy_clean, expected = best_time(lambda: legacy_clean_data(expected), args.repeat)
+    cleaned, result = best_time(lambda: clean(result), args.repeat)
+    pd.testing.assert_frame_equal(result, expected)
+
+    print(f"{'étape':<22}{'avant (s)':>12}{'après (s)':>12}{'gain':>8}")
+    for step, before, after in [("build_nutrition_frame", legacy_build, build),
+                                ("clean_data", legacy_clean, cleaned)]:
+        print(f"{step:<22}{before:>12.3f}{after:>12.3f}{before / after:>7.1f}x")
+    print("Sorties identiques.")
+
+
+if __name__ == "__main__":
+    main()
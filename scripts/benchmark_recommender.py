@@ -0,0 +1,135 @@
+"""
+Compare la vectorisation des ingrédients par hachage (`HashingTfidf`) au TF-IDF
+actuel (`TfidfVectorizer`) : durée et pic mémoire de l'ajustement, mémoire du
+vocabulaire, et qualité des recommandations (recouvrement des 10 plus proches
+voisins par similarité cosinus).
+
+Le mode par hachage est mesuré deux fois : ajusté d'un bloc, puis ajusté sur
+90 % des recettes et complété des 10 % restants sans réajustement
+(`partial_fit`), comme lors de l'ajout de nouvelles recettes.
+
+Sans fichier RAW_recipes.csv dans le répertoire indiqué, des recettes
+synthétiques au volume du jeu complet sont générées.
+
+Usage :
+    python -m scripts.benchmark_recommender [--dataset-dir DIR] [--queries N] [--top-k K]
+"""
+import argparse
+import ast
+import logging
+import os
+import pickle
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import vstack
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.process.hashing_features import HashingTfidf
+
+N_RECIPES = 231637
+VOCABULARY_SIZE = 14000
+
+
+def synthetic_ingredients(n_recipes=N_RECIPES, seed=0):
+    """
+    Génère des listes d'ingrédients à la distribution très inégale (loi de Zipf).
+
+    Args:
+        n_recipes (int, optional): Nombre de recettes.
+        seed (int, optional): Graine aléatoire.
+
+    Returns:
+        pd.Series: Ingrédients de chaque recette, en minuscules, séparés par des espaces.
+    """
+    rng = np.random.default_rng(seed)
+    words = np.array([f"ingredient{i}" for i in range(VOCABULARY_SIZE)])
+    weights = 1 / np.arange(1, VOCABULARY_SIZE + 1) ** 1.1
+    sizes = rng.integers(3, 18, n_recipes)
+    terms = rng.choice(words, sizes.sum(), p=weights / weights.sum())
+    return pd.Series([" ".join(recipe) for recipe in np.split(terms, np.cumsum(sizes)[:-1])])
+
+
+def load_ingredients(dataset_dir):
+    """
+    Charge les ingrédients de RAW_recipes.csv, ou génère des recettes synthétiques s'il est absent.
+
+    Args:
+        dataset_dir (str): Répertoire contenant RAW_recipes.csv.
+
+    Returns:
+        pd.Series: Ingrédients de chaque recette, au format de `ingredients_cleaned`.
+    """
+    try:
+        ingredients = pd.read_csv(os.path.join(dataset_dir or "", "RAW_recipes.csv"),
+                                  usecols=['ingredients'])['ingredients']
+    except (OSError, ValueError, pd.errors.ParserError) as e:
+        logging.info(f"Jeu de données indisponible ({e}) : génération de recettes synthétiques.")
+        return synthetic_ingredients()
+    return ingredients.map(lambda x: ' '.join(ast.literal_eval(x)).lower())
+
+
+def measure(fn):
+    """Durée (s), pic mémoire (Mo) et résultat d'un appel."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    tracemalloc.stop()
+    return duration, peak, result
+
+
+def top_neighbors(matrix, queries, k):
+    """Positions des `k` recettes les plus similaires (cosinus) à chaque recette requête."""
+    similarities = (matrix[queries] @ matrix.T).toarray()
+    similarities[np.arange(len(queries)), queries] = -1
+    return np.argsort(-similarities, axis=1, kind="stable")[:, :k]
+
+
+def overlap(reference, candidate):
+    """Part moyenne des voisins de référence retrouvés dans les voisins candidats."""
+    return float(np.mean([len(np.intersect1d(a, b)) / len(a) for a, b in zip(reference, candidate)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la vectorisation des ingrédients.")
+    parser.add_argument("--dataset-dir", default=os.getenv("DIR_DATASET"))
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    texts = load_ingredients(args.dataset_dir)
+    print(f"{len(texts)} recettes")
+    queries = np.random.default_rng(1).choice(len(texts), min(args.queries, len(texts)), replace=False)
+
+    tfidf = TfidfVectorizer(stop_words='english')
+    tfidf_time, tfidf_peak, tfidf_matrix = measure(lambda: tfidf.fit_transform(texts))
+    hashing = HashingTfidf()
+    hashing_time, hashing_peak, hashing_matrix = measure(lambda: hashing.fit_transform(texts))
+
+    # Ajustement sur 90 % des recettes puis ajout des 10 % restants
+    split = int(len(texts) * 0.9)
+    incremental = HashingTfidf()
+    base = incremental.fit_transform(texts[:split])
+    added = incremental.partial_fit(texts[split:]).transform(texts[split:])
+    incremental_matrix = vstack([base, added], format='csr')
+
+    reference = top_neighbors(tfidf_matrix, queries, args.top_k)
+    print(f"{'vectorisation':<22}{'durée (s)':>11}{'pic (Mo)':>10}{'vocabulaire (Mo)':>18}"
+          f"{f'voisins@{args.top_k}':>12}")
+    print(f"{'TfidfVectorizer':<22}{tfidf_time:>11.2f}{tfidf_peak:>10.0f}"
+          f"{len(pickle.dumps(tfidf.vocabulary_)) / 1024 ** 2:>18.2f}{1:>12.3f}")
+    print(f"{'HashingTfidf':<22}{hashing_time:>11.2f}{hashing_peak:>10.0f}"
+          f"{hashing.document_frequency.nbytes / 1024 ** 2:>18.2f}"
+          f"{overlap(reference, top_neighbors(hashing_matrix, queries, args.top_k)):>12.3f}")
+    print(f"{'HashingTfidf 90%+10%':<22}{'':>11}{'':>10}{'':>18}"
+          f"{overlap(reference, top_neighbors(incremental_matrix, queries, args.top_k)):>12.3f}")
+    collisions = len(tfidf.vocabulary_) - np.count_nonzero(hashing.document_frequency)
+    print(f"{len(tfidf.vocabulary_)} termes, {collisions} collisions de hachage")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Construction des artefacts prétraités lus par l'application (voir `src.utils.artifacts`).
+
+À partir des CSV Food.com, le script écrit dans le répertoire des artefacts :
+les tables Arrow typées et triées par date (recettes, interactions, clusters),
+les nutriments, les résumés mensuels par plage de dates, l'index de recherche,
+les textes des recettes, les modèles du recommandeur, la popularité et les
+voisinages précalculés, ainsi qu'un manifeste des empreintes des CSV sources. Un CSV
+inchangé depuis la dernière construction n'est pas retraité.
+
+Utilisation :
+    python -m scripts.build_artifacts --dataset-dir data/ [--output-dir artifacts/] [--force]
+"""
+import argparse
+import ast
+import json
+import logging
+import os
+import time
+from typing import Dict
+
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from dotenv import load_dotenv
+from scipy.sparse import csr_matrix, hstack
+from sklearn.cluster import KMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import StandardScaler
+
+from src.utils.artifacts import (ARTIFACTS_DIR, INTERACTIONS_FILE, MANIFEST_FILE,
+                                 MANIFEST_VERSION, NUMERIC_FEATURES, RECIPES_FILE, SOURCE_TABLES, source_fingerprint)
+from src.process.collaborative import ItemSimilarity, bayesian_popularity
+from src.process.range_stats import RECIPE_SKETCHES, build_recipe_sketches
+from src.process.recommendation_cache import CONTENT_NEIGHBOR_SEEDS, NeighborTable
+from src.process.recommender_index import update_feature_index
+from src.process.search_index import SEARCH_INDEX_FILE, BM25Index
+from src.utils.fingerprint import file_fingerprint
+from src.utils.lazy_dataset import RECIPE_TEXT_COLUMNS, TextSideStore
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler(os.path.join(os.path.join(
+            os.path.dirname(__file__), '..'), "script.log")),
+        logging.StreamHandler()
+    ]
+)
+
+# Nombre de clusters précalculés (valeur par défaut de `recipe_clustering`)
+CLUSTER_COUNT = 5
+# Dimension de la projection SVD utilisée pour le clustering
+CLUSTER_COMPONENTS = 20
+
+
+def _write_table(df: pd.DataFrame, path: str) -> None:
+    """
+    Écrit un DataFrame en Arrow IPC non compressé, lisible par projection mémoire.
+
+    Args:
+        df (pd.DataFrame): Données à écrire.
+        path (str): Fichier de destination.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _downcast(df: pd.DataFrame, columns) -> pd.DataFrame:
+    # Identifiants et compteurs en entiers les plus étroits possibles
+    for col in columns:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+    return df
+
+
+def build_recipes(dataset_dir: str, output_dir: str) -> Dict[str, dict]:
+    """
+    Prétraite RAW_recipes.csv et écrit les artefacts des recettes.
+
+    Sont écrits : la table typée, les nutriments, les textes, les résumés mensuels,
+    l'index de recherche, le TF-IDF, le scaler et les clusters.
+
+    La table conserve les colonnes de listes sous forme de chaînes, comme le CSV,
+    pour rester compatible avec le code de l'application ; les nutriments analysés
+    sont écrits à part dans `nutrition.npy`, aligné ligne à ligne sur la table.
+
+    Args:
+        dataset_dir (str): Répertoire des CSV Food.com.
+        output_dir (str): Répertoire des artefacts.
+
+    Returns:
+        dict: Entrées du manifeste (forme des matrices creuses, paramètres du clustering).
+    """
+    start = time.perf_counter()
+    df = pd.read_csv(os.path.join(dataset_dir, RECIPES_FILE), parse_dates=['submitted'])
+    df = df.sort_values('submitted', kind="stable").reset_index(drop=True)
+    df = _downcast(df, ['id', 'minutes', 'contributor_id', 'n_steps', 'n_ingredients'])
+    _write_table(df, os.path.join(output_dir, "recipes.arrow"))
+    np.save(os.path.join(output_dir, "recipe_ids.npy"), df['id'].to_numpy())
+    # Textes volumineux, lus par identifiant par la page des recettes (voir `lazy_dataset`)
+    TextSideStore.build(df, 'id', RECIPE_TEXT_COLUMNS, os.path.join(output_dir, "recipe_text"),
+                        file_fingerprint(os.path.join(dataset_dir, RECIPES_FILE)))
+
+    nutrition = np.array(df['nutrition'].map(ast.literal_eval).tolist(), dtype=np.float32)
+    np.save(os.path.join(output_dir, "nutrition.npy"), nutrition)
+
+    logging.info(f"Table des recettes écrite ({len(df)} lignes) en {time.perf_counter() - start:.1f} s")
+
+    # Résumés mensuels fusionnables (quantiles, valeurs distinctes, top-k) par plage de dates
+    start = time.perf_counter()
+    joblib.dump(build_recipe_sketches(df, nutrition),
+                os.path.join(output_dir, f"{RECIPE_SKETCHES}.joblib"))
+    logging.info(f"Résumés mensuels construits en {time.perf_counter() - start:.1f} s")
+
+    # Index de recherche plein texte (nom, description, étapes)
+    start = time.perf_counter()
+    BM25Index.build(df).save(os.path.join(output_dir, SEARCH_INDEX_FILE))
+    logging.info(f"Index de recherche construit en {time.perf_counter() - start:.1f} s")
+
+    # Modèles du recommandeur, ajustés comme dans AdvancedRecipeRecommender
+    start = time.perf_counter()
+    ingredients = df['ingredients'].map(lambda x: ' '.join(ast.literal_eval(x)).lower())
+    tfidf = TfidfVectorizer(stop_words='english')
+    ingredient_matrix = csr_matrix(tfidf.fit_transform(ingredients))
+    scaler = StandardScaler()
+    numeric_features = scaler.fit_transform(df[NUMERIC_FEATURES])
+    joblib.dump(tfidf, os.path.join(output_dir, "tfidf.joblib"))
+    joblib.dump(scaler, os.path.join(output_dir, "scaler.joblib"))
+    np.save(os.path.join(output_dir, "numeric_features.npy"), numeric_features)
+    for part in ("data", "indices", "indptr"):
+        np.save(os.path.join(output_dir, f"ingredient_matrix.{part}.npy"),
+                getattr(ingredient_matrix, part))
+    logging.info(f"TF-IDF et scaler ajustés en {time.perf_counter() - start:.1f} s")
+
+    # Index des comptes hachés, complété ensuite par les scripts d'ingestion
+    start = time.perf_counter()
+    update_feature_index(df, os.path.join(output_dir, "recommender"), reset=True)
+    logging.info(f"Index du recommandeur construit en {time.perf_counter() - start:.1f} s")
+
+    # Clustering : projection SVD (la matrice TF-IDF complète ne tient pas en dense)
+    start = time.perf_counter()
+    combined = hstack([ingredient_matrix, csr_matrix(numeric_features)]).tocsr()
+    reduced = TruncatedSVD(n_components=min(CLUSTER_COMPONENTS, combined.shape[1] - 1),
+                           random_state=42).fit_transform(combined)
+    clusters = KMeans(n_clusters=min(CLUSTER_COUNT, len(df)), random_state=42,
+                      n_init=10).fit_predict(reduced)
+    _write_table(pd.DataFrame({
+        'id': df['id'].to_numpy(),
+        'Cluster': clusters.astype(np.int8),
+        'X': reduced[:, 0].astype(np.float32),
+        'Y': reduced[:, 1].astype(np.float32),
+    }), os.path.join(output_dir, "clusters.arrow"))
+    logging.info(f"Clustering calculé en {time.perf_counter() - start:.1f} s")
+
+    return {"sparse": {"ingredient_matrix": list(ingredient_matrix.shape)},
+            "clusters": {"n_clusters": int(clusters.max()) + 1}}
+
+
+def build_interactions(dataset_dir: str, output_dir: str) -> Dict[str, dict]:
+    """
+    Prétraite RAW_interactions.csv : table typée triée par date et voisinages item-item.
+
+    Args:
+        dataset_dir (str): Répertoire des CSV Food.com.
+        output_dir (str): Répertoire des artefacts.
+
+    Returns:
+        dict: Entrée 'collaborative' du manifeste.
+    """
+    start = time.perf_counter()
+    df = pd.read_csv(os.path.join(dataset_dir, INTERACTIONS_FILE), parse_dates=['date'])
+    df = df.sort_values('date', kind="stable").reset_index(drop=True)
+    df = _downcast(df, ['user_id', 'recipe_id', 'rating'])
+    _write_table(df, os.path.join(output_dir, "interactions.arrow"))
+
+    logging.info(f"Table des interactions écrite ({len(df)} lignes) en {time.perf_counter() - start:.1f} s")
+
+    return ItemSimilarity.build(df).save(output_dir)
+
+
+def build_neighbors(output_dir: str, manifest: dict, n_seeds: int = CONTENT_NEIGHBOR_SEEDS) -> Dict[str, dict]:
+    """
+    Précalcule les voisins par ingrédients des recettes les plus notées.
+
+    Args:
+        output_dir (str): Répertoire des artefacts (matrice TF-IDF et interactions déjà écrites).
+        manifest (dict): Manifeste en cours d'écriture (forme de la matrice TF-IDF).
+        n_seeds (int, optional): Nombre de recettes de la table ; 0 : toutes les recettes.
+
+    Returns:
+        dict: Entrée 'content_neighbors' du manifeste.
+    """
+    recipe_ids = np.load(os.path.join(output_dir, "recipe_ids.npy"))
+    ingredient_matrix = csr_matrix(
+        tuple(np.load(os.path.join(output_dir, f"ingredient_matrix.{part}.npy"))
+              for part in ("data", "indices", "indptr")),
+        shape=tuple(manifest["sparse"]["ingredient_matrix"]))
+    seeds = None
+    interactions_path = os.path.join(output_dir, "interactions.arrow")
+    if n_seeds and os.path.exists(interactions_path):
+        with pa.memory_map(interactions_path) as source:
+            rated = pa.ipc.open_file(source).read_all().column('recipe_id').to_pandas()
+        seeds = rated.value_counts().index[:n_seeds].to_numpy()
+    return NeighborTable.build(recipe_ids, ingredient_matrix, seeds).save(output_dir)
+
+
+def build_popularity(output_dir: str) -> Dict[str, dict]:
+    """
+    Précalcule la popularité (moyenne bayésienne des notes) de chaque recette.
+
+    Args:
+        output_dir (str): Répertoire des artefacts (identifiants des recettes et interactions déjà écrits).
+
+    Returns:
+        dict: Entrée 'popularity' du manifeste (note moyenne des recettes non notées).
+    """
+    recipe_ids = np.load(os.path.join(output_dir, "recipe_ids.npy"))
+    with pa.memory_map(os.path.join(output_dir, "interactions.arrow")) as source:
+        interactions = pa.ipc.open_file(source).read_all().select(['recipe_id', 'rating']).to_pandas()
+    popularity, prior = bayesian_popularity(interactions, recipe_ids)
+    np.save(os.path.join(output_dir, "popularity.npy"), popularity)
+    return {"popularity": {"prior": prior}}
+
+
+def build_artifacts(dataset_dir: str, output_dir: str = ARTIFACTS_DIR, force: bool = False) -> dict:
+    """
+    Construit tous les artefacts prétraités à partir des CSV Food.com.
+
+    Les CSV dont l'empreinte n'a pas changé depuis la dernière construction sont
+    ignorés. Le manifeste est écrit en dernier : une construction interrompue
+    laisse l'application sur son chemin de chargement CSV habituel.
+
+    Args:
+        dataset_dir (str): Répertoire contenant RAW_recipes.csv et RAW_interactions.csv.
+        output_dir (str, optional): Répertoire des artefacts. Par défaut : `ARTIFACTS_DIR`.
+        force (bool, optional): Reconstruire même si les sources n'ont pas changé.
+
+    Returns:
+        dict: Le manifeste écrit.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    previous = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path, encoding="utf-8") as handle:
+            previous = json.load(handle)
+        if previous.get("version") != MANIFEST_VERSION:
+            previous = {}
+
+    manifest = {"version": MANIFEST_VERSION, "sources": {},
+                "sparse": previous.get("sparse", {}),
+                "clusters": previous.get("clusters", {})}
+    for entry in ("collaborative", "content_neighbors", "popularity"):
+        if entry in previous:
+            manifest[entry] = previous[entry]
+    rebuilt = False
+    builders = {RECIPES_FILE: build_recipes, INTERACTIONS_FILE: build_interactions}
+    for file_name in SOURCE_TABLES:
+        path = os.path.join(dataset_dir, file_name)
+        fingerprint = source_fingerprint(path)
+        if fingerprint is None:
+            logging.warning(f"{path} introuvable : artefacts non construits.")
+            continue
+        if previous.get("sources", {}).get(file_name) == fingerprint:
+            logging.info(f"{file_name} inchangé : artefacts conservés.")
+        else:
+            logging.info(f"Prétraitement de {file_name}...")
+            manifest.update(builders[file_name](dataset_dir, output_dir))
+            rebuilt = True
+        manifest["sources"][file_name] = fingerprint
+
+    if manifest["sparse"] and (rebuilt or "content_neighbors" not in manifest):
+        manifest.update(build_neighbors(output_dir, manifest))
+    if (manifest["sparse"] and "collaborative" in manifest
+            and (rebuilt or "popularity" not in manifest)):
+        manifest.update(build_popularity(output_dir))
+    with open(manifest_path, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2)
+    logging.info(f"Artefacts écrits dans {output_dir}")
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construit les artefacts prétraités de l'application.")
+    parser.add_argument("--dataset-dir", default=os.getenv("DIR_DATASET"))
+    parser.add_argument("--output-dir", default=ARTIFACTS_DIR)
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+    build_artifacts(args.dataset_dir, args.output_dir, args.force)
@@ -6,6 +6,9 @@ import pandas as pd
 from pymongo import MongoClient
 from pymongo.errors import AutoReconnect, ServerSelectionTimeoutError, BulkWriteError
 from dotenv import load_dotenv
+
+from src.process.recommender_index import update_feature_index
+from src.process.search_index import update_search_index
 load_dotenv()
 
 
@@ -218,3 +221,6 @@ if __name__ == "__main__":
     COLLECTION_RECIPES_NAME = os.getenv("COLLECTION_RECIPES_NAME", "recipes2")
     load_dataframe_to_mongodb(df, CONNECTION_STRING,
                               DATABASE_NAME, COLLECTION_RECIPES_NAME)
+    # Les recettes insérées sont ajoutées à l'index du recommandeur (nouvelles ou modifiées seulement)
+    update_feature_index(df)
+    update_search_index(df)
@@ -0,0 +1,40 @@
+"""
+Ajoute de nouvelles recettes (ou leurs versions modifiées) à l'index du recommandeur
+et à l'index de recherche plein texte.
+
+Seules les recettes absentes de l'index ou dont les ingrédients ou les
+caractéristiques numériques ont changé sont vectorisées ; chaque exécution écrit
+un nouveau segment. `--compact` réécrit l'index en un seul segment, sans les
+versions remplacées.
+
+Usage :
+    python -m scripts.update_recommender new_recipes.csv [--index-dir DIR] [--compact]
+"""
+import argparse
+import logging
+
+import pandas as pd
+
+from src.process.recommender_index import RECOMMENDER_INDEX_DIR, RecipeFeatureIndex
+from src.process.search_index import update_search_index
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Met à jour l'index du recommandeur.")
+    parser.add_argument("recipes", nargs="*", help="CSV de recettes au format de RAW_recipes.csv")
+    parser.add_argument("--index-dir", default=RECOMMENDER_INDEX_DIR)
+    parser.add_argument("--compact", action="store_true")
+    args = parser.parse_args()
+
+    index = RecipeFeatureIndex(args.index_dir)
+    for path in args.recipes:
+        recipes = pd.read_csv(path)
+        stats = index.upsert(recipes)
+        update_search_index(recipes)
+        print(f"{path} : {stats['added']} ajoutées, {stats['updated']} modifiées, "
+              f"{stats['unchanged']} inchangées")
+    if args.compact:
+        index.compact()
+    print(f"{index.n_recipes} recettes, {len(index.segments)} segments")
@@ -1,4 +1,5 @@
 from scripts.download_dataset import download_dataset_from_drive
+from scripts.build_artifacts import build_artifacts
 from dotenv import load_dotenv
 import os
 load_dotenv()
@@ -7,3 +8,5 @@ if __name__ == "__main__":
     file_id = os.getenv("DATASET_DRIVE_ID")
     output_dir = os.getenv("DOCKER_DOWNLOAD_DATASET_DIR")
     downloaded_file = download_dataset_from_drive(file_id, output_dir)
+    # Prétraitement hors ligne : tables typées, agrégats, modèles et clusters
+    build_artifacts(os.getenv("DIR_DATASET"), os.getenv("DIR_ARTIFACTS", "./data/artifacts"))
@@ -4,9 +4,13 @@ import seaborn as sns
 import streamlit as st
 import matplotlib.pyplot as plt
 from src.process.nutrition_preprocess import load_data, clean_data
+from src.process.search_index import load_search_index
+from src.process.clustering import CLUSTER_FEATURES, MAX_CLUSTERS, KMeansSweep, get_kmeans_sweep
+from src.process.nutrition_neighbors import NutritionNeighbors, get_nutrition_neighbors
+from src.process.nutrition_index import NUTRIENT_COLUMNS, QUERY_COLUMNS, REGIMES, Constraints, NutritionIndex, get_nutrition_index
+from src.utils.fingerprint import dataframe_fingerprint
 from st_aggrid import AgGrid
 from st_aggrid.grid_options_builder import GridOptionsBuilder
-from sklearn.cluster import KMeans
 import logging
 from typing import Tuple, Optional
 import pandas as pd
@@ -282,18 +286,10 @@ class NutritionPage:
                 st.subheader(
                     'Méthode du coude pour déterminer le nombre de clusters')
 
-                # Sélectionner les colonnes pour le clustering
-                features = ['Moyenne des notes', 'Calories', 'Graisses', 'Protéines',
-                            'Glucides', 'Sucre', 'Sodium', 'Graisse_saturées']
-                df_clustering = self.clean_nutrition_df[features]
-
-                # Calculer l'inertie pour différents nombres de clusters
-                inertias = []
-                max_clusters = 10
-                for k in range(1, max_clusters + 1):
-                    kmeans = KMeans(n_clusters=k, random_state=42)
-                    kmeans.fit(df_clustering)
-                    inertias.append(kmeans.inertia_)
+                # Inerties de k = 1..10, calculées une fois par jeu de données
+                sweep = self.get_kmeans_sweep()
+                max_clusters = max(sweep.ks)
+                inertias = [sweep.inertias[k] for k in sweep.ks]
 
                 # Tracer le graphique du "coudé"
                 plt.figure(figsize=(8, 6))
@@ -316,18 +312,10 @@ class NutritionPage:
                     """Vous pouvez cependant sélectionner une autre valeur pour déterminer par vous même l'impact de la sélection du nombre de clusters.""")
 
             cluster_value = st.slider(
-                "Choisissez un nombre de clusters :", min_value=2, max_value=10, value=3)
-
-            # Sélectionner les colonnes pour le clustering
+                "Choisissez un nombre de clusters :", min_value=2, max_value=max_clusters, value=min(3, max_clusters))
 
-            features = ['Moyenne des notes', 'Graisses', 'Protéines',
-                        'Glucides', 'Sucre', 'Sodium', 'Graisse_saturées', 'Calories']
-            df_clustering = self.clean_nutrition_df[features]
-
-            # Appliquer K-Means
-            kmeans = KMeans(n_clusters=cluster_value, random_state=42)
-            self.clean_nutrition_df['Cluster'] = kmeans.fit_predict(
-                df_clustering)
+            # Étiquettes du modèle déjà ajusté lors du balayage
+            self.clean_nutrition_df['Cluster'] = sweep.labels[cluster_value]
 
             # Affichage des résultats du clustering
             st.write(f"Nombre de clusters créés : {
@@ -419,7 +407,7 @@ class NutritionPage:
             logger.info(
                 "Affichage de la recherche de recettes par régime alimentaire")
 
-            regimes = ["Low-Carb", "High-Protein", "Low-Fat"]
+            regimes = list(REGIMES) + ["Personnalisé"]
             selected_regime = st.selectbox("Choisissez un régime", regimes)
 
             logger.info(f"Régime sélectionné : {selected_regime}")
@@ -428,30 +416,44 @@ class NutritionPage:
             regime_descriptions = {
                 "Low-Carb": "Le régime Low-Carb limite la consommation de glucides, ce qui pousse le corps à utiliser les graisses comme source principale d'énergie.",
                 "High-Protein": "Le régime High-Protein se concentre sur un apport élevé en protéines, favorisant la construction musculaire et la perte de poids.",
-                "Low-Fat": "Le régime Low-Fat réduit la consommation de graisses, ce qui peut aider à la gestion du poids et à la santé cardiovasculaire."
+                "Low-Fat": "Le régime Low-Fat réduit la consommation de graisses, ce qui peut aider à la gestion du poids et à la santé cardiovasculaire.",
+                "Personnalisé": "Composez votre propre régime en fixant un minimum et un maximum pour chaque valeur nutritionnelle, la note moyenne et le nombre de notes."
             }
 
             # Afficher la description du régime sélectionné
             st.write(f"### Description du régime **{selected_regime}**:")
             st.write(regime_descriptions[selected_regime])
 
-            def filter_recipes(regime) -> None:
-                logger.info(f"Filtrage des recettes pour le régime {regime}")
-                if regime == "Low-Carb":
-                    return self.clean_nutrition_df[self.clean_nutrition_df['Glucides'] <= 3]
-                elif regime == "High-Protein":
-                    return self.clean_nutrition_df[self.clean_nutrition_df['Protéines'] >= 75]
-                elif regime == "Low-Fat":
-                    return self.clean_nutrition_df[self.clean_nutrition_df['Graisses'] <= 3]
-                else:
-                    return self.clean_nutrition_df
-
-            filtered_df = filter_recipes(selected_regime)
+            index = self.get_nutrition_index()
+            constraints = self.constraint_inputs(
+                index, REGIMES.get(selected_regime, {}), key=selected_regime)
+
+            col_sort, col_order, col_page = st.columns(3)
+            sort_by = col_sort.selectbox(
+                "Trier par", list(QUERY_COLUMNS), index=QUERY_COLUMNS.index('Moyenne des notes'))
+            ascending = col_order.radio(
+                "Ordre", ["Décroissant", "Croissant"], horizontal=True) == "Croissant"
+            page_size = 100
+
+            positions = index.query(constraints)
+            search_query = st.text_input(
+                "🔎 Rechercher parmi ces recettes (nom, description, étapes)", key="nutrition_search")
+            matched = self.search_filtered_recipes(
+                index.df.iloc[positions], search_query) if search_query else None
+            total = len(positions) if matched is None else len(matched)
+            n_pages = max(1, -(-total // page_size))
+            page = col_page.number_input(
+                f"Page (sur {n_pages})", min_value=1, max_value=n_pages, value=1) - 1
+            if matched is None:
+                filtered_df = index.page(positions, sort_by, ascending, page, page_size)
+            else:
+                filtered_df = matched.iloc[page * page_size:(page + 1) * page_size]
+            logger.info(f"{total} recettes satisfont les contraintes {constraints}")
 
             # Vérification si des recettes ont été trouvées
             if not filtered_df.empty:
                 st.write(
-                    f"Recettes correspondant au régime **{selected_regime}**:")
+                    f"Recettes correspondant au régime **{selected_regime}** ({total} au total):")
                 logger.info(f"{len(filtered_df)} recettes trouvées pour le régime {
                             selected_regime}")
 
@@ -509,6 +511,8 @@ class NutritionPage:
                 with col2:
                     st.plotly_chart(fig2)
 
+                self.display_similar_recipes(recette_info)
+
             else:
                 st.write(
                     f"Aucune recette trouvée pour le régime **{selected_regime}**.")
@@ -518,6 +522,129 @@ class NutritionPage:
             logger.error(
                 f"Erreur lors de l'affichage des recettes filtrées : {e}")
 
+    def get_nutrition_index(self) -> "NutritionIndex":
+        """
+        Retourne l'index de plages des recettes nettoyées.
+
+        L'index est mis en cache par empreinte des colonnes indexées : il n'est
+        reconstruit que lorsque les données changent (nouvelle limite d'interactions).
+
+        Returns:
+            NutritionIndex: L'index des valeurs nutritionnelles.
+        """
+        return get_nutrition_index(self.clean_nutrition_df, self.data_fingerprint(('name',) + QUERY_COLUMNS))
+
+    def data_fingerprint(self, columns) -> str:
+        """
+        Empreinte de certaines colonnes des recettes nettoyées.
+
+        Les caches des index et du clustering sont indexés sur les seules colonnes
+        qu'ils utilisent : l'ajout de la colonne 'Cluster' ne les invalide pas.
+
+        Parameters:
+            columns (Iterable[str]): Colonnes prises en compte (celles absentes sont ignorées).
+
+        Returns:
+            str: Condensé de l'empreinte.
+        """
+        df = self.clean_nutrition_df
+        return dataframe_fingerprint(df[[column for column in columns if column in df.columns]])
+
+    def get_kmeans_sweep(self) -> "KMeansSweep":
+        """
+        Retourne les modèles K-Means k = 1..10 des recettes nettoyées, mis en cache par empreinte.
+
+        Returns:
+            KMeansSweep: Inerties, étiquettes et centroïdes de chaque nombre de clusters.
+        """
+        return get_kmeans_sweep(self.clean_nutrition_df, self.data_fingerprint(CLUSTER_FEATURES),
+                                CLUSTER_FEATURES, MAX_CLUSTERS)
+
+    def get_nutrition_neighbors(self) -> "NutritionNeighbors":
+        """
+        Retourne l'index des profils nutritionnels des recettes nettoyées, mis en cache par empreinte.
+
+        Returns:
+            NutritionNeighbors: L'index des plus proches voisins.
+        """
+        return get_nutrition_neighbors(self.clean_nutrition_df, self.data_fingerprint(('name',) + NUTRIENT_COLUMNS))
+
+    def display_similar_recipes(self, recette_info: pd.Series, k: int = 5) -> None:
+        """
+        Affiche les recettes dont le profil nutritionnel est le plus proche de la recette sélectionnée.
+
+        Parameters:
+            recette_info (pd.Series): Recette sélectionnée (colonnes 'name' et valeurs nutritionnelles).
+            k (int): Nombre de recettes affichées.
+        """
+        try:
+            neighbors = self.get_nutrition_neighbors()
+            similar = neighbors.similar_recipes(recette_info, k=k, exclude_name=recette_info['name'])
+            st.write("### Recettes au profil nutritionnel proche")
+            st.dataframe(similar[['name', 'Distance', 'Moyenne des notes', *neighbors.columns]],
+                         hide_index=True, use_container_width=True)
+            logger.info(f"Recherche de profils proches : {neighbors.latency_report()}")
+        except Exception as e:
+            logger.error(f"Erreur lors de la recherche de recettes au profil proche : {e}")
+
+    def constraint_inputs(self, index: "NutritionIndex", preset: "Constraints", key: str = "") -> "Constraints":
+        """
+        Affiche un curseur de plage par colonne et retourne les contraintes choisies.
+
+        Parameters:
+            index (NutritionIndex): Index des recettes (fournit les bornes des curseurs).
+            preset (Constraints): Bornes initiales, celles du régime sélectionné.
+            key (str): Suffixe des clés des curseurs, pour les réinitialiser à chaque changement de régime.
+
+        Returns:
+            Constraints: Les bornes par colonne ; une colonne laissée sur toute son étendue est omise.
+        """
+        constraints = {}
+        with st.expander("🎚️ Contraintes nutritionnelles", expanded=not preset):
+            columns = st.columns(3)
+            for i, column in enumerate(QUERY_COLUMNS):
+                if column not in index.values:
+                    continue
+                low, high = index.bounds(column)
+                if not low < high:
+                    continue
+                preset_low, preset_high = preset.get(column, (None, None))
+                value = (low if preset_low is None else min(max(float(preset_low), low), high),
+                         high if preset_high is None else min(max(float(preset_high), low), high))
+                selected = columns[i % 3].slider(
+                    column, float(low), float(high), (float(value[0]), float(value[1])),
+                    key=f"nutrition_{column}_{key}")
+                if tuple(selected) != (low, high):
+                    constraints[column] = (selected[0] if selected[0] > low else None,
+                                           selected[1] if selected[1] < high else None)
+        return constraints
+
+    def search_filtered_recipes(self, filtered_df: pd.DataFrame, query: str, top_k: int = 500) -> pd.DataFrame:
+        """
+        Restreint les recettes filtrées à celles correspondant à une recherche plein texte.
+
+        La recherche BM25 est restreinte aux identifiants des recettes filtrées, dont
+        les résultats sont rapprochés par identifiant et triés par pertinence. Sans
+        index enregistré, les recettes sont retournées inchangées.
+
+        Parameters:
+            filtered_df (pd.DataFrame): Recettes du régime sélectionné, indexées par identifiant.
+            query (str): Texte recherché.
+            top_k (int): Nombre maximal de recettes retournées.
+
+        Returns:
+            pd.DataFrame: Les recettes correspondantes, par pertinence décroissante.
+        """
+        index = load_search_index()
+        if index is None:
+            st.info("Index de recherche indisponible : lancez `python -m scripts.build_artifacts`.")
+            return filtered_df
+        results = index.search(query, top_k=top_k, ids=filtered_df.index.to_numpy())
+        rank = pd.Series(range(len(results)), index=results['id'])
+        matched = filtered_df[filtered_df.index.isin(rank.index)]
+        logger.info(f"Recherche « {query} » : {len(matched)} recettes correspondantes.")
+        return matched.iloc[rank.loc[matched.index].to_numpy().argsort(kind="stable")]
+
     def run(self) -> None:
         """
         Affiche l'interface utilisateur avec plusieurs onglets permettant de naviguer entre différentes sections de l'application.
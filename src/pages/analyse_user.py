@@ -31,12 +31,15 @@ import pandas as pd
 from dotenv import load_dotenv
 from datetime import datetime
 from src.pages.recipes.Welcom import Welcome
+from functools import partial
 load_dotenv()
 
 
 logger = logging.getLogger(__name__)
 load_dotenv()
 DEPLOIEMENT_SITE = os.getenv("DEPLOIEMENT_SITE")
+# Colonnes utilisées par l'analyse des utilisateurs (le texte des avis est laissé sur disque)
+INTERACTIONS_COLUMNS = ['user_id', 'recipe_id', 'date', 'rating']
 
 def setup_logging():
     """
@@ -185,7 +188,9 @@ class DataLoaderMango:
                         collection_name, limit=limit)
                 else:
                     dataset_dir = os.getenv("DIR_DATASET")
-                    data = Welcome.show_welcom(DEPLOIEMENT_SITE, load_dataset_from_file, os.path.join(
+                    # La colonne 'review' n'est jamais affichée ici : on ne la charge pas
+                    loader = partial(load_dataset_from_file, columns=INTERACTIONS_COLUMNS)
+                    data = Welcome.show_welcom(DEPLOIEMENT_SITE, loader, os.path.join(
                         dataset_dir, "RAW_interactions.csv"), None, None, datetime(1999, 1, 1), datetime(2018, 12, 31), is_interactional=True)
                 data['collection_name'] = collection_name  # Ajouter une colonne pour identifier la collection
                 data_frames[collection_name] = data
@@ -1,3 +1,4 @@
+import ast
 import logging
 import numpy as np
 import pandas as pd
@@ -10,12 +11,16 @@ from src.utils.static import mois
 import locale
 from src.visualizations import load_css
 from src.utils.static import recipe_columns_description
-from collections import Counter
 from streamlit_echarts import st_echarts
 from src.utils.static import constribution_data
 from dotenv import load_dotenv
 import os
-from src.process.recommandation import AdvancedRecipeRecommender
+from src.process.recommandation import HYBRID_WEIGHTS, RECOMMENDER_FEATURIZER, AdvancedRecipeRecommender
+from src.process.recommender_index import get_feature_index
+from src.utils.export import EXPORT_FORMATS, cached_export
+from src.process.ingredients import WORDCLOUD_TOP_K, wordcloud_payload
+from src.process.contributors import ContributorActivity
+from src.utils.artifacts import get_artifact_store
 from typing import Optional
 
 
@@ -129,6 +134,30 @@ class DataManager:
         except Exception as e:
             logging.error(f"Échec de l'exportation des données: {e}")
 
+    def export_data_to_file(self, export_format: str) -> Optional[str]:
+        """
+        Exporte les données de recettes par blocs dans un fichier, réutilisé tant qu'elles ne changent pas.
+
+        Contrairement à `export_data`, l'export n'est jamais construit en mémoire sous
+        forme de chaîne. Les formats Parquet et Arrow sont compressés et réutilisent
+        les colonnes de listes déjà analysées (`tags_list`, `nutrition_list`...). Le
+        fichier est mis en cache par empreinte des données et format (`cached_export`).
+
+        Args:
+            export_format (str): Le format d'export ("CSV", "JSON", "Parquet" ou "Arrow").
+
+        Retourne:
+            Optional[str]: Le chemin du fichier (à ne pas supprimer), ou None en cas d'échec.
+        """
+        try:
+            recipe: Recipe = self.recipe
+            # Les textes (`steps`, `description`) laissés sur disque sont lus bloc par bloc
+            return cached_export(recipe.get_fingerprint(), export_format,
+                                 lambda: recipe.st.session_state.data, fetch_text=recipe.with_text)
+        except Exception as e:
+            logging.error(f"Échec de l'exportation des données: {e}")
+            return None
+
     def analyze_temporal_distribution(self, start_datetime: datetime, end_datetime: datetime) -> dict:
         """
         Analyse la distribution temporelle des recettes.
@@ -196,6 +225,123 @@ class DataManager:
         except Exception as e:
             logging.error(f"Échec de l'analyse des tags: {e}")
 
+    def facet_values(self, column: str) -> list[str]:
+        """
+        Liste les valeurs disponibles d'un filtre (tags ou ingrédients).
+
+        Args:
+            column (str): 'tags' ou 'ingredients'.
+
+        Retourne:
+            list[str]: Les valeurs triées, ou une liste vide en cas d'échec.
+        """
+        try:
+            return self.recipe.facet_values(column)
+        except Exception as e:
+            logging.error(f"Échec de la lecture des valeurs de filtre: {e}")
+            return []
+
+    def filter_recipes(self, all_of: Optional[dict] = None, none_of: Optional[dict] = None) -> Optional[pd.DataFrame]:
+        """
+        Filtre les recettes par tags et ingrédients.
+
+        Args:
+            all_of (dict): Valeurs toutes requises, par colonne.
+            none_of (dict): Valeurs exclues, par colonne.
+
+        Retourne:
+            pd.DataFrame: Les recettes correspondantes, ou None en cas d'échec.
+        """
+        try:
+            return self.recipe.filter_recipes(all_of=all_of, none_of=none_of)
+        except Exception as e:
+            logging.error(f"Échec du filtrage des recettes: {e}")
+
+    def analyze_ingredients(self) -> Optional[pd.Series]:
+        """
+        Compte les ingrédients des recettes de la période.
+
+        Retourne:
+            pd.Series: Les comptes par ordre décroissant, ou None en cas d'échec.
+        """
+        try:
+            return self.recipe.analyze_ingredients()
+        except Exception as e:
+            logging.error(f"Échec de l'analyse des ingrédients: {e}")
+
+    def complete_recipe_names(self, query: str, top_k: int = 15) -> Optional[pd.DataFrame]:
+        """
+        Suggère des recettes dont le nom correspond au texte saisi.
+
+        Args:
+            query (str): Texte saisi.
+            top_k (int): Nombre de suggestions.
+
+        Retourne:
+            pd.DataFrame: Colonnes 'id', 'name' et 'score', ou None en cas d'échec.
+        """
+        try:
+            return self.recipe.complete_recipe_names(query, top_k=top_k)
+        except Exception as e:
+            logging.error(f"Échec de l'autocomplétion des noms de recettes: {e}")
+
+    def search_recipes(self, query: str, top_k: int = 15) -> Optional[pd.DataFrame]:
+        """
+        Recherche des recettes par texte (nom, description, étapes).
+
+        Args:
+            query (str): Texte recherché.
+            top_k (int): Nombre maximal de résultats.
+
+        Retourne:
+            pd.DataFrame: Colonnes 'id', 'name' et 'score', ou None en cas d'échec.
+        """
+        try:
+            return self.recipe.search_recipes(query, top_k=top_k)
+        except Exception as e:
+            logging.error(f"Échec de la recherche de recettes: {e}")
+
+    def analyze_tag_associations(self, min_count: int = 5, sort_by: str = 'Lift') -> Optional[pd.DataFrame]:
+        """
+        Analyse les associations entre tags des recettes.
+
+        Args:
+            min_count (int): Nombre minimal de recettes partageant les deux tags.
+            sort_by (str): Critère de tri ('Lift', 'PMI' ou 'Co-occurrences').
+
+        Retourne:
+            pd.DataFrame: Les paires de tags les plus associées, ou None en cas d'échec.
+        """
+        try:
+            return self.recipe.analyze_tag_associations(min_count=min_count, sort_by=sort_by)
+        except Exception as e:
+            logging.error(f"Échec de l'analyse des associations de tags: {e}")
+
+    def analyze_contributors(self) -> Optional[dict]:
+        """
+        Analyse les contributions par utilisateur sur la période sélectionnée.
+
+        Retourne:
+            dict: Nombre de contributeurs, statistiques de contributions et principaux
+                contributeurs, ou None en cas d'échec.
+        """
+        try:
+            return self.recipe.analyze_contributors()
+        except Exception as e:
+            logging.error(f"Échec de l'analyse des contributeurs: {e}")
+
+    def contributor_activity(self) -> Optional[ContributorActivity]:
+        """
+        Retourne l'activité des contributeurs de la période sélectionnée.
+
+        Retourne:
+            ContributorActivity: Comptes et périodes d'activité, ou None en cas d'échec.
+        """
+        try:
+            return self.recipe.contributor_activity()
+        except Exception as e:
+            logging.error(f"Échec du calcul de l'activité des contributeurs: {e}")
+
 
 class DisplayManager:
     """ 
@@ -209,7 +355,9 @@ class DisplayManager:
         """Initialise le DisplayManager avec une instance de DataManager."""
         self.data_manager: DataManager = data_manager
         self.recommender:  AdvancedRecipeRecommender = AdvancedRecipeRecommender(
-            recipes_df=self.data_manager.get_recipe_data().st.session_state.data)
+            recipes_df=self.data_manager.get_recipe_data().st.session_state.data,
+            artifacts=get_artifact_store(),
+            feature_index=get_feature_index() if RECOMMENDER_FEATURIZER == 'hashing' else None)
     @staticmethod
     def load_css() -> None:
         """Charge les fichiers CSS pour l'application."""
@@ -258,18 +406,40 @@ class DisplayManager:
                     self.data_manager.get_recipe_data().clean_dataframe()
                 st.header("📥 Exporter")
                 export_format: str = st.radio(
-                    "Format d'export", ["CSV", "JSON"])
-                if export_format == "CSV":
-                    csv: str = self.data_manager.export_data("CSV")
-                    if st.download_button(label="Télécharger au format CSV", data=csv, file_name="data.csv", mime="text/csv"):
-                        st.success("Export en cours...")
-                elif export_format == "JSON":
-                    json: str = self.data_manager.export_data("JSON")
-                    if st.download_button(label="Télécharger au format JSON", data=json, file_name="data.json", mime="application/json"):
-                        st.success("Export en cours...")
+                    "Format d'export", list(EXPORT_FORMATS))
+                self._download_export(export_format)
         except Exception as e:
             logging.error(f"Erreur dans sidebar: {e}")
 
+    def _download_export(self, export_format: str) -> None:
+        """
+        Affiche le bouton de téléchargement de l'export au format choisi.
+
+        L'export n'est écrit qu'après un clic sur « Préparer l'export », puis réutilisé
+        tant que les données et le format sont inchangés. Le fichier n'est relu que
+        pendant que le bouton de téléchargement est affiché, c'est-à-dire jusqu'au
+        téléchargement.
+
+        Args:
+            export_format (str): Le format d'export ("CSV", "JSON", "Parquet" ou "Arrow").
+        """
+        extension, mime = EXPORT_FORMATS[export_format]
+        if st.session_state.get("export_ready") != export_format:
+            if not st.button("Préparer l'export", key="prepare_export"):
+                return
+            st.session_state.export_ready = export_format
+        with st.spinner("Préparation de l'export..."):
+            path: Optional[str] = self.data_manager.export_data_to_file(export_format)
+        if path is None:
+            st.session_state.pop("export_ready", None)
+            st.error("L'export des données a échoué.")
+            return
+        with open(path, "rb") as handle:
+            if st.download_button(label=f"Télécharger au format {export_format}", data=handle,
+                                  file_name=f"data.{extension}", mime=mime):
+                st.session_state.pop("export_ready", None)
+                st.success("Export en cours...")
+
     def home_tab(self) -> None:
         """Affiche l'onglet d'accueil avec l'analyse des recettes."""
         try:
@@ -310,8 +480,9 @@ class DisplayManager:
                 )
                 search_term: str = st.text_input(
                     "🔍 Rechercher dans le dataset")
+                filtered: Optional[pd.DataFrame] = self._facet_filters()
                 self.display_data_structures(
-                    columns_to_show=columns_to_show, search_term=search_term)
+                    columns_to_show=columns_to_show, search_term=search_term, data=filtered)
                 self.display_anomalies_values()
 
             elif option == "Colonne Ingredient":
@@ -360,9 +531,11 @@ class DisplayManager:
         Fournit des métriques, des graphiques de distribution et des informations détaillées sur les contributeurs.
         """
         try:
-            data: dict = constribution_data
+            # Statistiques de la période sélectionnée ; l'instantané statique sert de repli
+            activity: Optional[ContributorActivity] = self.data_manager.contributor_activity()
+            data: dict = constribution_data if activity is None else activity.summary(top_k=10)
 
-            top_contrib_df: pd.DataFrame = pd.DataFrame(
+            top_contrib_df: pd.DataFrame = activity.top(10) if activity is not None else pd.DataFrame(
                 list(data['top_contributors'].items()),
                 columns=['ID Utilisateur', 'Nombre de contributions']
             )
@@ -403,6 +576,12 @@ class DisplayManager:
                     "Max Contributions",
                     f"{data['contributions_per_user']['max']:,}",
                 )
+            if activity is not None:
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Indice de Gini", f"{activity.gini():.3f}")
+                with col2:
+                    st.metric("Part des recettes du top 1 %", f"{activity.top_share(0.01):.1%}")
 
             if display_mode == "Vue d'ensemble":
                 col1, col2 = st.columns(2)
@@ -425,7 +604,7 @@ class DisplayManager:
                 )
 
                 with tab1:
-                    self._display_distribution_histogram(data, color_theme)
+                    self._display_distribution_histogram(data, color_theme, activity)
 
                 with tab2:
                     self._display_top_contributors(top_contrib_df, color_theme)
@@ -511,16 +690,47 @@ class DisplayManager:
         except Exception as e:
             logging.error(f"Erreur dans _create_top_contributors_figure: {e}")
 
-    def _display_distribution_histogram(self, data: dict, color_theme: str) -> None:
+    def _display_distribution_histogram(self, data: dict, color_theme: str,
+                                        activity: Optional[ContributorActivity] = None) -> None:
         """
         Affiche un histogramme de la distribution des contributions.
 
+        Avec l'activité des contributeurs de la période, l'histogramme est celui des
+        comptes réels, accompagné de la courbe de Lorenz ; sinon il est simulé à partir
+        des statistiques.
+
         Args:
             data (dict): Les données contenant les statistiques de contribution.
             color_theme (str): Le thème de couleur pour la figure.
+            activity (ContributorActivity, optional): Activité des contributeurs de la période.
         """
         try:
             st.subheader("Distribution détaillée des contributions")
+            if activity is not None:
+                histogram: pd.Series = activity.count_histogram()
+                fig_hist: px.bar = px.bar(
+                    x=histogram.index, y=histogram.to_numpy(), log_x=True, log_y=True,
+                    title="Nombre de contributeurs par nombre de recettes",
+                    color_discrete_sequence=[px.colors.sequential.Blues[6]]
+                )
+                fig_hist.update_layout(
+                    xaxis_title="Nombre de contributions",
+                    yaxis_title="Contributeurs"
+                )
+                st.plotly_chart(fig_hist, use_container_width=True)
+
+                lorenz: pd.DataFrame = activity.lorenz()
+                fig_lorenz: go.Figure = go.Figure()
+                fig_lorenz.add_trace(go.Scatter(
+                    x=lorenz['Part des contributeurs'], y=lorenz['Part des recettes'],
+                    mode='lines', name='Lorenz', fill='tozeroy'))
+                fig_lorenz.add_trace(go.Scatter(
+                    x=[0, 1], y=[0, 1], mode='lines', name='Égalité', line=dict(dash='dash')))
+                fig_lorenz.update_layout(
+                    title=f"Courbe de Lorenz (Gini = {activity.gini():.3f})",
+                    xaxis_title="Part des contributeurs", yaxis_title="Part des recettes")
+                st.plotly_chart(fig_lorenz, use_container_width=True)
+                return
             simulated_data: np.ndarray = np.random.lognormal(
                 0, 2, data['total_contributors'])
             simulated_data *= (data['contributions_per_user']
@@ -646,8 +856,8 @@ class DisplayManager:
                     "Maximum de tags par recette",
                     str(tags_data['tags_per_recipe']['max'])
                 )
-            tab1, tab2 = st.tabs(
-                ["🏷️ Tags les Plus Courants", "📊 Analyse Détaillée"])
+            tab1, tab2, tab3 = st.tabs(
+                ["🏷️ Tags les Plus Courants", "📊 Analyse Détaillée", "🔗 Associations de Tags"])
 
             with tab1:
                 df_tags: pd.DataFrame = pd.DataFrame(
@@ -779,9 +989,49 @@ class DisplayManager:
                         .highlight_min(subset=['Valeur'], color='lightpink'),
                         hide_index=True
                     )
+
+            with tab3:
+                self._display_tag_associations()
         except Exception as e:
             logging.error(f"Erreur dans display_tags_analysis: {e}")
 
+    def _display_tag_associations(self) -> None:
+        """
+        Affiche les paires de tags les plus associées (lift, PMI) et leur carte de chaleur.
+        """
+        st.subheader("Associations entre Tags")
+        st.markdown(
+            "Le **lift** compare la fréquence d'une paire de tags à celle attendue si les "
+            "tags étaient indépendants (> 1 : association positive) ; la **PMI** en est le logarithme en base 2."
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            min_count: int = st.slider(
+                "Nombre minimal de recettes communes", 1, 500, 20, key="tag_assoc_min_count")
+        with col2:
+            sort_by: str = st.selectbox(
+                "Trier par", ['Lift', 'PMI', 'Co-occurrences'], key="tag_assoc_sort")
+        associations: Optional[pd.DataFrame] = self.data_manager.analyze_tag_associations(
+            min_count=min_count, sort_by=sort_by)
+        if associations is None or associations.empty:
+            st.info("Aucune paire de tags ne satisfait ces critères.")
+            return
+        st.dataframe(
+            associations.style.format({'Support': '{:.2%}', 'Lift': '{:.2f}', 'PMI': '{:.2f}'}),
+            hide_index=True
+        )
+        top_pairs: pd.DataFrame = associations.head(20)
+        fig_heatmap: go.Figure = go.Figure(go.Heatmap(
+            x=top_pairs['Tag B'],
+            y=top_pairs['Tag A'],
+            z=top_pairs[sort_by],
+            colorscale='Viridis',
+            hovertemplate='%{y} × %{x}<br>' + sort_by + ' : %{z:.2f}<extra></extra>'
+        ))
+        fig_heatmap.update_layout(
+            title=f'Top 20 des paires de tags ({sort_by})', height=600)
+        st.plotly_chart(fig_heatmap, use_container_width=True)
+
     def display_submission_analysis(self) -> None:
         """ 
         Afficher l'analyse des soumissions de recettes au fil du temps.
@@ -1032,7 +1282,34 @@ class DisplayManager:
         except Exception as e:
             logging.error(f"Error in display_nutrition_analysis: {e}")
 
-    def display_data_structures(self, columns_to_show: Optional[list[str]] = None, search_term: Optional[str] = None) -> None:
+    def _facet_filters(self) -> Optional[pd.DataFrame]:
+        """
+        Affiche les filtres par tags et ingrédients et retourne les recettes retenues.
+
+        Retourne:
+            pd.DataFrame: Les recettes filtrées, ou None si aucun filtre n'est actif.
+        """
+        with st.expander("🏷️ Filtrer par tags et ingrédients"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                tags: list[str] = st.multiselect(
+                    "Tags requis", self.data_manager.facet_values('tags'), key="facet_tags")
+            with col2:
+                ingredients: list[str] = st.multiselect(
+                    "Ingrédients requis", self.data_manager.facet_values('ingredients'), key="facet_ingredients")
+            with col3:
+                excluded: list[str] = st.multiselect(
+                    "Ingrédients exclus", self.data_manager.facet_values('ingredients'), key="facet_excluded")
+        if not (tags or ingredients or excluded):
+            return None
+        filtered: Optional[pd.DataFrame] = self.data_manager.filter_recipes(
+            all_of={'tags': tags, 'ingredients': ingredients}, none_of={'ingredients': excluded})
+        if filtered is not None:
+            st.caption(f"{len(filtered):,} recettes correspondent aux filtres.")
+        return filtered
+
+    def display_data_structures(self, columns_to_show: Optional[list[str]] = None, search_term: Optional[str] = None,
+                                data: Optional[pd.DataFrame] = None) -> None:
         """
         Affiche les structures de données avec un filtrage optionnel.
 
@@ -1040,8 +1317,13 @@ class DisplayManager:
             columns_to_show (Facultatif[liste[str]]) : Les colonnes à afficher. La valeur par défaut est None.
             search_term (Facultatif[str]) : Le terme de recherche pour filtrer les données. 
         La valeur par défaut est None.
+            data (Facultatif[pd.DataFrame]) : Recettes déjà filtrées (tags, ingrédients). 
+        Par défaut, toutes les recettes de la session.
         """
         try:
+            recipe: Recipe = self.data_manager.get_recipe_data()
+            if data is None:
+                data = recipe.st.session_state.data
             if columns_to_show is None:
                 columns_to_show = self.data_manager.get_recipe_data().columns
             number_of_rows: int = st.selectbox(
@@ -1053,14 +1335,12 @@ class DisplayManager:
             st.subheader(f'Afficharger des {
                          number_of_rows} premiers elements du dataset')
             if search_term:
-                mask = self.data_manager.get_recipe_data().st.session_state.data['description'].str.contains(
-                    search_term, case=False)
-                mask = mask.fillna(False)
-                st.dataframe(
-                    self.data_manager.get_recipe_data().st.session_state.data[mask][columns_to_show].head(number_of_rows))
-            else:
-                st.dataframe(
-                    self.data_manager.get_recipe_data().st.session_state.data[columns_to_show].head(number_of_rows))
+                # Index BM25 (nom, description, étapes) : aucun texte n'est relu pour filtrer
+                matches = recipe.search_recipes(search_term, top_k=max(len(data), 1), ids=data['id'].to_numpy())
+                data = matches[['id']].merge(data, on='id')
+            rows: pd.DataFrame = recipe.with_text(data.head(number_of_rows))
+            st.dataframe(
+                rows[[column for column in columns_to_show if column in rows.columns]])
 
             colonnes_preview: bool = st.checkbox(
                 "Afficher la description des colonnes")
@@ -1103,28 +1383,22 @@ class DisplayManager:
     def analyze_ingredients(self) -> None:
         """Analyser et afficher les ingrédients les plus fréquents dans les recettes."""
         try:
-            ingredient_sample = self.data_manager.get_recipe_data().st.session_state.data["ingredients"].apply(
-                eval) if DEPLOIEMENT_SITE != "ONLINE" else self.data_manager.get_recipe_data().st.session_state.data["ingredients"]
-            flat_ingredients: list[str] = [
-                item.lower() for sublist in ingredient_sample for item in sublist]
-            ingredient_freq: Counter = Counter(flat_ingredients)
-            ingredients: list[str] = []
-            frequences: list[int] = []
-            for ingredient, count in ingredient_freq.most_common(10):
-                ingredients.append(ingredient)
-                frequences.append(count)
-
+            ingredient_freq: pd.Series = self.data_manager.analyze_ingredients()
             df: pd.DataFrame = pd.DataFrame(
-                {"Ingrédient": ingredients, "Frequence": frequences})
+                {"Ingrédient": ingredient_freq.index[:10], "Frequence": ingredient_freq.to_numpy()[:10]})
             st.write("10 ingrédients les plus frequents dans les recettes")
             st.table(df)
-            data: list[dict[str, int]] = [
-                {"name": name, "value": value} for name, value in ingredient_freq.items()
-            ]
+            top_k: int = st.slider(
+                "Nombre d'ingrédients dans le nuage de mots", 20, 1000, WORDCLOUD_TOP_K, step=20,
+                key="wordcloud_top_k")
+            data, tail = wordcloud_payload(ingredient_freq, top_k)
             wordcloud_option: dict = {"series": [
                 {"type": "wordCloud", "data": data}]}
             st.markdown("### Nuage de mots")
             st_echarts(wordcloud_option)
+            if tail["count"]:
+                st.caption(
+                    f"{tail['count']:,} autres ingrédients ({tail['value']:,} occurrences) non affichés.")
         except Exception as e:
             logging.error(f"Error in analyze_ingredients: {e}")
 
@@ -1157,27 +1431,48 @@ class DisplayManager:
         # if "selected_recipe_id" in st.session_state:
         # print(st.session_state.selected_recipe_id)
         list_recommender = self.recommender.recipes_df['id'].tolist()[:15]
+        recipe_names: dict = {}
+        search_query: str = st.text_input(
+            "🔎 Rechercher une recette (nom, description, étapes)", key="recipe_search")
+        if search_query:
+            # Suggestions par nom d'abord, puis recherche plein texte
+            results: Optional[pd.DataFrame] = self.data_manager.complete_recipe_names(
+                search_query, top_k=15)
+            if results is None or results.empty:
+                results = self.data_manager.search_recipes(search_query, top_k=15)
+            if results is not None and not results.empty:
+                list_recommender = results['id'].tolist()
+                recipe_names = dict(zip(results['id'], results['name']))
+            else:
+                st.info("Aucune recette ne correspond à cette recherche.")
         if 'selected_recipe_id' not in st.session_state:
             st.session_state.selected_recipe_id = list_recommender[
                 2]
+        if st.session_state.selected_recipe_id not in list_recommender:
+            st.session_state.selected_recipe_id = list_recommender[0]
         selected_recipe_id = st.selectbox(
             "Choisissez une recette de base",
             list_recommender,
             list_recommender.index(
-                st.session_state.selected_recipe_id)
+                st.session_state.selected_recipe_id),
+            format_func=lambda recipe_id: f"{recipe_names[recipe_id]} ({recipe_id})"
+            if recipe_id in recipe_names else str(recipe_id)
         )
 
         st.session_state.selected_recipe_id = selected_recipe_id
         # print(recommender.recipes_df[recommender.recipes_df['id']
         #                           == st.session_state.selected_recipe_id])
-        selected_recipe = self.recommender.recipes_df[self.recommender.recipes_df['id']
-                                                      == st.session_state.selected_recipe_id].iloc[0]
+        recipe: Recipe = self.data_manager.get_recipe_data()
+        # Seule la recette choisie est complétée avec ses textes (description, étapes)
+        selected_recipe = recipe.with_text(self.recommender.recipes_df[self.recommender.recipes_df['id']
+                                                                       == st.session_state.selected_recipe_id]).iloc[0]
         st.markdown(f"""
         <div class="recommendation-card">
             <h2 class="recipe-detail">{selected_recipe['name']}</h2>
             <div class="recipe-detail">
                 <p>⏰ <strong>Durée :</strong> {selected_recipe['minutes']} minutes</p>
                 <p>📋 <strong>Nombre d'étapes :</strong> {selected_recipe['n_steps']}</p>
+                <p>{selected_recipe.get('description') if pd.notna(selected_recipe.get('description')) else ''}</p>
             </div>
         </div>
         """, unsafe_allow_html=True)
@@ -1186,19 +1481,67 @@ class DisplayManager:
             selected_recipe['ingredients']) if DEPLOIEMENT_SITE != "ONLINE" else selected_recipe['ingredients']
         st.markdown(
             f'<div class="ingredient-list">{" • ".join(ingredients)}</div>', unsafe_allow_html=True)
+        steps = selected_recipe.get('steps')
+        if isinstance(steps, (str, list)) and len(steps):
+            st.markdown("<h3>📝 Étapes</h3>", unsafe_allow_html=True)
+            for number, step in enumerate(ast.literal_eval(steps) if isinstance(steps, str) else steps, 1):
+                st.markdown(f"{number}. {step}")
 
         st.markdown("<h3>🔍 Recommandations Similaires</h3>",
                     unsafe_allow_html=True)
-        recommendations: pd.DataFrame = self.recommender.content_based_recommendations(
+        mode: str = st.radio("Mode de recommandation", ["Ingrédients", "Hybride"],
+                             horizontal=True, key="recommendation_mode")
+        if mode == "Hybride":
+            with st.expander("Poids du score hybride"):
+                weights: dict = {
+                    name: st.slider(label, 0.0, 1.0, HYBRID_WEIGHTS[name], 0.05, key=f"hybrid_{name}")
+                    for name, label in [('ingredients', "Ingrédients (TF-IDF)"),
+                                        ('numeric', "Durée, ingrédients, étapes"),
+                                        ('popularity', "Popularité (notes)"),
+                                        ('nutrition', "Profil nutritionnel")]
+                }
+            recommendations: pd.DataFrame = self.recommender.cached_recommendations(
+                selected_recipe_id,
+                top_n=3,
+                mode='hybrid',
+                weights=weights
+            )
+        else:
+            recommendations = self.recommender.cached_recommendations(
+                selected_recipe_id,
+                top_n=3,
+                mode='content'
+            )
+        self._recommendation_cards(recipe.with_text(recommendations, ['description']))
+
+        st.markdown("<h3>👥 Appréciées par les mêmes utilisateurs</h3>",
+                    unsafe_allow_html=True)
+        collaborative: pd.DataFrame = self.recommender.cached_recommendations(
             selected_recipe_id,
-            top_n=3
+            top_n=3,
+            mode='collaborative'
         )
+        if collaborative.empty:
+            st.info("Aucune interaction positive connue pour cette recette "
+                    "(voisinages construits par `scripts/build_artifacts.py`).")
+        else:
+            self._recommendation_cards(recipe.with_text(collaborative, ['description']))
+
+    @staticmethod
+    def _recommendation_cards(recommendations: pd.DataFrame) -> None:
+        """
+        Affiche une carte par recette recommandée.
+
+        Args:
+            recommendations (pd.DataFrame): Recettes recommandées.
+        """
         for _, rec in recommendations.iterrows():
             st.markdown(f"""
             <div class="recommendation-card">
                 <h4>{rec['name']}</h4>
                 <p>⏰ <strong>Durée :</strong> {rec['minutes']} minutes</p>
                 <p>🥘 <strong>Ingrédients :</strong> {', '.join(eval(rec['ingredients'])) if DEPLOIEMENT_SITE != "ONLINE" else ', '.join(rec['ingredients'])}</p>
+                <p>{rec.get('description') if pd.notna(rec.get('description')) else ''}</p>
             </div>
             """, unsafe_allow_html=True)
 
@@ -0,0 +1,157 @@
+"""
+Moteur de statistiques pour la détection d'anomalies de `Recipe.detect_dataframe_anomalies`.
+
+Toutes les statistiques par colonne (valeurs manquantes, moyenne, écart-type,
+nombre de valeurs aberrantes selon l'écart-type et le score Z) sont calculées en
+une seule passe vectorisée sur la matrice des colonnes numériques. Les valeurs
+distinctes des colonnes de listes sont comptées sur leur version encodée
+(`CodedListColumn`), partagée par empreinte avec les autres analyses, plutôt
+qu'en aplatissant les listes dans un ensemble Python.
+
+Le rapport produit a exactement la même forme que l'implémentation historique ;
+il est mis en cache par empreinte du jeu de données et par seuils.
+"""
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.coded_columns import get_coded_column, is_list_column
+from src.utils.fingerprint import FingerprintCache
+
+logger = logging.getLogger(__name__)
+
+# Rapports d'anomalies déjà calculés, par (seuil écart-type, seuil score Z)
+anomaly_cache = FingerprintCache("anomalies", max_entries=16)
+
+
+def _numeric_moments(values: np.ndarray, std_threshold: float,
+                     z_score_threshold: float) -> Dict[str, np.ndarray]:
+    """
+    Calcule les moments et les comptes d'aberrations de chaque colonne d'une matrice.
+
+    Reproduit la sémantique de pandas (`mean`, `std` avec ddof=1, valeurs manquantes
+    ignorées) et de `scipy.stats.zscore` (ddof=0 ; une colonne contenant une valeur
+    manquante n'a aucune aberration au sens du score Z).
+
+    Args:
+        values (np.ndarray): Matrice (n_lignes, n_colonnes) en float64, NaN pour les manquants.
+        std_threshold (float): Seuil en nombre d'écarts-types.
+        z_score_threshold (float): Seuil de score Z.
+
+    Returns:
+        dict: Tableaux 'mean', 'std', 'std_outliers' et 'z_outliers' (un élément par colonne).
+    """
+    valid = ~np.isnan(values)
+    n_valid = valid.sum(axis=0)
+    filled = np.where(valid, values, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = filled.sum(axis=0) / n_valid
+        deviation = np.abs(values - mean)
+        squares = np.where(valid, deviation, 0.0) ** 2
+        sum_squares = squares.sum(axis=0)
+        std = np.sqrt(sum_squares / (n_valid - 1))
+        std_population = np.sqrt(sum_squares / n_valid)
+        std_outliers = (deviation > std_threshold * std).sum(axis=0)
+        z_outliers = (deviation / std_population > z_score_threshold).sum(axis=0)
+    z_outliers[n_valid < len(values)] = 0
+    return {"mean": mean, "std": std, "std_outliers": std_outliers, "z_outliers": z_outliers}
+
+
+def _distinct_count(df: pd.DataFrame, column: str, fingerprint: Optional[str] = None) -> int:
+    """Nombre de valeurs distinctes ; les colonnes de listes sont comptées élément par élément."""
+    if not is_list_column(df[column]):
+        return df[column].nunique()
+    # 'tags_list' est encodée sous la clé 'tags', comme dans les autres analyses
+    name = column[:-len("_list")] if column.endswith("_list") else column
+    return get_coded_column(df, name, fingerprint).n_distinct
+
+
+def compute_anomaly_report(df: pd.DataFrame, std_threshold: float = 3.0, z_score_threshold: float = 3.0,
+                           fingerprint: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Calcule le rapport d'anomalies d'un DataFrame.
+
+    Args:
+        df (pd.DataFrame): Données à analyser.
+        std_threshold (float, optional): Seuil en nombre d'écarts-types. Par défaut : 3.0.
+        z_score_threshold (float, optional): Seuil de score Z. Par défaut : 3.0.
+        fingerprint (str, optional): Empreinte de `df`, pour réutiliser les colonnes de listes
+            déjà encodées. Par défaut : None (colonnes encodées sans cache).
+
+    Returns:
+        Dict[str, pd.DataFrame]: Clés 'missing_values', 'std_outliers', 'z_score_outliers',
+            'column_info' et 'data_types', au format de `Recipe.detect_dataframe_anomalies`.
+    """
+    anomalies: Dict[str, pd.DataFrame] = {}
+    n_rows = len(df)
+
+    missing_count = df.isnull().sum()
+    missing_df = pd.DataFrame({
+        'Missing Count': missing_count,
+        'Missing Percentage': (missing_count / n_rows * 100).round(2)
+    }).query('`Missing Count` > 0')
+    anomalies['missing_values'] = missing_df if not missing_df.empty else pd.DataFrame()
+
+    numeric_columns = df.select_dtypes(include=[np.number]).columns
+    moments = _numeric_moments(df[numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan),
+                               std_threshold, z_score_threshold)
+
+    std_rows, z_rows = [], []
+    for i, col in enumerate(numeric_columns):
+        mean, std = moments["mean"][i], moments["std"][i]
+        if moments["std_outliers"][i]:
+            std_rows.append({
+                'Column': col,
+                'Mean': mean,
+                'Standard Deviation': std,
+                'Lower Bound': mean - (std_threshold * std),
+                'Upper Bound': mean + (std_threshold * std),
+                'Outlier Count': int(moments["std_outliers"][i]),
+                'Outlier Percentage': round(moments["std_outliers"][i] / n_rows * 100, 2)
+            })
+        if moments["z_outliers"][i]:
+            z_rows.append({
+                'Column': col,
+                'Mean': mean,
+                'Standard Deviation': std,
+                'Outlier Count': int(moments["z_outliers"][i]),
+                'Outlier Percentage': round(moments["z_outliers"][i] / n_rows * 100, 2)
+            })
+    anomalies['std_outliers'] = pd.DataFrame(std_rows, index=[0] * len(std_rows)) if std_rows else pd.DataFrame()
+    anomalies['z_score_outliers'] = pd.DataFrame(z_rows, index=[0] * len(z_rows)) if z_rows else pd.DataFrame()
+
+    object_columns = df.select_dtypes(include=['object', 'category', 'string']).columns
+    unique_counts = {col: _distinct_count(df, col, fingerprint) for col in object_columns}
+    anomalies['column_info'] = pd.DataFrame({
+        'Total Count': n_rows,
+        'Unique Count': unique_counts,
+        'Unique Percentage': {col: round(count / n_rows * 100, 2)
+                              for col, count in unique_counts.items()}
+    })
+
+    anomalies['data_types'] = pd.DataFrame({
+        'Data Type': df.dtypes,
+        'Sample': [df[col].iloc[0] for col in df.columns]
+    })
+    return anomalies
+
+
+def cached_anomaly_report(df: pd.DataFrame, fingerprint: Optional[str], std_threshold: float = 3.0,
+                          z_score_threshold: float = 3.0) -> Dict[str, pd.DataFrame]:
+    """
+    Rapport d'anomalies mis en cache par empreinte du jeu de données et par seuils.
+
+    Args:
+        df (pd.DataFrame): Données à analyser.
+        fingerprint (str, optional): Empreinte de `df` ; sans empreinte, aucun cache.
+        std_threshold (float, optional): Seuil en nombre d'écarts-types.
+        z_score_threshold (float, optional): Seuil de score Z.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Le rapport d'anomalies.
+    """
+    return anomaly_cache.get_or_compute(
+        (std_threshold, z_score_threshold, fingerprint), fingerprint,
+        lambda: compute_anomaly_report(df, std_threshold, z_score_threshold, fingerprint))
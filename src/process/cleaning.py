@@ -0,0 +1,126 @@
+"""
+Nettoyage des valeurs aberrantes par masque unique.
+
+Les bornes de toutes les colonnes numériques sont calculées d'un coup sur le jeu
+de données complet, puis combinées en un seul masque booléen. Le résultat ne
+dépend donc plus de l'ordre des colonnes, et aucune copie intermédiaire du
+DataFrame n'est produite : l'appelant reçoit le masque et décide s'il matérialise
+la vue nettoyée (`df[mask]`) ou s'il l'applique directement à des tableaux NumPy.
+
+Méthodes disponibles (`threshold` change de sens selon la méthode) :
+
+- 'std' : moyenne ± threshold × écart-type (ddof=1) ;
+- 'zscore' : |score Z| ≤ threshold (écart-type ddof=0) ;
+- 'iqr' : [Q1 - threshold × IQR, Q3 + threshold × IQR] (1.5 classiquement) ;
+- 'mad' : médiane ± threshold × MAD normalisée (1.4826 × MAD) ;
+- 'quantile' : écrêtage des queues, [quantile(threshold), quantile(1 - threshold)].
+"""
+import logging
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.fingerprint import FingerprintCache
+
+logger = logging.getLogger(__name__)
+
+CLEANING_METHODS = ('std', 'zscore', 'iqr', 'mad', 'quantile')
+# Facteur rendant la MAD comparable à un écart-type pour une loi normale
+MAD_SCALE = 1.4826
+
+# Masques déjà calculés, par (méthode, seuil, colonnes sans valeurs manquantes)
+mask_cache = FingerprintCache("clean_masks", max_entries=16)
+
+
+def compute_bounds(values: np.ndarray, method: str = 'std',
+                   threshold: float = 3.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcule les bornes basse et haute de chaque colonne d'une matrice.
+
+    Les valeurs manquantes (NaN) sont ignorées dans le calcul des statistiques.
+
+    Args:
+        values (np.ndarray): Matrice (n_lignes, n_colonnes) en float64.
+        method (str, optional): Une des `CLEANING_METHODS`. Par défaut : 'std'.
+        threshold (float, optional): Seuil de la méthode. Par défaut : 3.0.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Bornes basses et hautes (une par colonne).
+
+    Raises:
+        ValueError: Si la méthode est inconnue ou le seuil invalide pour 'quantile'.
+    """
+    if method not in CLEANING_METHODS:
+        raise ValueError(f"Méthode de nettoyage inconnue : {method}")
+    if values.shape[0] == 0:
+        empty = np.full(values.shape[1], np.nan)
+        return empty, empty
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if method in ('std', 'zscore'):
+            center = np.nanmean(values, axis=0)
+            spread = np.nanstd(values, axis=0, ddof=1 if method == 'std' else 0)
+            return center - threshold * spread, center + threshold * spread
+        if method == 'iqr':
+            q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+            return q1 - threshold * (q3 - q1), q3 + threshold * (q3 - q1)
+        if method == 'mad':
+            median = np.nanmedian(values, axis=0)
+            mad = MAD_SCALE * np.nanmedian(np.abs(values - median), axis=0)
+            return median - threshold * mad, median + threshold * mad
+    if not 0 <= threshold < 0.5:
+        raise ValueError("Pour 'quantile', le seuil est la fraction écrêtée de chaque queue, dans [0, 0.5[.")
+    lower, upper = np.nanquantile(values, [threshold, 1 - threshold], axis=0)
+    return lower, upper
+
+
+def outlier_mask(df: pd.DataFrame, method: str = 'std', threshold: float = 3.0,
+                 columns: Optional[Iterable[str]] = None,
+                 dropna_columns: Optional[Iterable[str]] = None) -> np.ndarray:
+    """
+    Masque des lignes à conserver : toutes leurs valeurs numériques sont dans les bornes.
+
+    Une valeur numérique manquante est hors bornes, comme dans le nettoyage historique.
+
+    Args:
+        df (pd.DataFrame): Données à nettoyer.
+        method (str, optional): Une des `CLEANING_METHODS`. Par défaut : 'std'.
+        threshold (float, optional): Seuil de la méthode. Par défaut : 3.0.
+        columns (Iterable[str], optional): Colonnes contrôlées. Par défaut : toutes les colonnes numériques.
+        dropna_columns (Iterable[str], optional): Colonnes supplémentaires où une valeur manquante exclut la ligne.
+
+    Returns:
+        np.ndarray: Masque booléen aligné sur les lignes de `df`.
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns
+    values = df[list(columns)].to_numpy(dtype=np.float64, na_value=np.nan)
+    lower, upper = compute_bounds(values, method, threshold)
+    keep = ((values >= lower) & (values <= upper)).all(axis=1)
+    dropna_columns = [col for col in (dropna_columns or []) if col in df.columns]
+    if dropna_columns:
+        keep &= df[dropna_columns].notna().all(axis=1).to_numpy()
+    return keep
+
+
+def cached_outlier_mask(df: pd.DataFrame, fingerprint: Optional[str], method: str = 'std',
+                        threshold: float = 3.0,
+                        dropna_columns: Optional[Iterable[str]] = None) -> np.ndarray:
+    """
+    Masque de nettoyage mis en cache par empreinte du jeu de données, méthode et seuil.
+
+    Args:
+        df (pd.DataFrame): Données à nettoyer.
+        fingerprint (str, optional): Empreinte de `df` ; sans empreinte, aucun cache.
+        method (str, optional): Une des `CLEANING_METHODS`.
+        threshold (float, optional): Seuil de la méthode.
+        dropna_columns (Iterable[str], optional): Colonnes où une valeur manquante exclut la ligne.
+
+    Returns:
+        np.ndarray: Masque booléen des lignes à conserver.
+    """
+    dropna_columns = tuple(dropna_columns or ())
+    return mask_cache.get_or_compute(
+        (method, threshold, dropna_columns, fingerprint), fingerprint,
+        lambda: outlier_mask(df, method, threshold, dropna_columns=dropna_columns))
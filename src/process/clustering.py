@@ -0,0 +1,142 @@
+"""
+Balayage K-Means (méthode du coude) pour l'analyse nutritionnelle.
+
+Les modèles k = 1..max_clusters sont ajustés une seule fois par jeu de données,
+en parallèle (`joblib`, un processus par valeur de k ; joblib limite les threads
+internes de chaque processus pour ne pas surcharger les cœurs). Les inerties,
+étiquettes et centroïdes de chaque k sont conservés et mis en cache par
+empreinte : déplacer le curseur du nombre de clusters ne refait aucun calcul.
+"""
+import logging
+import os
+import time
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.cluster import KMeans
+
+from src.utils.fingerprint import FingerprintCache
+
+logger = logging.getLogger(__name__)
+
+CLUSTER_FEATURES = ('Moyenne des notes', 'Calories', 'Graisses', 'Protéines',
+                    'Glucides', 'Sucre', 'Sodium', 'Graisse_saturées')
+MAX_CLUSTERS = 10
+
+# Nombre de processus du balayage (-1 : tous les cœurs)
+CLUSTER_N_JOBS = int(os.getenv("CLUSTER_N_JOBS", "-1"))
+
+# Balayages K-Means, par (caractéristiques, nombre maximal de clusters)
+sweep_cache = FingerprintCache("kmeans_sweep", max_entries=4)
+
+
+def fit_kmeans(X: np.ndarray, k: int, random_state: int = 42) -> Tuple[float, np.ndarray, np.ndarray]:
+    """
+    Ajuste un modèle K-Means.
+
+    Args:
+        X (np.ndarray): Données (n_recettes, n_variables).
+        k (int): Nombre de clusters.
+        random_state (int, optional): Graine de l'initialisation.
+
+    Returns:
+        Tuple[float, np.ndarray, np.ndarray]: Inertie, étiquettes et centroïdes.
+    """
+    model = KMeans(n_clusters=k, random_state=random_state).fit(X)
+    return float(model.inertia_), model.labels_.astype(np.int32), model.cluster_centers_
+
+
+class KMeansSweep:
+    """
+    Résultats K-Means pour chaque nombre de clusters.
+
+    Args:
+        features (Sequence[str]): Variables utilisées.
+        inertias (Dict[int, float]): Inertie par nombre de clusters.
+        labels (Dict[int, np.ndarray]): Étiquettes des recettes par nombre de clusters.
+        centroids (Dict[int, np.ndarray]): Centroïdes par nombre de clusters.
+    """
+
+    def __init__(self, features: Sequence[str], inertias: Dict[int, float],
+                 labels: Dict[int, np.ndarray], centroids: Dict[int, np.ndarray]):
+        """
+        Initialise les résultats.
+
+        Args:
+            features (Sequence[str]): Variables utilisées.
+            inertias (Dict[int, float]): Inertie par nombre de clusters.
+            labels (Dict[int, np.ndarray]): Étiquettes par nombre de clusters.
+            centroids (Dict[int, np.ndarray]): Centroïdes par nombre de clusters.
+        """
+        self.features = list(features)
+        self.inertias = inertias
+        self.labels = labels
+        self.centroids = centroids
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame, features: Iterable[str] = CLUSTER_FEATURES,
+            max_clusters: int = MAX_CLUSTERS, n_jobs: int = CLUSTER_N_JOBS,
+            random_state: int = 42) -> "KMeansSweep":
+        """
+        Ajuste les modèles k = 1..max_clusters en parallèle.
+
+        Args:
+            df (pd.DataFrame): Recettes nettoyées.
+            features (Iterable[str], optional): Variables du clustering.
+            max_clusters (int, optional): Plus grand nombre de clusters.
+            n_jobs (int, optional): Nombre de processus (-1 : tous les cœurs).
+            random_state (int, optional): Graine de l'initialisation.
+
+        Returns:
+            KMeansSweep: Les résultats de chaque k.
+        """
+        features = list(features)
+        X = df[features].to_numpy(dtype=np.float64)
+        ks = range(1, min(max_clusters, len(X)) + 1)
+        start = time.perf_counter()
+        fits = Parallel(n_jobs=n_jobs)(delayed(fit_kmeans)(X, k, random_state) for k in ks)
+        logger.info(f"Balayage K-Means k=1..{len(ks)} sur {len(X)} recettes en "
+                    f"{time.perf_counter() - start:.2f} s")
+        return cls(features,
+                   {k: fit[0] for k, fit in zip(ks, fits)},
+                   {k: fit[1] for k, fit in zip(ks, fits)},
+                   {k: fit[2] for k, fit in zip(ks, fits)})
+
+    @property
+    def ks(self) -> list:
+        """Nombres de clusters calculés, croissants."""
+        return sorted(self.inertias)
+
+    def centroid_frame(self, k: int) -> pd.DataFrame:
+        """
+        Centroïdes d'un modèle, une ligne par cluster.
+
+        Args:
+            k (int): Nombre de clusters.
+
+        Returns:
+            pd.DataFrame: Coordonnées des centroïdes, colonnes = variables.
+        """
+        return pd.DataFrame(self.centroids[k], columns=self.features)
+
+
+def get_kmeans_sweep(df: pd.DataFrame, fingerprint: Optional[str] = None,
+                     features: Iterable[str] = CLUSTER_FEATURES,
+                     max_clusters: int = MAX_CLUSTERS) -> KMeansSweep:
+    """
+    Retourne le balayage K-Means, mis en cache par empreinte du jeu de données.
+
+    Args:
+        df (pd.DataFrame): Recettes nettoyées.
+        fingerprint (str, optional): Empreinte de `df` ; sans empreinte, aucun cache.
+        features (Iterable[str], optional): Variables du clustering.
+        max_clusters (int, optional): Plus grand nombre de clusters.
+
+    Returns:
+        KMeansSweep: Les résultats de chaque k.
+    """
+    features = tuple(features)
+    return sweep_cache.get_or_compute(
+        (features, max_clusters, fingerprint), fingerprint, lambda: KMeansSweep.fit(df, features, max_clusters))
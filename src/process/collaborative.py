@@ -0,0 +1,241 @@
+"""
+Filtrage collaboratif item-item à partir des interactions (RAW_interactions).
+
+Les interactions positives (note >= `LIKE_THRESHOLD`) forment une matrice creuse
+recettes x utilisateurs binaire, dont les lignes sont normalisées (L2). La
+similarité cosinus de deux recettes est le produit scalaire de leurs lignes ;
+elle est calculée par blocs de recettes (`X[bloc] @ X.T`, produit creux) afin de
+borner la mémoire, puis atténuée pour les paires partagées par peu d'utilisateurs
+(`sim * n / (n + shrinkage)`). Seuls les `k` voisins les plus similaires de
+chaque recette sont conservés.
+
+Les voisins sont enregistrés parmi les artefacts prétraités
+(`scripts/build_artifacts.py`) et relus par projection mémoire : une
+recommandation est alors une recherche dichotomique suivie d'une lecture de
+`k` valeurs.
+
+La popularité des recettes (moyenne bayésienne des notes) est également
+précalculée à la construction des artefacts, alignée sur leurs recettes.
+"""
+import logging
+import os
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+from src.utils.fingerprint import FingerprintCache
+
+logger = logging.getLogger(__name__)
+
+# Note minimale d'une interaction considérée comme positive
+LIKE_THRESHOLD = 4
+# Nombre de voisins conservés par recette
+COLLAB_TOP_K = int(os.getenv("COLLAB_TOP_K", "50"))
+# Nombre de recettes par bloc du produit creux
+COLLAB_BLOCK_SIZE = int(os.getenv("COLLAB_BLOCK_SIZE", "4096"))
+# Atténuation des similarités fondées sur peu d'utilisateurs communs
+COLLAB_SHRINKAGE = 2.0
+# Nombre de notes fictives (à la note moyenne) de la moyenne bayésienne des notes
+POPULARITY_PRIOR = 10
+
+# Préfixe des fichiers de voisins parmi les artefacts
+ARTIFACT_PREFIX = "item_neighbors"
+
+# Voisinages déjà calculés, par empreinte des interactions
+similarity_cache = FingerprintCache("item_similarity", max_entries=2)
+
+
+def _top_k_per_row(block: csr_matrix, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Les `k` plus grandes valeurs de chaque ligne d'une matrice creuse.
+
+    Args:
+        block (csr_matrix): Similarités d'un bloc de recettes.
+        k (int): Nombre de valeurs par ligne.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Colonnes (n_lignes, k), -1 pour les places vides,
+            et valeurs (n_lignes, k), décroissantes.
+    """
+    n_rows = block.shape[0]
+    rows = np.repeat(np.arange(n_rows), np.diff(block.indptr))
+    order = np.lexsort((-block.data, rows))
+    rank = np.arange(len(order)) - block.indptr[rows[order]]
+    keep = order[rank < k]
+    columns = np.full((n_rows, k), -1, dtype=np.int32)
+    values = np.zeros((n_rows, k), dtype=np.float32)
+    columns[rows[keep], rank[rank < k]] = block.indices[keep]
+    values[rows[keep], rank[rank < k]] = block.data[keep]
+    return columns, values
+
+
+class ItemSimilarity:
+    """
+    Plus proches voisins de chaque recette au sens du filtrage collaboratif.
+
+    Args:
+        item_ids (np.ndarray): Identifiants des recettes, croissants.
+        neighbors (np.ndarray): Positions (dans `item_ids`) des voisins de chaque recette,
+            (n_recettes, k), du plus similaire au moins similaire ; -1 pour une place vide.
+        scores (np.ndarray): Similarités correspondantes, (n_recettes, k).
+    """
+
+    def __init__(self, item_ids: np.ndarray, neighbors: np.ndarray, scores: np.ndarray):
+        """
+        Initialise les voisinages.
+
+        Args:
+            item_ids (np.ndarray): Identifiants des recettes, croissants.
+            neighbors (np.ndarray): Positions des voisins de chaque recette.
+            scores (np.ndarray): Similarités correspondantes.
+        """
+        self.item_ids = item_ids
+        self.neighbors = neighbors
+        self.scores = scores
+
+    @property
+    def n_items(self) -> int:
+        """Nombre de recettes ayant au moins une interaction positive."""
+        return len(self.item_ids)
+
+    @classmethod
+    def build(cls, interactions: pd.DataFrame, k: int = COLLAB_TOP_K,
+              block_size: int = COLLAB_BLOCK_SIZE, shrinkage: float = COLLAB_SHRINKAGE,
+              like_threshold: float = LIKE_THRESHOLD) -> "ItemSimilarity":
+        """
+        Calcule les voisins de chaque recette à partir des interactions.
+
+        Args:
+            interactions (pd.DataFrame): Colonnes 'user_id', 'recipe_id' et 'rating'.
+            k (int, optional): Nombre de voisins conservés par recette.
+            block_size (int, optional): Nombre de recettes par bloc du produit creux.
+            shrinkage (float, optional): Atténuation des paires à peu d'utilisateurs communs (0 : aucune).
+            like_threshold (float, optional): Note minimale d'une interaction positive.
+
+        Returns:
+            ItemSimilarity: Les voisinages.
+        """
+        start = time.perf_counter()
+        liked = interactions[interactions['rating'] >= like_threshold]
+        items, item_ids = pd.factorize(liked['recipe_id'], sort=True)
+        users, user_ids = pd.factorize(liked['user_id'])
+        matrix = csr_matrix((np.ones(len(items), dtype=np.float32), (items, users)),
+                            shape=(len(item_ids), len(user_ids)))
+        # Une interaction répétée compte une seule fois
+        matrix.sum_duplicates()
+        matrix.data[:] = 1.0
+        norms = np.sqrt(np.diff(matrix.indptr)).astype(np.float32)
+        matrix.data /= np.repeat(norms, np.diff(matrix.indptr))
+        transposed = matrix.T.tocsr()
+
+        neighbors = np.full((len(item_ids), k), -1, dtype=np.int32)
+        scores = np.zeros((len(item_ids), k), dtype=np.float32)
+        for first in range(0, len(item_ids), block_size):
+            last = min(first + block_size, len(item_ids))
+            block = (matrix[first:last] @ transposed).tocsr()
+            rows = np.repeat(np.arange(first, last), np.diff(block.indptr))
+            if shrinkage > 0:
+                # Nombre d'utilisateurs communs : cosinus multiplié par le produit des normes
+                common = block.data * norms[rows] * norms[block.indices]
+                block.data *= common / (common + shrinkage)
+            # Une recette n'est pas sa propre voisine
+            block.data[block.indices == rows] = 0
+            block.eliminate_zeros()
+            neighbors[first:last], scores[first:last] = _top_k_per_row(block, k)
+        logger.info(f"Similarités item-item de {len(item_ids)} recettes ({len(liked)} interactions "
+                    f"positives) calculées en {time.perf_counter() - start:.1f} s")
+        return cls(np.asarray(item_ids), neighbors, scores)
+
+    def similar_items(self, recipe_id: int, top_n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Recettes les plus similaires à une recette.
+
+        Args:
+            recipe_id (int): Identifiant de la recette de référence.
+            top_n (int, optional): Nombre maximal de voisins. Par défaut : tous les voisins conservés.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Identifiants et similarités des voisins, de la plus
+                similaire à la moins similaire (vides si la recette n'a aucune interaction positive).
+        """
+        position = int(np.searchsorted(self.item_ids, recipe_id))
+        if position >= self.n_items or self.item_ids[position] != recipe_id:
+            return np.zeros(0, dtype=self.item_ids.dtype), np.zeros(0, dtype=np.float32)
+        neighbors = np.asarray(self.neighbors[position, :top_n])
+        present = neighbors >= 0
+        return self.item_ids[neighbors[present]], np.asarray(self.scores[position, :top_n])[present]
+
+    def save(self, directory: str) -> dict:
+        """
+        Enregistre les voisinages en tableaux NumPy lisibles par projection mémoire.
+
+        Args:
+            directory (str): Répertoire des artefacts.
+
+        Returns:
+            dict: Entrée du manifeste ('collaborative').
+        """
+        for name, array in (("ids", self.item_ids), ("neighbors", self.neighbors), ("scores", self.scores)):
+            np.save(os.path.join(directory, f"{ARTIFACT_PREFIX}.{name}.npy"), array)
+        return {"collaborative": {"n_items": self.n_items, "k": int(self.neighbors.shape[1])}}
+
+    @classmethod
+    def from_artifacts(cls, store) -> Optional["ItemSimilarity"]:
+        """
+        Relit les voisinages enregistrés parmi les artefacts.
+
+        Args:
+            store (ArtifactStore): Artefacts prétraités.
+
+        Returns:
+            ItemSimilarity or None: Les voisinages, ou None s'ils n'ont pas été construits.
+        """
+        if store is None or "collaborative" not in store.manifest:
+            return None
+        return cls(store.load_array(f"{ARTIFACT_PREFIX}.ids"),
+                   store.load_array(f"{ARTIFACT_PREFIX}.neighbors"),
+                   store.load_array(f"{ARTIFACT_PREFIX}.scores"))
+
+
+def get_item_similarity(interactions: Optional[pd.DataFrame] = None, fingerprint: Optional[str] = None,
+                        artifacts=None) -> Optional[ItemSimilarity]:
+    """
+    Retourne les voisinages item-item : enregistrés parmi les artefacts, sinon calculés.
+
+    Args:
+        interactions (pd.DataFrame, optional): Interactions ('user_id', 'recipe_id', 'rating').
+        fingerprint (str, optional): Empreinte de `interactions` ; sans empreinte, aucun cache.
+        artifacts (ArtifactStore, optional): Artefacts prétraités.
+
+    Returns:
+        ItemSimilarity or None: Les voisinages, ou None sans artefacts ni interactions.
+    """
+    similarity = ItemSimilarity.from_artifacts(artifacts)
+    if similarity is not None or interactions is None:
+        return similarity
+    return similarity_cache.get_or_compute(("item_similarity", fingerprint), fingerprint,
+                                           lambda: ItemSimilarity.build(interactions))
+
+
+def bayesian_popularity(interactions: pd.DataFrame, recipe_ids) -> Tuple[np.ndarray, float]:
+    """
+    Moyenne bayésienne des notes de chaque recette, ramenée entre 0 et 1.
+
+    Une recette peu notée est rapprochée de la note moyenne (`POPULARITY_PRIOR` notes
+    fictives) ; les interactions sans note (0) sont ignorées.
+
+    Args:
+        interactions (pd.DataFrame): Interactions (colonnes 'recipe_id', 'rating').
+        recipe_ids (array-like): Identifiants des recettes.
+
+    Returns:
+        tuple: Popularité alignée sur `recipe_ids` et note moyenne (popularité d'une recette non notée : note / 5).
+    """
+    rated = interactions[interactions['rating'] > 0]
+    prior = float(rated['rating'].mean()) if len(rated) else 0.0
+    stats = rated.groupby('recipe_id')['rating'].agg(['sum', 'count'])
+    bayesian = (stats['sum'] + POPULARITY_PRIOR * prior) / (stats['count'] + POPULARITY_PRIOR)
+    return bayesian.reindex(recipe_ids).fillna(prior).to_numpy() / 5, prior
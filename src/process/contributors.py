@@ -0,0 +1,211 @@
+"""
+Statistiques des contributeurs d'une période.
+
+Les identifiants de contributeurs sont encodés une seule fois (`pd.factorize`) ;
+le nombre de recettes de chacun est un `np.bincount` des codes, et la première
+et la dernière soumission s'obtiennent après un tri unique par (contributeur,
+date). Toutes les statistiques en découlent :
+
+- résumé (nombre de contributeurs, moyenne, médiane, maximum, top k) ;
+- concentration des contributions : courbe de Lorenz et indice de Gini ;
+- période d'activité de chaque contributeur.
+
+Le résultat est mis en cache par empreinte du jeu de données, donc par période.
+"""
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.fingerprint import FingerprintCache
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximal de points de la courbe de Lorenz envoyés au graphique
+LORENZ_POINTS = 200
+
+# Activité des contributeurs de la session
+contributor_cache = FingerprintCache("contributor_activity", max_entries=8)
+
+
+class ContributorActivity:
+    """
+    Nombre de recettes et période d'activité de chaque contributeur.
+
+    Args:
+        ids (np.ndarray): Identifiant de chaque contributeur, par ordre de première apparition.
+        counts (np.ndarray): Nombre de recettes de chaque contributeur.
+        first (np.ndarray, optional): Date de la première recette de chaque contributeur.
+        last (np.ndarray, optional): Date de la dernière recette de chaque contributeur.
+    """
+
+    def __init__(self, ids: np.ndarray, counts: np.ndarray,
+                 first: Optional[np.ndarray] = None, last: Optional[np.ndarray] = None):
+        """
+        Initialise l'activité des contributeurs.
+
+        Args:
+            ids (np.ndarray): Identifiants des contributeurs.
+            counts (np.ndarray): Nombre de recettes de chacun.
+            first (np.ndarray, optional): Date de première recette de chacun.
+            last (np.ndarray, optional): Date de dernière recette de chacun.
+        """
+        self.ids = ids
+        self.counts = counts
+        self.first = first
+        self.last = last
+        # Rang de chaque contributeur : nombre de recettes décroissant, puis ordre d'apparition
+        self.ranking = np.argsort(-counts, kind="stable")
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, id_column: str = 'contributor_id',
+                   date_column: str = 'submitted') -> "ContributorActivity":
+        """
+        Calcule l'activité des contributeurs d'un DataFrame de recettes.
+
+        Args:
+            df (pd.DataFrame): Recettes.
+            id_column (str, optional): Colonne des identifiants de contributeurs.
+            date_column (str, optional): Colonne des dates (ignorée si absente).
+
+        Returns:
+            ContributorActivity: L'activité des contributeurs.
+        """
+        codes, ids = pd.factorize(df[id_column])
+        valid = codes >= 0
+        codes = codes[valid]
+        counts = np.bincount(codes, minlength=len(ids))
+        first = last = None
+        if date_column in df.columns:
+            dates = pd.to_datetime(df[date_column]).to_numpy(dtype="datetime64[ns]")[valid]
+            # Périodes d'activité calculées sur les seules recettes datées
+            dated = ~np.isnat(dates)
+            dated_codes, dates = codes[dated], dates[dated]
+            order = np.lexsort((dates.view(np.int64), dated_codes))
+            dates = dates[order]
+            n_dated = np.bincount(dated_codes, minlength=len(ids))
+            ends = np.cumsum(n_dated)
+            has_dates = n_dated > 0
+            first = np.full(len(ids), np.datetime64("NaT", "ns"))
+            last = first.copy()
+            first[has_dates] = dates[(ends - n_dated)[has_dates]]
+            last[has_dates] = dates[ends[has_dates] - 1]
+        return cls(np.asarray(ids), counts, first, last)
+
+    @property
+    def n_contributors(self) -> int:
+        """Nombre de contributeurs."""
+        return len(self.ids)
+
+    def summary(self, top_k: int = 10) -> Dict[str, Any]:
+        """
+        Résumé des contributions, au format de `Recipe.analyze_contributors`.
+
+        Args:
+            top_k (int, optional): Nombre de principaux contributeurs.
+
+        Returns:
+            Dict[str, Any]: 'total_contributors', 'contributions_per_user' ('mean',
+                'median', 'max') et 'top_contributors' ({identifiant: nombre de recettes}).
+        """
+        top = self.ranking[:top_k]
+        empty = self.n_contributors == 0
+        return {
+            'total_contributors': self.n_contributors,
+            'contributions_per_user': {
+                'mean': float("nan") if empty else float(self.counts.mean()),
+                'median': float("nan") if empty else float(np.median(self.counts)),
+                'max': 0 if empty else int(self.counts.max()),
+            },
+            'top_contributors': dict(zip(self.ids[top].tolist(), self.counts[top].tolist())),
+        }
+
+    def lorenz(self, points: int = LORENZ_POINTS) -> pd.DataFrame:
+        """
+        Courbe de Lorenz des contributions.
+
+        Args:
+            points (int, optional): Nombre maximal de points (échantillonnés régulièrement).
+
+        Returns:
+            pd.DataFrame: Colonnes 'Part des contributeurs' et 'Part des recettes', de (0, 0) à (1, 1).
+        """
+        shares = np.concatenate([[0], np.cumsum(np.sort(self.counts))]) / max(self.counts.sum(), 1)
+        positions = np.unique(np.linspace(0, len(shares) - 1, num=min(points, len(shares))).astype(np.int64))
+        return pd.DataFrame({'Part des contributeurs': positions / max(len(shares) - 1, 1),
+                             'Part des recettes': shares[positions]})
+
+    def gini(self) -> float:
+        """
+        Indice de Gini des contributions (0 : égalité parfaite, 1 : un seul contributeur).
+
+        Returns:
+            float: L'indice de Gini.
+        """
+        n, total = self.n_contributors, self.counts.sum()
+        if n == 0 or total == 0:
+            return 0.0
+        ranks = np.arange(1, n + 1)
+        return float(2 * np.sum(ranks * np.sort(self.counts)) / (n * total) - (n + 1) / n)
+
+    def top_share(self, share: float = 0.01) -> float:
+        """
+        Part des recettes soumises par la fraction la plus active des contributeurs.
+
+        Args:
+            share (float, optional): Fraction des contributeurs (0.01 : le 1 % le plus actif).
+
+        Returns:
+            float: Part des recettes, entre 0 et 1.
+        """
+        k = max(int(np.ceil(share * self.n_contributors)), 1)
+        total = self.counts.sum()
+        return float(self.counts[self.ranking[:k]].sum() / total) if total else 0.0
+
+    def count_histogram(self) -> pd.Series:
+        """
+        Nombre de contributeurs par nombre de recettes soumises.
+
+        Returns:
+            pd.Series: Nombre de contributeurs, indexé par nombre de recettes (sans les valeurs absentes).
+        """
+        histogram = np.bincount(self.counts)
+        present = np.flatnonzero(histogram)
+        return pd.Series(histogram[present], index=present, name='Contributeurs')
+
+    def top(self, k: int = 10) -> pd.DataFrame:
+        """
+        Principaux contributeurs et leur période d'activité.
+
+        Args:
+            k (int, optional): Nombre de contributeurs.
+
+        Returns:
+            pd.DataFrame: Colonnes 'ID Utilisateur', 'Nombre de contributions' et, si les dates
+                sont connues, 'Première recette', 'Dernière recette' et 'Jours d'activité'.
+        """
+        rows = self.ranking[:k]
+        result = pd.DataFrame({'ID Utilisateur': self.ids[rows],
+                               'Nombre de contributions': self.counts[rows]})
+        if self.first is not None:
+            first, last = pd.to_datetime(self.first[rows]), pd.to_datetime(self.last[rows])
+            result['Première recette'] = first
+            result['Dernière recette'] = last
+            result["Jours d'activité"] = (last - first).days
+        return result
+
+
+def get_contributor_activity(df: pd.DataFrame, fingerprint: Optional[str] = None) -> ContributorActivity:
+    """
+    Retourne l'activité des contributeurs, mise en cache par empreinte du jeu de données.
+
+    Args:
+        df (pd.DataFrame): Recettes de la période.
+        fingerprint (str, optional): Empreinte de `df` ; sans empreinte, aucun cache.
+
+    Returns:
+        ContributorActivity: L'activité des contributeurs.
+    """
+    return contributor_cache.get_or_compute(("contributors", fingerprint), fingerprint,
+                                            lambda: ContributorActivity.from_frame(df))
@@ -0,0 +1,146 @@
+"""
+TF-IDF des ingrédients par hachage, à mémoire bornée.
+
+`TfidfVectorizer` construit un vocabulaire (dictionnaire Python) et doit voir
+tous les textes d'un coup. Ici, chaque terme est haché vers l'une de
+`n_features` colonnes (`HashingVectorizer`, sans vocabulaire) et les fréquences
+documentaires sont cumulées à part dans un tableau de taille fixe. L'ajustement
+se fait donc par blocs, de nouvelles recettes s'ajoutent sans réajustement
+complet, et la mémoire ne dépend pas de la taille du vocabulaire.
+
+La pondération est celle de `TfidfVectorizer` par défaut (fréquence brute,
+idf lissé `ln((1 + n) / (1 + df)) + 1`, normalisation L2) : en l'absence de
+collisions de hachage, les similarités cosinus sont identiques.
+"""
+import logging
+import os
+from typing import Iterable
+
+import numpy as np
+from scipy.sparse import csr_matrix, diags, vstack
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+logger = logging.getLogger(__name__)
+
+# Nombre de colonnes de hachage (2^18 : collisions rares pour quelques milliers de termes)
+HASHING_FEATURES = int(os.getenv("HASHING_FEATURES", str(2 ** 18)))
+# Nombre de recettes vectorisées par bloc
+HASHING_CHUNK_SIZE = 50_000
+
+
+class HashingTfidf:
+    """
+    Vectoriseur TF-IDF par hachage, ajustable par blocs.
+
+    Args:
+        n_features (int, optional): Nombre de colonnes de hachage.
+
+    Attributes:
+        document_frequency (np.ndarray): Nombre de recettes contenant chaque colonne.
+        n_documents (int): Nombre de recettes vues par `partial_fit`.
+    """
+
+    def __init__(self, n_features: int = HASHING_FEATURES):
+        """
+        Initialise le vectoriseur, sans aucune recette vue.
+
+        Args:
+            n_features (int, optional): Nombre de colonnes de hachage.
+        """
+        self.n_features = n_features
+        self.hasher = HashingVectorizer(n_features=n_features, stop_words='english',
+                                        alternate_sign=False, norm=None)
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+
+    def counts(self, texts: Iterable[str]) -> csr_matrix:
+        """
+        Nombre d'occurrences de chaque colonne de hachage, sans pondération.
+
+        Args:
+            texts (Iterable[str]): Ingrédients des recettes.
+
+        Returns:
+            csr_matrix: Matrice (n_recettes, n_features).
+        """
+        return self.hasher.transform(texts).tocsr()
+
+    def observe(self, counts: csr_matrix) -> "HashingTfidf":
+        """
+        Ajoute des recettes déjà comptées (`counts`) aux fréquences documentaires.
+
+        Args:
+            counts (csr_matrix): Occurrences des recettes ajoutées.
+
+        Returns:
+            HashingTfidf: Le vectoriseur.
+        """
+        self.document_frequency += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_documents += counts.shape[0]
+        return self
+
+    def partial_fit(self, texts: Iterable[str]) -> "HashingTfidf":
+        """
+        Ajoute un bloc de recettes aux fréquences documentaires.
+
+        Args:
+            texts (Iterable[str]): Ingrédients des recettes.
+
+        Returns:
+            HashingTfidf: Le vectoriseur.
+        """
+        return self.observe(self.counts(texts))
+
+    @property
+    def idf(self) -> np.ndarray:
+        """Poids idf lissé de chaque colonne."""
+        return np.log((1 + self.n_documents) / (1 + self.document_frequency)) + 1
+
+    def weight(self, counts: csr_matrix) -> csr_matrix:
+        """
+        Pondère des occurrences par l'idf courant puis normalise chaque ligne.
+
+        Args:
+            counts (csr_matrix): Occurrences (`counts`).
+
+        Returns:
+            csr_matrix: Matrice TF-IDF normalisée (L2).
+        """
+        return normalize(counts @ diags(self.idf), norm='l2', copy=False).tocsr()
+
+    def transform(self, texts: Iterable[str]) -> csr_matrix:
+        """
+        Vectorise des recettes avec l'idf courant, sans modifier les fréquences documentaires.
+
+        Args:
+            texts (Iterable[str]): Ingrédients des recettes.
+
+        Returns:
+            csr_matrix: Matrice TF-IDF normalisée (L2).
+        """
+        return self.weight(self.counts(texts))
+
+    def fit_transform(self, texts, chunk_size: int = HASHING_CHUNK_SIZE) -> csr_matrix:
+        """
+        Ajuste les fréquences documentaires et vectorise des recettes, bloc par bloc.
+
+        Chaque bloc n'est haché qu'une fois ; la pondération est appliquée à la fin,
+        avec l'idf de toutes les recettes.
+
+        Args:
+            texts: Ingrédients des recettes (séquence indexable, ex. pd.Series ou liste).
+            chunk_size (int, optional): Nombre de recettes par bloc.
+
+        Returns:
+            csr_matrix: Matrice TF-IDF normalisée (L2).
+        """
+        blocks = []
+        for start in range(0, len(texts), chunk_size):
+            block = self.counts(texts[start:start + chunk_size])
+            self.observe(block)
+            blocks.append(block)
+        counts = vstack(blocks, format='csr') if blocks else csr_matrix((0, self.n_features))
+        logger.info(f"Vectorisation par hachage de {counts.shape[0]} recettes "
+                    f"({np.count_nonzero(self.document_frequency)} colonnes utilisées)")
+        return self.weight(counts)
@@ -0,0 +1,70 @@
+"""
+Fréquence des ingrédients et données du nuage de mots.
+
+Les comptes sont calculés sur la colonne 'ingredients' encodée en entiers
+(`CodedListColumn`) : un `np.bincount` des codes, puis un regroupement des
+valeurs qui ne diffèrent que par la casse (la mise en minuscules porte sur le
+vocabulaire, quelques milliers de chaînes, et non sur chaque élément). Le
+résultat de chaque période est mis en cache sous l'empreinte de ses données :
+revenir à une période déjà analysée ne recalcule rien.
+
+Le nuage de mots ne reçoit que les `top_k` ingrédients les plus fréquents ; la
+longue traîne est résumée par son nombre d'ingrédients et son total.
+"""
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.coded_columns import get_coded_column
+from src.utils.fingerprint import FingerprintCache
+
+logger = logging.getLogger(__name__)
+
+# Nombre d'ingrédients envoyés au nuage de mots
+WORDCLOUD_TOP_K = int(os.getenv("WORDCLOUD_TOP_K", "200"))
+
+# Comptes d'ingrédients sans distinction de casse
+ingredient_cache = FingerprintCache("ingredient_counts", max_entries=8)
+
+
+def ingredient_counts(df: pd.DataFrame, fingerprint: Optional[str] = None) -> pd.Series:
+    """
+    Nombre d'occurrences de chaque ingrédient, sans distinction de casse.
+
+    Args:
+        df (pd.DataFrame): Recettes (colonne 'ingredients' ou 'ingredients_list').
+        fingerprint (str, optional): Empreinte de `df` ; sans empreinte, aucun cache.
+
+    Returns:
+        pd.Series: Comptes indexés par ingrédient (en minuscules), par ordre décroissant.
+    """
+    def compute() -> pd.Series:
+        coded = get_coded_column(df, 'ingredients', fingerprint)
+        lowered = pd.Series(coded.vocabulary, dtype=object).str.lower()
+        folded, vocabulary = pd.factorize(lowered, sort=True)
+        counts = np.bincount(folded, weights=coded.counts(), minlength=len(vocabulary)).astype(np.int64)
+        order = np.argsort(-counts, kind="stable")
+        order = order[counts[order] > 0]
+        return pd.Series(counts[order], index=np.asarray(vocabulary, dtype=object)[order], name="count")
+
+    return ingredient_cache.get_or_compute(("ingredients", fingerprint), fingerprint, compute)
+
+
+def wordcloud_payload(counts: pd.Series, top_k: int = WORDCLOUD_TOP_K) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    Données du nuage de mots, limitées aux ingrédients les plus fréquents.
+
+    Args:
+        counts (pd.Series): Comptes triés par ordre décroissant (`ingredient_counts`).
+        top_k (int, optional): Nombre d'ingrédients retenus. Par défaut : `WORDCLOUD_TOP_K`.
+
+    Returns:
+        Tuple[List[Dict], Dict[str, int]]: Les éléments {"name", "value"} du nuage et le
+            résumé de la traîne écartée ({"count": nombre d'ingrédients, "value": total}).
+    """
+    head, tail = counts.iloc[:top_k], counts.iloc[top_k:]
+    data = [{"name": name, "value": int(value)} for name, value in head.items()]
+    return data, {"count": len(tail), "value": int(tail.sum())}
@@ -0,0 +1,240 @@
+"""
+Index inversé des tags et ingrédients pour le filtrage des recettes.
+
+Pour chaque valeur d'une colonne de listes ('tags', 'ingredients'), l'index
+conserve la liste triée (int32) des lignes qui la contiennent, au format CSR
+(`indptr` + `rows`), construite d'un bloc à partir de la colonne encodée
+(`CodedListColumn`). Les lignes sont numérotées dans l'ordre des dates de
+soumission : une plage de dates est une tranche contiguë [lo, hi[ et chaque liste
+y est restreinte par deux recherches dichotomiques.
+
+Une requête combine des conditions ET (`all_of`), OU (`any_of`) et SAUF
+(`none_of`). Elle est évaluée sur un masque de bits de la seule tranche de dates,
+en commençant par la liste la plus courte ; les positions retournées sont celles
+du DataFrame d'origine.
+"""
+import logging
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.coded_columns import CodedListColumn, encode_list_column
+from src.utils.fingerprint import FingerprintCache
+
+logger = logging.getLogger(__name__)
+
+FACET_COLUMNS = ('tags', 'ingredients')
+
+# Listes d'occurrences des facettes (tags, ingrédients) de la session
+index_cache = FingerprintCache("inverted_index", max_entries=4)
+
+
+class PostingLists:
+    """
+    Listes de lignes triées de chaque valeur d'une colonne de listes.
+
+    Args:
+        indptr (np.ndarray): Début de la liste de chaque valeur (n_valeurs + 1).
+        rows (np.ndarray): Numéros de lignes (int32), triés dans chaque liste.
+        vocabulary (np.ndarray): Valeurs, triées.
+    """
+
+    def __init__(self, indptr: np.ndarray, rows: np.ndarray, vocabulary: np.ndarray):
+        """
+        Initialise les listes.
+
+        Args:
+            indptr (np.ndarray): Début de la liste de chaque valeur.
+            rows (np.ndarray): Numéros de lignes.
+            vocabulary (np.ndarray): Valeurs, triées.
+        """
+        self.indptr = indptr
+        self.rows = rows
+        self.vocabulary = vocabulary
+        self._lookup = pd.Index(vocabulary)
+
+    @classmethod
+    def from_coded(cls, coded: CodedListColumn) -> "PostingLists":
+        """
+        Inverse une colonne encodée (une valeur répétée dans une ligne n'y compte qu'une fois).
+
+        Args:
+            coded (CodedListColumn): Colonne encodée, lignes dans l'ordre voulu.
+
+        Returns:
+            PostingLists: Les listes de lignes.
+        """
+        row_ids = coded.row_ids()
+        # Tri par (code, ligne) puis suppression des doublons d'une même ligne
+        order = np.lexsort((row_ids, coded.codes))
+        codes, rows = coded.codes[order], row_ids[order]
+        keep = np.ones(len(codes), dtype=bool)
+        keep[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+        codes, rows = codes[keep], rows[keep]
+        indptr = np.zeros(coded.n_distinct + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=coded.n_distinct), out=indptr[1:])
+        return cls(indptr, rows.astype(np.int32), coded.vocabulary)
+
+    def postings(self, value, lo: int = 0, hi: Optional[int] = None) -> np.ndarray:
+        """
+        Lignes contenant une valeur, restreintes à la tranche [lo, hi[.
+
+        Args:
+            value: Valeur recherchée (tag, ingrédient).
+            lo (int, optional): Première ligne de la tranche.
+            hi (int, optional): Fin (exclue) de la tranche. Par défaut : sans borne.
+
+        Returns:
+            np.ndarray: Numéros de lignes triés (vide si la valeur est inconnue).
+        """
+        position = self._lookup.get_indexer([value])[0]
+        if position < 0:
+            return self.rows[:0]
+        rows = self.rows[self.indptr[position]:self.indptr[position + 1]]
+        start = np.searchsorted(rows, lo, side="left")
+        end = len(rows) if hi is None else np.searchsorted(rows, hi, side="left")
+        return rows[start:end]
+
+
+class FacetIndex:
+    """
+    Index inversé de plusieurs colonnes de listes, lignes triées par date.
+
+    Args:
+        facets (Dict[str, PostingLists]): Listes de lignes par colonne.
+        order (np.ndarray): Position dans le DataFrame d'origine de chaque ligne indexée.
+        dates (np.ndarray, optional): Date (datetime64) de chaque ligne indexée, croissante.
+    """
+
+    def __init__(self, facets: Dict[str, PostingLists], order: np.ndarray,
+                 dates: Optional[np.ndarray] = None):
+        """
+        Initialise l'index.
+
+        Args:
+            facets (Dict[str, PostingLists]): Listes de lignes par colonne.
+            order (np.ndarray): Positions d'origine des lignes indexées.
+            dates (np.ndarray, optional): Dates triées des lignes indexées.
+        """
+        self.facets = facets
+        self.order = order
+        self.dates = dates
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: Iterable[str] = FACET_COLUMNS,
+                   date_column: str = 'submitted') -> "FacetIndex":
+        """
+        Construit l'index des colonnes de listes d'un DataFrame.
+
+        Args:
+            df (pd.DataFrame): Recettes.
+            columns (Iterable[str], optional): Colonnes indexées (celles absentes sont ignorées).
+            date_column (str, optional): Colonne de date définissant l'ordre des lignes.
+
+        Returns:
+            FacetIndex: L'index.
+        """
+        order = np.arange(len(df))
+        dates = None
+        if date_column in df.columns:
+            dates = pd.to_datetime(df[date_column]).to_numpy()
+            order = np.argsort(dates, kind="stable")
+            dates = dates[order]
+        facets = {column: PostingLists.from_coded(encode_list_column(df, column).take(order))
+                  for column in columns if column in df.columns}
+        logger.info(f"Index inversé construit : {len(df)} recettes, colonnes {list(facets)}.")
+        return cls(facets, order, dates)
+
+    @property
+    def n_rows(self) -> int:
+        """Nombre de lignes indexées."""
+        return len(self.order)
+
+    def values(self, column: str) -> np.ndarray:
+        """
+        Valeurs indexées d'une colonne.
+
+        Args:
+            column (str): Colonne ('tags', 'ingredients').
+
+        Returns:
+            np.ndarray: Valeurs triées.
+        """
+        return self.facets[column].vocabulary
+
+    def _date_slice(self, date_start, date_end) -> slice:
+        if self.dates is None:
+            return slice(0, self.n_rows)
+        lo = 0 if date_start is None else int(np.searchsorted(
+            self.dates, np.datetime64(pd.Timestamp(date_start)), side="left"))
+        hi = self.n_rows if date_end is None else int(np.searchsorted(
+            self.dates, np.datetime64(pd.Timestamp(date_end)), side="right"))
+        return slice(lo, max(lo, hi))
+
+    def query(self, all_of: Optional[Dict[str, Iterable]] = None,
+              any_of: Optional[Dict[str, Iterable]] = None,
+              none_of: Optional[Dict[str, Iterable]] = None,
+              date_start=None, date_end=None) -> np.ndarray:
+        """
+        Recettes satisfaisant une combinaison de conditions sur les tags et ingrédients.
+
+        Exemple : `all_of={'tags': ['vegetarian', '30-minutes-or-less']},
+        none_of={'ingredients': ['walnuts', 'pecans']}`.
+
+        Args:
+            all_of (Dict[str, Iterable], optional): Valeurs toutes requises (ET), par colonne.
+            any_of (Dict[str, Iterable], optional): Au moins une de ces valeurs (OU), toutes colonnes confondues.
+            none_of (Dict[str, Iterable], optional): Valeurs exclues (SAUF), par colonne.
+            date_start (optional): Début de la plage de dates (incluse).
+            date_end (optional): Fin de la plage de dates (incluse).
+
+        Returns:
+            np.ndarray: Positions des recettes dans le DataFrame d'origine, dans l'ordre des dates.
+
+        Raises:
+            KeyError: Si une colonne n'est pas indexée.
+        """
+        window = self._date_slice(date_start, date_end)
+        lo, hi = window.start, window.stop
+
+        def lists(conditions):
+            return [self.facets[column].postings(value, lo, hi) - lo
+                    for column, values in (conditions or {}).items() for value in values]
+
+        required = sorted(lists(all_of), key=len)
+        if required and len(required[0]) == 0:
+            return self.order[:0]
+        if required:
+            # Amorce par la liste la plus courte, puis filtrage par masque de bits
+            mask = np.zeros(hi - lo, dtype=bool)
+            mask[required[0]] = True
+            for rows in required[1:]:
+                keep = np.zeros(hi - lo, dtype=bool)
+                keep[rows] = True
+                mask &= keep
+        else:
+            mask = np.ones(hi - lo, dtype=bool)
+        alternatives = lists(any_of)
+        if alternatives:
+            either = np.zeros(hi - lo, dtype=bool)
+            for rows in alternatives:
+                either[rows] = True
+            mask &= either
+        for rows in lists(none_of):
+            mask[rows] = False
+        return self.order[lo + np.flatnonzero(mask)]
+
+
+def get_facet_index(df: pd.DataFrame, fingerprint: Optional[str] = None) -> FacetIndex:
+    """
+    Retourne l'index inversé des tags et ingrédients, mis en cache par empreinte.
+
+    Args:
+        df (pd.DataFrame): Recettes.
+        fingerprint (str, optional): Empreinte de `df` ; sans empreinte, aucun cache.
+
+    Returns:
+        FacetIndex: L'index.
+    """
+    return index_cache.get_or_compute(("facets", fingerprint), fingerprint, lambda: FacetIndex.from_frame(df))
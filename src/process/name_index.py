@@ -0,0 +1,213 @@
+"""
+Index des noms de recettes pour l'autocomplétion du sélecteur de recettes.
+
+Deux structures sont construites sur les noms normalisés (minuscules, espaces
+simples) :
+
+- un tableau trié des noms, interrogé par recherche dichotomique pour les
+  correspondances par préfixe ;
+- des listes de trigrammes au format CSR : chaque nom est complété par des espaces
+  ("  nom "), ses trigrammes sont codés en entiers 64 bits (trois points de code de
+  21 bits) de façon entièrement vectorisée, puis inversés.
+
+Une requête floue compte les trigrammes partagés avec chaque nom (`np.bincount`)
+et classe les noms par similarité de Jaccard ; les fautes de frappe et les mots
+dans le désordre restent ainsi trouvés. Seuls les k meilleurs résultats sont
+envoyés au navigateur.
+"""
+import logging
+import re
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.fingerprint import FingerprintCache
+
+logger = logging.getLogger(__name__)
+
+# Similarité de Jaccard minimale d'un résultat flou
+MIN_SIMILARITY = 0.2
+
+# Trigrammes et préfixes des noms de recettes pour l'autocomplétion
+name_index_cache = FingerprintCache("name_index", max_entries=4)
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(name) -> str:
+    """
+    Normalise un nom : minuscules, espaces simples, sans espaces aux extrémités.
+
+    Args:
+        name: Nom (les valeurs manquantes donnent une chaîne vide).
+
+    Returns:
+        str: Le nom normalisé.
+    """
+    if not isinstance(name, str):
+        return ""
+    return _SPACES.sub(" ", name.lower()).strip()
+
+
+def trigram_keys(names) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trigrammes distincts de chaque nom, codés en entiers.
+
+    Args:
+        names: Séquence de noms normalisés.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Codes des trigrammes et numéro du nom de chacun,
+            triés par (code, nom), sans doublons.
+    """
+    padded = [f"  {name} " for name in names]
+    if not padded:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    lengths = np.fromiter((len(name) for name in padded), dtype=np.int64, count=len(padded))
+    points = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    owner = np.repeat(np.arange(len(padded), dtype=np.int64), lengths)
+    # Un trigramme est valide si ses trois caractères appartiennent au même nom
+    valid = owner[:-2] == owner[2:]
+    keys = ((points[:-2] << 42) | (points[1:-1] << 21) | points[2:])[valid]
+    rows = owner[:-2][valid]
+    order = np.lexsort((rows, keys))
+    keys, rows = keys[order], rows[order]
+    keep = np.ones(len(keys), dtype=bool)
+    keep[1:] = (keys[1:] != keys[:-1]) | (rows[1:] != rows[:-1])
+    return keys[keep], rows[keep]
+
+
+class NameIndex:
+    """
+    Index des noms de recettes : préfixes triés et listes de trigrammes.
+
+    Args:
+        ids (np.ndarray): Identifiant de chaque recette.
+        names (np.ndarray): Nom affiché de chaque recette.
+    """
+
+    def __init__(self, ids: np.ndarray, names: np.ndarray):
+        """
+        Construit l'index.
+
+        Args:
+            ids (np.ndarray): Identifiant de chaque recette.
+            names (np.ndarray): Nom affiché de chaque recette.
+        """
+        self.ids = np.asarray(ids)
+        self.names = np.asarray(names, dtype=object)
+        normalized = np.array([normalize(name) for name in self.names], dtype=object)
+        self._lengths = np.fromiter((len(name) for name in normalized), dtype=np.int64,
+                                    count=len(normalized))
+        self._sorted_order = np.argsort(normalized, kind="stable")
+        self._sorted_names = normalized[self._sorted_order]
+        keys, rows = trigram_keys(normalized)
+        self.trigrams, counts = np.unique(keys, return_counts=True)
+        self.indptr = np.zeros(len(self.trigrams) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+        self.rows = rows.astype(np.int32)
+        self._trigram_counts = np.bincount(rows, minlength=len(normalized))
+        logger.info(f"Index des noms construit : {len(normalized)} recettes, {len(self.trigrams)} trigrammes.")
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, id_column: str = 'id', name_column: str = 'name') -> "NameIndex":
+        """
+        Construit l'index des noms d'un DataFrame de recettes.
+
+        Args:
+            df (pd.DataFrame): Recettes.
+            id_column (str, optional): Colonne des identifiants.
+            name_column (str, optional): Colonne des noms.
+
+        Returns:
+            NameIndex: L'index.
+        """
+        return cls(df[id_column].to_numpy(), df[name_column].to_numpy(dtype=object))
+
+    def prefix_matches(self, prefix: str, top_k: int = 10) -> np.ndarray:
+        """
+        Recettes dont le nom commence par un préfixe, les noms les plus courts d'abord.
+
+        Args:
+            prefix (str): Début du nom (normalisé par la fonction).
+            top_k (int, optional): Nombre maximal de résultats.
+
+        Returns:
+            np.ndarray: Positions des recettes.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return np.zeros(0, dtype=np.int64)
+        lo = np.searchsorted(self._sorted_names, prefix, side="left")
+        hi = np.searchsorted(self._sorted_names, prefix + "\U0010ffff", side="left")
+        rows = self._sorted_order[lo:hi]
+        if len(rows) > top_k:
+            rows = rows[np.argpartition(self._lengths[rows], top_k - 1)[:top_k]]
+        return rows[np.lexsort((rows, self._lengths[rows]))]
+
+    def fuzzy_matches(self, query: str, top_k: int = 10,
+                      min_similarity: float = MIN_SIMILARITY) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Recettes dont le nom partage le plus de trigrammes avec la requête.
+
+        Args:
+            query (str): Texte saisi.
+            top_k (int, optional): Nombre maximal de résultats.
+            min_similarity (float, optional): Similarité de Jaccard minimale.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Positions des recettes et similarités, décroissantes.
+        """
+        query = normalize(query)
+        empty = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+        if not query or len(self.trigrams) == 0:
+            return empty
+        keys, _ = trigram_keys([query])
+        positions = np.minimum(np.searchsorted(self.trigrams, keys), len(self.trigrams) - 1)
+        positions = positions[self.trigrams[positions] == keys]
+        if len(positions) == 0:
+            return empty
+        rows = np.concatenate([self.rows[self.indptr[p]:self.indptr[p + 1]] for p in positions])
+        shared = np.bincount(rows, minlength=len(self.names))
+        candidates = np.flatnonzero(shared)
+        similarity = shared[candidates] / (len(keys) + self._trigram_counts[candidates] - shared[candidates])
+        keep = similarity >= min_similarity
+        candidates, similarity = candidates[keep], similarity[keep]
+        if len(candidates) > top_k:
+            best = np.argpartition(-similarity, top_k - 1)[:top_k]
+            candidates, similarity = candidates[best], similarity[best]
+        order = np.lexsort((self._lengths[candidates], -similarity))
+        return candidates[order], similarity[order]
+
+    def complete(self, query: str, top_k: int = 10) -> pd.DataFrame:
+        """
+        Autocomplétion : correspondances par préfixe, puis correspondances floues.
+
+        Args:
+            query (str): Texte saisi.
+            top_k (int, optional): Nombre de suggestions.
+
+        Returns:
+            pd.DataFrame: Colonnes 'id', 'name' et 'score' (1 pour un préfixe, similarité sinon).
+        """
+        prefix_rows = self.prefix_matches(query, top_k)
+        fuzzy_rows, similarity = self.fuzzy_matches(query, top_k + len(prefix_rows))
+        fresh = ~np.isin(fuzzy_rows, prefix_rows)
+        rows = np.concatenate([prefix_rows, fuzzy_rows[fresh]])[:top_k]
+        scores = np.concatenate([np.ones(len(prefix_rows)), similarity[fresh]])[:top_k]
+        return pd.DataFrame({'id': self.ids[rows], 'name': self.names[rows], 'score': scores})
+
+
+def get_name_index(df: pd.DataFrame, fingerprint: Optional[str] = None) -> NameIndex:
+    """
+    Retourne l'index des noms, mis en cache par empreinte du jeu de données.
+
+    Args:
+        df (pd.DataFrame): Recettes (colonnes 'id' et 'name').
+        fingerprint (str, optional): Empreinte de `df` ; sans empreinte, aucun cache.
+
+    Returns:
+        NameIndex: L'index.
+    """
+    return name_index_cache.get_or_compute(("names", fingerprint), fingerprint, lambda: NameIndex.from_frame(df))
@@ -0,0 +1,187 @@
+"""
+Index de plages sur les valeurs nutritionnelles, pour la recherche de recettes par régime.
+
+Chaque colonne numérique (sept nutriments, note moyenne, nombre de notes) est
+indexée par le tri de ses valeurs : les recettes satisfaisant `min <= valeur <= max`
+forment une tranche contiguë de cet ordre, trouvée par deux recherches
+dichotomiques. Une requête part de la contrainte la plus sélective (la tranche
+la plus courte) et vérifie les autres contraintes sur ces seuls candidats ;
+aucune colonne n'est parcourue en entier. Les résultats sont triés puis
+paginés.
+"""
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.fingerprint import FingerprintCache
+
+logger = logging.getLogger(__name__)
+
+NUTRIENT_COLUMNS = ('Calories', 'Graisses', 'Graisse_saturées', 'Sucre', 'Sodium', 'Protéines', 'Glucides')
+QUERY_COLUMNS = NUTRIENT_COLUMNS + ('Moyenne des notes', 'Nombre de notes')
+
+# Régimes prédéfinis : colonne -> (minimum, maximum), None pour une borne ouverte
+REGIMES: Dict[str, Dict[str, Tuple[Optional[float], Optional[float]]]] = {
+    "Low-Carb": {'Glucides': (None, 3)},
+    "High-Protein": {'Protéines': (75, None)},
+    "Low-Fat": {'Graisses': (None, 3)},
+}
+
+# Ordre de tri de chaque colonne nutritionnelle de la page Nutrition
+nutrition_index_cache = FingerprintCache("nutrition_index", max_entries=4)
+
+Constraints = Dict[str, Tuple[Optional[float], Optional[float]]]
+
+
+class NutritionIndex:
+    """
+    Index trié de chaque colonne nutritionnelle d'un DataFrame de recettes.
+
+    Args:
+        df (pd.DataFrame): Recettes nettoyées.
+        columns (Iterable[str], optional): Colonnes indexées (celles absentes sont ignorées).
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Iterable[str] = QUERY_COLUMNS):
+        """
+        Construit l'index.
+
+        Args:
+            df (pd.DataFrame): Recettes nettoyées.
+            columns (Iterable[str], optional): Colonnes indexées.
+        """
+        self.df = df
+        self.values: Dict[str, np.ndarray] = {}
+        self.orders: Dict[str, np.ndarray] = {}
+        self.sorted_values: Dict[str, np.ndarray] = {}
+        self.n_valid: Dict[str, int] = {}
+        for column in columns:
+            if column not in df.columns:
+                continue
+            values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64)
+            # Les valeurs manquantes sont triées en dernier et ne satisfont aucune borne
+            order = np.argsort(values, kind="stable")
+            self.values[column] = values
+            self.orders[column] = order
+            self.sorted_values[column] = values[order]
+            self.n_valid[column] = int(np.count_nonzero(~np.isnan(values)))
+        logger.info(f"Index nutritionnel construit : {len(df)} recettes, {len(self.values)} colonnes.")
+
+    @property
+    def n_recipes(self) -> int:
+        """Nombre de recettes indexées."""
+        return len(self.df)
+
+    def bounds(self, column: str) -> Tuple[float, float]:
+        """
+        Plus petite et plus grande valeur d'une colonne.
+
+        Args:
+            column (str): Colonne indexée.
+
+        Returns:
+            Tuple[float, float]: Le minimum et le maximum (NaN si la colonne est vide).
+        """
+        valid = self.sorted_values[column][:self.n_valid[column]]
+        if len(valid) == 0:
+            return float("nan"), float("nan")
+        return float(valid[0]), float(valid[-1])
+
+    def _range(self, column: str, low: Optional[float], high: Optional[float]) -> Tuple[int, int]:
+        values = self.sorted_values[column][:self.n_valid[column]]
+        lo = 0 if low is None else int(np.searchsorted(values, low, side="left"))
+        hi = len(values) if high is None else int(np.searchsorted(values, high, side="right"))
+        return lo, max(lo, hi)
+
+    def query(self, constraints: Optional[Constraints] = None) -> np.ndarray:
+        """
+        Recettes dont chaque colonne contrainte est dans [minimum, maximum].
+
+        Args:
+            constraints (Constraints, optional): Bornes par colonne, ex.
+                `{'Glucides': (None, 3), 'Moyenne des notes': (4, None)}`.
+
+        Returns:
+            np.ndarray: Positions des recettes dans le DataFrame, croissantes.
+
+        Raises:
+            KeyError: Si une colonne n'est pas indexée.
+        """
+        constraints = {column: bounds for column, bounds in (constraints or {}).items()
+                       if bounds != (None, None)}
+        if not constraints:
+            return np.arange(self.n_recipes)
+        ranges = {column: self._range(column, *bounds) for column, bounds in constraints.items()}
+        # Amorce par la tranche la plus courte, puis vérification des autres bornes
+        seed = min(ranges, key=lambda column: ranges[column][1] - ranges[column][0])
+        lo, hi = ranges[seed]
+        candidates = np.sort(self.orders[seed][lo:hi])
+        for column, (low, high) in constraints.items():
+            if column == seed or len(candidates) == 0:
+                continue
+            values = self.values[column][candidates]
+            keep = ~np.isnan(values)
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values <= high
+            candidates = candidates[keep]
+        return candidates
+
+    def page(self, positions: np.ndarray, sort_by: Optional[str] = None, ascending: bool = False,
+             page: int = 0, page_size: int = 50) -> pd.DataFrame:
+        """
+        Trie des résultats par une colonne et en extrait une page.
+
+        Args:
+            positions (np.ndarray): Positions des recettes (`query`).
+            sort_by (str, optional): Colonne de tri. Par défaut : ordre des positions.
+            ascending (bool, optional): Tri croissant. Par défaut : décroissant.
+            page (int, optional): Numéro de page, à partir de 0.
+            page_size (int, optional): Nombre de recettes par page.
+
+        Returns:
+            pd.DataFrame: Les recettes de la page.
+        """
+        if sort_by is not None:
+            column = self.values.get(sort_by)
+            if column is None:
+                column = pd.to_numeric(self.df[sort_by], errors="coerce").to_numpy(dtype=np.float64)
+            keys = column[positions]
+            positions = positions[np.argsort(keys if ascending else -keys, kind="stable")]
+        start = max(page, 0) * page_size
+        return self.df.iloc[positions[start:start + page_size]]
+
+    def search(self, constraints: Optional[Constraints] = None, sort_by: Optional[str] = None,
+               ascending: bool = False, page: int = 0, page_size: int = 50) -> Tuple[pd.DataFrame, int]:
+        """
+        Page de recettes satisfaisant des contraintes, triées par une colonne.
+
+        Args:
+            constraints (Constraints, optional): Bornes par colonne.
+            sort_by (str, optional): Colonne de tri. Par défaut : ordre du DataFrame.
+            ascending (bool, optional): Tri croissant. Par défaut : décroissant.
+            page (int, optional): Numéro de page, à partir de 0.
+            page_size (int, optional): Nombre de recettes par page.
+
+        Returns:
+            Tuple[pd.DataFrame, int]: Les recettes de la page et le nombre total de résultats.
+        """
+        positions = self.query(constraints)
+        return self.page(positions, sort_by, ascending, page, page_size), len(positions)
+
+
+def get_nutrition_index(df: pd.DataFrame, fingerprint: Optional[str] = None) -> NutritionIndex:
+    """
+    Retourne l'index nutritionnel, mis en cache par empreinte du jeu de données.
+
+    Args:
+        df (pd.DataFrame): Recettes nettoyées.
+        fingerprint (str, optional): Empreinte de `df` ; sans empreinte, aucun cache.
+
+    Returns:
+        NutritionIndex: L'index.
+    """
+    return nutrition_index_cache.get_or_compute(("nutrition", fingerprint), fingerprint, lambda: NutritionIndex(df))
@@ -0,0 +1,135 @@
+"""
+Recherche des recettes au profil nutritionnel le plus proche (k plus proches voisins).
+
+Les sept valeurs nutritionnelles sont centrées-réduites (moyenne et écart type
+du jeu de données), puis indexées une fois dans un `KDTree` scikit-learn : en
+dimension 7, l'arbre ne visite qu'une petite partie des recettes par requête.
+Les requêtes acceptent un lot de profils et leur durée est comptabilisée
+(`latency_report`).
+"""
+import logging
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+from src.process.nutrition_index import NUTRIENT_COLUMNS
+from src.utils.fingerprint import FingerprintCache
+
+logger = logging.getLogger(__name__)
+
+# KDTree des profils nutritionnels centrés-réduits
+neighbors_cache = FingerprintCache("nutrition_neighbors", max_entries=4)
+
+
+class NutritionNeighbors:
+    """
+    Index des profils nutritionnels centrés-réduits d'un DataFrame de recettes.
+
+    Args:
+        df (pd.DataFrame): Recettes nettoyées.
+        columns (Iterable[str], optional): Colonnes du profil. Par défaut : les sept nutriments.
+        leaf_size (int, optional): Taille des feuilles du KDTree.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Iterable[str] = NUTRIENT_COLUMNS, leaf_size: int = 40):
+        """
+        Construit l'index (les recettes au profil incomplet sont ignorées).
+
+        Args:
+            df (pd.DataFrame): Recettes nettoyées.
+            columns (Iterable[str], optional): Colonnes du profil.
+            leaf_size (int, optional): Taille des feuilles du KDTree.
+        """
+        self.df = df
+        self.columns = [column for column in columns if column in df.columns]
+        values = df[self.columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+        complete = np.isfinite(values).all(axis=1)
+        self.positions = np.flatnonzero(complete)
+        values = values[complete]
+        self.mean = values.mean(axis=0) if len(values) else np.zeros(len(self.columns))
+        std = values.std(axis=0) if len(values) else np.ones(len(self.columns))
+        self.std = np.where(std > 0, std, 1.0)
+        self.tree = KDTree((values - self.mean) / self.std, leaf_size=leaf_size)
+        self.latency = {"calls": 0, "queries": 0, "seconds": 0.0, "max_seconds": 0.0}
+        logger.info(f"Index des profils nutritionnels construit : {len(values)} recettes.")
+
+    def kneighbors(self, profiles, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Plus proches voisins d'un lot de profils nutritionnels.
+
+        Args:
+            profiles: Tableau (n, n_colonnes) ou DataFrame contenant les colonnes du profil ;
+                une valeur manquante est remplacée par la moyenne de sa colonne.
+            k (int, optional): Nombre de voisins par profil.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Distances (n, k) dans l'espace centré-réduit et
+                positions (n, k) des voisins dans le DataFrame, du plus proche au plus éloigné.
+        """
+        if isinstance(profiles, (pd.DataFrame, pd.Series)):
+            profiles = pd.DataFrame(profiles).T if isinstance(profiles, pd.Series) else profiles
+            profiles = profiles[self.columns]
+        points = np.atleast_2d(np.asarray(profiles, dtype=np.float64))
+        points = np.where(np.isfinite(points), points, self.mean)
+        k = min(k, len(self.positions))
+        start = time.perf_counter()
+        distances, rows = self.tree.query((points - self.mean) / self.std, k=k)
+        elapsed = time.perf_counter() - start
+        self.latency["calls"] += 1
+        self.latency["queries"] += len(points)
+        self.latency["seconds"] += elapsed
+        self.latency["max_seconds"] = max(self.latency["max_seconds"], elapsed)
+        logger.debug(f"{len(points)} profils, k={k} : {elapsed * 1000:.2f} ms")
+        return distances, self.positions[rows]
+
+    def similar_recipes(self, profile, k: int = 5, exclude_name: Optional[str] = None) -> pd.DataFrame:
+        """
+        Recettes dont le profil nutritionnel est le plus proche d'un profil donné.
+
+        Args:
+            profile: Profil (Series ou ligne du DataFrame contenant les colonnes du profil).
+            k (int, optional): Nombre de recettes retournées.
+            exclude_name (str, optional): Nom de la recette de référence, exclue des résultats.
+
+        Returns:
+            pd.DataFrame: Les recettes voisines avec une colonne 'Distance', de la plus proche à la plus éloignée.
+        """
+        distances, positions = self.kneighbors(profile, k + (exclude_name is not None))
+        result = self.df.iloc[positions[0]].assign(Distance=distances[0])
+        if exclude_name is not None and 'name' in result.columns:
+            result = result[result['name'] != exclude_name]
+        return result.head(k)
+
+    def latency_report(self) -> Dict[str, float]:
+        """
+        Statistiques de durée des requêtes depuis la construction de l'index.
+
+        Returns:
+            Dict[str, float]: Nombre d'appels et de profils, durée moyenne par appel et
+                par profil, et durée maximale d'un appel (en millisecondes).
+        """
+        calls, queries = self.latency["calls"], self.latency["queries"]
+        return {
+            "calls": calls,
+            "queries": queries,
+            "mean_ms_per_call": 1000 * self.latency["seconds"] / calls if calls else 0.0,
+            "mean_ms_per_query": 1000 * self.latency["seconds"] / queries if queries else 0.0,
+            "max_ms": 1000 * self.latency["max_seconds"],
+        }
+
+
+def get_nutrition_neighbors(df: pd.DataFrame, fingerprint: Optional[str] = None) -> NutritionNeighbors:
+    """
+    Retourne l'index des profils nutritionnels, mis en cache par empreinte du jeu de données.
+
+    Args:
+        df (pd.DataFrame): Recettes nettoyées.
+        fingerprint (str, optional): Empreinte de `df` ; sans empreinte, aucun cache.
+
+    Returns:
+        NutritionNeighbors: L'index.
+    """
+    return neighbors_cache.get_or_compute(("neighbors", fingerprint), fingerprint, lambda: NutritionNeighbors(df))
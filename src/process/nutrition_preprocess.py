@@ -4,8 +4,8 @@ import os
 from dotenv import load_dotenv
 import streamlit as st
 import pandas as pd
-import ast
 import logging
+from functools import partial
 from datetime import date
 from pathlib import Path
 from datetime import datetime
@@ -56,6 +56,14 @@ end_date = date(YEAR_MAX, 12, 31)
 
 cwd = str(Path.cwd())
 
+# Colonnes réellement utilisées par la page Nutrition : les textes volumineux
+# (`steps`, `description`, `review`...) ne sont pas chargés.
+RECIPES_COLUMNS = ['id', 'name', 'nutrition']
+INTERACTIONS_COLUMNS = ['recipe_id', 'rating']
+# Ordre des valeurs dans la colonne 'nutrition'
+NUTRITION_VALUES = ['Calories', 'Graisses', 'Sucre', 'Sodium',
+                    'Protéines', 'Graisse_saturées', 'Glucides']
+
 
 def load_data(limit=500000):
     """
@@ -82,7 +90,7 @@ def load_data(limit=500000):
             st.session_state.limit = limit
         if DEPLOIEMENT_SITE !="ONLINE":
             if "data" not in st.session_state:
-                df_RAW_recipes = Welcome.show_welcom(DEPLOIEMENT_SITE, load_dataset_from_file, os.path.join(dataset_dir, "RAW_recipes.csv"), None, None, datetime(1999, 1, 1), datetime(2018, 12, 31))
+                df_RAW_recipes = Welcome.show_welcom(DEPLOIEMENT_SITE, partial(load_dataset_from_file, columns=RECIPES_COLUMNS), os.path.join(dataset_dir, "RAW_recipes.csv"), None, None, datetime(1999, 1, 1), datetime(2018, 12, 31))
             else:    
                 df_RAW_recipes = st.session_state.data
         else:
@@ -92,7 +100,7 @@ def load_data(limit=500000):
                 df_RAW_recipes = st.session_state.data
         if "df_RAW_interactions" not in st.session_state or limit!=st.session_state.limit:
             if DEPLOIEMENT_SITE !="ONLINE":
-                df_RAW_interactions = Welcome.show_welcom(DEPLOIEMENT_SITE, load_dataset_from_file, os.path.join(dataset_dir, "RAW_interactions.csv"), None, None, datetime(1999, 1, 1), datetime(2018, 12, 31), is_interactional=True)
+                df_RAW_interactions = Welcome.show_welcom(DEPLOIEMENT_SITE, partial(load_dataset_from_file, columns=INTERACTIONS_COLUMNS), os.path.join(dataset_dir, "RAW_interactions.csv"), None, None, datetime(1999, 1, 1), datetime(2018, 12, 31), is_interactional=True)
             else:
                 df_RAW_interactions = Welcome.show_welcom(DEPLOIEMENT_SITE, load_dataset_from_file, CONNECTION_STRING, DATABASE_NAME,COLLECTION_RAW_INTERACTIONS , datetime(1999, 1, 1), datetime(2018, 12, 31), is_interactional=True, limit=limit)
         else:
@@ -102,51 +110,70 @@ def load_data(limit=500000):
     except Exception as e:
         logger.error(f"Erreur lors du chargement des fichiers CSV: {e}")
         raise
-    # On ne garde que la moyenne des notes de la recette
-    df_mean_rating = df_RAW_interactions[[
-        'recipe_id', 'rating']].groupby(['recipe_id']).mean().round(2)
-    logger.info("Moyenne des notes par recette calculée.")
+    return build_nutrition_frame(df_RAW_recipes, df_RAW_interactions)
 
-    # On ne garde que le nombre de notes de la recette
-    df_count_rating = df_RAW_interactions[[
-        'recipe_id', 'rating']].groupby(['recipe_id']).count()
-    logger.info("Nombre de notes par recette calculé.")
 
-    df_nutrition = df_RAW_recipes[['id', 'name', 'nutrition']]
+def aggregate_ratings(df_interactions):
+    """
+    Calcule la moyenne (arrondie à 2 décimales) et le nombre de notes de chaque recette.
 
-    # Fusionner les DataFrames
-    merged_df = df_nutrition.merge(df_mean_rating, left_on='id', right_on='recipe_id').merge(
-        df_count_rating, left_on='id', right_on='recipe_id')
-    logger.info("Données fusionnées avec succès.")
+    Les deux agrégats sont obtenus en un seul `groupby`.
 
-    merged_df.rename(columns={'rating_x': 'Moyenne des notes',
-                              'rating_y': 'Nombre de notes'}, inplace=True)
+    Parameters:
+        df_interactions (pd.DataFrame): Interactions (colonnes 'recipe_id' et 'rating').
 
-    # Convertir les chaînes de caractères en listes
-    merged_df['nutrition'] = merged_df['nutrition'].apply(ast.literal_eval) if DEPLOIEMENT_SITE!="ONLINE" else  merged_df['nutrition']
-    logger.info("Les données de nutrition ont été converties en listes.")
+    Returns:
+        pd.DataFrame: Colonnes 'Moyenne des notes' et 'Nombre de notes', indexées par 'recipe_id'.
+    """
+    ratings = df_interactions.groupby('recipe_id')['rating'].agg(['mean', 'count'])
+    ratings['mean'] = ratings['mean'].round(2)
+    logger.info("Moyenne et nombre de notes par recette calculés.")
+    return ratings.rename(columns={'mean': 'Moyenne des notes', 'count': 'Nombre de notes'})
 
-    # Convertir la colonne de listes en plusieurs colonnes
-    valeurs_df = pd.DataFrame(
-        merged_df['nutrition'].tolist(), index=merged_df.index)
 
-    # Renommer les colonnes si nécessaire
-    valeurs_df.columns = ['Calories', 'Graisses', 'Sucre', 'Sodium',
-                          'Protéines', 'Graisse_saturées', 'Glucides']
+def split_nutrition(nutrition):
+    """
+    Sépare la colonne 'nutrition' en sept colonnes numériques.
+
+    Hors déploiement en ligne, les valeurs sont des chaînes "[v1, v2, ...]" découpées
+    de façon vectorisée, sans évaluer chaque chaîne.
 
-    # Joindre le DataFrame original avec le nouveau DataFrame
-    nutrition_df = merged_df.drop(columns=['nutrition', 'id']).join(valeurs_df)
+    Parameters:
+        nutrition (pd.Series): Listes (ou leur représentation textuelle) de sept valeurs.
+
+    Returns:
+        pd.DataFrame: Colonnes NUTRITION_VALUES, de même index que `nutrition`.
+    """
+    if DEPLOIEMENT_SITE != "ONLINE":
+        valeurs_df = nutrition.str.strip('[]').str.split(',', expand=True)
+        if valeurs_df.shape[1] != len(NUTRITION_VALUES):
+            raise ValueError(f"{valeurs_df.shape[1]} valeurs nutritionnelles au lieu de {len(NUTRITION_VALUES)}")
+        valeurs_df = valeurs_df.astype('float64')
+    else:
+        valeurs_df = pd.DataFrame(nutrition.tolist(), index=nutrition.index).apply(pd.to_numeric)
+    valeurs_df.columns = NUTRITION_VALUES
     logger.info("Données de nutrition séparées en colonnes individuelles.")
+    return valeurs_df
+
 
-    # Convertir les colonnes en numériques
-    nutrition_df[['Calories', 'Graisses', 'Sucre', 'Sodium',
-                  'Protéines', 'Graisse_saturées', 'Glucides']] = nutrition_df[[
-                      'Calories', 'Graisses', 'Sucre', 'Sodium',
-                      'Protéines', 'Graisse_saturées', 'Glucides']].apply(pd.to_numeric)
-    logger.info(
-        "Les colonnes de valeurs nutritionnelles ont été converties en numériques.")
+def build_nutrition_frame(df_recipes, df_interactions):
+    """
+    Associe à chaque recette notée ses notes agrégées et ses valeurs nutritionnelles.
+
+    Parameters:
+        df_recipes (pd.DataFrame): Recettes (colonnes 'id', 'name', 'nutrition').
+        df_interactions (pd.DataFrame): Interactions (colonnes 'recipe_id', 'rating').
 
-    return nutrition_df
+    Returns:
+        pd.DataFrame: Colonnes 'name', 'Moyenne des notes', 'Nombre de notes' puis les
+            valeurs nutritionnelles, dans l'ordre des recettes, indexées par identifiant ('id').
+    """
+    ratings = aggregate_ratings(df_interactions)
+    merged_df = df_recipes[['id', 'name', 'nutrition']].join(ratings, on='id', how='inner')
+    merged_df = merged_df.reset_index(drop=True)
+    logger.info("Données fusionnées avec succès.")
+    return merged_df[['id', 'name', 'Moyenne des notes', 'Nombre de notes']].join(
+        split_nutrition(merged_df['nutrition'])).set_index('id')
 
 
 @st.cache_data
@@ -170,19 +197,12 @@ def clean_data(df):
 
     logger.info("Nettoyage des données...")
 
-    # Filtrer les données (nombre de notes >= 5)
-    df = df[(df['Nombre de notes'] >= 5)]
-    logger.info("Filtrage des recettes ayant moins de 5 notes effectué.")
-
-    # Supprimer les valeurs nutritionnelles aberrantes
+    # Un seul masque : nombre de notes >= 5, nutriments <= 100, calories <= 800
     nutrition_columns = ['Graisses', 'Graisse_saturées',
                          'Sucre', 'Sodium', 'Protéines', 'Glucides']
-    for column in nutrition_columns:
-        df = df.drop(df[df[column] > 100].index)
-        logger.info(f"Valeurs aberrantes supprimées pour la colonne {column}.")
-
-    df = df.drop(df[df[('Calories')] > 800].index)
-    logger.info("Valeurs aberrantes supprimées pour la colonne Calories.")
+    outliers = (df[nutrition_columns] > 100).any(axis=1) | (df['Calories'] > 800)
+    df = df[(df['Nombre de notes'] >= 5) & ~outliers]
+    logger.info("Recettes ayant moins de 5 notes et valeurs aberrantes supprimées.")
 
     logger.info("Nettoyage des données terminé.")
 
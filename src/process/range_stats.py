@@ -0,0 +1,335 @@
+"""
+Statistiques de plage de dates à partir de résumés mensuels fusionnables.
+
+`MonthlySketches` construit, pour chaque mois, des résumés de taille bornée
+(`src.utils.sketches`) : quantiles et moments des colonnes numériques, nombre de
+valeurs distinctes et valeurs les plus fréquentes des colonnes d'identifiants ou
+de listes (tags). Une plage de dates quelconque s'obtient en fusionnant les mois
+qu'elle couvre, sans relire les données : un changement de plage ne coûte que
+quelques fusions de petits tableaux.
+
+La granularité est le mois : une plage est étendue aux mois entiers qu'elle
+touche. Le mode exact (`exact_range_stats`) calcule les mêmes statistiques sur
+les lignes brutes et sert de référence pour vérifier les résumés.
+"""
+import ast
+import logging
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.artifacts import NUTRITION_COLUMNS, RECIPES_FILE, ArtifactStore, source_fingerprint
+from src.utils.coded_columns import CodedListColumn, encode_list_column
+from src.utils.fingerprint import FingerprintCache
+from src.utils.sketches import HyperLogLog, KLLSketch, Moments, SpaceSaving
+
+logger = logging.getLogger(__name__)
+
+STATS_MODES = ('exact', 'sketch')
+# Rangs des quantiles retournés
+QUANTILES = [0.25, 0.5, 0.75]
+# Nom de l'artefact des résumés mensuels des recettes
+RECIPE_SKETCHES = "recipes_sketches"
+
+# Colonnes de RAW_recipes.csv lues pour construire les résumés sans artefacts
+SKETCH_COLUMNS = ['submitted', 'contributor_id', 'tags', 'nutrition']
+
+# Résumés de tout le jeu de données (artefacts ou CSV source), et à défaut de la session
+sketch_cache = FingerprintCache("range_sketches", max_entries=4)
+
+
+def month_keys(dates: pd.Series) -> np.ndarray:
+    """
+    Numéro de mois (année × 12 + mois - 1) de chaque date.
+
+    Args:
+        dates (pd.Series): Dates.
+
+    Returns:
+        np.ndarray: Numéros de mois (int64).
+    """
+    dates = pd.to_datetime(dates)
+    return (dates.dt.year * 12 + dates.dt.month - 1).to_numpy(dtype=np.int64)
+
+
+def _month_key(value) -> int:
+    value = pd.Timestamp(value)
+    return value.year * 12 + value.month - 1
+
+
+class MonthSummary:
+    """
+    Résumés d'un mois (ou d'une fusion de mois).
+
+    Attributes:
+        count (int): Nombre de lignes.
+        moments (Dict[str, Moments]): Moments exacts par colonne numérique.
+        quantiles (Dict[str, KLLSketch]): Résumés de quantiles par colonne numérique.
+        distinct (Dict[str, HyperLogLog]): Estimateurs de valeurs distinctes.
+        top (Dict[str, SpaceSaving]): Valeurs les plus fréquentes.
+    """
+
+    def __init__(self):
+        """Initialise un résumé vide."""
+        self.count = 0
+        self.moments: Dict[str, Moments] = {}
+        self.quantiles: Dict[str, KLLSketch] = {}
+        self.distinct: Dict[str, HyperLogLog] = {}
+        self.top: Dict[str, SpaceSaving] = {}
+
+    def merge(self, other: "MonthSummary") -> "MonthSummary":
+        """
+        Fusionne deux résumés dans un nouvel objet.
+
+        Args:
+            other (MonthSummary): Résumé à fusionner.
+
+        Returns:
+            MonthSummary: La fusion.
+        """
+        merged = MonthSummary()
+        merged.count = self.count + other.count
+        for attribute in ("moments", "quantiles", "distinct", "top"):
+            mine, theirs = getattr(self, attribute), getattr(other, attribute)
+            getattr(merged, attribute).update({
+                key: mine[key].merge(theirs[key]) if key in mine and key in theirs
+                else mine.get(key, theirs.get(key))
+                for key in set(mine) | set(theirs)})
+        return merged
+
+
+class MonthlySketches:
+    """
+    Résumés mensuels fusionnables d'un jeu de données daté.
+
+    Args:
+        months (Dict[int, MonthSummary]): Résumé de chaque numéro de mois.
+    """
+
+    def __init__(self, months: Dict[int, MonthSummary]):
+        """
+        Initialise l'ensemble des résumés.
+
+        Args:
+            months (Dict[int, MonthSummary]): Résumé de chaque numéro de mois.
+        """
+        self.months = months
+        self._keys = np.array(sorted(months), dtype=np.int64)
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, date_column: str,
+              numeric: Optional[Dict[str, np.ndarray]] = None,
+              distinct_columns: Iterable[str] = (),
+              list_columns: Optional[Dict[str, CodedListColumn]] = None,
+              k: int = 200, hll_precision: int = 12, top_capacity: int = 256) -> "MonthlySketches":
+        """
+        Construit les résumés de chaque mois.
+
+        Args:
+            df (pd.DataFrame): Données.
+            date_column (str): Colonne de date ('submitted', 'date').
+            numeric (Dict[str, np.ndarray], optional): Colonnes numériques à résumer
+                (quantiles et moments), alignées sur `df`. Par défaut : aucune.
+            distinct_columns (Iterable[str], optional): Colonnes d'identifiants
+                (valeurs distinctes et top-k), par exemple 'contributor_id'.
+            list_columns (Dict[str, CodedListColumn], optional): Colonnes de listes
+                encodées (valeurs distinctes et top-k des éléments, quantiles de la longueur).
+            k (int, optional): Précision des résumés de quantiles.
+            hll_precision (int, optional): Précision des HyperLogLog.
+            top_capacity (int, optional): Nombre de valeurs suivies par Space-Saving.
+
+        Returns:
+            MonthlySketches: Les résumés.
+        """
+        numeric = dict(numeric or {})
+        list_columns = list_columns or {}
+        for name, coded in list_columns.items():
+            numeric[f"{name}_length"] = coded.lengths()
+        keys = month_keys(df[date_column])
+        order = np.argsort(keys, kind="stable")
+        bounds = np.flatnonzero(np.diff(keys[order])) + 1
+        months: Dict[int, MonthSummary] = {}
+        for rows in np.split(order, bounds):
+            if len(rows) == 0:
+                continue
+            summary = MonthSummary()
+            summary.count = len(rows)
+            for name, values in numeric.items():
+                values = np.asarray(values, dtype=np.float64)[rows]
+                summary.moments[name] = Moments.from_values(values)
+                summary.quantiles[name] = KLLSketch(k, seed=int(keys[rows[0]])).update(values)
+            for name in distinct_columns:
+                values = df[name].to_numpy()[rows]
+                summary.distinct[name] = HyperLogLog(hll_precision).update(values)
+                summary.top[name] = SpaceSaving.from_counts(
+                    pd.Series(values).value_counts(), top_capacity)
+            for name, coded in list_columns.items():
+                month = coded.take(rows)
+                present = np.flatnonzero(month.counts())
+                summary.distinct[name] = HyperLogLog(hll_precision).update(coded.vocabulary[present])
+                summary.top[name] = SpaceSaving.from_counts(month.value_counts(), top_capacity)
+            months[int(keys[rows[0]])] = summary
+        logger.info(f"Résumés construits pour {len(months)} mois.")
+        return cls(months)
+
+    def query(self, date_start, date_end) -> MonthSummary:
+        """
+        Fusionne les résumés des mois couverts par une plage de dates.
+
+        Args:
+            date_start: Date de début (son mois est inclus).
+            date_end: Date de fin (son mois est inclus).
+
+        Returns:
+            MonthSummary: Le résumé de la plage (vide si aucun mois).
+        """
+        lo = np.searchsorted(self._keys, _month_key(date_start), side="left")
+        hi = np.searchsorted(self._keys, _month_key(date_end), side="right")
+        keys: List[int] = self._keys[lo:hi].tolist()
+        merged = MonthSummary()
+        # Fusion par paires : les résumés restent de taille bornée à chaque étape
+        summaries = [self.months[key] for key in keys]
+        while len(summaries) > 1:
+            summaries = [summaries[i].merge(summaries[i + 1]) if i + 1 < len(summaries)
+                         else summaries[i] for i in range(0, len(summaries), 2)]
+        return summaries[0] if summaries else merged
+
+
+def summarize(summary: MonthSummary, top_n: int = 10) -> Dict[str, dict]:
+    """
+    Convertit un résumé en statistiques lisibles.
+
+    Args:
+        summary (MonthSummary): Résumé d'une plage.
+        top_n (int, optional): Nombre de valeurs les plus fréquentes retournées.
+
+    Returns:
+        dict: Pour chaque colonne numérique : 'mean', 'min', 'max', 'median', 'quartiles' ;
+            pour chaque colonne d'identifiants ou de listes : 'distinct' et 'top'.
+    """
+    result: Dict[str, dict] = {}
+    for name, moments in summary.moments.items():
+        q = summary.quantiles[name].quantiles(QUANTILES)
+        result[name] = {
+            'mean': moments.mean, 'min': moments.minimum, 'max': moments.maximum,
+            'median': float(q[1]), 'quartiles': dict(zip(QUANTILES, map(float, q))),
+        }
+    for name, hll in summary.distinct.items():
+        result[name] = {'distinct': int(round(hll.estimate())),
+                        'top': summary.top[name].top(top_n)}
+    return result
+
+
+def exact_range_stats(df: pd.DataFrame, date_column: str, date_start, date_end,
+                      numeric: Optional[Dict[str, np.ndarray]] = None,
+                      distinct_columns: Iterable[str] = (),
+                      list_columns: Optional[Dict[str, CodedListColumn]] = None,
+                      top_n: int = 10) -> Dict[str, dict]:
+    """
+    Mode exact, au même format que `summarize`, pour vérifier les résumés.
+
+    La plage est étendue aux mois entiers, comme pour `MonthlySketches.query`.
+
+    Args:
+        df (pd.DataFrame): Données.
+        date_column (str): Colonne de date.
+        date_start: Date de début.
+        date_end: Date de fin.
+        numeric (Dict[str, np.ndarray], optional): Colonnes numériques, alignées sur `df`.
+        distinct_columns (Iterable[str], optional): Colonnes d'identifiants.
+        list_columns (Dict[str, CodedListColumn], optional): Colonnes de listes encodées.
+        top_n (int, optional): Nombre de valeurs les plus fréquentes retournées.
+
+    Returns:
+        dict: Statistiques exactes.
+    """
+    keys = month_keys(df[date_column])
+    rows = (keys >= _month_key(date_start)) & (keys <= _month_key(date_end))
+    numeric = dict(numeric or {})
+    list_columns = list_columns or {}
+    for name, coded in list_columns.items():
+        numeric[f"{name}_length"] = coded.lengths()
+    result: Dict[str, dict] = {}
+    for name, values in numeric.items():
+        values = pd.Series(np.asarray(values, dtype=np.float64)[rows])
+        result[name] = {
+            'mean': values.mean(), 'min': values.min(), 'max': values.max(),
+            'median': values.median(), 'quartiles': values.quantile(QUANTILES).to_dict(),
+        }
+    for name in distinct_columns:
+        counts = df.loc[rows, name].value_counts()
+        result[name] = {'distinct': len(counts), 'top': counts.head(top_n).to_dict()}
+    for name, coded in list_columns.items():
+        counts = coded.value_counts(rows)
+        result[name] = {'distinct': len(counts), 'top': counts.head(top_n).to_dict()}
+    return result
+
+
+def build_recipe_sketches(df: pd.DataFrame, nutrition: Optional[np.ndarray] = None,
+                          **kwargs) -> MonthlySketches:
+    """
+    Résumés mensuels des recettes : nutriments, contributeurs et tags.
+
+    Args:
+        df (pd.DataFrame): Recettes (colonnes 'submitted', 'contributor_id', 'tags', 'nutrition').
+        nutrition (np.ndarray, optional): Nutriments déjà analysés (n_lignes, 7) ;
+            par défaut, ils sont lus depuis 'nutrition_list' ou 'nutrition'.
+        **kwargs: Paramètres de précision transmis à `MonthlySketches.build`.
+
+    Returns:
+        MonthlySketches: Les résumés.
+    """
+    if nutrition is None:
+        source = df['nutrition_list'] if 'nutrition_list' in df.columns else df['nutrition']
+        nutrition = np.array([value if isinstance(value, (list, tuple)) else ast.literal_eval(value)
+                              for value in source], dtype=np.float64)
+    nutrition = np.asarray(nutrition, dtype=np.float64).reshape(len(df), len(NUTRITION_COLUMNS))
+    numeric = {col: nutrition[:, i] for i, col in enumerate(NUTRITION_COLUMNS)}
+    return MonthlySketches.build(df, 'submitted', numeric, ['contributor_id'],
+                                 {'tags': encode_list_column(df, 'tags')}, **kwargs)
+
+
+def recipe_range_summary(df: pd.DataFrame, fingerprint: Optional[str], date_start, date_end,
+                         store: Optional[ArtifactStore] = None,
+                         source_path: Optional[str] = None) -> MonthSummary:
+    """
+    Résumé des recettes d'une plage de dates.
+
+    Les résumés prétraités (`scripts/build_artifacts.py`) sont utilisés lorsque le
+    CSV source n'a pas changé. Sans artefacts, ils sont construits une seule fois sur
+    tout le CSV source et mis en cache par son empreinte : un changement de plage
+    ne fait que fusionner des mois. Dans les deux cas, ils portent sur les données
+    brutes, avant tout nettoyage. Ce n'est qu'en l'absence de CSV source (données
+    MongoDB) que les résumés sont construits sur `df`, par empreinte de la période.
+
+    Args:
+        df (pd.DataFrame): Recettes de la session.
+        fingerprint (str, optional): Empreinte de `df`.
+        date_start: Date de début.
+        date_end: Date de fin.
+        store (ArtifactStore, optional): Artefacts prétraités.
+        source_path (str, optional): Chemin de RAW_recipes.csv, pour vérifier la fraîcheur des artefacts
+            ou construire les résumés sans artefacts.
+
+    Returns:
+        MonthSummary: Le résumé fusionné de la plage.
+    """
+    sketches = None
+    if store is not None and source_path and store.is_fresh(source_path):
+        try:
+            sketches = sketch_cache.get_or_compute(
+                "artifacts", store.manifest["sources"][os.path.basename(source_path)],
+                lambda: store.load_model(RECIPE_SKETCHES))
+        except FileNotFoundError:
+            logger.warning("Résumés mensuels absents des artefacts : construction sur le CSV source.")
+    source = source_fingerprint(source_path) if sketches is None and source_path else None
+    if source is not None:
+        sketches = sketch_cache.get_or_compute(
+            ("source", source), source,
+            lambda: build_recipe_sketches(pd.read_csv(source_path, usecols=SKETCH_COLUMNS,
+                                                      parse_dates=['submitted'])))
+    if sketches is None:
+        sketches = sketch_cache.get_or_compute(("session", fingerprint), fingerprint, lambda: build_recipe_sketches(df))
+    return sketches.query(date_start, date_end)
@@ -1,14 +1,31 @@
 import logging
 from src.utils.helper_data import load_dataset_from_file
+from src.utils.fingerprint import FingerprintCache, collection_fingerprint, dataframe_fingerprint, fingerprint_digest
+from src.utils.scheduler import run_parallel
+from src.process.anomalies import cached_anomaly_report
+from src.process.cleaning import CLEANING_METHODS, cached_outlier_mask
+from src.process.range_stats import STATS_MODES, recipe_range_summary, summarize
+from src.process.tag_analytics import get_tag_matrix
+from src.process.inverted_index import get_facet_index
+from src.process.search_index import get_search_index
+from src.process.name_index import get_name_index
+from src.process.ingredients import ingredient_counts
+from src.process.temporal import get_temporal_histogram
+from src.process.contributors import ContributorActivity, get_contributor_activity
+from src.utils.artifacts import NUTRITION_COLUMNS, RECIPES_FILE, get_artifact_store
+from src.utils.lazy_dataset import (RECIPE_TEXT_COLUMNS, TEXT_STORE_DIR, LazyDataset, MongoTextSource,
+                                    narrow_columns, open_text_store)
+from src.utils.MongoDBConnector import MongoDBConnector
 from datetime import date
 from typing import (
-    Any, Dict, List, Union, TypedDict
+    Any, Dict, Iterable, List, Optional, Union, TypedDict
 )
 import pandas as pd
 import streamlit as st
 from datetime import datetime
 import numpy as np
-from scipy import stats
+import weakref
+from functools import partial
 from pymongo import MongoClient
 from pymongo.errors import ServerSelectionTimeoutError
 from dotenv import load_dotenv
@@ -26,6 +43,11 @@ DEPLOIEMENT_SITE = os.getenv("DEPLOIEMENT_SITE", "LOCAL")
 DEPLOIEMENT_SITE = os.getenv("DEPLOIEMENT_SITE")
 YEAR_MIN = 1999 if DEPLOIEMENT_SITE != "ONLINE" else 2014
 YEAR_MAX = 2018 if DEPLOIEMENT_SITE != "ONLINE" else 2018
+# 'exact' (par défaut) ou 'sketch' : statistiques issues des résumés mensuels fusionnables
+STATS_MODE = os.getenv("STATS_MODE", "exact")
+
+# Recettes lues dans MongoDB, par période, tant que l'empreinte de la collection ne change pas
+mongo_cache = FingerprintCache("mongo_recipes", max_entries=2)
 
 # Configurer le logger pour écrire dans un fichier
 logging.basicConfig(
@@ -62,6 +84,8 @@ class TemporalStats(TypedDict):
     submissions_per_year: Dict[int, int]
     submissions_per_month: Dict[int, int]
     submissions_per_weekday: Dict[int, int]
+    submissions_per_day: pd.Series
+    submissions_per_week: pd.Series
 
 class ComplexityStats(TypedDict):
     steps_stats: Dict[str, Union[float, int, Dict[int, int]]]
@@ -101,6 +125,100 @@ class Recipe:
             raise
         self.columns: List[str] = list(self.st.session_state.data.columns)
 
+    def get_fingerprint(self) -> str:
+        """
+        Retourne l'empreinte du jeu de données courant (`st.session_state.data`).
+
+        L'empreinte est recalculée uniquement lorsque le DataFrame de la session est
+        remplacé (changement de période, nettoyage) ; elle sert de clé aux caches
+        des analyses et artefacts dérivés.
+
+        Retourne:
+        str: Condensé de l'empreinte, ou None si elle ne peut pas être calculée.
+        """
+        data = self.st.session_state.data
+        if data is None:
+            return None
+        cached = getattr(self, '_fingerprint', None)
+        if cached is not None and cached[0]() is data:
+            return cached[1]
+        try:
+            fingerprint = dataframe_fingerprint(data)
+            self._fingerprint = (weakref.ref(data), fingerprint)
+        except Exception as e:
+            logging.error(f"Error computing dataset fingerprint: {e}")
+            return None
+        return fingerprint
+
+    def text_source(self):
+        """
+        Source des colonnes de texte (`steps`, `description`) des recettes.
+
+        Les recettes de la session sont chargées sans ces colonnes : elles sont lues
+        par identifiant dans le magasin annexe du CSV (local) ou par une requête `$in`
+        sur la collection MongoDB (en ligne).
+
+        Retourne:
+        TextSideStore or MongoTextSource: La source des textes.
+        """
+        if DEPLOIEMENT_SITE == "ONLINE":
+            connector = getattr(self, '_text_connector', None)
+            if connector is None:
+                connector = MongoDBConnector(CONNECTION_STRING, DATABASE_NAME)
+                connector.connect()
+                self._text_connector = connector
+            return MongoTextSource(connector, COLLECTION_RECIPES_NAME)
+        return open_text_store(os.path.join(os.getenv("DIR_DATASET"), RECIPES_FILE),
+                               TEXT_STORE_DIR, text_columns=RECIPE_TEXT_COLUMNS)
+
+    def lazy_dataset(self) -> LazyDataset:
+        """
+        Poignée sur les recettes de la session dont les textes sont chargés à la demande.
+
+        Retourne:
+        LazyDataset: Les recettes de `st.session_state.data` et leur source de textes.
+        """
+        return LazyDataset(self.st.session_state.data, self.text_source())
+
+    def with_text(self, rows: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Complète quelques recettes (vue de détail, recommandations, export) avec leurs textes.
+
+        Paramètres:
+        rows (pd.DataFrame): Recettes issues de `st.session_state.data`.
+        columns (list, optional): Colonnes de texte voulues. Par défaut : `steps` et `description`.
+
+        Retourne:
+        pd.DataFrame: Les recettes avec leurs colonnes de texte, dans le même ordre.
+        """
+        try:
+            return self.lazy_dataset().with_text(rows, columns or RECIPE_TEXT_COLUMNS)
+        except Exception as e:
+            logging.error(f"Error fetching recipe texts: {e}")
+            raise
+
+    def _stats_mode(self, mode: Optional[str]) -> str:
+        mode = mode or STATS_MODE
+        if mode not in STATS_MODES:
+            raise ValueError(f"Mode de statistiques inconnu : {mode}")
+        return mode
+
+    def _range_summary(self):
+        """
+        Résumé mensuel fusionné de la période de la recette (mode 'sketch').
+
+        Les résumés portent sur tout le jeu de données brut (artefacts, ou à défaut
+        RAW_recipes.csv, lu une fois) ; sans CSV source, ils sont construits sur
+        `st.session_state.data`.
+
+        Retourne:
+        MonthSummary: Le résumé de la période [date_start, date_end].
+        """
+        dataset_dir = os.getenv("DIR_DATASET")
+        return recipe_range_summary(
+            self.st.session_state.data, self.get_fingerprint(), self.date_start, self.date_end,
+            store=get_artifact_store(),
+            source_path=os.path.join(dataset_dir, RECIPES_FILE) if dataset_dir else None)
 
 
     def initialize_session_state(self, start_date, end_date) -> None:
@@ -152,7 +270,10 @@ class Recipe:
             else:
                 if 'data' not in self.st.session_state:
                     dataset_dir = os.getenv("DIR_DATASET")
-                    self.st.session_state.data = Welcome.show_welcom(DEPLOIEMENT_SITE, load_dataset_from_file, os.path.join(
+                    # `steps` et `description` restent sur disque (voir `lazy_dataset`)
+                    loader = partial(load_dataset_from_file, columns=narrow_columns(
+                        os.path.join(dataset_dir, "RAW_recipes.csv"), RECIPE_TEXT_COLUMNS))
+                    self.st.session_state.data = Welcome.show_welcom(DEPLOIEMENT_SITE, loader, os.path.join(
                         dataset_dir, "RAW_recipes.csv"), None, None, start_date, end_date)
                     self.st.session_state.start_date = self._ensure_date(
                         start_date)
@@ -161,7 +282,8 @@ class Recipe:
                 elif (self._ensure_date(start_date) != self.st.session_state.start_date and self._ensure_date(start_date) != date(YEAR_MIN, 1, 1)) or (self._ensure_date(end_date) != self.st.session_state.end_date and self._ensure_date(end_date) != date(YEAR_MAX, 12, 31)):
                     dataset_dir = os.getenv("DIR_DATASET")
                     self.st.session_state.data = load_dataset_from_file(
-                        os.path.join(dataset_dir, "RAW_recipes.csv"), self._ensure_datetime(start_date), self._ensure_datetime(end_date))
+                        os.path.join(dataset_dir, "RAW_recipes.csv"), self._ensure_datetime(start_date), self._ensure_datetime(end_date),
+                        columns=narrow_columns(os.path.join(dataset_dir, "RAW_recipes.csv"), RECIPE_TEXT_COLUMNS))
                     self.st.session_state.start_date = self._ensure_date(
                         start_date)
                     self.st.session_state.end_date = self._ensure_date(
@@ -217,116 +339,14 @@ class Recipe:
 
         Lève:
         Exception: Si une erreur se produit pendant le processus de détection d'anomalies.
+
+        Les statistiques sont calculées en une seule passe vectorisée par
+        `src.process.anomalies` et mises en cache par empreinte du jeu de données.
             """
-        anomalies: Dict[str, pd.DataFrame] = {}
         try:
-            # Missing values detection
-            missing_df = pd.DataFrame({
-                'Missing Count': self.st.session_state.data.isnull().sum(),
-                'Missing Percentage': (
-                    self.st.session_state.data.isnull().sum() /
-                    len(self.st.session_state.data) * 100
-                ).round(2)
-            }).query('`Missing Count` > 0')
-            anomalies['missing_values'] = missing_df if not missing_df.empty else pd.DataFrame()
-
-            # Numeric columns detection
-            numeric_columns = self.st.session_state.data.select_dtypes(
-                include=[np.number]).columns
-
-            # Standard deviation outliers
-            std_outliers_dict: Dict[str, pd.DataFrame] = {}
-            for col in numeric_columns:
-                mean = self.st.session_state.data[col].mean()
-                std = self.st.session_state.data[col].std()
-                std_outliers = self.st.session_state.data[
-                    np.abs(
-                        self.st.session_state.data[col] - mean) > (std_threshold * std)
-                ]
-
-                if not std_outliers.empty:
-                    std_outliers_info = pd.DataFrame({
-                        'Column': [col],
-                        'Mean': [mean],
-                        'Standard Deviation': [std],
-                        'Lower Bound': [mean - (std_threshold * std)],
-                        'Upper Bound': [mean + (std_threshold * std)],
-                        'Outlier Count': [len(std_outliers)],
-                        'Outlier Percentage': [
-                            round(len(std_outliers) /
-                                  len(self.st.session_state.data) * 100, 2)
-                        ]
-                    })
-                    std_outliers_dict[col] = std_outliers_info
-
-            # Z-score outliers
-            z_score_outliers_dict: Dict[str, pd.DataFrame] = {}
-            for col in numeric_columns:
-                z_scores = np.abs(stats.zscore(
-                    self.st.session_state.data[col]))
-                z_score_outliers = self.st.session_state.data[z_scores >
-                                                              z_score_threshold]
-
-                if not z_score_outliers.empty:
-                    z_score_outliers_info = pd.DataFrame({
-                        'Column': [col],
-                        'Mean': [self.st.session_state.data[col].mean()],
-                        'Standard Deviation': [self.st.session_state.data[col].std()],
-                        'Outlier Count': [len(z_score_outliers)],
-                        'Outlier Percentage': [
-                            round(len(z_score_outliers) /
-                                  len(self.st.session_state.data) * 100, 2)
-                        ]
-                    })
-                    z_score_outliers_dict[col] = z_score_outliers_info
-
-            # Combine outlier results
-            anomalies['std_outliers'] = (
-                pd.concat(std_outliers_dict.values())
-                if std_outliers_dict else pd.DataFrame()
-            )
-            anomalies['z_score_outliers'] = (
-                pd.concat(z_score_outliers_dict.values())
-                if z_score_outliers_dict else pd.DataFrame()
-            )
-
-            # Column information
-            def safe_nunique(series: pd.Series) -> int:
-                """Handle columns that might contain lists."""
-                if series.apply(lambda x: isinstance(x, list)).any():
-                    unique_elements = set(
-                        [item for sublist in series for item in sublist]
-                    )
-                    return len(unique_elements)
-                return series.nunique()
-
-            column_info_df = pd.DataFrame({
-                'Total Count': len(self.st.session_state.data),
-                'Unique Count': {
-                    col: safe_nunique(self.st.session_state.data[col])
-                    for col in self.st.session_state.data.select_dtypes(
-                        include=['object', 'category', 'string']
-                    ).columns
-                },
-                'Unique Percentage': {
-                    col: round(
-                        safe_nunique(self.st.session_state.data[col]) /
-                        len(self.st.session_state.data) * 100,
-                        2
-                    )
-                    for col in self.st.session_state.data.select_dtypes(
-                        include=['object', 'category', 'string']
-                    ).columns
-                }
-            })
-            anomalies['column_info'] = column_info_df
-
-            # Data types information
-            data_types_df = pd.DataFrame({
-                'Data Type': self.st.session_state.data.dtypes,
-                'Sample': [self.st.session_state.data[col].iloc[0] for col in self.st.session_state.data.columns]
-            })
-            anomalies['data_types'] = data_types_df
+            anomalies: Dict[str, pd.DataFrame] = cached_anomaly_report(
+                self.st.session_state.data, self.get_fingerprint(),
+                std_threshold, z_score_threshold)
         except Exception as e:
             logging.error(f"Error detecting dataframe anomalies: {e}")
             raise
@@ -336,62 +356,71 @@ class Recipe:
     def clean_dataframe(
         self,
         cleaning_method: str = 'std',
-        threshold: float = 3.0
-    ) -> None:
+        threshold: float = 3.0,
+        inplace: bool = True
+    ) -> np.ndarray:
         """
         Supprimer les anomalies du DataFrame en fonction des résultats de détection.
 
+        Les bornes de toutes les colonnes numériques sont calculées sur le jeu de
+        données complet puis combinées en un seul masque (voir `src.process.cleaning`),
+        mis en cache par empreinte du jeu de données, méthode et seuil. Un jeu de
+        données déjà nettoyé avec les mêmes paramètres n'est pas nettoyé une seconde fois.
+
         Args:
-            anomalies: Résultats de la détection d'anomalies
-            cleaning_method: Méthode de nettoyage ('std' ou 'zscore')
-            threshold: Seuil pour la détection d'anomalies
+            cleaning_method: Méthode de nettoyage ('std', 'zscore', 'iqr', 'mad' ou 'quantile')
+            threshold: Seuil pour la détection d'anomalies (fraction de chaque queue pour 'quantile')
+            inplace: Remplacer `st.session_state.data` par la vue nettoyée. Avec False,
+                seul le masque est retourné et les données restent intactes.
+
+        Returns:
+            np.ndarray: Masque booléen des lignes conservées, aligné sur les données avant nettoyage.
         """
         try:
-            numeric_columns = self.st.session_state.data.select_dtypes(
-                include=[np.number]).columns
-
-            for col in numeric_columns:
-                if cleaning_method == 'std':
-                    mean = self.st.session_state.data[col].mean()
-                    std = self.st.session_state.data[col].std()
-                    lower_bound = mean - (threshold * std)
-                    upper_bound = mean + (threshold * std)
-                    self.st.session_state.data = self.st.session_state.data[
-                        (self.st.session_state.data[col] >= lower_bound) &
-                        (self.st.session_state.data[col] <= upper_bound)
-                    ]
-
-                elif cleaning_method == 'zscore':
-                    z_scores = np.abs(stats.zscore(
-                        self.st.session_state.data[col]))
-                    self.st.session_state.data = self.st.session_state.data[z_scores <= threshold]
-
-            # Handle missing values
-            if not self.annomalis['missing_values'].empty:
-                self.st.session_state.data = self.st.session_state.data.dropna(
-                    subset=self.annomalis['missing_values'].index
-                )
-
-            self.st.session_state.data = self.st.session_state.data.reset_index(
-                drop=True)
+            data = self.st.session_state.data
+            fingerprint = self.get_fingerprint()
+            if fingerprint is not None and inplace and \
+                    self.st.session_state.get('cleaned_with') == (fingerprint, cleaning_method, threshold):
+                return np.ones(len(data), dtype=bool)
+
+            dropna_columns = list(self.annomalis['missing_values'].index)
+            if cleaning_method in CLEANING_METHODS:
+                mask = cached_outlier_mask(data, fingerprint, cleaning_method,
+                                           threshold, dropna_columns)
+            else:
+                logging.warning(f"Méthode de nettoyage inconnue ({cleaning_method}) : "
+                                "seules les valeurs manquantes sont retirées.")
+                mask = np.ones(len(data), dtype=bool)
+                if dropna_columns:
+                    mask &= data[dropna_columns].notna().all(axis=1).to_numpy()
+
+            if inplace:
+                self.st.session_state.data = data[mask].reset_index(drop=True)
+                self.st.session_state.cleaned_with = (
+                    self.get_fingerprint(), cleaning_method, threshold)
+            return mask
         except Exception as e:
             logging.error(f"Error cleaning dataframe: {e}")
             raise
 
-    def analyze_nutrition(self) -> Dict[str, NutritionStats]:
+    def analyze_nutrition(self, mode: Optional[str] = None) -> Dict[str, NutritionStats]:
         """
         Analyser les informations nutritionnelles.
 
+        Args :
+            mode : 'exact' ou 'sketch' (quantiles approchés issus des résumés mensuels).
+                Par défaut : la variable d'environnement STATS_MODE.
+
         Retourne :
             Statistiques nutritionnelles pour chaque catégorie
         """
         try:
-            df = self.st.session_state.data
+            if self._stats_mode(mode) == 'sketch':
+                stats = summarize(self._range_summary())
+                return {col: stats[col] for col in NUTRITION_COLUMNS}
 
-            if DEPLOIEMENT_SITE != "ONLINE":
-                df['nutrition_list'] = df['nutrition'].apply(eval)
-            else:
-                df['nutrition_list'] = df['nutrition']
+            df = self.st.session_state.data
+            self._list_column(df, 'nutrition', 'nutrition_list')
             nutrition_columns = [
                 'calories', 'total_fat', 'sugar',
                 'sodium', 'protein', 'saturated_fat', 'carbohydrates'
@@ -425,34 +454,25 @@ class Recipe:
         """
         Analyse la distribution temporelle des recettes.
 
+        L'histogramme journalier des dates est calculé une fois par jeu de données ;
+        chaque plage de dates n'en lit qu'une tranche.
+
         Args :
             date_start : Date de début de l'analyse
             date_end : Date de fin de l'analyse
 
         Returns :
-            Statistiques de distribution temporelle
+            Statistiques de distribution temporelle, y compris les séries par jour et par semaine
         """
         try:
-            mask = (
-                (self.st.session_state.data['submitted'] >= date_start) &
-                (self.st.session_state.data['submitted'] <= date_end)
-            )
-            df = self.st.session_state.data[mask]
-
-            temporal_stats: TemporalStats = {
-                'date_min': df['submitted'].min(),
-                'date_max': df['submitted'].max(),
-                'total_days': (df['submitted'].max() - df['submitted'].min()).days,
-                'submissions_per_year': df.groupby(df['submitted'].dt.year).size().to_dict(),
-                'submissions_per_month': df.groupby(df['submitted'].dt.month).size().to_dict(),
-                'submissions_per_weekday': df.groupby(df['submitted'].dt.dayofweek).size().to_dict()
-            }
+            histogram = get_temporal_histogram(self.st.session_state.data, self.get_fingerprint())
+            temporal_stats: TemporalStats = histogram.distribution(date_start, date_end)
         except Exception as e:
             logging.error(f"Error analyzing temporal distribution: {e}")
             raise
         return temporal_stats
 
-    def analyze_tags(self) -> TagStats:
+    def analyze_tags(self, mode: Optional[str] = None) -> TagStats:
         """
         Analyse les étiquettes de recettes et génère des statistiques liées aux étiquettes.
 
@@ -469,27 +489,39 @@ class Recipe:
                     - 'min' : Le nombre minimum de tags par recette : Le nombre minimum de tags pour une recette.
                     - 'max' : Le nombre maximum de tags pour une recette : Le nombre maximum de tags pour une recette.
 
+        En mode 'sketch', le nombre de tags uniques est estimé (HyperLogLog), les tags
+        les plus courants proviennent de Space-Saving et la médiane d'un résumé KLL.
+
+        Args :
+            mode : 'exact' ou 'sketch'. Par défaut : la variable d'environnement STATS_MODE.
+
         Lève :
             Exception : Si une erreur se produit pendant le processus d'analyse des balises.
         """
         try:
+            if self._stats_mode(mode) == 'sketch':
+                stats = summarize(self._range_summary(), top_n=20)
+                lengths = stats['tags_length']
+                return {
+                    'total_unique_tags': stats['tags']['distinct'],
+                    'most_common_tags': stats['tags']['top'],
+                    'tags_per_recipe': {key: lengths[key] for key in ('mean', 'median', 'min', 'max')}
+                }
+
             df = self.st.session_state.data
-            if DEPLOIEMENT_SITE != "ONLINE":
-                df['tags_list'] = df['tags'].apply(eval)
-            else:
-                df['tags_list'] = df['tags']
+            self._list_column(df, 'tags', 'tags_list')
 
-            all_tags = [tag for tags in df['tags_list'] for tag in tags]
-            tag_counts = pd.Series(all_tags).value_counts()
+            tag_counts = get_tag_matrix(df, self.get_fingerprint()).frequencies()
+            tags_per_recipe = df['tags_list'].str.len()
 
             tag_stats: TagStats = {
                 'total_unique_tags': len(tag_counts),
                 'most_common_tags': tag_counts.head(20).to_dict(),
                 'tags_per_recipe': {
-                    'mean': df['tags_list'].str.len().mean(),
-                    'median': df['tags_list'].str.len().median(),
-                    'min': df['tags_list'].str.len().min(),
-                    'max': df['tags_list'].str.len().max()
+                    'mean': tags_per_recipe.mean(),
+                    'median': tags_per_recipe.median(),
+                    'min': tags_per_recipe.min(),
+                    'max': tags_per_recipe.max()
                 }
             }
         except Exception as e:
@@ -498,7 +530,149 @@ class Recipe:
 
         return tag_stats
 
-    def analyze_contributors(self):
+    def analyze_tag_associations(
+        self,
+        min_count: int = 5,
+        top_n: Optional[int] = 50,
+        sort_by: str = 'Lift',
+        date_start: Optional[datetime] = None,
+        date_end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Analyse les associations entre tags (co-occurrences, lift et PMI).
+
+        Args :
+            min_count : Nombre minimal de recettes partageant les deux tags.
+            top_n : Nombre de paires retournées (None : toutes).
+            sort_by : Colonne de tri ('Lift', 'PMI' ou 'Co-occurrences').
+            date_start : Début de la plage analysée. Par défaut : toutes les recettes.
+            date_end : Fin de la plage analysée. Par défaut : toutes les recettes.
+
+        Retourne :
+            pd.DataFrame : Une ligne par paire de tags, voir `TagMatrix.associations`.
+        """
+        try:
+            tag_matrix = get_tag_matrix(self.st.session_state.data, self.get_fingerprint())
+            return tag_matrix.associations(tag_matrix.rows_between(date_start, date_end),
+                                           min_count=min_count, top_n=top_n, sort_by=sort_by)
+        except Exception as e:
+            logging.error(f"Error analyzing tag associations: {e}")
+            raise
+
+    def facet_values(self, column: str) -> List[str]:
+        """
+        Valeurs disponibles pour filtrer les recettes (tags ou ingrédients).
+
+        Args :
+            column : 'tags' ou 'ingredients'.
+
+        Retourne :
+            List[str] : Valeurs distinctes triées.
+        """
+        try:
+            return get_facet_index(self.st.session_state.data, self.get_fingerprint()).values(column).tolist()
+        except Exception as e:
+            logging.error(f"Error listing facet values: {e}")
+            raise
+
+    def filter_recipes(
+        self,
+        all_of: Optional[Dict[str, List[str]]] = None,
+        any_of: Optional[Dict[str, List[str]]] = None,
+        none_of: Optional[Dict[str, List[str]]] = None,
+        date_start: Optional[datetime] = None,
+        date_end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Filtre les recettes par tags et ingrédients avec l'index inversé.
+
+        Exemple : recettes 'vegetarian' ET '30-minutes-or-less' sans noix :
+        `filter_recipes(all_of={'tags': ['vegetarian', '30-minutes-or-less']},
+        none_of={'ingredients': ['walnuts']})`.
+
+        Args :
+            all_of : Valeurs toutes requises, par colonne ('tags', 'ingredients').
+            any_of : Valeurs dont au moins une est requise, par colonne.
+            none_of : Valeurs exclues, par colonne.
+            date_start : Début de la plage de dates. Par défaut : sans borne.
+            date_end : Fin de la plage de dates. Par défaut : sans borne.
+
+        Retourne :
+            pd.DataFrame : Les recettes correspondantes, par date de soumission croissante.
+        """
+        try:
+            data = self.st.session_state.data
+            rows = get_facet_index(data, self.get_fingerprint()).query(
+                all_of, any_of, none_of, date_start, date_end)
+            return data.iloc[rows]
+        except Exception as e:
+            logging.error(f"Error filtering recipes: {e}")
+            raise
+
+    def search_recipes(self, query: str, top_k: int = 20, ids: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """
+        Recherche plein texte (nom, description, étapes) parmi les recettes de la session.
+
+        Args :
+            query : Texte recherché.
+            top_k : Nombre maximal de résultats.
+            ids : Restreint la recherche à ces recettes. Par défaut : toutes les recettes de la session.
+
+        Retourne :
+            pd.DataFrame : Colonnes 'id', 'name' et 'score' (BM25), par pertinence décroissante.
+        """
+        try:
+            data = self.st.session_state.data
+            index = get_search_index(data, self.get_fingerprint(), fetch_text=self.with_text)
+            return index.search(query, top_k=top_k, ids=data['id'].to_numpy() if ids is None else ids)
+        except Exception as e:
+            logging.error(f"Error searching recipes: {e}")
+            raise
+
+    def complete_recipe_names(self, query: str, top_k: int = 10) -> pd.DataFrame:
+        """
+        Autocomplétion des noms de recettes (préfixe puis correspondance floue par trigrammes).
+
+        Args :
+            query : Texte saisi.
+            top_k : Nombre de suggestions.
+
+        Retourne :
+            pd.DataFrame : Colonnes 'id', 'name' et 'score', meilleures suggestions d'abord.
+        """
+        try:
+            return get_name_index(self.st.session_state.data, self.get_fingerprint()).complete(query, top_k)
+        except Exception as e:
+            logging.error(f"Error completing recipe names: {e}")
+            raise
+
+    def analyze_ingredients(self) -> pd.Series:
+        """
+        Compte les ingrédients des recettes de la période (mis en cache par période).
+
+        Retourne :
+            pd.Series : Nombre d'occurrences de chaque ingrédient, par ordre décroissant.
+        """
+        try:
+            return ingredient_counts(self.st.session_state.data, self.get_fingerprint())
+        except Exception as e:
+            logging.error(f"Error analyzing ingredients: {e}")
+            raise
+
+    def contributor_activity(self) -> ContributorActivity:
+        """
+        Activité des contributeurs de la période (mise en cache par période).
+
+        Retourne :
+            ContributorActivity : Nombre de recettes et période d'activité de chaque contributeur.
+        """
+        try:
+            return get_contributor_activity(self.st.session_state.data, self.get_fingerprint())
+        except Exception as e:
+            logging.error(f"Error computing contributor activity: {e}")
+            raise
+
+    def analyze_contributors(self, mode: Optional[str] = None):
         """
         Analyse les contributions par utilisateur.
 
@@ -513,20 +687,34 @@ class Recipe:
             - 'contributions_per_user': Statistiques de contributions par utilisateur (moyenne, médiane, maximum).
             - 'top_contributors': Les 10 principaux contributeurs avec leur nombre de contributions.
 
+        En mode 'sketch', le nombre de contributeurs est estimé (HyperLogLog) et les
+        principaux contributeurs proviennent de Space-Saving. La médiane des
+        contributions n'est pas fusionnable : elle reste calculée sur les comptes exacts
+        de la période (`contributor_activity`, un calcul par période), si bien que le
+        mode 'sketch' n'accélère pas cette analyse, il en estime seulement les autres valeurs.
+
+        Args:
+            mode: 'exact' ou 'sketch'. Par défaut : la variable d'environnement STATS_MODE.
+
         Raises:
             Exception: Si une erreur se produit lors de l'analyse des contributions.
         """
         try:
-            df = self.st.session_state.data
-            contributor_stats = {
-                'total_contributors': df['contributor_id'].nunique(),
-                'contributions_per_user': {
-                    'mean': df['contributor_id'].value_counts().mean(),
-                    'median': df['contributor_id'].value_counts().median(),
-                    'max': df['contributor_id'].value_counts().max()
-                },
-                'top_contributors': df['contributor_id'].value_counts().head(10).to_dict()
-            }
+            if self._stats_mode(mode) == 'sketch':
+                summary = self._range_summary()
+                contributors = summarize(summary)['contributor_id']
+                return {
+                    'total_contributors': contributors['distinct'],
+                    'contributions_per_user': {
+                        'mean': summary.count / max(contributors['distinct'], 1),
+                        # Pas de résumé fusionnable pour la médiane : comptes exacts de la période
+                        'median': float(np.median(self.contributor_activity().counts)),
+                        'max': next(iter(contributors['top'].values()), 0)
+                    },
+                    'top_contributors': contributors['top']
+                }
+
+            contributor_stats = self.contributor_activity().summary(top_k=10)
         except Exception as e:
             logging.error(f"Error analyzing contributors: {e}")
             raise
@@ -537,31 +725,60 @@ class Recipe:
         """
         Effectuer une analyse complète de l'ensemble des données.
 
+        Les analyses (statistiques générales, temporelle, complexité, nutrition, tags,
+        contributeurs) sont indépendantes et exécutées en parallèle (`run_parallel`) ;
+        la durée de chacune est reportée sous la clé 'timings'.
+
         Retours :
             Analyse complète de l'ensemble de données de la recette
         """
         try:
+            # Les colonnes de listes sont ajoutées au DataFrame partagé avant le lancement des
+            # threads : les analyses parallèles ne font ensuite que le lire
             data = self.st.session_state.data
-
-            general_stats = {
-                'total_recipes': len(data),
-                'dataset_size_mb': data.memory_usage(deep=True).sum() / 1024 / 1024,
-                'columns': list(data.columns),
-                'missing_values': data.isnull().sum().to_dict()
-            }
+            self._list_column(data, 'nutrition', 'nutrition_list')
+            self._list_column(data, 'tags', 'tags_list')
+            results, timings = run_parallel({
+                'general_stats': self._general_stats,
+                'temporal_analysis': lambda: self.analyze_temporal_distribution(
+                    self.date_start, self.date_end
+                ),
+                'complexity_analysis': self.analyze_recipe_complexity,
+                'nutrition_analysis': self.analyze_nutrition,
+                'tag_analysis': self.analyze_tags,
+                'contributor_analysis': self.analyze_contributors
+            })
         except Exception as e:
             logging.error(f"Error analyzing recipe dataset: {e}")
             raise
 
+        results['timings'] = timings
+        return results
+
+    @staticmethod
+    def _list_column(df: pd.DataFrame, source: str, target: str) -> pd.Series:
+        """
+        Ajoute au DataFrame la colonne `target` des listes décodées de `source`, une seule fois.
+
+        Args:
+            df (pd.DataFrame): Recettes (modifié en place).
+            source (str): Colonne des listes, textuelles hors déploiement en ligne.
+            target (str): Colonne des listes décodées.
+
+        Returns:
+            pd.Series: La colonne `target`.
+        """
+        if target not in df.columns:
+            df[target] = df[source].apply(eval) if DEPLOIEMENT_SITE != "ONLINE" else df[source]
+        return df[target]
+
+    def _general_stats(self) -> Dict[str, Any]:
+        data = self.st.session_state.data
         return {
-            'general_stats': general_stats,
-            'temporal_analysis': self.analyze_temporal_distribution(
-                self.date_start, self.date_end
-            ),
-            'complexity_analysis': self.analyze_recipe_complexity(),
-            'nutrition_analysis': self.analyze_nutrition(),
-            'tag_analysis': self.analyze_tags(),
-            'contributor_analysis': self.analyze_contributors()
+            'total_recipes': len(data),
+            'dataset_size_mb': data.memory_usage(deep=True).sum() / 1024 / 1024,
+            'columns': list(data.columns),
+            'missing_values': data.isnull().sum().to_dict()
         }
 
     def analyze_recipe_complexity(self):
@@ -613,13 +830,21 @@ class Recipe:
             collection = db[collection_name]
             query = {"submitted": {"$gte": pd.to_datetime(
                 start_date), "$lte": pd.to_datetime(end_date)}}
-            projection = {"_id": 0}
-            data = list(collection.find(query, projection))
-            if not data:
+            # Les textes volumineux sont lus à la demande (`text_source`)
+            projection = {"_id": 0, **{column: 0 for column in RECIPE_TEXT_COLUMNS}}
+            # Trois requêtes indexées : la période n'est relue que si la collection a changé
+            source = collection_fingerprint(collection, 'submitted')
+            key = (database_name, collection_name, str(query["submitted"]["$gte"]),
+                   str(query["submitted"]["$lte"]))
+            df = mongo_cache.get_or_compute(
+                key, source, lambda: pd.DataFrame(list(collection.find(query, projection))))
+            if df.empty:
                 st.warning(
                     "Aucune donnée trouvée pour cet intervalle de dates.")
                 return pd.DataFrame()
-            df = pd.DataFrame(data)
+            df = df.copy()
+            # L'empreinte de la collection tient lieu d'empreinte des données chargées
+            self._fingerprint = (weakref.ref(df), fingerprint_digest(source, key))
             return df
 
         except ServerSelectionTimeoutError as e:
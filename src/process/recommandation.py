@@ -8,6 +8,14 @@ from sklearn.cluster import KMeans
 from sklearn.decomposition import PCA
 from dotenv import load_dotenv
 import os
+from scipy.sparse import vstack
+from src.process.collaborative import bayesian_popularity, get_item_similarity
+from src.process.hashing_features import HashingTfidf
+from src.process.nutrition_preprocess import split_nutrition
+from src.process.recommendation_cache import NeighborTable, recommendation_cache
+from src.process.recommender_index import ingredients_text
+from src.utils.artifacts import NUMERIC_FEATURES
+from src.utils.fingerprint import dataframe_fingerprint, fingerprint_digest
 
 load_dotenv()
 
@@ -35,18 +43,55 @@ logging.getLogger().addHandler(error_handler)
 
 DEPLOIEMENT_SITE = os.getenv("DEPLOIEMENT_SITE")
 
+# Poids par défaut des composantes du score hybride
+HYBRID_WEIGHTS = {'ingredients': 0.6, 'numeric': 0.2, 'popularity': 0.2, 'nutrition': 0.0}
+# Nombre de candidats retenus par l'index des ingrédients avant le calcul du score hybride
+HYBRID_CANDIDATES = 500
+# Vectorisation des ingrédients : 'tfidf' (vocabulaire) ou 'hashing' (mémoire bornée)
+RECOMMENDER_FEATURIZER = os.getenv("RECOMMENDER_FEATURIZER", "tfidf")
+
 
 class AdvancedRecipeRecommender:
-    def __init__(self, recipes_df: pd.DataFrame):
+    def __init__(self, recipes_df: pd.DataFrame, artifacts=None, interactions_df: pd.DataFrame = None,
+                 featurizer: str = RECOMMENDER_FEATURIZER, feature_index=None):
         """
         Initialise le système de recommandation de recettes.
 
         Args:
             recipes_df (pd.DataFrame): DataFrame contenant les informations des recettes
+            artifacts (ArtifactStore, optional): Artefacts prétraités (`get_artifact_store()`).
+                S'ils couvrent toutes les recettes, le TF-IDF, le scaler et les clusters
+                ajustés à la construction sont réutilisés au lieu d'être recalculés.
+            interactions_df (pd.DataFrame, optional): Interactions ('user_id', 'recipe_id', 'rating')
+                du filtrage collaboratif, utilisées si les artefacts n'en contiennent pas les voisinages.
+            featurizer (str, optional): 'tfidf' (`TfidfVectorizer`) ou 'hashing' (`HashingTfidf`,
+                ajusté par blocs, sans vocabulaire). Les artefacts ne contiennent que le TF-IDF.
+            feature_index (RecipeFeatureIndex, optional): Index persistant des comptes hachés
+                (`get_feature_index()`), réutilisé en mode 'hashing' s'il couvre toutes les recettes.
         """
         try:
             self.recipes_df = recipes_df
-            self._preprocess_data()
+            self.featurizer = featurizer
+            self.artifacts = artifacts
+            self.interactions_df = interactions_df
+            self.feature_index = feature_index
+            self._item_similarity = None
+            self._neighbor_table = None
+            self._fingerprint = None
+            self._term_index = None
+            self._popularity_scores = None
+            self._artifact_rows = None
+            if artifacts is not None and 'id' in recipes_df.columns and featurizer == 'tfidf':
+                self._artifact_rows = artifacts.recipe_rows(recipes_df['id'])
+            index_rows = None
+            if feature_index is not None and 'id' in recipes_df.columns and featurizer == 'hashing':
+                index_rows = feature_index.rows(recipes_df['id'])
+            if self._artifact_rows is not None:
+                self._load_preprocessed_data()
+            elif index_rows is not None and (index_rows >= 0).all():
+                self._load_feature_index(index_rows)
+            else:
+                self._preprocess_data()
         except Exception as e:
             logging.error(f"Error in __init__: {e}")
             raise
@@ -62,27 +107,107 @@ class AdvancedRecipeRecommender:
         """
         try:
             # Nettoie les ingrédients : convertit en chaîne de caractères lowercase
-            if DEPLOIEMENT_SITE != "ONLINE":
-                self.recipes_df['ingredients_cleaned'] = self.recipes_df['ingredients'].apply(
-                    lambda x: ' '.join(eval(x)).lower())
-            else:
-                self.recipes_df['ingredients_cleaned'] = self.recipes_df['ingredients'].apply(
-                    lambda x: ' '.join(x).lower())
+            self.recipes_df['ingredients_cleaned'] = ingredients_text(self.recipes_df['ingredients'])
             # Vectorisation TF-IDF des ingrédients
-            self.tfidf = TfidfVectorizer(stop_words='english')
+            if self.featurizer == 'hashing':
+                self.tfidf = HashingTfidf()
+            else:
+                self.tfidf = TfidfVectorizer(stop_words='english')
             self.ingredient_matrix = self.tfidf.fit_transform(
                 self.recipes_df['ingredients_cleaned']
             )
 
             # Normalisation des caractéristiques numériques
-            numeric_features = ['minutes', 'n_ingredients', 'n_steps']
-            scaler = StandardScaler()
-            self.numeric_features = scaler.fit_transform(
-                self.recipes_df[numeric_features]
+            self.scaler = StandardScaler()
+            self.numeric_features = self.scaler.fit_transform(
+                self.recipes_df[NUMERIC_FEATURES]
             )
         except Exception as e:
             logging.error(f"Error in _preprocess_data: {e}")
 
+    def _load_preprocessed_data(self) -> None:
+        """
+        Charge la matrice TF-IDF et les caractéristiques normalisées depuis les artefacts.
+
+        Les lignes correspondant aux recettes de `recipes_df` sont extraites des
+        matrices projetées en mémoire ; aucun modèle n'est ajusté.
+        """
+        try:
+            self.tfidf = self.artifacts.load_model('tfidf')
+            self.scaler = self.artifacts.load_model('scaler')
+            self.ingredient_matrix = self.artifacts.load_sparse(
+                'ingredient_matrix')[self._artifact_rows]
+            self.numeric_features = np.asarray(
+                self.artifacts.load_array('numeric_features')[self._artifact_rows])
+            logging.info("Modèles du recommandeur chargés depuis les artefacts prétraités")
+        except Exception as e:
+            logging.error(f"Error in _load_preprocessed_data: {e}")
+            self._artifact_rows = None
+            self._preprocess_data()
+
+    def _load_feature_index(self, rows: np.ndarray) -> None:
+        """
+        Reprend les comptes hachés de l'index persistant au lieu de vectoriser les recettes.
+
+        Args:
+            rows (np.ndarray): Lignes de l'index correspondant aux recettes de `recipes_df`.
+        """
+        try:
+            self.tfidf = self.feature_index.featurizer
+            self.ingredient_matrix = self.feature_index.matrix()[rows]
+            self.scaler = StandardScaler()
+            self.numeric_features = self.scaler.fit_transform(self.recipes_df[NUMERIC_FEATURES])
+            logging.info("Matrice des ingrédients chargée depuis l'index du recommandeur")
+        except Exception as e:
+            logging.error(f"Error in _load_feature_index: {e}")
+            self._preprocess_data()
+
+    def add_recipes(self, recipes: pd.DataFrame) -> None:
+        """
+        Ajoute ou remplace des recettes sans réajuster le recommandeur.
+
+        Seules les recettes fournies sont vectorisées. Avec un index persistant
+        (mode 'hashing'), elles y sont ajoutées et l'idf est mis à jour par l'index ;
+        sinon, le vectoriseur par hachage cumule leurs fréquences documentaires
+        (les lignes existantes gardent leur pondération) et le TF-IDF par vocabulaire
+        les vectorise avec son vocabulaire figé. Le scaler n'est pas réajusté.
+
+        Args:
+            recipes (pd.DataFrame): Recettes ('id', 'ingredients' et caractéristiques numériques) ;
+                une recette déjà chargée est remplacée.
+        """
+        try:
+            recipes = recipes.drop_duplicates('id', keep='last').assign(
+                ingredients_cleaned=lambda df: ingredients_text(df['ingredients']))
+            keep = np.flatnonzero(~self.recipes_df['id'].isin(recipes['id']).to_numpy())
+            numeric_features = self.scaler.transform(recipes[NUMERIC_FEATURES])
+            use_index = self.feature_index is not None and isinstance(self.tfidf, HashingTfidf)
+            if use_index:
+                self.feature_index.upsert(recipes)
+            elif isinstance(self.tfidf, HashingTfidf):
+                counts = self.tfidf.counts(recipes['ingredients_cleaned'])
+                ingredient_matrix = self.tfidf.observe(counts).weight(counts)
+            else:
+                ingredient_matrix = self.tfidf.transform(recipes['ingredients_cleaned'])
+
+            self.recipes_df = pd.concat([self.recipes_df.iloc[keep], recipes], ignore_index=True)
+            if use_index:
+                # L'index a pu pondérer à nouveau toutes ses lignes
+                self.ingredient_matrix = self.feature_index.matrix()[
+                    self.feature_index.rows(self.recipes_df['id'])]
+            else:
+                self.ingredient_matrix = vstack([self.ingredient_matrix[keep], ingredient_matrix], format='csr')
+            self.numeric_features = np.vstack([self.numeric_features[keep], numeric_features])
+            self._artifact_rows = None
+            self._neighbor_table = None
+            self._fingerprint = None
+            self._term_index = None
+            self._popularity_scores = None
+            logging.info(f"{len(recipes)} recettes ajoutées au recommandeur")
+        except Exception as e:
+            logging.error(f"Error in add_recipes: {e}")
+            raise
+
     def content_based_recommendations(self, recipe_id: int, top_n: int = 5) -> pd.DataFrame:
         """
         Génère des recommandations basées sur la similarité de contenu.
@@ -95,6 +220,15 @@ class AdvancedRecipeRecommender:
             pd.DataFrame: DataFrame des recettes recommandées
         """
         try:
+            table = self.neighbor_table()
+            neighbors = None if table is None else table.similar_items(recipe_id)
+            if neighbors is not None:
+                # Seuls les voisins présents dans les recettes chargées sont proposés
+                positions = pd.Index(self.recipes_df['id']).get_indexer(neighbors[0])
+                positions = positions[positions >= 0]
+                if len(positions) >= top_n:
+                    return self.recipes_df.iloc[positions[:top_n]]
+
             # Trouve l'index de la recette de référence
             recipe_index = self.recipes_df[self.recipes_df['id']
                                            == recipe_id].index[0]
@@ -113,6 +247,254 @@ class AdvancedRecipeRecommender:
             raise
             return pd.DataFrame()
 
+    def neighbor_table(self):
+        """
+        Table précalculée des voisins par ingrédients, chargée au premier appel.
+
+        Returns:
+            NeighborTable or None: La table, ou None si la matrice TF-IDF ne provient
+                pas des artefacts ou si la table n'y a pas été construite.
+        """
+        if self._neighbor_table is None and self._artifact_rows is not None:
+            self._neighbor_table = NeighborTable.from_artifacts(self.artifacts)
+        return self._neighbor_table
+
+    def model_fingerprint(self) -> str:
+        """
+        Empreinte du modèle : recettes chargées, vectorisation, artefacts et interactions.
+
+        Returns:
+            str: Condensé, modifié par des artefacts reconstruits, d'autres recettes
+                chargées ou l'ajout de recettes (`add_recipes`).
+        """
+        if self._fingerprint is None:
+            parts = [self.featurizer, dataframe_fingerprint(self.recipes_df[['id']])]
+            if self._artifact_rows is not None:
+                parts.append(self.artifacts.manifest.get('sources'))
+            elif self.feature_index is not None and isinstance(self.tfidf, HashingTfidf):
+                parts.append((self.feature_index.segments, self.feature_index.n_recipes))
+            else:
+                parts.append(dataframe_fingerprint(self.recipes_df[['ingredients', *NUMERIC_FEATURES]]))
+            if self.interactions_df is not None:
+                parts.append(dataframe_fingerprint(self.interactions_df))
+            self._fingerprint = fingerprint_digest(*parts)
+        return self._fingerprint
+
+    def cached_recommendations(self, recipe_id: int, top_n: int = 5, mode: str = 'content',
+                               weights: dict = None) -> pd.DataFrame:
+        """
+        Recommandations conservées dans le cache LRU partagé (`recommendation_cache`).
+
+        Les entrées sont indexées par (recette, top_n, mode) et invalidées lorsque
+        l'empreinte du modèle (`model_fingerprint`) change.
+
+        Args:
+            recipe_id (int): Identifiant de la recette de référence
+            top_n (int, optional): Nombre de recommandations à retourner. Défaut à 5.
+            mode (str, optional): 'content', 'hybrid' ou 'collaborative'.
+            weights (dict, optional): Poids des composantes du mode 'hybrid'.
+
+        Returns:
+            pd.DataFrame: Copie des recommandations du mode demandé.
+        """
+        try:
+            compute = {
+                'content': lambda: self.content_based_recommendations(recipe_id, top_n),
+                'hybrid': lambda: self.hybrid_recommendations(recipe_id, top_n, weights),
+                'collaborative': lambda: self.collaborative_recommendations(recipe_id, top_n),
+            }[mode]
+            key = (recipe_id, top_n, mode)
+            if mode == 'hybrid':
+                key += (tuple(sorted({**HYBRID_WEIGHTS, **(weights or {})}.items())),)
+            return recommendation_cache.get_or_compute(key, self.model_fingerprint(), compute).copy()
+        except Exception as e:
+            logging.error(f"Error in cached_recommendations: {e}")
+            raise
+
+    def item_similarity(self):
+        """
+        Voisinages item-item du filtrage collaboratif, chargés au premier appel.
+
+        Returns:
+            ItemSimilarity or None: Les voisinages, ou None sans artefacts ni interactions.
+        """
+        if self._item_similarity is None:
+            fingerprint = None if self.interactions_df is None else dataframe_fingerprint(self.interactions_df)
+            self._item_similarity = get_item_similarity(self.interactions_df, fingerprint, self.artifacts)
+        return self._item_similarity
+
+    def collaborative_recommendations(self, recipe_id: int, top_n: int = 5) -> pd.DataFrame:
+        """
+        Génère des recommandations par filtrage collaboratif item-item : les recettes
+        appréciées par les mêmes utilisateurs que la recette de référence.
+
+        Args:
+            recipe_id (int): Identifiant de la recette de référence
+            top_n (int, optional): Nombre de recommandations à retourner. Défaut à 5.
+
+        Returns:
+            pd.DataFrame: DataFrame des recettes recommandées (parmi `recipes_df`), de la plus
+                similaire à la moins similaire, avec une colonne 'similarity' ; vide si la recette
+                n'a aucune interaction positive ou si aucun voisinage n'est disponible.
+        """
+        try:
+            similarity = self.item_similarity()
+            if similarity is None:
+                return self.recipes_df.iloc[:0]
+            neighbor_ids, scores = similarity.similar_items(recipe_id)
+            # Seuls les voisins présents dans les recettes chargées sont proposés
+            positions = pd.Index(self.recipes_df['id']).get_indexer(neighbor_ids)
+            found = positions >= 0
+            return self.recipes_df.iloc[positions[found][:top_n]].assign(
+                similarity=scores[found][:top_n])
+        except Exception as e:
+            logging.error(f"Error in collaborative_recommendations: {e}")
+            raise
+
+    def _recipe_row(self, recipe_id: int) -> int:
+        rows = np.flatnonzero(self.recipes_df['id'].to_numpy() == recipe_id)
+        if len(rows) == 0:
+            raise KeyError(f"Recette {recipe_id} absente des recettes chargées")
+        return int(rows[0])
+
+    def _candidates(self, row: int, n_candidates: int) -> tuple:
+        """
+        Recettes candidates d'une recommandation hybride et leur similarité d'ingrédients.
+
+        Les candidates sont lues dans l'index inversé des termes TF-IDF (les recettes
+        partageant au moins un ingrédient avec la référence), les `n_candidates` plus
+        similaires étant conservées, complétées par les voisins du filtrage collaboratif.
+
+        Args:
+            row (int): Position de la recette de référence.
+            n_candidates (int): Nombre de candidates retenues par l'index des ingrédients.
+
+        Returns:
+            tuple: Positions des candidates (sans la référence) et similarité cosinus TF-IDF de chacune.
+        """
+        if self._term_index is None:
+            self._term_index = self.ingredient_matrix.T.tocsr()
+        reference = self.ingredient_matrix[row]
+        # Accumulation sur les seules listes de recettes des termes de la référence ; les
+        # lignes TF-IDF étant normalisées, le produit scalaire est le cosinus
+        accumulated = (reference @ self._term_index).tocsr()
+        keep = accumulated.indices != row
+        positions, cosine = accumulated.indices[keep], accumulated.data[keep]
+        if len(positions) > n_candidates:
+            best = np.argpartition(-cosine, n_candidates)[:n_candidates]
+            positions, cosine = positions[best], cosine[best]
+        similarity = self.item_similarity()
+        if similarity is not None:
+            neighbor_ids, _ = similarity.similar_items(self.recipes_df['id'].iloc[row])
+            extra = pd.Index(self.recipes_df['id']).get_indexer(neighbor_ids)
+            extra = np.setdiff1d(extra[extra >= 0], np.append(positions, row))
+            if len(extra):
+                positions = np.concatenate([positions, extra])
+                cosine = np.concatenate([cosine, (self.ingredient_matrix[extra] @ reference.T).toarray().ravel()])
+        return positions, cosine
+
+    def _popularity(self):
+        """
+        Popularité de chaque recette : moyenne bayésienne de ses notes ramenée entre 0 et 1.
+
+        Sans `interactions_df`, elle est lue dans le tableau précalculé des artefacts
+        (projeté en mémoire) ; une recette absente des artefacts reçoit la note moyenne.
+
+        Returns:
+            np.ndarray or None: Popularité alignée sur `recipes_df`, ou None sans interactions.
+        """
+        if self._popularity_scores is None:
+            if self.interactions_df is not None:
+                self._popularity_scores = bayesian_popularity(self.interactions_df, self.recipes_df['id'])[0]
+            elif self.artifacts is not None and 'popularity' in self.artifacts.manifest:
+                try:
+                    self._popularity_scores = self._artifact_popularity()
+                except Exception as e:
+                    logging.error(f"Error in _popularity: {e}")
+        return self._popularity_scores
+
+    def _artifact_popularity(self) -> np.ndarray:
+        """
+        Popularité des recettes lue dans les artefacts (`popularity.npy`).
+
+        Returns:
+            np.ndarray: Popularité alignée sur `recipes_df`.
+        """
+        popularity = self.artifacts.load_array('popularity')
+        if self._artifact_rows is not None:
+            return np.asarray(popularity[self._artifact_rows])
+        ids = self.recipes_df['id'].to_numpy()
+        known = np.isin(ids, self.artifacts.load_array('recipe_ids'))
+        scores = np.full(len(ids), self.artifacts.manifest['popularity']['prior'] / 5)
+        scores[known] = popularity[self.artifacts.recipe_rows(ids[known])]
+        return scores
+
+    def _nutrition(self, positions: np.ndarray):
+        """
+        Valeurs nutritionnelles de quelques recettes.
+
+        Args:
+            positions (np.ndarray): Positions des recettes.
+
+        Returns:
+            np.ndarray or None: Tableau (n, 7), ou None si les recettes n'en ont pas.
+        """
+        if self._artifact_rows is not None:
+            return np.asarray(self.artifacts.load_array('nutrition')[self._artifact_rows[positions]], dtype=np.float64)
+        if 'nutrition' not in self.recipes_df.columns:
+            return None
+        return split_nutrition(self.recipes_df['nutrition'].iloc[positions]).to_numpy(dtype=np.float64)
+
+    def hybrid_recommendations(self, recipe_id: int, top_n: int = 5, weights: dict = None,
+                               n_candidates: int = HYBRID_CANDIDATES) -> pd.DataFrame:
+        """
+        Génère des recommandations par un score hybride, calculé sur un ensemble de candidates.
+
+        Le score est la moyenne pondérée de quatre similarités entre 0 et 1 :
+        - 'ingredients' : cosinus des vecteurs TF-IDF des ingrédients ;
+        - 'numeric' : 1 / (1 + distance) des caractéristiques normalisées (durée,
+          nombre d'ingrédients, nombre d'étapes) ;
+        - 'popularity' : moyenne bayésienne des notes de la candidate ;
+        - 'nutrition' : 1 / (1 + distance) des valeurs nutritionnelles (échelle log).
+        Une composante indisponible (pas d'interactions, pas de valeurs nutritionnelles)
+        est ignorée et les poids restants sont renormalisés.
+
+        Args:
+            recipe_id (int): Identifiant de la recette de référence
+            top_n (int, optional): Nombre de recommandations à retourner. Défaut à 5.
+            weights (dict, optional): Poids des composantes. Défaut à `HYBRID_WEIGHTS`.
+            n_candidates (int, optional): Nombre de candidates retenues par l'index des ingrédients.
+
+        Returns:
+            pd.DataFrame: DataFrame des recettes recommandées, du meilleur score au moins bon,
+                avec une colonne 'score' et une colonne 'score_<composante>' par composante utilisée.
+        """
+        try:
+            weights = {**HYBRID_WEIGHTS, **(weights or {})}
+            row = self._recipe_row(recipe_id)
+            positions, cosine = self._candidates(row, n_candidates)
+            components = {'ingredients': cosine}
+            if weights['numeric'] > 0 and getattr(self, 'numeric_features', None) is not None:
+                distance = np.linalg.norm(self.numeric_features[positions] - self.numeric_features[row], axis=1)
+                components['numeric'] = 1 / (1 + distance)
+            if weights['popularity'] > 0 and self._popularity() is not None:
+                components['popularity'] = self._popularity()[positions]
+            if weights['nutrition'] > 0:
+                nutrition = self._nutrition(np.append(positions, row))
+                if nutrition is not None:
+                    nutrition = np.log1p(np.clip(nutrition, 0, None))
+                    distance = np.linalg.norm(nutrition[:-1] - nutrition[-1], axis=1) / np.sqrt(nutrition.shape[1])
+                    components['nutrition'] = 1 / (1 + distance)
+            total = sum(weights[name] for name in components)
+            score = sum(weights[name] * values for name, values in components.items()) / (total or 1)
+            best = np.argsort(-score, kind="stable")[:top_n]
+            return self.recipes_df.iloc[positions[best]].assign(
+                score=score[best],
+                **{f"score_{name}": values[best] for name, values in components.items()})
+        except Exception as e:
+            logging.error(f"Error in hybrid_recommendations: {e}")
+            raise
+
     def recipe_clustering(self, n_clusters: int = 5) -> pd.DataFrame:
         """
         Réalise un clustering avancé des recettes.
@@ -124,9 +506,21 @@ class AdvancedRecipeRecommender:
             pd.DataFrame: DataFrame avec les clusters et coordonnées 2D
         """
         try:
+            if self._artifact_rows is not None and n_clusters == self.artifacts.manifest.get(
+                    'clusters', {}).get('n_clusters'):
+                clusters = self.artifacts.read_table('clusters').to_pandas().iloc[self._artifact_rows]
+                return pd.DataFrame({
+                    'Recipe': self.recipes_df['name'].to_numpy(),
+                    'Cluster': clusters['Cluster'].to_numpy(),
+                    'X': clusters['X'].to_numpy(),
+                    'Y': clusters['Y'].to_numpy()
+                }, index=self.recipes_df.index)
+
             # Combine les features de la matrice d'ingrédients et des caractéristiques numériques
+            # (colonnes vides retirées : la matrice par hachage en compte 2^18)
+            used_columns = np.unique(self.ingredient_matrix.indices)
             combined_features = np.hstack([
-                self.ingredient_matrix.toarray(),
+                self.ingredient_matrix[:, used_columns].toarray(),
                 self.numeric_features
             ])
 
@@ -0,0 +1,188 @@
+"""
+Cache des recommandations et table précalculée des voisins par ingrédients.
+
+Les recommandations sont conservées dans un cache LRU (`recommendation_cache`)
+indexé par (recette, nombre de recommandations, mode) et associé à l'empreinte
+du modèle du recommandeur (`AdvancedRecipeRecommender.model_fingerprint`) : un
+nouveau modèle (artefacts reconstruits, autres recettes chargées, recettes
+ajoutées) invalide les entrées.
+
+La table des voisins (`NeighborTable`) est construite avec les artefacts pour
+les recettes les plus notées : pour chacune, les `k` recettes les plus
+similaires (cosinus TF-IDF des ingrédients) parmi toutes les recettes, en
+identifiants int32 et similarités float16. Une recommandation par ingrédients
+d'une de ces recettes est alors une recherche dichotomique.
+"""
+import logging
+import os
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+from src.utils.fingerprint import FingerprintCache
+
+logger = logging.getLogger(__name__)
+
+# Nombre de recommandations conservées par le cache LRU
+RECOMMENDATION_CACHE_SIZE = int(os.getenv("RECOMMENDATION_CACHE_SIZE", "512"))
+# Nombre de voisins précalculés par recette
+CONTENT_TOP_K = int(os.getenv("CONTENT_TOP_K", "20"))
+# Nombre de recettes (les plus notées) de la table des voisins ; 0 : toutes les recettes
+CONTENT_NEIGHBOR_SEEDS = int(os.getenv("CONTENT_NEIGHBOR_SEEDS", "20000"))
+# Nombre de recettes par bloc : chaque bloc produit une matrice dense (bloc x recettes)
+NEIGHBOR_BLOCK_SIZE = 128
+
+# Préfixe des fichiers de la table parmi les artefacts
+NEIGHBOR_ARTIFACT_PREFIX = "content_neighbors"
+
+# Recommandations déjà calculées, par empreinte du modèle
+recommendation_cache = FingerprintCache("recommendations", max_entries=RECOMMENDATION_CACHE_SIZE)
+
+
+class NeighborTable:
+    """
+    Voisins par ingrédients précalculés d'un ensemble de recettes.
+
+    Args:
+        recipe_ids (np.ndarray): Identifiants des recettes de la table, croissants.
+        neighbors (np.ndarray): Identifiants (int32) des voisins de chaque recette,
+            (n_recettes, k), du plus similaire au moins similaire ; -1 pour une place vide.
+        scores (np.ndarray): Similarités cosinus correspondantes (float16).
+
+    Attributes:
+        hits (int): Nombre de recherches servies par la table.
+        misses (int): Nombre de recherches de recettes absentes de la table.
+    """
+
+    def __init__(self, recipe_ids: np.ndarray, neighbors: np.ndarray, scores: np.ndarray):
+        """
+        Initialise la table.
+
+        Args:
+            recipe_ids (np.ndarray): Identifiants des recettes, croissants.
+            neighbors (np.ndarray): Identifiants des voisins de chaque recette.
+            scores (np.ndarray): Similarités correspondantes.
+        """
+        self.recipe_ids = recipe_ids
+        self.neighbors = neighbors
+        self.scores = scores
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def n_recipes(self) -> int:
+        """Nombre de recettes de la table."""
+        return len(self.recipe_ids)
+
+    @classmethod
+    def build(cls, recipe_ids: np.ndarray, ingredient_matrix: csr_matrix, seeds: Optional[np.ndarray] = None,
+              k: int = CONTENT_TOP_K, block_size: int = NEIGHBOR_BLOCK_SIZE) -> "NeighborTable":
+        """
+        Calcule les voisins des recettes `seeds` parmi toutes les recettes.
+
+        Args:
+            recipe_ids (np.ndarray): Identifiant de chaque ligne de `ingredient_matrix`.
+            ingredient_matrix (csr_matrix): Matrice TF-IDF des ingrédients, lignes normalisées (L2).
+            seeds (np.ndarray, optional): Identifiants des recettes de la table. Par défaut : toutes.
+            k (int, optional): Nombre de voisins par recette.
+            block_size (int, optional): Nombre de recettes par bloc.
+
+        Returns:
+            NeighborTable: La table.
+        """
+        start = time.perf_counter()
+        recipe_ids = np.asarray(recipe_ids)
+        matrix = csr_matrix(ingredient_matrix, dtype=np.float32)
+        rows = np.arange(len(recipe_ids))
+        if seeds is not None:
+            rows = pd.Index(recipe_ids).get_indexer(np.asarray(seeds))
+            rows = np.unique(rows[rows >= 0])
+        rows = rows[np.argsort(recipe_ids[rows], kind="stable")]
+        k = min(k, max(len(recipe_ids) - 1, 0))
+
+        neighbors = np.full((len(rows), k), -1, dtype=np.int32)
+        scores = np.zeros((len(rows), k), dtype=np.float16)
+        for first in range(0, len(rows) if k else 0, block_size):
+            block = rows[first:first + block_size]
+            # Produit creux x dense : la similarité d'un bloc avec toutes les recettes
+            similarity = np.asarray(matrix @ matrix[block].toarray().T).T
+            # Une recette n'est pas sa propre voisine
+            similarity[np.arange(len(block)), block] = -1
+            best = np.argpartition(similarity, -k, axis=1)[:, -k:]
+            best_scores = np.take_along_axis(similarity, best, axis=1)
+            order = np.argsort(-best_scores, axis=1, kind="stable")
+            best = np.take_along_axis(best, order, axis=1)
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+            similar = best_scores > 0
+            neighbors[first:first + len(block)] = np.where(similar, recipe_ids[best], -1)
+            scores[first:first + len(block)] = np.where(similar, best_scores, 0)
+        logger.info(f"Voisins par ingrédients de {len(rows)} recettes calculés "
+                    f"en {time.perf_counter() - start:.1f} s")
+        return cls(recipe_ids[rows], neighbors, scores)
+
+    def similar_items(self, recipe_id: int, top_n: Optional[int] = None) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Voisins précalculés d'une recette.
+
+        Args:
+            recipe_id (int): Identifiant de la recette de référence.
+            top_n (int, optional): Nombre maximal de voisins. Par défaut : tous les voisins conservés.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray] or None: Identifiants et similarités des voisins, du plus
+                similaire au moins similaire, ou None si la recette est absente de la table.
+        """
+        position = int(np.searchsorted(self.recipe_ids, recipe_id))
+        if position >= self.n_recipes or self.recipe_ids[position] != recipe_id:
+            self.misses += 1
+            return None
+        self.hits += 1
+        neighbors = np.asarray(self.neighbors[position, :top_n])
+        present = neighbors >= 0
+        return neighbors[present], np.asarray(self.scores[position, :top_n], dtype=np.float32)[present]
+
+    def save(self, directory: str) -> dict:
+        """
+        Enregistre la table en tableaux NumPy lisibles par projection mémoire.
+
+        Args:
+            directory (str): Répertoire des artefacts.
+
+        Returns:
+            dict: Entrée du manifeste ('content_neighbors').
+        """
+        for name, array in (("ids", self.recipe_ids), ("neighbors", self.neighbors), ("scores", self.scores)):
+            np.save(os.path.join(directory, f"{NEIGHBOR_ARTIFACT_PREFIX}.{name}.npy"), array)
+        return {"content_neighbors": {"n_recipes": self.n_recipes, "k": int(self.neighbors.shape[1])}}
+
+    @classmethod
+    def from_artifacts(cls, store) -> Optional["NeighborTable"]:
+        """
+        Relit la table enregistrée parmi les artefacts.
+
+        Args:
+            store (ArtifactStore): Artefacts prétraités.
+
+        Returns:
+            NeighborTable or None: La table, ou None si elle n'a pas été construite.
+        """
+        if store is None or "content_neighbors" not in store.manifest:
+            return None
+        return cls(store.load_array(f"{NEIGHBOR_ARTIFACT_PREFIX}.ids"),
+                   store.load_array(f"{NEIGHBOR_ARTIFACT_PREFIX}.neighbors"),
+                   store.load_array(f"{NEIGHBOR_ARTIFACT_PREFIX}.scores"))
+
+
+def recommendation_cache_stats() -> dict:
+    """
+    Statistiques du cache des recommandations.
+
+    Returns:
+        dict: Lectures servies ('hits'), calculs ('misses'), taux de succès ('hit_rate')
+            et nombre d'entrées ('size').
+    """
+    return {"hits": recommendation_cache.hits, "misses": recommendation_cache.misses,
+            "hit_rate": recommendation_cache.hit_rate, "size": len(recommendation_cache)}
@@ -0,0 +1,300 @@
+"""
+Index persistant des caractéristiques du recommandeur, mis à jour par ajout.
+
+Les ingrédients de chaque recette sont stockés sous forme de comptes hachés
+(`HashingTfidf`, sans pondération) avec ses caractéristiques numériques brutes.
+Les recettes arrivent par lots (`upsert`) : seules les recettes nouvelles ou
+modifiées (empreinte des ingrédients et des caractéristiques) sont vectorisées,
+et chaque lot est écrit dans un nouveau segment `.npz`, sans réécrire les
+précédents. Une recette modifiée est ajoutée à nouveau et sa version
+précédente est désactivée ; `compact` réécrit l'index en un seul segment.
+
+Les fréquences documentaires sont mises à jour à chaque lot. La matrice TF-IDF
+pondérée (`matrix`) est recalculée paresseusement, à partir des comptes et sans
+nouveau hachage, lorsque le nombre de recettes a varié de plus de
+`IDF_REFRESH_RATIO` depuis la dernière pondération ; entre-temps, les nouvelles
+lignes sont pondérées avec l'idf courant.
+"""
+import ast
+import json
+import logging
+import os
+import shutil
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix, vstack
+
+from src.process.hashing_features import HASHING_FEATURES, HashingTfidf
+from src.utils.artifacts import ARTIFACTS_DIR, NUMERIC_FEATURES
+from src.utils.fingerprint import FingerprintCache, file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Répertoire par défaut de l'index
+RECOMMENDER_INDEX_DIR = os.getenv("DIR_RECOMMENDER_INDEX", os.path.join(ARTIFACTS_DIR, "recommender"))
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+# Variation relative du nombre de recettes déclenchant une nouvelle pondération complète
+IDF_REFRESH_RATIO = 0.05
+
+# Index ouverts, par empreinte de leur fichier `index.json`
+feature_index_cache = FingerprintCache("feature_index", max_entries=4)
+
+
+def _ingredient_list(value) -> list:
+    # CSV et artefacts : représentation textuelle d'une liste ; MongoDB : liste
+    if isinstance(value, str):
+        return ast.literal_eval(value)
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return list(value)
+    return []
+
+
+def ingredients_text(ingredients: pd.Series) -> pd.Series:
+    """
+    Ingrédients d'une recette en une chaîne en minuscules, comme `ingredients_cleaned`.
+
+    Chaque valeur est traitée selon son type : une chaîne (CSV, artefacts) est lue
+    avec `ast.literal_eval`, une liste (MongoDB) est utilisée telle quelle.
+
+    Args:
+        ingredients (pd.Series): Listes d'ingrédients, textuelles ou non.
+
+    Returns:
+        pd.Series: Ingrédients séparés par des espaces.
+    """
+    return ingredients.map(lambda value: ' '.join(_ingredient_list(value)).lower())
+
+
+def _row_hashes(recipes: pd.DataFrame) -> np.ndarray:
+    columns = recipes[['ingredients', *NUMERIC_FEATURES]].astype(str)
+    return pd.util.hash_pandas_object(columns, index=False).to_numpy()
+
+
+class RecipeFeatureIndex:
+    """
+    Comptes hachés des ingrédients et caractéristiques numériques des recettes, par segments.
+
+    Args:
+        directory (str): Répertoire de l'index (créé s'il est absent).
+        n_features (int, optional): Nombre de colonnes de hachage d'un nouvel index.
+
+    Attributes:
+        featurizer (HashingTfidf): Vectoriseur et fréquences documentaires des recettes actives.
+        ids (np.ndarray): Identifiant de chaque ligne, dans l'ordre d'ajout.
+        counts (csr_matrix): Comptes hachés de chaque ligne.
+        numeric (np.ndarray): Caractéristiques numériques brutes (`NUMERIC_FEATURES`) de chaque ligne.
+        active (np.ndarray): Lignes correspondant à la version courante de leur recette.
+    """
+
+    def __init__(self, directory: str = RECOMMENDER_INDEX_DIR, n_features: int = HASHING_FEATURES):
+        """
+        Ouvre l'index d'un répertoire, ou en crée un vide.
+
+        Args:
+            directory (str, optional): Répertoire de l'index.
+            n_features (int, optional): Nombre de colonnes de hachage d'un nouvel index.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        meta = {"version": INDEX_VERSION, "n_features": n_features, "segments": [], "next_segment": 0}
+        path = os.path.join(directory, INDEX_FILE)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                meta = json.load(handle)
+        self.segments = list(meta["segments"])
+        self.next_segment = meta["next_segment"]
+        self.featurizer = HashingTfidf(meta["n_features"])
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.counts = csr_matrix((0, meta["n_features"]))
+        self.numeric = np.zeros((0, len(NUMERIC_FEATURES)))
+        self.hashes = np.zeros(0, dtype=np.uint64)
+        self.active = np.zeros(0, dtype=bool)
+        self._positions = None
+        self._weighted = None
+        self._weighted_documents = 0
+        if self.segments:
+            self._load()
+
+    def _load(self) -> None:
+        parts = [np.load(os.path.join(self.directory, name)) for name in self.segments]
+        self.ids = np.concatenate([part["ids"] for part in parts])
+        self.counts = vstack([csr_matrix((part["data"], part["indices"], part["indptr"]),
+                                         shape=(len(part["ids"]), self.featurizer.n_features))
+                              for part in parts], format='csr')
+        self.numeric = np.concatenate([part["numeric"] for part in parts])
+        self.hashes = np.concatenate([part["hashes"] for part in parts])
+        self.active = np.ones(len(self.ids), dtype=bool)
+        self.active[np.load(os.path.join(self.directory, "inactive.npy"))] = False
+        self.featurizer.document_frequency = np.load(os.path.join(self.directory, "document_frequency.npy"))
+        self.featurizer.n_documents = int(self.active.sum())
+        logger.info(f"Index du recommandeur ouvert : {self.featurizer.n_documents} recettes, "
+                    f"{len(self.segments)} segments.")
+
+    def _save_state(self) -> None:
+        np.save(os.path.join(self.directory, "inactive.npy"), np.flatnonzero(~self.active))
+        np.save(os.path.join(self.directory, "document_frequency.npy"), self.featurizer.document_frequency)
+        with open(os.path.join(self.directory, INDEX_FILE), "w", encoding="utf-8") as handle:
+            json.dump({"version": INDEX_VERSION, "n_features": self.featurizer.n_features,
+                       "segments": self.segments, "next_segment": self.next_segment}, handle, indent=2)
+
+    def _write_segment(self, rows: slice) -> None:
+        name = f"segment_{self.next_segment:05d}.npz"
+        counts = self.counts[rows]
+        np.savez(os.path.join(self.directory, name), data=counts.data, indices=counts.indices,
+                 indptr=counts.indptr, ids=self.ids[rows], numeric=self.numeric[rows],
+                 hashes=self.hashes[rows])
+        self.segments.append(name)
+        self.next_segment += 1
+
+    @property
+    def n_recipes(self) -> int:
+        """Nombre de recettes actives."""
+        return int(self.active.sum())
+
+    def rows(self, recipe_ids: Iterable[int]) -> np.ndarray:
+        """
+        Lignes de la version courante de recettes.
+
+        Args:
+            recipe_ids (Iterable[int]): Identifiants de recettes.
+
+        Returns:
+            np.ndarray: Position de chaque recette dans l'index, -1 si elle est absente.
+        """
+        if self._positions is None:
+            active = np.flatnonzero(self.active)
+            self._positions = (pd.Index(self.ids[active]), active)
+        index, active = self._positions
+        found = index.get_indexer(np.asarray(list(recipe_ids)))
+        rows = np.full(len(found), -1, dtype=np.int64)
+        rows[found >= 0] = active[found[found >= 0]]
+        return rows
+
+    def upsert(self, recipes: pd.DataFrame) -> Dict[str, int]:
+        """
+        Ajoute les recettes nouvelles ou modifiées et écrit un segment pour elles seules.
+
+        Args:
+            recipes (pd.DataFrame): Recettes ('id', 'ingredients' et `NUMERIC_FEATURES`).
+
+        Returns:
+            Dict[str, int]: Nombre de recettes 'added', 'updated' et 'unchanged'.
+        """
+        recipes = recipes.drop_duplicates('id', keep='last')
+        hashes = _row_hashes(recipes)
+        previous = self.rows(recipes['id'])
+        known = previous >= 0
+        unchanged = np.zeros(len(recipes), dtype=bool)
+        unchanged[known] = self.hashes[previous[known]] == hashes[known]
+        changed = known & ~unchanged
+        fresh = ~unchanged
+        stats = {"added": int((~known).sum()), "updated": int(changed.sum()), "unchanged": int(unchanged.sum())}
+        if not fresh.any():
+            return stats
+
+        # Les versions précédentes des recettes modifiées ne comptent plus dans l'idf
+        replaced = previous[changed]
+        self.active[replaced] = False
+        self.featurizer.document_frequency -= np.bincount(
+            self.counts[replaced].indices, minlength=self.featurizer.n_features)
+        self.featurizer.n_documents -= len(replaced)
+
+        new = recipes[fresh]
+        counts = self.featurizer.counts(ingredients_text(new['ingredients']))
+        self.featurizer.observe(counts)
+        first = len(self.ids)
+        self.ids = np.concatenate([self.ids, new['id'].to_numpy(dtype=np.int64)])
+        self.counts = vstack([self.counts, counts], format='csr')
+        self.numeric = np.concatenate([self.numeric, new[NUMERIC_FEATURES].to_numpy(dtype=np.float64)])
+        self.hashes = np.concatenate([self.hashes, hashes[fresh]])
+        self.active = np.concatenate([self.active, np.ones(len(new), dtype=bool)])
+        self._positions = None
+
+        self._write_segment(slice(first, len(self.ids)))
+        self._save_state()
+        logger.info(f"Index du recommandeur : {stats['added']} recettes ajoutées, "
+                    f"{stats['updated']} modifiées, {stats['unchanged']} inchangées.")
+        return stats
+
+    def matrix(self) -> csr_matrix:
+        """
+        Matrice TF-IDF normalisée de toutes les lignes (actives ou non).
+
+        Returns:
+            csr_matrix: Matrice (n_lignes, n_features), pondérée à nouveau si le nombre de
+                recettes a varié de plus de `IDF_REFRESH_RATIO` depuis la dernière pondération.
+        """
+        n_documents = self.featurizer.n_documents
+        drift = abs(n_documents - self._weighted_documents) / max(self._weighted_documents, 1)
+        if self._weighted is None or drift > IDF_REFRESH_RATIO:
+            self._weighted = self.featurizer.weight(self.counts)
+            self._weighted_documents = n_documents
+        elif self._weighted.shape[0] < self.counts.shape[0]:
+            self._weighted = vstack([self._weighted,
+                                     self.featurizer.weight(self.counts[self._weighted.shape[0]:])], format='csr')
+        return self._weighted
+
+    def compact(self) -> None:
+        """Réécrit l'index en un seul segment, sans les versions désactivées."""
+        keep = np.flatnonzero(self.active)
+        self.ids, self.counts = self.ids[keep], self.counts[keep]
+        self.numeric, self.hashes = self.numeric[keep], self.hashes[keep]
+        self.active = np.ones(len(keep), dtype=bool)
+        self._positions = None
+        self._weighted = None
+        old_segments, self.segments = self.segments, []
+        self._write_segment(slice(None))
+        self._save_state()
+        for name in old_segments:
+            os.remove(os.path.join(self.directory, name))
+
+
+def get_feature_index(directory: Optional[str] = None) -> Optional[RecipeFeatureIndex]:
+    """
+    Ouvre l'index du recommandeur s'il a été construit.
+
+    L'index ouvert est conservé en mémoire tant que son fichier `index.json`
+    (réécrit à chaque ajout ou compactage) est inchangé.
+
+    Args:
+        directory (str, optional): Répertoire de l'index. Par défaut : `RECOMMENDER_INDEX_DIR`.
+
+    Returns:
+        RecipeFeatureIndex or None: L'index, ou None s'il est absent ou d'une autre version.
+    """
+    directory = directory or RECOMMENDER_INDEX_DIR
+    path = os.path.join(directory, INDEX_FILE)
+    fingerprint = file_fingerprint(path)
+    if fingerprint is None:
+        return None
+
+    def open_index() -> Optional[RecipeFeatureIndex]:
+        with open(path, encoding="utf-8") as handle:
+            if json.load(handle).get("version") != INDEX_VERSION:
+                logger.warning(f"Index du recommandeur de {directory} ignoré : version différente.")
+                return None
+        return RecipeFeatureIndex(directory)
+
+    return feature_index_cache.get_or_compute(os.path.abspath(directory), fingerprint, open_index)
+
+
+def update_feature_index(recipes: pd.DataFrame, directory: Optional[str] = None,
+                         reset: bool = False) -> Dict[str, int]:
+    """
+    Ajoute des recettes à l'index du recommandeur ; point d'entrée des scripts d'ingestion.
+
+    Args:
+        recipes (pd.DataFrame): Recettes ajoutées ou modifiées.
+        directory (str, optional): Répertoire de l'index. Par défaut : `RECOMMENDER_INDEX_DIR`.
+        reset (bool, optional): Supprimer l'index existant avant l'ajout.
+
+    Returns:
+        Dict[str, int]: Nombre de recettes ajoutées, modifiées et inchangées.
+    """
+    directory = directory or RECOMMENDER_INDEX_DIR
+    if reset and os.path.exists(directory):
+        shutil.rmtree(directory)
+    return RecipeFeatureIndex(directory).upsert(recipes)
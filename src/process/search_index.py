@@ -0,0 +1,387 @@
+"""
+Recherche plein texte des recettes (nom, description, étapes) classée par BM25.
+
+L'index est un index inversé dont les listes sont des tableaux NumPy au format
+CSR : pour chaque terme t, `doc_ids[indptr[t]:indptr[t + 1]]` sont les recettes
+qui le contiennent et `tfs` leurs fréquences, pondérées par champ (un terme du
+nom compte davantage qu'un terme des étapes). Une requête additionne les
+contributions BM25 de ses termes avec `np.bincount`, puis sélectionne les
+meilleurs documents avec `np.argpartition`.
+
+L'index se construit par segments : `update` n'analyse que les recettes absentes
+de l'index et fusionne le nouveau segment. Il est enregistré dans un seul fichier
+`.npz` (chaînes stockées en UTF-8 concaténé + positions) et rechargé sans
+réanalyse du texte. Seuls `scripts/build_artifacts.py` et les scripts
+d'ingestion (`update_search_index`) écrivent ce fichier ; les pages complètent
+l'index en mémoire (`get_search_index`).
+"""
+import logging
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from src.utils.artifacts import ARTIFACTS_DIR, source_fingerprint
+from src.utils.fingerprint import FingerprintCache
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_FILE = "search_index.npz"
+# Poids de chaque champ dans la fréquence des termes
+FIELD_WEIGHTS: Dict[str, float] = {'name': 3.0, 'description': 1.0, 'steps': 1.0}
+# Paramètres BM25 usuels
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Index chargés ou construits, par empreinte du jeu de données
+search_cache = FingerprintCache("search_index", max_entries=4)
+
+
+def _vectorizer() -> CountVectorizer:
+    return CountVectorizer(stop_words='english', dtype=np.float32)
+
+
+def analyze(text: str) -> List[str]:
+    """
+    Découpe un texte en termes, comme lors de l'indexation.
+
+    Args:
+        text (str): Texte (requête).
+
+    Returns:
+        List[str]: Termes en minuscules, sans mots vides.
+    """
+    return _vectorizer().build_analyzer()(text)
+
+
+def _pack_strings(values: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [str(value).encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(blob: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    data = blob.tobytes()
+    values = np.empty(len(offsets) - 1, dtype=object)
+    values[:] = [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+    return values
+
+
+def _field_counts(texts: pd.Series) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """Matrice documents × termes d'un champ et son vocabulaire trié."""
+    texts = texts.fillna('').astype(str)
+    vectorizer = _vectorizer()
+    try:
+        counts = vectorizer.fit_transform(texts)
+    except ValueError:
+        # Champ vide ou composé uniquement de mots vides
+        return sparse.csr_matrix((len(texts), 0), dtype=np.float32), np.empty(0, dtype=object)
+    return counts.tocsr(), vectorizer.get_feature_names_out().astype(object)
+
+
+def _remap_columns(matrix: sparse.csr_matrix, columns: np.ndarray, n_columns: int) -> sparse.csr_matrix:
+    """Renumérote les colonnes d'une matrice CSR vers un vocabulaire plus large."""
+    return sparse.csr_matrix((matrix.data, columns[matrix.indices], matrix.indptr),
+                             shape=(matrix.shape[0], n_columns))
+
+
+class BM25Index:
+    """
+    Index inversé BM25 des recettes.
+
+    Args:
+        vocabulary (np.ndarray): Termes, triés.
+        postings (sparse.csr_matrix): Matrice termes × documents des fréquences pondérées.
+        doc_lengths (np.ndarray): Longueur pondérée de chaque document.
+        keys (np.ndarray): Identifiant de recette de chaque document.
+        names (np.ndarray): Nom de chaque recette.
+        k1 (float, optional): Saturation de la fréquence des termes.
+        b (float, optional): Normalisation par la longueur des documents.
+    """
+
+    def __init__(self, vocabulary: np.ndarray, postings: sparse.csr_matrix, doc_lengths: np.ndarray,
+                 keys: np.ndarray, names: np.ndarray, k1: float = BM25_K1, b: float = BM25_B):
+        """
+        Initialise l'index.
+
+        Args:
+            vocabulary (np.ndarray): Termes, triés.
+            postings (sparse.csr_matrix): Matrice termes × documents.
+            doc_lengths (np.ndarray): Longueur pondérée de chaque document.
+            keys (np.ndarray): Identifiant de recette de chaque document.
+            names (np.ndarray): Nom de chaque recette.
+            k1 (float, optional): Paramètre k1 de BM25.
+            b (float, optional): Paramètre b de BM25.
+        """
+        self.vocabulary = vocabulary
+        self.postings = postings
+        self.doc_lengths = doc_lengths.astype(np.float32)
+        self.keys = keys.astype(np.int64)
+        self.names = names
+        self.k1 = k1
+        self.b = b
+        self._terms = pd.Index(vocabulary)
+        self._key_order = np.argsort(self.keys, kind="stable")
+        document_frequency = np.diff(postings.indptr).astype(np.float64)
+        self._idf = np.log1p((self.n_documents - document_frequency + 0.5) / (document_frequency + 0.5))
+        self._avg_length = float(self.doc_lengths.mean()) if self.n_documents else 1.0
+
+    @property
+    def n_documents(self) -> int:
+        """Nombre de recettes indexées."""
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, fields: Optional[Dict[str, float]] = None,
+              id_column: str = 'id', name_column: str = 'name') -> "BM25Index":
+        """
+        Indexe les champs texte d'un DataFrame de recettes.
+
+        Args:
+            df (pd.DataFrame): Recettes.
+            fields (Dict[str, float], optional): Poids de chaque champ (ceux absents de `df`
+                sont ignorés). Par défaut : `FIELD_WEIGHTS`.
+            id_column (str, optional): Colonne des identifiants.
+            name_column (str, optional): Colonne des noms, conservés pour l'affichage.
+
+        Returns:
+            BM25Index: L'index.
+        """
+        fields = {field: weight for field, weight in (fields or FIELD_WEIGHTS).items() if field in df.columns}
+        parts = {field: _field_counts(df[field]) for field in fields}
+        vocabulary = np.unique(np.concatenate(
+            [terms for _, terms in parts.values()] + [np.empty(0, dtype=object)])).astype(object)
+        counts = sparse.csr_matrix((len(df), len(vocabulary)), dtype=np.float32)
+        for field, (matrix, terms) in parts.items():
+            columns = np.searchsorted(vocabulary, terms).astype(np.int32)
+            counts = counts + fields[field] * _remap_columns(matrix, columns, len(vocabulary))
+        names = df[name_column].fillna('').astype(str).to_numpy(dtype=object) \
+            if name_column in df.columns else np.full(len(df), '', dtype=object)
+        logger.info(f"Index BM25 construit : {len(df)} recettes, {len(vocabulary)} termes.")
+        return cls(vocabulary, counts.T.tocsr(), np.asarray(counts.sum(axis=1)).ravel(),
+                   df[id_column].to_numpy(), names)
+
+    def merge(self, other: "BM25Index") -> "BM25Index":
+        """
+        Fusionne deux segments d'index (documents de `other` ajoutés à la suite).
+
+        Args:
+            other (BM25Index): Segment à ajouter.
+
+        Returns:
+            BM25Index: Le nouvel index.
+        """
+        vocabulary = np.union1d(self.vocabulary, other.vocabulary).astype(object)
+
+        def remap(index: BM25Index) -> sparse.csr_matrix:
+            documents = index.postings.T.tocsr()
+            columns = np.searchsorted(vocabulary, index.vocabulary).astype(np.int32)
+            return _remap_columns(documents, columns, len(vocabulary))
+
+        documents = sparse.vstack([remap(self), remap(other)]).tocsr()
+        return BM25Index(vocabulary, documents.T.tocsr(),
+                         np.concatenate([self.doc_lengths, other.doc_lengths]),
+                         np.concatenate([self.keys, other.keys]),
+                         np.concatenate([self.names, other.names]), self.k1, self.b)
+
+    def _lookup(self, ids) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions des documents de `ids` et masque des identifiants indexés."""
+        ids = np.asarray(ids if isinstance(ids, (np.ndarray, pd.Series)) else list(ids), dtype=np.int64)
+        if self.n_documents == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(len(ids), dtype=bool)
+        sorted_keys = self.keys[self._key_order]
+        positions = np.minimum(np.searchsorted(sorted_keys, ids), len(sorted_keys) - 1)
+        found = sorted_keys[positions] == ids
+        return self._key_order[positions[found]], found
+
+    def contains(self, ids: Iterable[int]) -> np.ndarray:
+        """
+        Indique quelles recettes sont déjà indexées.
+
+        Args:
+            ids (Iterable[int]): Identifiants de recettes.
+
+        Returns:
+            np.ndarray: Masque booléen aligné sur `ids`.
+        """
+        return self._lookup(ids)[1]
+
+    def update(self, df: pd.DataFrame, id_column: str = 'id',
+               fetch_text: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None) -> "BM25Index":
+        """
+        Ajoute les recettes de `df` qui ne sont pas encore indexées.
+
+        Les recettes déjà indexées ne sont pas réanalysées (ni mises à jour).
+
+        Args:
+            df (pd.DataFrame): Recettes.
+            id_column (str, optional): Colonne des identifiants.
+            fetch_text (Callable, optional): Complète des lignes de `df` avec leurs colonnes de
+                texte, lorsque `df` a été chargé sans elles (`LazyDataset.with_text`).
+
+        Returns:
+            BM25Index: L'index lui-même si rien n'a changé, sinon le nouvel index.
+        """
+        new = df[~self.contains(df[id_column].to_numpy())]
+        if new.empty:
+            return self
+        logger.info(f"Index BM25 : ajout de {len(new)} recettes.")
+        if fetch_text is not None:
+            new = fetch_text(new)
+        return self.merge(BM25Index.build(new, id_column=id_column))
+
+    def search(self, query: str, top_k: int = 10, ids: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """
+        Recherche les recettes les plus pertinentes pour une requête.
+
+        Args:
+            query (str): Texte recherché.
+            top_k (int, optional): Nombre de résultats.
+            ids (Iterable[int], optional): Restreint la recherche à ces recettes.
+
+        Returns:
+            pd.DataFrame: Colonnes 'id', 'name' et 'score', par score décroissant.
+        """
+        empty = pd.DataFrame({'id': pd.Series(dtype=np.int64), 'name': pd.Series(dtype=object),
+                              'score': pd.Series(dtype=np.float64)})
+        terms = self._terms.get_indexer(analyze(query))
+        terms = np.unique(terms[terms >= 0])
+        if len(terms) == 0 or self.n_documents == 0:
+            return empty
+        indptr = self.postings.indptr
+        slices = [slice(indptr[t], indptr[t + 1]) for t in terms]
+        documents = np.concatenate([self.postings.indices[s] for s in slices])
+        tfs = np.concatenate([self.postings.data[s] for s in slices]).astype(np.float64)
+        idf = np.repeat(self._idf[terms], [s.stop - s.start for s in slices])
+        norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[documents] / self._avg_length)
+        scores = np.bincount(documents, weights=idf * tfs * (self.k1 + 1) / (tfs + norm),
+                             minlength=self.n_documents)
+        if ids is not None:
+            allowed = np.zeros(self.n_documents, dtype=bool)
+            allowed[self._lookup(ids)[0]] = True
+            scores[~allowed] = 0
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) == 0:
+            return empty
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return pd.DataFrame({'id': self.keys[candidates], 'name': self.names[candidates],
+                             'score': scores[candidates]})
+
+    def save(self, path: str) -> None:
+        """
+        Enregistre l'index dans un fichier `.npz`.
+
+        Args:
+            path (str): Chemin du fichier.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        vocabulary, vocabulary_offsets = _pack_strings(self.vocabulary)
+        names, names_offsets = _pack_strings(self.names)
+        temp_path = f"{path}.tmp.npz"
+        np.savez(temp_path, vocabulary=vocabulary, vocabulary_offsets=vocabulary_offsets,
+                 indptr=self.postings.indptr, doc_ids=self.postings.indices, tfs=self.postings.data,
+                 doc_lengths=self.doc_lengths, keys=self.keys, names=names, names_offsets=names_offsets,
+                 params=np.array([self.k1, self.b]))
+        os.replace(temp_path, path)
+        logger.info(f"Index BM25 enregistré dans {path}")
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """
+        Charge un index enregistré par `save`.
+
+        Args:
+            path (str): Chemin du fichier.
+
+        Returns:
+            BM25Index: L'index.
+        """
+        with np.load(path) as stored:
+            vocabulary = _unpack_strings(stored['vocabulary'], stored['vocabulary_offsets'])
+            postings = sparse.csr_matrix((stored['tfs'], stored['doc_ids'], stored['indptr']),
+                                         shape=(len(vocabulary), len(stored['keys'])))
+            k1, b = stored['params']
+            return cls(vocabulary, postings, stored['doc_lengths'], stored['keys'],
+                       _unpack_strings(stored['names'], stored['names_offsets']), float(k1), float(b))
+
+
+def _default_path() -> str:
+    return os.path.join(ARTIFACTS_DIR, SEARCH_INDEX_FILE)
+
+
+def load_search_index(path: Optional[str] = None) -> Optional[BM25Index]:
+    """
+    Charge l'index enregistré, mis en cache tant que le fichier ne change pas.
+
+    Args:
+        path (str, optional): Fichier de l'index. Par défaut : `<ARTIFACTS_DIR>/search_index.npz`.
+
+    Returns:
+        BM25Index or None: L'index, ou None s'il est absent ou illisible.
+    """
+    path = path or _default_path()
+    fingerprint = source_fingerprint(path)
+    if fingerprint is None:
+        return None
+    try:
+        return search_cache.get_or_compute(("file", path), fingerprint, lambda: BM25Index.load(path))
+    except Exception as e:
+        logger.error(f"Index de recherche illisible ({path}) : {e}")
+        return None
+
+
+def get_search_index(df: pd.DataFrame, fingerprint: Optional[str] = None,
+                     path: Optional[str] = None,
+                     fetch_text: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None) -> BM25Index:
+    """
+    Retourne l'index de recherche couvrant les recettes de `df`.
+
+    L'index enregistré (construit par `scripts/build_artifacts.py` ou par les scripts
+    d'ingestion) est rechargé puis complété en mémoire avec les recettes manquantes ;
+    le fichier n'est jamais réécrit depuis une page.
+
+    Args:
+        df (pd.DataFrame): Recettes à couvrir.
+        fingerprint (str, optional): Empreinte de `df` ; sans empreinte, aucun cache en mémoire.
+        path (str, optional): Fichier de l'index. Par défaut : `<ARTIFACTS_DIR>/search_index.npz`.
+        fetch_text (Callable, optional): Complète les recettes à indexer avec leurs colonnes de
+            texte ; seules les recettes absentes de l'index sont complétées.
+
+    Returns:
+        BM25Index: L'index.
+    """
+    path = path or _default_path()
+
+    def load_or_build() -> BM25Index:
+        index = load_search_index(path)
+        if index is None:
+            return BM25Index.build(df if fetch_text is None else fetch_text(df))
+        return index.update(df, fetch_text=fetch_text)
+
+    return search_cache.get_or_compute(("bm25", fingerprint), fingerprint, load_or_build)
+
+
+def update_search_index(recipes: pd.DataFrame, path: Optional[str] = None) -> BM25Index:
+    """
+    Ajoute des recettes à l'index enregistré ; point d'entrée des scripts d'ingestion.
+
+    Args:
+        recipes (pd.DataFrame): Recettes ingérées (colonnes 'id', 'name', 'description', 'steps').
+        path (str, optional): Fichier de l'index. Par défaut : `<ARTIFACTS_DIR>/search_index.npz`.
+
+    Returns:
+        BM25Index: L'index enregistré.
+    """
+    path = path or _default_path()
+    index = load_search_index(path)
+    updated = BM25Index.build(recipes) if index is None else index.update(recipes)
+    if updated is not index:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        updated.save(path)
+    return updated
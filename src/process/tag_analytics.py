@@ -0,0 +1,179 @@
+"""
+Analyse des tags à partir d'une matrice creuse recettes × tags.
+
+La matrice d'incidence X (CSR, une ligne par recette, une colonne par tag) est
+construite une seule fois par jeu de données, lignes triées par date de
+soumission. On en déduit :
+
+- la fréquence des tags : somme des colonnes de X ;
+- la matrice de co-occurrence : X.T @ X (creuse, diagonale = fréquences) ;
+- l'association entre deux tags a et b, sur N recettes :
+  lift = N × n(a, b) / (n(a) × n(b)) et PMI = log2(lift) ;
+- les comptes d'une plage de dates : découpage contigu des lignes de X.
+"""
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.utils.coded_columns import CodedListColumn, encode_list_column
+from src.utils.fingerprint import FingerprintCache
+
+logger = logging.getLogger(__name__)
+
+# Matrice recettes x tags de la session
+tag_matrix_cache = FingerprintCache("tag_matrix", max_entries=4)
+
+
+class TagMatrix:
+    """
+    Matrice d'incidence recettes × tags, lignes triées par date.
+
+    Args:
+        matrix (sparse.csr_matrix): Matrice binaire (n_recettes, n_tags).
+        vocabulary (np.ndarray): Tag de chaque colonne.
+        dates (np.ndarray, optional): Date (datetime64) de chaque ligne, croissante.
+    """
+
+    def __init__(self, matrix: sparse.csr_matrix, vocabulary: np.ndarray,
+                 dates: Optional[np.ndarray] = None):
+        """
+        Initialise la matrice.
+
+        Args:
+            matrix (sparse.csr_matrix): Matrice binaire (n_recettes, n_tags).
+            vocabulary (np.ndarray): Tag de chaque colonne.
+            dates (np.ndarray, optional): Date de chaque ligne, triée.
+        """
+        self.matrix = matrix
+        self.vocabulary = vocabulary
+        self.dates = dates
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, date_column: str = 'submitted',
+                   coded: Optional[CodedListColumn] = None) -> "TagMatrix":
+        """
+        Construit la matrice à partir d'un DataFrame de recettes.
+
+        Args:
+            df (pd.DataFrame): Recettes (colonne 'tags' ou 'tags_list').
+            date_column (str, optional): Colonne de date servant à trier les lignes.
+            coded (CodedListColumn, optional): Colonne 'tags' déjà encodée.
+
+        Returns:
+            TagMatrix: La matrice.
+        """
+        coded = coded if coded is not None else encode_list_column(df, 'tags')
+        dates = None
+        if date_column in df.columns:
+            dates = pd.to_datetime(df[date_column]).to_numpy()
+            order = np.argsort(dates, kind="stable")
+            coded, dates = coded.take(order), dates[order]
+        return cls(coded.to_csr(), coded.vocabulary, dates)
+
+    @property
+    def n_recipes(self) -> int:
+        """Nombre de recettes (lignes)."""
+        return self.matrix.shape[0]
+
+    def rows_between(self, date_start=None, date_end=None) -> slice:
+        """
+        Lignes d'une plage de dates (bornes incluses).
+
+        Args:
+            date_start (optional): Date de début. Par défaut : sans borne.
+            date_end (optional): Date de fin. Par défaut : sans borne.
+
+        Returns:
+            slice: Tranche contiguë des lignes de la matrice.
+        """
+        if self.dates is None or (date_start is None and date_end is None):
+            return slice(0, self.n_recipes)
+        lo = 0 if date_start is None else np.searchsorted(
+            self.dates, np.datetime64(pd.Timestamp(date_start)), side="left")
+        hi = self.n_recipes if date_end is None else np.searchsorted(
+            self.dates, np.datetime64(pd.Timestamp(date_end)), side="right")
+        return slice(int(lo), int(hi))
+
+    def _rows(self, rows: Optional[slice]) -> sparse.csr_matrix:
+        return self.matrix if rows is None else self.matrix[rows]
+
+    def frequencies(self, rows: Optional[slice] = None) -> pd.Series:
+        """
+        Nombre de recettes portant chaque tag, par ordre décroissant.
+
+        Args:
+            rows (slice, optional): Lignes à compter (`rows_between`). Par défaut : toutes.
+
+        Returns:
+            pd.Series: Comptes indexés par tag, sans les tags absents.
+        """
+        counts = np.asarray(self._rows(rows).sum(axis=0)).ravel().astype(np.int64)
+        order = np.argsort(-counts, kind="stable")
+        order = order[counts[order] > 0]
+        return pd.Series(counts[order], index=self.vocabulary[order], name="count")
+
+    def cooccurrence(self, rows: Optional[slice] = None) -> sparse.csr_matrix:
+        """
+        Matrice de co-occurrence des tags (X.T @ X).
+
+        Args:
+            rows (slice, optional): Lignes prises en compte. Par défaut : toutes.
+
+        Returns:
+            sparse.csr_matrix: Matrice (n_tags, n_tags) ; la diagonale contient les fréquences.
+        """
+        x = self._rows(rows)
+        return (x.T @ x).tocsr()
+
+    def associations(self, rows: Optional[slice] = None, min_count: int = 5,
+                     top_n: Optional[int] = 50, sort_by: str = 'Lift') -> pd.DataFrame:
+        """
+        Paires de tags les plus associées.
+
+        Args:
+            rows (slice, optional): Lignes prises en compte. Par défaut : toutes.
+            min_count (int, optional): Nombre minimal de recettes communes d'une paire.
+            top_n (int, optional): Nombre de paires retournées (None : toutes).
+            sort_by (str, optional): Colonne de tri ('Lift', 'PMI', 'Co-occurrences').
+
+        Returns:
+            pd.DataFrame: Colonnes 'Tag A', 'Tag B', 'Co-occurrences', 'Support', 'Lift', 'PMI'.
+        """
+        n = self._rows(rows).shape[0]
+        co = self.cooccurrence(rows)
+        frequencies = co.diagonal().astype(np.float64)
+        pairs = sparse.triu(co, k=1).tocoo()
+        keep = pairs.data >= min_count
+        a, b, counts = pairs.row[keep], pairs.col[keep], pairs.data[keep].astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lift = counts * n / (frequencies[a] * frequencies[b])
+        result = pd.DataFrame({
+            'Tag A': self.vocabulary[a],
+            'Tag B': self.vocabulary[b],
+            'Co-occurrences': counts.astype(np.int64),
+            'Support': counts / n if n else counts,
+            'Lift': lift,
+            'PMI': np.log2(lift),
+        })
+        result = result.sort_values(sort_by, ascending=False, kind="stable").reset_index(drop=True)
+        return result if top_n is None else result.head(top_n)
+
+
+def get_tag_matrix(df: pd.DataFrame, fingerprint: Optional[str] = None,
+                   coded: Optional[CodedListColumn] = None) -> TagMatrix:
+    """
+    Retourne la matrice recettes × tags, mise en cache par empreinte du jeu de données.
+
+    Args:
+        df (pd.DataFrame): Recettes.
+        fingerprint (str, optional): Empreinte de `df` ; sans empreinte, aucun cache.
+        coded (CodedListColumn, optional): Colonne 'tags' déjà encodée.
+
+    Returns:
+        TagMatrix: La matrice.
+    """
+    return tag_matrix_cache.get_or_compute(
+        ("tags", fingerprint), fingerprint, lambda: TagMatrix.from_frame(df, coded=coded))
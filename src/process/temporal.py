@@ -0,0 +1,166 @@
+"""
+Histogramme temporel des soumissions de recettes, calculé en une passe.
+
+Les dates sont converties une fois en numéros de jour entiers, triées, puis
+comptées par jour avec `np.bincount`. Les distributions par année, mois, jour de
+la semaine et semaine s'en déduisent sur le calendrier de la période (quelques
+milliers de jours) et non plus sur les recettes. Une plage de dates est une
+tranche du tableau trié, trouvée par recherche dichotomique ; les comptes
+restent exacts lorsque les dates comportent une heure.
+"""
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.fingerprint import FingerprintCache
+
+logger = logging.getLogger(__name__)
+
+NS_PER_DAY = 86_400 * 10**9
+
+# Un histogramme par colonne de dates ('submitted' ou 'date')
+temporal_cache = FingerprintCache("temporal_histogram", max_entries=8)
+
+
+def _as_dict(keys: np.ndarray, counts: np.ndarray) -> Dict[int, int]:
+    present = counts > 0
+    return dict(zip(keys[present].tolist(), counts[present].astype(np.int64).tolist()))
+
+
+class TemporalHistogram:
+    """
+    Dates de soumission triées et leur histogramme journalier.
+
+    Args:
+        values (np.ndarray): Dates en nanosecondes depuis l'epoch (int64), triées, sans NaT.
+    """
+
+    def __init__(self, values: np.ndarray):
+        """
+        Construit l'histogramme journalier.
+
+        Args:
+            values (np.ndarray): Dates en nanosecondes (int64), triées.
+        """
+        self.values = values
+        self.days = values // NS_PER_DAY
+        self.first_day = int(self.days[0]) if len(values) else 0
+        self.daily = np.bincount(self.days - self.first_day) if len(values) else np.zeros(0, dtype=np.int64)
+        # Sans heure dans les dates, un jour est entièrement dans une plage ou hors de celle-ci
+        self.whole_days = bool(np.all(values % NS_PER_DAY == 0))
+
+    @classmethod
+    def from_series(cls, dates: pd.Series) -> "TemporalHistogram":
+        """
+        Construit l'histogramme d'une colonne de dates.
+
+        Args:
+            dates (pd.Series): Dates de soumission (les valeurs manquantes sont ignorées).
+
+        Returns:
+            TemporalHistogram: L'histogramme.
+        """
+        values = pd.to_datetime(dates).to_numpy(dtype="datetime64[ns]")
+        values = values[~np.isnat(values)].view(np.int64)
+        return cls(np.sort(values, kind="stable"))
+
+    def window(self, date_start=None, date_end=None) -> slice:
+        """
+        Tranche des dates triées comprises dans une plage (bornes incluses).
+
+        Args:
+            date_start (optional): Début de la plage. Par défaut : sans borne.
+            date_end (optional): Fin de la plage. Par défaut : sans borne.
+
+        Returns:
+            slice: Tranche de `values`.
+        """
+        lo = 0 if date_start is None else int(np.searchsorted(
+            self.values, pd.Timestamp(date_start).value, side="left"))
+        hi = len(self.values) if date_end is None else int(np.searchsorted(
+            self.values, pd.Timestamp(date_end).value, side="right"))
+        return slice(lo, max(lo, hi))
+
+    def daily_counts(self, rows: slice) -> np.ndarray:
+        """
+        Nombre de soumissions par jour pour une tranche de dates.
+
+        Args:
+            rows (slice): Tranche de `values` (`window`).
+
+        Returns:
+            np.ndarray: Comptes du jour de la première date à celui de la dernière.
+        """
+        if rows.stop <= rows.start:
+            return np.zeros(0, dtype=np.int64)
+        first, last = int(self.days[rows.start]), int(self.days[rows.stop - 1])
+        if self.whole_days:
+            return self.daily[first - self.first_day:last - self.first_day + 1]
+        return np.bincount(self.days[rows] - first, minlength=last - first + 1)
+
+    def distribution(self, date_start=None, date_end=None) -> dict:
+        """
+        Statistiques temporelles d'une plage de dates.
+
+        Args:
+            date_start (optional): Début de la plage (inclus).
+            date_end (optional): Fin de la plage (incluse).
+
+        Returns:
+            dict: 'date_min', 'date_max', 'total_days', 'submissions_per_year',
+                'submissions_per_month', 'submissions_per_weekday' (lundi = 0) ainsi que
+                'submissions_per_day' et 'submissions_per_week' (pd.Series indexées par date,
+                la semaine par son lundi).
+        """
+        rows = self.window(date_start, date_end)
+        daily = self.daily_counts(rows)
+        if len(daily) == 0:
+            empty = pd.Series(dtype=np.int64)
+            return {
+                'date_min': pd.NaT, 'date_max': pd.NaT, 'total_days': (pd.NaT - pd.NaT).days,
+                'submissions_per_year': {}, 'submissions_per_month': {}, 'submissions_per_weekday': {},
+                'submissions_per_day': empty, 'submissions_per_week': empty,
+            }
+        days = self.days[rows.start] + np.arange(len(daily))
+        calendar = days.astype("datetime64[D]")
+        years = calendar.astype("datetime64[Y]").astype(np.int64) + 1970
+        months = calendar.astype("datetime64[M]").astype(np.int64) % 12 + 1
+        # Le 1er janvier 1970 (jour 0) est un jeudi
+        weekdays = (days + 3) % 7
+        weeks = (days - weekdays - (days[0] - weekdays[0])) // 7
+        date_min = pd.Timestamp(self.values[rows.start])
+        date_max = pd.Timestamp(self.values[rows.stop - 1])
+        return {
+            'date_min': date_min,
+            'date_max': date_max,
+            'total_days': (date_max - date_min).days,
+            'submissions_per_year': _as_dict(
+                years[0] + np.arange(years[-1] - years[0] + 1),
+                np.bincount(years - years[0], weights=daily)),
+            'submissions_per_month': _as_dict(np.arange(1, 13), np.bincount(months - 1, weights=daily, minlength=12)),
+            'submissions_per_weekday': _as_dict(np.arange(7), np.bincount(weekdays, weights=daily, minlength=7)),
+            'submissions_per_day': pd.Series(daily, index=pd.DatetimeIndex(calendar), name='submissions'),
+            'submissions_per_week': pd.Series(
+                np.bincount(weeks, weights=daily).astype(np.int64),
+                index=pd.DatetimeIndex(calendar[0] - weekdays[0] + 7 * np.arange(weeks[-1] + 1)),
+                name='submissions'),
+        }
+
+
+def get_temporal_histogram(df: pd.DataFrame, fingerprint: Optional[str] = None,
+                           date_column: str = 'submitted') -> TemporalHistogram:
+    """
+    Retourne l'histogramme temporel, mis en cache par empreinte du jeu de données.
+
+    Args:
+        df (pd.DataFrame): Recettes.
+        fingerprint (str, optional): Empreinte de `df` ; sans empreinte, aucun cache.
+        date_column (str, optional): Colonne des dates de soumission.
+
+    Returns:
+        TemporalHistogram: L'histogramme.
+    """
+    return temporal_cache.get_or_compute(
+        (date_column, fingerprint), fingerprint, lambda: TemporalHistogram.from_series(df[date_column]))
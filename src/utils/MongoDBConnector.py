@@ -2,6 +2,7 @@ from pymongo import MongoClient
 import pandas as pd
 import logging
 import os
+from src.utils.fingerprint import compute_collection_fingerprint, fingerprint_digest
 # Configuration de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -141,6 +142,69 @@ class MongoDBConnector:
                           collection_name}': {e}")
             return pd.DataFrame()
 
+    def get_collection_fingerprint(self, collection_name: str, date_field: str = None) -> str:
+        """
+        Calcule l'empreinte d'une collection pour invalider les caches qui en dépendent.
+
+        L'empreinte combine le nombre de documents, l'`_id` maximal et la date maximale
+        (si `date_field` est fourni) ; elle ne coûte que trois requêtes indexées.
+
+        Args:
+            collection_name (str): Nom de la collection.
+            date_field (str, optional): Champ date à suivre ('submitted', 'date'...).
+
+        Returns:
+            str: Condensé de l'empreinte de la collection.
+
+        Raises:
+            Exception: Si la connexion à MongoDB n'a pas été établie avant l'appel de cette méthode.
+        """
+        if self.db is None:
+            logging.error(
+                "La connexion à MongoDB n'a pas été initialisée. Appelez `connect()` en premier.")
+            raise Exception("La connexion à MongoDB n'a pas été initialisée. Appelez `connect()` en premier.")
+
+        fingerprint = compute_collection_fingerprint(
+            self.db[collection_name], date_field)
+        return fingerprint_digest(self.database_name, collection_name, fingerprint)
+
+    def load_documents_by_ids(
+        self,
+        collection_name: str,
+        ids,
+        id_field: str = 'id',
+        columns: list = None
+    ) -> pd.DataFrame:
+        """
+        Charge quelques documents par identifiant avec une requête `$in`.
+
+        Sert au chargement paresseux des colonnes de texte volumineuses (`steps`,
+        `description`, `review`) : seuls les documents et les champs demandés sont
+        transférés depuis MongoDB.
+
+        Args:
+            collection_name (str): Nom de la collection.
+            ids (Iterable[int]): Identifiants recherchés.
+            id_field (str, optional): Champ identifiant. Par défaut : 'id'.
+            columns (list, optional): Champs à projeter en plus de l'identifiant.
+                Par défaut : None, pour tous les champs.
+
+        Returns:
+            pd.DataFrame: Documents trouvés, sans la colonne `_id`.
+
+        Raises:
+            Exception: Si la connexion à MongoDB n'a pas été établie avant l'appel de cette méthode.
+        """
+        ids = [int(i) for i in ids]
+        fields = None
+        if columns:
+            fields = {field: 1 for field in [id_field, *columns]}
+            fields['_id'] = 0
+        if not ids:
+            return pd.DataFrame(columns=[id_field, *(columns or [])])
+        return self.load_collection_as_dataframe(
+            collection_name, query={id_field: {"$in": ids}}, fields=fields)
+
     def close(self):
         """
         Ferme la connexion à MongoDB.
@@ -0,0 +1,237 @@
+"""
+Lecture des artefacts prétraités produits à la construction de l'image.
+
+Le script `scripts/build_artifacts.py` convertit une fois pour toutes les CSV
+Food.com en tables Arrow typées (triées par date), en résumés mensuels fusionnables,
+en modèles ajustés (TF-IDF, StandardScaler) et en résultats de clustering.
+L'application les ouvre ici par projection mémoire : aucun CSV n'est analysé
+et aucun modèle n'est ajusté pendant la première session utilisateur.
+
+Un manifeste (`manifest.json`) enregistre l'empreinte de chaque CSV source ;
+un artefact n'est utilisé que si le CSV correspondant n'a pas changé depuis.
+"""
+import json
+import logging
+import os
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.fingerprint import FingerprintCache, compute_file_fingerprint, file_fingerprint, fingerprint_digest
+
+logger = logging.getLogger(__name__)
+
+# Répertoire par défaut des artefacts
+ARTIFACTS_DIR = os.getenv("DIR_ARTIFACTS", "./data/artifacts")
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Fichiers sources et tables Arrow correspondantes (colonne de date de tri)
+RECIPES_FILE = "RAW_recipes.csv"
+INTERACTIONS_FILE = "RAW_interactions.csv"
+SOURCE_TABLES = {
+    RECIPES_FILE: ("recipes", "submitted"),
+    INTERACTIONS_FILE: ("interactions", "date"),
+}
+
+NUTRITION_COLUMNS = ['calories', 'total_fat', 'sugar',
+                     'sodium', 'protein', 'saturated_fat', 'carbohydrates']
+NUMERIC_FEATURES = ['minutes', 'n_ingredients', 'n_steps']
+
+# Magasins ouverts, par empreinte du manifeste : il n'est relu qu'après une reconstruction
+store_cache = FingerprintCache("artifact_stores", max_entries=4)
+
+
+def source_fingerprint(path: str) -> Optional[str]:
+    """
+    Empreinte d'un CSV source, indépendante de son chemin absolu.
+
+    Args:
+        path (str): Chemin du fichier.
+
+    Returns:
+        str or None: Condensé de l'empreinte, ou None si le fichier est inaccessible.
+    """
+    fingerprint = compute_file_fingerprint(path)
+    return None if fingerprint is None else fingerprint_digest(fingerprint)
+
+
+class ArtifactStore:
+    """
+    Accès en lecture, par projection mémoire, aux artefacts prétraités.
+
+    Args:
+        directory (str): Répertoire contenant `manifest.json` et les artefacts.
+
+    Attributes:
+        manifest (dict): Contenu du manifeste.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Ouvre le répertoire d'artefacts.
+
+        Args:
+            directory (str): Répertoire des artefacts.
+        """
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as handle:
+            self.manifest = json.load(handle)
+        self._id_index = None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def is_fresh(self, source_path: str) -> bool:
+        """
+        Indique si les artefacts issus d'un CSV source sont à jour.
+
+        Args:
+            source_path (str): Chemin du CSV source.
+
+        Returns:
+            bool: True si le CSV a été prétraité et n'a pas changé depuis.
+        """
+        expected = self.manifest.get("sources", {}).get(os.path.basename(source_path))
+        return expected is not None and expected == source_fingerprint(source_path)
+
+    def read_table(self, name: str, columns: Optional[Iterable[str]] = None):
+        """
+        Ouvre une table Arrow par projection mémoire (sans copie).
+
+        Args:
+            name (str): Nom de la table ('recipes', 'interactions', 'clusters').
+            columns (Iterable[str], optional): Colonnes à conserver. Par défaut : toutes.
+
+        Returns:
+            pyarrow.Table: La table.
+        """
+        import pyarrow as pa
+
+        source = pa.memory_map(self._path(f"{name}.arrow"), "r")
+        table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select([col for col in columns if col in table.column_names])
+        return table
+
+    def read_range(self, name: str, date_column: str, date_start, date_end,
+                   columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Lit les lignes d'une table comprises dans un intervalle de dates.
+
+        Les tables étant triées par date, l'intervalle est localisé par recherche
+        dichotomique puis découpé sans copie. Les colonnes numériques et de dates du
+        DataFrame restent des vues en lecture seule sur la projection mémoire ; seules
+        les colonnes de chaînes sont converties.
+
+        Args:
+            name (str): Nom de la table.
+            date_column (str): Colonne de date ('submitted' ou 'date').
+            date_start (datetime): Date de début (incluse).
+            date_end (datetime): Date de fin (incluse).
+            columns (Iterable[str], optional): Colonnes à charger ; la colonne de date est toujours incluse.
+
+        Returns:
+            pd.DataFrame: Les lignes de l'intervalle, index réinitialisé.
+        """
+        if columns is not None:
+            columns = list(dict.fromkeys([*columns, date_column]))
+        table = self.read_table(name, columns)
+        dates = table.column(date_column).to_numpy()
+        start = np.searchsorted(dates, np.datetime64(pd.Timestamp(date_start)), side="left")
+        end = np.searchsorted(dates, np.datetime64(pd.Timestamp(date_end)), side="right")
+        return table.slice(start, end - start).to_pandas(split_blocks=True)
+
+    def load_array(self, name: str) -> np.ndarray:
+        """
+        Ouvre un tableau NumPy par projection mémoire.
+
+        Args:
+            name (str): Nom du tableau ('nutrition', 'recipe_ids', 'numeric_features'...).
+
+        Returns:
+            np.ndarray: Le tableau en lecture seule.
+        """
+        return np.load(self._path(f"{name}.npy"), mmap_mode="r")
+
+    def load_sparse(self, name: str):
+        """
+        Reconstruit une matrice CSR à partir de ses tableaux projetés en mémoire.
+
+        Args:
+            name (str): Nom de la matrice ('ingredient_matrix').
+
+        Returns:
+            scipy.sparse.csr_matrix: La matrice.
+        """
+        from scipy.sparse import csr_matrix
+
+        shape = tuple(self.manifest["sparse"][name])
+        return csr_matrix((self.load_array(f"{name}.data"),
+                           self.load_array(f"{name}.indices"),
+                           self.load_array(f"{name}.indptr")), shape=shape, copy=False)
+
+    def load_model(self, name: str):
+        """
+        Charge un modèle scikit-learn ajusté ('tfidf', 'scaler').
+
+        Args:
+            name (str): Nom du modèle.
+
+        Returns:
+            Le modèle désérialisé.
+        """
+        import joblib
+
+        return joblib.load(self._path(f"{name}.joblib"))
+
+    def recipe_rows(self, recipe_ids: Iterable[int]) -> Optional[np.ndarray]:
+        """
+        Positions de recettes dans les artefacts alignés sur la table 'recipes'.
+
+        Args:
+            recipe_ids (Iterable[int]): Identifiants de recettes.
+
+        Returns:
+            np.ndarray or None: Positions des lignes, ou None si un identifiant est absent.
+        """
+        if self._id_index is None:
+            ids = np.asarray(self.load_array("recipe_ids"))
+            order = np.argsort(ids, kind="stable")
+            self._id_index = (ids[order], order)
+        sorted_ids, order = self._id_index
+        wanted = np.asarray(list(recipe_ids), dtype=sorted_ids.dtype)
+        positions = np.minimum(np.searchsorted(sorted_ids, wanted), max(len(sorted_ids) - 1, 0))
+        if len(sorted_ids) == 0 or not np.array_equal(sorted_ids[positions], wanted):
+            return None
+        return order[positions]
+
+
+def get_artifact_store(directory: Optional[str] = None) -> Optional[ArtifactStore]:
+    """
+    Ouvre les artefacts prétraités s'ils ont été construits.
+
+    Args:
+        directory (str, optional): Répertoire des artefacts. Par défaut : `ARTIFACTS_DIR`.
+
+    Returns:
+        ArtifactStore or None: Le magasin, ou None s'il est absent, illisible ou d'une autre version.
+    """
+    directory = directory or ARTIFACTS_DIR
+    fingerprint = file_fingerprint(os.path.join(directory, MANIFEST_FILE))
+    if fingerprint is None:
+        return None
+
+    def open_store() -> Optional[ArtifactStore]:
+        try:
+            store = ArtifactStore(directory)
+        except Exception as e:
+            logger.error(f"Artefacts illisibles dans {directory} : {e}")
+            return None
+        if store.manifest.get("version") != MANIFEST_VERSION:
+            logger.warning(f"Artefacts de {directory} ignorés : version différente.")
+            return None
+        return store
+
+    return store_cache.get_or_compute(os.path.abspath(directory), fingerprint, open_store)
@@ -0,0 +1,215 @@
+"""
+Encodage des colonnes de listes (tags, ingrédients...) en tableaux d'entiers.
+
+Une colonne dont chaque cellule est une liste de chaînes est convertie une fois
+au format CSR :
+
+- `vocabulary` : valeurs distinctes (tableau d'objets) ;
+- `codes` : code (int32) de chaque élément, listes mises bout à bout ;
+- `indptr` : position (int64) du début de la liste de chaque ligne.
+
+Les comptages, valeurs distinctes, matrices recette×valeur et index inversés se
+calculent ensuite avec NumPy (`np.bincount`, découpages) au lieu de parcourir des
+listes Python. Les colonnes stockées sous forme de chaînes (déploiement local)
+sont analysées avec `ast.literal_eval`, sauf si la colonne `<colonne>_list` déjà
+analysée par `Recipe` est disponible.
+"""
+import ast
+import logging
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.fingerprint import FingerprintCache
+
+logger = logging.getLogger(__name__)
+
+# Cache des colonnes encodées, partagé par les analyses d'une même session
+_coded_cache = FingerprintCache("coded_columns", max_entries=32)
+
+
+def _parse_cell(value) -> list:
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return list(value)
+    if isinstance(value, str):
+        try:
+            parsed = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return [value]
+        return list(parsed) if isinstance(parsed, (list, tuple)) else [parsed]
+    return []
+
+
+def is_list_column(series: pd.Series) -> bool:
+    """
+    Indique si une colonne contient des listes Python (et non des chaînes à évaluer).
+
+    Args:
+        series (pd.Series): Colonne à inspecter.
+
+    Returns:
+        bool: True si la première valeur non nulle est une liste.
+    """
+    if series.dtype != object:
+        return False
+    non_null = series.dropna()
+    return len(non_null) > 0 and isinstance(non_null.iloc[0], (list, tuple, np.ndarray))
+
+
+class CodedListColumn:
+    """
+    Colonne de listes encodée au format CSR.
+
+    Args:
+        indptr (np.ndarray): Début de la liste de chaque ligne (n_lignes + 1 valeurs).
+        codes (np.ndarray): Codes des éléments, listes mises bout à bout.
+        vocabulary (np.ndarray): Valeur correspondant à chaque code.
+    """
+
+    def __init__(self, indptr: np.ndarray, codes: np.ndarray, vocabulary: np.ndarray):
+        """
+        Initialise la colonne encodée.
+
+        Args:
+            indptr (np.ndarray): Début de la liste de chaque ligne.
+            codes (np.ndarray): Codes des éléments.
+            vocabulary (np.ndarray): Valeurs distinctes.
+        """
+        self.indptr = indptr
+        self.codes = codes
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_lists(cls, lists: Iterable) -> "CodedListColumn":
+        """
+        Encode une séquence de listes (ou de chaînes représentant des listes).
+
+        Args:
+            lists (Iterable): Une liste par ligne.
+
+        Returns:
+            CodedListColumn: La colonne encodée.
+        """
+        parsed = [_parse_cell(value) for value in lists]
+        lengths = np.fromiter((len(items) for items in parsed), dtype=np.int64, count=len(parsed))
+        indptr = np.zeros(len(parsed) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        flat = np.empty(int(indptr[-1]), dtype=object)
+        flat[:] = [item for items in parsed for item in items]
+        codes, vocabulary = pd.factorize(flat, sort=True)
+        return cls(indptr, codes.astype(np.int32), np.asarray(vocabulary, dtype=object))
+
+    @property
+    def n_rows(self) -> int:
+        """Nombre de lignes."""
+        return len(self.indptr) - 1
+
+    @property
+    def n_distinct(self) -> int:
+        """Nombre de valeurs distinctes."""
+        return len(self.vocabulary)
+
+    def lengths(self) -> np.ndarray:
+        """Longueur de la liste de chaque ligne."""
+        return np.diff(self.indptr)
+
+    def row_ids(self) -> np.ndarray:
+        """Numéro de ligne de chaque élément de `codes`."""
+        return np.repeat(np.arange(self.n_rows, dtype=np.int64), self.lengths())
+
+    def take(self, rows: np.ndarray) -> "CodedListColumn":
+        """
+        Sous-ensemble de lignes, avec le même vocabulaire.
+
+        Args:
+            rows (np.ndarray): Positions (ou masque booléen) des lignes à conserver.
+
+        Returns:
+            CodedListColumn: La colonne restreinte.
+        """
+        rows = np.flatnonzero(rows) if np.asarray(rows).dtype == bool else np.asarray(rows)
+        starts, ends = self.indptr[rows], self.indptr[rows + 1]
+        lengths = ends - starts
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        offsets = np.repeat(starts - indptr[:-1], lengths)
+        codes = self.codes[np.arange(indptr[-1], dtype=np.int64) + offsets]
+        return CodedListColumn(indptr, codes, self.vocabulary)
+
+    def counts(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Nombre d'occurrences de chaque valeur du vocabulaire.
+
+        Args:
+            rows (np.ndarray, optional): Lignes à compter. Par défaut : toutes.
+
+        Returns:
+            np.ndarray: Un compte par code.
+        """
+        codes = self.codes if rows is None else self.take(rows).codes
+        return np.bincount(codes, minlength=self.n_distinct)
+
+    def value_counts(self, rows: Optional[np.ndarray] = None) -> pd.Series:
+        """
+        Comptage des valeurs trié par fréquence décroissante (équivalent de `value_counts`).
+
+        Args:
+            rows (np.ndarray, optional): Lignes à compter. Par défaut : toutes.
+
+        Returns:
+            pd.Series: Nombre d'occurrences indexé par valeur, sans les valeurs absentes.
+        """
+        counts = self.counts(rows)
+        order = np.argsort(-counts, kind="stable")
+        order = order[counts[order] > 0]
+        return pd.Series(counts[order], index=self.vocabulary[order], name="count")
+
+    def to_csr(self):
+        """
+        Matrice creuse binaire lignes × valeurs.
+
+        Returns:
+            scipy.sparse.csr_matrix: Matrice (n_lignes, n_valeurs) de 0/1.
+        """
+        from scipy.sparse import csr_matrix
+
+        data = np.ones(len(self.codes), dtype=np.float32)
+        matrix = csr_matrix((data, self.codes, self.indptr),
+                            shape=(self.n_rows, self.n_distinct))
+        matrix.sum_duplicates()
+        matrix.data[:] = 1
+        return matrix
+
+
+def encode_list_column(df: pd.DataFrame, column: str) -> CodedListColumn:
+    """
+    Encode une colonne de listes d'un DataFrame, en réutilisant `<colonne>_list` si présente.
+
+    Args:
+        df (pd.DataFrame): Données.
+        column (str): Colonne à encoder ('tags', 'ingredients'...).
+
+    Returns:
+        CodedListColumn: La colonne encodée.
+    """
+    source = df[f"{column}_list"] if f"{column}_list" in df.columns else df[column]
+    return CodedListColumn.from_lists(source.to_numpy())
+
+
+def get_coded_column(df: pd.DataFrame, column: str,
+                     fingerprint: Optional[str] = None) -> CodedListColumn:
+    """
+    Retourne la colonne encodée, mise en cache par empreinte du jeu de données.
+
+    Args:
+        df (pd.DataFrame): Données.
+        column (str): Colonne à encoder.
+        fingerprint (str, optional): Empreinte de `df` (`Recipe.get_fingerprint()`).
+            Sans empreinte, la colonne est encodée sans cache.
+
+    Returns:
+        CodedListColumn: La colonne encodée.
+    """
+    return _coded_cache.get_or_compute((column, fingerprint), fingerprint,
+                                       lambda: encode_list_column(df, column))
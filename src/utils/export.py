@@ -0,0 +1,284 @@
+"""
+Export en continu (par blocs) des données de recettes vers un fichier temporaire.
+
+Au lieu de construire l'export complet sous forme de chaîne Python, les lignes sont
+écrites par blocs dans un fichier : la mémoire supplémentaire reste bornée par la
+taille d'un bloc. Quatre formats sont pris en charge :
+
+- CSV et JSON (tableau d'enregistrements) ;
+- Parquet et Arrow IPC (Feather v2), compressés, qui conservent les types.
+
+Les colonnes de listes (`tags`, `ingredients`, `nutrition`, `steps`) déjà analysées
+par `Recipe` dans les colonnes `<colonne>_list` sont réutilisées telles quelles pour
+les formats typés, plutôt que de réexporter les chaînes brutes à évaluer.
+
+Les colonnes de texte volumineuses (`steps`, `description`), laissées sur disque par
+`Recipe`, sont lues bloc par bloc via `fetch_text` au moment d'écrire chaque bloc.
+
+`cached_export` conserve les fichiers écrits, nommés d'après l'empreinte des données :
+un export déjà préparé pour les mêmes données et le même format est réutilisé.
+"""
+import glob
+import logging
+import os
+import tempfile
+from typing import Callable, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Nombre de lignes écrites par bloc
+EXPORT_CHUNK_ROWS = 50_000
+# Codec utilisé pour Parquet et Arrow IPC
+EXPORT_COMPRESSION = "zstd"
+# Colonnes stockées sous forme de chaînes à évaluer hors ligne, et leur version analysée
+LIST_COLUMNS = ['tags', 'ingredients', 'nutrition', 'steps']
+# Valeurs non nulles, réparties sur tout le DataFrame, d'où est déduit le type Arrow d'une colonne objet
+SCHEMA_SAMPLE_ROWS = 1000
+# Répertoire et nombre maximal des exports conservés par `cached_export`
+EXPORT_CACHE_DIR = os.getenv("DIR_EXPORT_CACHE", os.path.join(tempfile.gettempdir(), "recipes_exports"))
+EXPORT_CACHE_SIZE = int(os.getenv("EXPORT_CACHE_SIZE", "8"))
+
+# Complète des lignes (avec leur 'id') par leurs colonnes de texte, comme `Recipe.with_text`
+FetchText = Callable[[pd.DataFrame], pd.DataFrame]
+
+# Format -> (extension, type MIME)
+EXPORT_FORMATS: Dict[str, tuple] = {
+    "CSV": ("csv", "text/csv"),
+    "JSON": ("json", "application/json"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow": ("arrow", "application/vnd.apache.arrow.file"),
+}
+
+
+def _export_columns(chunk: pd.DataFrame, typed: bool) -> pd.DataFrame:
+    """
+    Prépare un bloc pour l'export.
+
+    Les colonnes auxiliaires `<colonne>_list` sont retirées ; pour les formats typés,
+    elles remplacent la colonne brute correspondante.
+
+    Args:
+        chunk (pd.DataFrame): Bloc de lignes.
+        typed (bool): True pour les formats qui conservent les listes (JSON, Parquet, Arrow).
+
+    Returns:
+        pd.DataFrame: Le bloc à écrire.
+    """
+    parsed = {col: f"{col}_list" for col in LIST_COLUMNS if f"{col}_list" in chunk.columns}
+    if not parsed:
+        return chunk
+    if typed:
+        chunk = chunk.assign(**{col: chunk[list_col] for col, list_col in parsed.items()})
+    return chunk.drop(columns=list(parsed.values()))
+
+
+def iter_chunks(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS, typed: bool = False,
+                fetch_text: Optional[FetchText] = None) -> Iterator[pd.DataFrame]:
+    """
+    Découpe un DataFrame en blocs prêts à être exportés.
+
+    Args:
+        df (pd.DataFrame): Données à exporter.
+        chunk_rows (int, optional): Nombre de lignes par bloc.
+        typed (bool, optional): Réutiliser les colonnes de listes analysées.
+        fetch_text (Callable, optional): Complète un bloc avec ses colonnes de texte, lues
+            par identifiant (`Recipe.with_text`). Par défaut : aucune colonne ajoutée.
+
+    Yields:
+        pd.DataFrame: Blocs successifs (un bloc vide si `df` est vide).
+    """
+    if len(df) == 0:
+        yield _export_columns(df if fetch_text is None else fetch_text(df), typed)
+        return
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        if fetch_text is not None:
+            chunk = fetch_text(chunk)
+        yield _export_columns(chunk, typed)
+
+
+def _write_csv(df: pd.DataFrame, path: str, chunk_rows: int, fetch_text: Optional[FetchText]) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        for i, chunk in enumerate(iter_chunks(df, chunk_rows, fetch_text=fetch_text)):
+            chunk.to_csv(handle, header=(i == 0), index=False)
+
+
+def _write_json(df: pd.DataFrame, path: str, chunk_rows: int, fetch_text: Optional[FetchText]) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write("[")
+        first = True
+        for chunk in iter_chunks(df, chunk_rows, typed=True, fetch_text=fetch_text):
+            records = chunk.to_json(orient="records", date_format="iso")[1:-1]
+            if not records:
+                continue
+            if not first:
+                handle.write(",")
+            handle.write(records)
+            first = False
+        handle.write("]")
+
+
+def _spread(n_rows: int, sample_rows: int) -> np.ndarray:
+    # Positions réparties uniformément sur toutes les lignes
+    return np.unique(np.linspace(0, max(n_rows - 1, 0), num=min(sample_rows, n_rows)).astype(np.int64))
+
+
+def arrow_schema(df: pd.DataFrame, sample_rows: int = SCHEMA_SAMPLE_ROWS,
+                 fetch_text: Optional[FetchText] = None):
+    """
+    Schéma Arrow de l'export typé d'un DataFrame, déduit du DataFrame complet.
+
+    Les colonnes typées suivent leur dtype ; le type d'une colonne objet (chaînes,
+    listes) est déduit de valeurs non nulles réparties sur toutes les lignes, et non
+    du premier bloc, qui peut ne contenir que des valeurs manquantes ou des listes vides.
+    Les colonnes ajoutées par `fetch_text` sont typées d'après un échantillon de lignes
+    réparties de la même façon ; une colonne de texte sans valeur est typée en chaîne.
+
+    Args:
+        df (pd.DataFrame): Données à exporter.
+        sample_rows (int, optional): Nombre de valeurs examinées par colonne objet.
+        fetch_text (Callable, optional): Complète des lignes avec leurs colonnes de texte.
+
+    Returns:
+        pa.Schema: Schéma commun à tous les blocs.
+    """
+    import pyarrow as pa
+
+    sample = None
+    if fetch_text is not None:
+        sample = fetch_text(df.iloc[_spread(len(df), sample_rows)])
+    sources = {col: f"{col}_list" for col in LIST_COLUMNS if f"{col}_list" in df.columns}
+    header = df.iloc[:0] if sample is None else sample.iloc[:0]
+    fields = []
+    for column in _export_columns(header, typed=True).columns:
+        source = sources.get(column, column)
+        fetched = source not in df.columns
+        values = sample[source] if fetched else df[source]
+        if values.dtype == object:
+            present = values.dropna()
+            data_type = pa.array(present.iloc[_spread(len(present), sample_rows)], from_pandas=True).type
+            if fetched and pa.types.is_null(data_type):
+                data_type = pa.string()
+        else:
+            data_type = pa.Schema.from_pandas(values.iloc[:0].to_frame(), preserve_index=False).field(0).type
+        fields.append(pa.field(str(column), data_type))
+    return pa.schema(fields)
+
+
+def _write_arrow(df: pd.DataFrame, path: str, chunk_rows: int, export_format: str,
+                 compression: str, fetch_text: Optional[FetchText]) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema(df, fetch_text=fetch_text)
+    if export_format == "Parquet":
+        writer = pq.ParquetWriter(path, schema, compression=compression)
+    else:
+        writer = pa.ipc.new_file(path, schema, options=pa.ipc.IpcWriteOptions(compression=compression))
+    try:
+        for chunk in iter_chunks(df, chunk_rows, typed=True, fetch_text=fetch_text):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    finally:
+        writer.close()
+
+
+def export_dataframe(df: pd.DataFrame, export_format: str, path: Optional[str] = None,
+                     chunk_rows: int = EXPORT_CHUNK_ROWS,
+                     compression: str = EXPORT_COMPRESSION,
+                     fetch_text: Optional[FetchText] = None) -> str:
+    """
+    Exporte un DataFrame par blocs dans un fichier.
+
+    Args:
+        df (pd.DataFrame): Données à exporter.
+        export_format (str): "CSV", "JSON", "Parquet" ou "Arrow".
+        path (str, optional): Fichier de destination. Par défaut : un fichier temporaire,
+            à supprimer par l'appelant.
+        chunk_rows (int, optional): Nombre de lignes écrites par bloc.
+        compression (str, optional): Codec pour Parquet et Arrow IPC. Par défaut : "zstd".
+        fetch_text (Callable, optional): Complète chaque bloc avec ses colonnes de texte,
+            juste avant son écriture. Par défaut : aucune colonne ajoutée.
+
+    Returns:
+        str: Chemin du fichier écrit.
+
+    Raises:
+        ValueError: Si le format n'est pas pris en charge.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export non pris en charge : {export_format}")
+    if path is None:
+        extension = EXPORT_FORMATS[export_format][0]
+        fd, path = tempfile.mkstemp(prefix="recipes_export_", suffix=f".{extension}")
+        os.close(fd)
+
+    try:
+        if export_format == "CSV":
+            _write_csv(df, path, chunk_rows, fetch_text)
+        elif export_format == "JSON":
+            _write_json(df, path, chunk_rows, fetch_text)
+        else:
+            _write_arrow(df, path, chunk_rows, export_format, compression, fetch_text)
+    except Exception:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+    logger.info(f"Export {export_format} écrit dans {path} "
+                f"({os.path.getsize(path) / 1024 / 1024:.1f} Mo, {len(df)} lignes).")
+    return path
+
+
+def cached_export(fingerprint: str, export_format: str, load: Callable[[], pd.DataFrame],
+                  directory: Optional[str] = None, fetch_text: Optional[FetchText] = None) -> str:
+    """
+    Retourne l'export des données d'empreinte `fingerprint`, écrit seulement s'il est absent.
+
+    Le fichier est nommé d'après l'empreinte et le format : il est partagé par les
+    sessions qui exportent les mêmes données et ne doit pas être supprimé par l'appelant.
+    Au-delà de `EXPORT_CACHE_SIZE` fichiers, les plus anciens sont supprimés.
+
+    Args:
+        fingerprint (str): Empreinte des données exportées.
+        export_format (str): "CSV", "JSON", "Parquet" ou "Arrow".
+        load (Callable): Fonction sans argument retournant les données, appelée seulement
+            si l'export doit être écrit.
+        directory (str, optional): Répertoire des exports. Par défaut : `EXPORT_CACHE_DIR`.
+        fetch_text (Callable, optional): Complète chaque bloc avec ses colonnes de texte.
+
+    Returns:
+        str: Chemin du fichier d'export.
+
+    Raises:
+        ValueError: Si le format n'est pas pris en charge ou si l'empreinte est absente.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export non pris en charge : {export_format}")
+    if not fingerprint:
+        raise ValueError("Empreinte des données requise pour un export en cache.")
+    directory = directory or EXPORT_CACHE_DIR
+    path = os.path.join(directory, f"{fingerprint}.{EXPORT_FORMATS[export_format][0]}")
+    if os.path.exists(path):
+        logger.info(f"Export {export_format} réutilisé : {path}")
+        return path
+
+    os.makedirs(directory, exist_ok=True)
+    fd, partial_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    os.close(fd)
+    try:
+        export_dataframe(load(), export_format, partial_path, fetch_text=fetch_text)
+        os.replace(partial_path, path)
+    except Exception:
+        # Un export interrompu ne laisse pas de fichier partiel, jamais évincé sinon
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    exports = sorted((p for p in glob.glob(os.path.join(glob.escape(directory), "*"))
+                      if not p.endswith(".part")), key=os.path.getmtime)
+    for stale in exports[:-EXPORT_CACHE_SIZE]:
+        os.remove(stale)
+    return path
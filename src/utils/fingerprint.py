@@ -0,0 +1,366 @@
+"""
+Empreintes (fingerprints) des jeux de données et cache invalidé automatiquement.
+
+Ce module permet de savoir, à moindre coût, si les fichiers CSV ou les collections
+MongoDB sous-jacents ont changé depuis le dernier calcul :
+
+- pour un fichier CSV : taille, date de modification et hachage d'un échantillon
+  d'octets répartis dans le fichier (début, milieu, fin) ;
+- pour une collection MongoDB : nombre de documents, `_id` maximal et date maximale ;
+- pour un DataFrame déjà chargé : forme, colonnes et hachage d'un échantillon de lignes.
+
+Chaque empreinte est réduite à un condensé hexadécimal court (`fingerprint_digest`)
+qui sert de clé de cache. `FingerprintCache` conserve chaque résultat avec
+l'empreinte qui l'a produit et le recalcule uniquement lorsque celle-ci change.
+"""
+import glob
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Taille de chaque bloc lu pour l'échantillon d'un fichier
+SAMPLE_BLOCK_SIZE = 64 * 1024
+# Nombre de blocs répartis uniformément dans le fichier
+SAMPLE_BLOCKS = 8
+# Nombre de lignes échantillonnées pour l'empreinte d'un DataFrame
+SAMPLE_ROWS = 1024
+
+
+def fingerprint_digest(*parts: Any) -> str:
+    """
+    Réduit un ensemble de composantes d'empreinte à un condensé hexadécimal stable.
+
+    Args:
+        *parts: Composantes (dictionnaires, chaînes, nombres...) à combiner.
+
+    Returns:
+        str: Condensé SHA-1 sur 16 caractères.
+    """
+    hasher = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, dict):
+            part = sorted(part.items())
+        hasher.update(repr(part).encode("utf-8"))
+    return hasher.hexdigest()[:16]
+
+
+def compute_file_fingerprint(path: str, block_size: int = SAMPLE_BLOCK_SIZE,
+                             n_blocks: int = SAMPLE_BLOCKS) -> Optional[Dict[str, Any]]:
+    """
+    Calcule l'empreinte d'un fichier sans le lire entièrement.
+
+    Args:
+        path (str): Chemin du fichier.
+        block_size (int, optional): Taille de chaque bloc échantillonné.
+        n_blocks (int, optional): Nombre de blocs répartis dans le fichier.
+
+    Returns:
+        dict or None: Dictionnaire avec les clés 'size', 'mtime' et 'sample_hash',
+            ou None si le fichier est inaccessible.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    size = stat.st_size
+    offsets = np.unique(np.linspace(
+        0, max(size - block_size, 0), num=max(n_blocks, 1)).astype(np.int64))
+    sample_hasher = hashlib.sha1()
+    try:
+        with open(path, "rb") as handle:
+            for offset in offsets:
+                handle.seek(int(offset))
+                sample_hasher.update(handle.read(block_size))
+    except OSError as e:
+        logger.error(f"Impossible de lire {path} pour l'empreinte : {e}")
+        return None
+
+    return {
+        "size": size,
+        "mtime": stat.st_mtime_ns,
+        "sample_hash": sample_hasher.hexdigest(),
+    }
+
+
+def file_fingerprint(path: str) -> Optional[str]:
+    """
+    Retourne le condensé de l'empreinte d'un fichier.
+
+    Args:
+        path (str): Chemin du fichier.
+
+    Returns:
+        str or None: Condensé de l'empreinte, ou None si le fichier est inaccessible.
+    """
+    fingerprint = compute_file_fingerprint(path)
+    if fingerprint is None:
+        return None
+    return fingerprint_digest(os.path.abspath(path), fingerprint)
+
+
+def compute_collection_fingerprint(collection, date_field: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Calcule l'empreinte d'une collection MongoDB à partir de trois requêtes indexées.
+
+    Args:
+        collection: Collection pymongo.
+        date_field (str, optional): Champ date dont on relève la valeur maximale
+            (par exemple 'submitted' pour les recettes, 'date' pour les interactions).
+
+    Returns:
+        dict: Dictionnaire avec les clés 'count', 'max_id' et 'max_date'.
+    """
+    fingerprint = {
+        "count": collection.estimated_document_count(),
+        "max_id": None,
+        "max_date": None,
+    }
+    last = collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+    if last is not None:
+        fingerprint["max_id"] = str(last["_id"])
+    if date_field:
+        latest = collection.find_one(
+            {date_field: {"$ne": None}}, {date_field: 1}, sort=[(date_field, -1)])
+        if latest is not None:
+            fingerprint["max_date"] = str(latest.get(date_field))
+    return fingerprint
+
+
+def collection_fingerprint(collection, date_field: Optional[str] = None) -> str:
+    """
+    Retourne le condensé de l'empreinte d'une collection MongoDB.
+
+    Args:
+        collection: Collection pymongo.
+        date_field (str, optional): Champ date suivi par l'empreinte.
+
+    Returns:
+        str: Condensé de l'empreinte.
+    """
+    return fingerprint_digest(collection.full_name,
+                              compute_collection_fingerprint(collection, date_field))
+
+
+def dataframe_fingerprint(df: pd.DataFrame, sample_rows: int = SAMPLE_ROWS) -> str:
+    """
+    Calcule l'empreinte d'un DataFrame en mémoire à partir d'un échantillon de lignes.
+
+    Les colonnes contenant des listes (tags, ingrédients...) sont hachées via leur
+    représentation textuelle, ce qui reste peu coûteux sur l'échantillon.
+
+    Args:
+        df (pd.DataFrame): DataFrame à identifier.
+        sample_rows (int, optional): Nombre de lignes échantillonnées.
+
+    Returns:
+        str: Condensé de l'empreinte.
+    """
+    if df is None:
+        return fingerprint_digest(None)
+    n_rows = len(df)
+    positions = np.unique(np.linspace(
+        0, max(n_rows - 1, 0), num=min(sample_rows, n_rows)).astype(np.int64))
+    sample = df.iloc[positions]
+    hasher = hashlib.sha1()
+    hasher.update(np.asarray(sample.index).tobytes()
+                  if sample.index.dtype.kind in "iuf" else repr(list(sample.index)).encode())
+    for column in sample.columns:
+        values = sample[column]
+        if values.dtype.kind in "iufbM":
+            hasher.update(np.ascontiguousarray(values.to_numpy()).tobytes())
+        else:
+            hasher.update(repr(values.astype(str).tolist()).encode("utf-8"))
+    return fingerprint_digest(df.shape, list(map(str, df.columns)), hasher.hexdigest())
+
+
+class FingerprintCache:
+    """
+    Cache clé/valeur dont chaque entrée porte l'empreinte des données sources.
+
+    Une entrée est considérée périmée dès que l'empreinte fournie à la lecture
+    diffère de celle enregistrée : elle est alors recalculée, une seule fois même
+    si plusieurs fils la demandent en même temps. Pour les données de session, qui
+    dépendent de la période choisie, l'empreinte fait aussi partie de la clé : chaque
+    période garde sa propre entrée, jusqu'à `max_entries`. Le cache peut être
+    persisté sur disque (un fichier pickle par clé) pour survivre aux redémarrages
+    de l'application sans être invalidé à chaque fois.
+
+    Args:
+        name (str): Nom du cache, utilisé dans les logs.
+        persist_dir (str, optional): Répertoire de persistance. Par défaut : None (mémoire seule).
+        max_entries (int, optional): Nombre maximal d'entrées conservées en mémoire ; au-delà,
+            les entrées les moins récemment lues ou écrites sont évincées.
+
+    Attributes:
+        hits (int): Nombre de lectures servies par le cache.
+        misses (int): Nombre de lectures ayant nécessité un calcul.
+    """
+
+    def __init__(self, name: str, persist_dir: Optional[str] = None, max_entries: int = 128):
+        """
+        Initialise le cache.
+
+        Args:
+            name (str): Nom du cache.
+            persist_dir (str, optional): Répertoire de persistance.
+            max_entries (int, optional): Nombre maximal d'entrées en mémoire.
+        """
+        self.name = name
+        self.persist_dir = persist_dir
+        self.max_entries = max_entries
+        self._entries: Dict[Any, tuple] = {}
+        # Les analyses exécutées en parallèle (`run_parallel`) partagent les caches
+        self._lock = threading.Lock()
+        # Verrous des entrées en cours de calcul, avec le nombre de fils qui les attendent
+        self._computing: Dict[Any, List] = {}
+        self.hits = 0
+        self.misses = 0
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+
+    def _path(self, key: Any) -> str:
+        return os.path.join(self.persist_dir, f"{self.name}_{fingerprint_digest(key)}.pkl")
+
+    def get(self, key: Any, fingerprint: str, default: Any = None) -> Any:
+        """
+        Lit une entrée si elle a été produite avec la même empreinte.
+
+        Args:
+            key: Clé de l'entrée.
+            fingerprint (str): Empreinte actuelle des données sources.
+            default: Valeur retournée si l'entrée est absente ou périmée.
+
+        Returns:
+            La valeur en cache ou `default`.
+        """
+        entry = self._entries.get(key)
+        if entry is None and self.persist_dir and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), "rb") as handle:
+                    entry = pickle.load(handle)
+                self._store(key, entry)
+            except Exception as e:
+                logger.error(f"Lecture du cache {self.name} impossible : {e}")
+                entry = None
+        if entry is not None and entry[0] == fingerprint:
+            with self._lock:
+                self.hits += 1
+            self._touch(key)
+            return entry[1]
+        if entry is not None:
+            logger.info(f"Cache {self.name} : entrée {key!r} périmée, recalcul.")
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def set(self, key: Any, fingerprint: str, value: Any) -> None:
+        """
+        Enregistre une valeur avec l'empreinte des données qui l'ont produite.
+
+        Args:
+            key: Clé de l'entrée.
+            fingerprint (str): Empreinte des données sources.
+            value: Valeur à conserver.
+        """
+        entry = (fingerprint, value)
+        self._store(key, entry)
+        if self.persist_dir:
+            try:
+                with open(self._path(key), "wb") as handle:
+                    pickle.dump(entry, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                logger.error(f"Écriture du cache {self.name} impossible : {e}")
+
+    def get_or_compute(self, key: Any, fingerprint: Optional[str], compute: Callable[[], Any]) -> Any:
+        """
+        Retourne l'entrée en cache ou la calcule si elle est absente ou périmée.
+
+        Args:
+            key: Clé de l'entrée.
+            fingerprint (str or None): Empreinte actuelle des données sources. Sans
+                empreinte, la valeur est calculée sans être lue ni enregistrée dans le cache.
+            compute (Callable): Fonction sans argument produisant la valeur.
+
+        Returns:
+            La valeur en cache ou nouvellement calculée.
+        """
+        if fingerprint is None:
+            return compute()
+        missing = object()
+        # Les fils qui demandent la même entrée attendent le premier calcul puis le relisent
+        with self._key_lock(key):
+            value = self.get(key, fingerprint, default=missing)
+            if value is missing:
+                value = compute()
+                self.set(key, fingerprint, value)
+        return value
+
+    @contextmanager
+    def _key_lock(self, key: Any) -> Iterator[None]:
+        with self._lock:
+            state = self._computing.setdefault(key, [threading.RLock(), 0])
+            state[1] += 1
+        try:
+            with state[0]:
+                yield
+        finally:
+            with self._lock:
+                state[1] -= 1
+                if not state[1]:
+                    self._computing.pop(key, None)
+
+    def invalidate(self, key: Any = None) -> None:
+        """
+        Supprime une entrée, ou tout le cache si aucune clé n'est fournie.
+
+        Args:
+            key (optional): Clé à supprimer. Par défaut : None (tout le cache).
+        """
+        with self._lock:
+            keys = list(self._entries) if key is None else [key]
+            for k in keys:
+                self._entries.pop(k, None)
+            if not self.persist_dir:
+                return
+            if key is None:
+                # Entrées persistées par une autre instance et jamais relues par celle-ci
+                paths = glob.glob(os.path.join(glob.escape(self.persist_dir),
+                                               f"{glob.escape(self.name)}_{'[0-9a-f]' * 16}.pkl"))
+            else:
+                paths = [self._path(key)]
+            for path in paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _store(self, key: Any, entry: tuple) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+
+    def _touch(self, key: Any) -> None:
+        # Une entrée lue devient la plus récente : les moins récemment lues sont évincées
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Taux de lectures servies par le cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -1,8 +1,13 @@
+import importlib.util
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from dotenv import load_dotenv
 import streamlit as st
+from src.utils.fingerprint import file_fingerprint, fingerprint_digest
+from src.utils.artifacts import SOURCE_TABLES, get_artifact_store
 load_dotenv()
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,51 +31,218 @@ error_handler.setFormatter(logging.Formatter(
 logging.getLogger().addHandler(error_handler)
 
 
-@st.cache_data
-def load_dataset(dir_name: str, all_contents=True):
+# Moteur de lecture CSV multi-thread, utilisé lorsque pyarrow est installé
+PARALLEL_CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else None
+
+
+def load_dataset(dir_name: str, all_contents=True, columns=None, dtype=None, engine=PARALLEL_CSV_ENGINE,
+                 max_workers=None, with_report=False):
     """
     Charge un jeu de données à partir d'un répertoire contenant des fichiers CSV ou d'un seul fichier CSV.
 
+    Les fichiers d'un répertoire sont lus en parallèle (un thread par fichier). Une projection
+    de colonnes et des types par colonne permettent de ne pas charger les colonnes de texte
+    volumineuses (`steps`, `description`, `review`) lorsqu'une page n'en a pas besoin.
+
+    L'empreinte des fichiers (taille, date de modification, échantillon haché) fait partie
+    de la clé du cache : une modification des CSV invalide automatiquement le résultat en cache.
+
     Paramètres :
     dir_name (str) : Le chemin d'accès au répertoire contenant les fichiers CSV ou le chemin d'accès à un seul fichier CSV.
     all_contents (bool, optionnel) : Si True, tous les fichiers CSV du répertoire sont chargés. Si False, seul le fichier spécifié est chargé. La valeur par défaut est True.
+    columns (list, optionnel) : Colonnes à charger. Les colonnes absentes d'un fichier sont ignorées. Par défaut : toutes.
+    dtype (dict, optionnel) : Types par colonne, par exemple {'id': 'int32'}. Par défaut : types inférés.
+    engine (str, optionnel) : Moteur de lecture pandas. Par défaut : `PARALLEL_CSV_ENGINE` ("pyarrow", qui parse
+        chaque fichier sur plusieurs threads) s'il est installé, sinon le moteur C ; un fichier que ce moteur
+        ne sait pas lire est relu avec le moteur C.
+    max_workers (int, optionnel) : Nombre de fichiers lus simultanément. Par défaut : nombre de fichiers, borné par le nombre de CPU.
+    with_report (bool, optionnel) : Si True, retourne aussi le rapport de chargement par fichier.
 
     Retourne :
     dict : Un dictionnaire dont les clés sont les noms de fichiers (sans les extensions) et les valeurs sont des DataFrames pandas contenant les données chargées.
+        Si `with_report` est True, un tuple (dataframes, rapport) où le rapport associe à chaque fichier
+        le nombre de lignes, de colonnes, la mémoire occupée (Mo) et la durée de lecture (s).
     """
-    dataframes = {}
     if all_contents:
-        csv_files = [file for file in os.listdir(
-            dir_name) if file.endswith('.csv')]
-        for file in csv_files:
-            dataframes[os.path.splitext(file)[0]] = pd.read_csv(
-                os.path.join(dir_name, file))
-        return dataframes
-
+        csv_files = tuple(file for file in os.listdir(
+            dir_name) if file.endswith('.csv'))
+        fingerprint = fingerprint_digest(*(file_fingerprint(
+            os.path.join(dir_name, file)) for file in csv_files))
     else:
+        csv_files = None
+        fingerprint = file_fingerprint(dir_name)
+    dataframes, report = _load_dataset(
+        dir_name, csv_files, fingerprint, columns, dtype, engine, max_workers)
+    if with_report:
+        return dataframes, report
+    return dataframes
+
+
+def _read_csv_file(path: str, columns=None, dtype=None, engine=None):
+    """
+    Lit un fichier CSV avec la projection et les types demandés et mesure la lecture.
+
+    Paramètres :
+    path (str) : Chemin du fichier CSV.
+    columns (list, optionnel) : Colonnes à charger.
+    dtype (dict, optionnel) : Types par colonne.
+    engine (str, optionnel) : Moteur de lecture pandas ; en cas d'échec, le fichier est relu avec le moteur C.
+
+    Retourne :
+    tuple : (DataFrame ou None si aucune colonne demandée n'existe, rapport de lecture).
+    """
+    start = time.perf_counter()
+    kwargs = {}
+    if columns is not None:
+        header = pd.read_csv(path, nrows=0).columns
+        kwargs['usecols'] = [col for col in columns if col in header]
+        if not kwargs['usecols']:
+            logging.warning(f"Aucune des colonnes {columns} dans {path}, fichier ignoré.")
+            return None, {'rows': 0, 'columns': 0, 'memory_mb': 0.0,
+                          'seconds': time.perf_counter() - start}
+    if dtype:
+        kwargs['dtype'] = dtype if columns is None else {
+            col: typ for col, typ in dtype.items() if col in kwargs['usecols']}
+    df = _read_csv_with_fallback(path, engine, **kwargs)
+    report = {
+        'rows': len(df),
+        'columns': len(df.columns),
+        'memory_mb': df.memory_usage(deep=True).sum() / 1024 / 1024,
+        'seconds': time.perf_counter() - start
+    }
+    logging.info(f"{os.path.basename(path)} chargé : {report['rows']} lignes, "
+                 f"{report['columns']} colonnes, {report['memory_mb']:.1f} Mo en {report['seconds']:.2f} s")
+    return df, report
+
+
+def _read_csv_with_fallback(path, engine=None, **kwargs):
+    """
+    Lit un fichier CSV avec le moteur demandé, puis avec le moteur C si celui-ci échoue.
+
+    Paramètres :
+    path (str) : Chemin du fichier CSV.
+    engine (str, optionnel) : Moteur de lecture pandas. Par défaut : moteur C.
+    **kwargs : Arguments transmis à `pd.read_csv`.
+
+    Retourne :
+    pd.DataFrame : Le contenu du fichier.
+    """
+    if engine:
+        try:
+            return pd.read_csv(path, engine=engine, **kwargs)
+        except Exception as e:
+            logging.warning(f"Lecture de {path} avec le moteur {engine} impossible ({e}), "
+                            f"relecture avec le moteur C.")
+    return pd.read_csv(path, **kwargs)
+
+
+@st.cache_data
+def _load_dataset(dir_name: str, csv_files, fingerprint, columns=None, dtype=None, engine=None,
+                  max_workers=None):
+    """
+    Charge les fichiers CSV ; `fingerprint` ne sert qu'à la clé du cache Streamlit.
+
+    Paramètres :
+    dir_name (str) : Répertoire ou fichier CSV.
+    csv_files (tuple ou None) : Fichiers CSV du répertoire, None pour un fichier unique.
+    fingerprint (str) : Empreinte des fichiers chargés.
+    columns, dtype, engine, max_workers : Voir `load_dataset`.
+
+    Retourne :
+    tuple : (dict des DataFrames indexés par nom de fichier, rapport de chargement par fichier).
+    """
+    dataframes = {}
+    report = {}
+    if csv_files is None:
         file = os.path.basename(dir_name)
-        dataframes[os.path.splitext(file)[0]] = pd.read_csv(dir_name)
-        return dataframes
+        name = os.path.splitext(file)[0]
+        df, report[name] = _read_csv_file(dir_name, columns, dtype, engine)
+        if df is not None:
+            dataframes[name] = df
+        return dataframes, report
+
+    if not csv_files:
+        return dataframes, report
+    workers = max_workers or min(len(csv_files), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            os.path.splitext(file)[0]: executor.submit(
+                _read_csv_file, os.path.join(dir_name, file), columns, dtype, engine)
+            for file in csv_files
+        }
+        for name, future in futures.items():
+            df, report[name] = future.result()
+            if df is not None:
+                dataframes[name] = df
+    return dataframes, report
 
 
+def load_dataset_from_file(dir_folder, date_start, date_end, is_interactional=False, columns=None, dtype=None,
+                           engine=PARALLEL_CSV_ENGINE):
+    """
+    Charge un fichier CSV de recettes ou d'interactions filtré sur un intervalle de dates.
+
+    Le résultat est mis en cache avec l'empreinte du fichier, de sorte qu'un CSV
+    modifié est rechargé sans avoir à redémarrer l'application. Si les artefacts
+    prétraités (`scripts/build_artifacts.py`) sont à jour pour ce fichier, la table
+    Arrow projetée en mémoire est lue à la place du CSV.
+
+    Paramètres :
+    dir_folder (str) : Chemin du fichier CSV.
+    date_start (datetime) : Date de début du filtre.
+    date_end (datetime) : Date de fin du filtre.
+    is_interactional (bool, optionnel) : True pour le fichier des interactions (colonne 'date'),
+        False pour celui des recettes (colonne 'submitted').
+    columns (list, optionnel) : Colonnes à charger ; la colonne de date est toujours incluse. Par défaut : toutes.
+    dtype (dict, optionnel) : Types par colonne. Par défaut : types inférés.
+    engine (str, optionnel) : Moteur de lecture pandas. Avec `PARALLEL_CSV_ENGINE` (par défaut s'il est
+        installé), le fichier est lu en une fois sur plusieurs threads puis filtré ; sans moteur, ou si
+        ce moteur échoue, il est lu par blocs de 1000 lignes avec le moteur C.
+
+    Retourne :
+    pd.DataFrame : Les lignes comprises dans l'intervalle de dates.
+    """
+    store = get_artifact_store()
+    if store is not None and store.is_fresh(dir_folder):
+        name, date_column = SOURCE_TABLES[os.path.basename(dir_folder)]
+        return _load_dataset_from_artifacts(store.directory, name, date_column, date_start, date_end,
+                                            store.manifest["sources"][os.path.basename(dir_folder)], columns)
+    return _load_dataset_from_file(dir_folder, date_start, date_end, is_interactional,
+                                   file_fingerprint(dir_folder), columns, dtype, engine)
+
 
 @st.cache_data
-def load_dataset_from_file(dir_folder, date_start, date_end, is_interactional=False):
-    if not is_interactional:
-        df = pd.read_csv(dir_folder,
-                         parse_dates=['submitted'],
-                         chunksize=1000)
-        df_filtered = pd.concat(chunk[(chunk['submitted'] >= date_start) &
-                                      (chunk['submitted'] <= date_end)]
-                                for chunk in df)
-        df_filtered = df_filtered.reset_index(drop=True)
-        return df_filtered
-    else:
-        df = pd.read_csv(dir_folder,
-                         parse_dates=['date'],
-                         chunksize=1000)
-        df_filtered = pd.concat(chunk[(chunk['date'] >= date_start) &
-                                      (chunk['date'] <= date_end)]
-                                for chunk in df)
-        df_filtered = df_filtered.reset_index(drop=True)
-        return df_filtered
+def _load_dataset_from_artifacts(directory, name, date_column, date_start, date_end, fingerprint,
+                                 columns=None):
+    # Mis en cache par (empreinte du CSV source, période, colonnes) : les colonnes de chaînes
+    # ne sont converties qu'une fois par période
+    logging.info(f"Lecture de la table prétraitée '{name}' depuis {directory}")
+    return get_artifact_store(directory).read_range(name, date_column, date_start, date_end, columns)
+
+
+@st.cache_data
+def _load_dataset_from_file(dir_folder, date_start, date_end, is_interactional, fingerprint,
+                            columns=None, dtype=None, engine=None):
+    date_column = 'date' if is_interactional else 'submitted'
+    kwargs = {}
+    if columns is not None:
+        kwargs['usecols'] = list(dict.fromkeys([*columns, date_column]))
+    if dtype:
+        kwargs['dtype'] = dtype
+    if engine:
+        # Le moteur pyarrow ne lit pas par blocs : le fichier est lu en entier puis filtré
+        try:
+            df = pd.read_csv(dir_folder, parse_dates=[date_column], engine=engine, **kwargs)
+            df_filtered = df[(df[date_column] >= date_start) & (df[date_column] <= date_end)]
+            return df_filtered.reset_index(drop=True)
+        except Exception as e:
+            logging.warning(f"Lecture de {dir_folder} avec le moteur {engine} impossible ({e}), "
+                            f"lecture par blocs avec le moteur C.")
+    df = pd.read_csv(dir_folder,
+                     parse_dates=[date_column],
+                     chunksize=1000, **kwargs)
+    df_filtered = pd.concat(chunk[(chunk[date_column] >= date_start) &
+                                  (chunk[date_column] <= date_end)]
+                            for chunk in df)
+    df_filtered = df_filtered.reset_index(drop=True)
+    return df_filtered
@@ -0,0 +1,318 @@
+"""
+Jeux de données à colonnes paresseuses : les textes volumineux sont chargés à la demande.
+
+La plupart des tableaux de bord n'utilisent que les colonnes numériques et les dates
+des recettes et des interactions ; seules les cartes du recommandeur et les vues de
+détail affichent `steps`, `description` ou `review`, et pour quelques lignes seulement.
+
+`LazyDataset` garde en mémoire les colonnes étroites et récupère les colonnes de
+texte par identifiant auprès d'une source :
+
+- `TextSideStore` : magasin annexe sur disque, lu par projection mémoire (memmap) ;
+- `MongoTextSource` : requête MongoDB ciblée `{id: {"$in": [...]}}`.
+
+La page des recettes charge ainsi `RAW_recipes` sans `steps` ni `description`
+(`narrow_columns`) et lit ces colonnes dans le magasin ouvert par `open_text_store`.
+"""
+import json
+import logging
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.artifacts import ARTIFACTS_DIR
+from src.utils.fingerprint import FingerprintCache, file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Colonnes de texte volumineuses des jeux de données Food.com
+HEAVY_TEXT_COLUMNS = ['steps', 'description', 'review']
+# Colonnes de texte des recettes, chargées à la demande par la page des recettes
+RECIPE_TEXT_COLUMNS = ['steps', 'description']
+# Magasin annexe des textes de RAW_recipes.csv (construit avec les artefacts ou au premier accès)
+TEXT_STORE_DIR = os.getenv("DIR_TEXT_STORE", os.path.join(ARTIFACTS_DIR, "recipe_text"))
+
+# Magasins ouverts, par empreinte du CSV source
+text_store_cache = FingerprintCache("text_stores", max_entries=4)
+
+
+class TextSideStore:
+    """
+    Magasin annexe de colonnes de texte, indexé par identifiant et lu en memmap.
+
+    Pour chaque colonne, les textes encodés en UTF-8 sont concaténés dans un fichier
+    `<colonne>.bin` et leurs positions dans `<colonne>.offsets.npy`. Les identifiants
+    sont triés (`ids.npy`) afin de localiser une ligne par recherche dichotomique.
+    Seuls les octets des lignes demandées sont lus depuis le disque.
+
+    Args:
+        directory (str): Répertoire du magasin.
+
+    Attributes:
+        ids (np.ndarray): Identifiants triés.
+        columns (List[str]): Colonnes de texte disponibles.
+        meta (dict): Métadonnées du magasin (empreinte de la source, colonnes...).
+    """
+
+    def __init__(self, directory: str):
+        """
+        Ouvre un magasin existant.
+
+        Args:
+            directory (str): Répertoire du magasin.
+        """
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as handle:
+            self.meta = json.load(handle)
+        self.columns: List[str] = self.meta["columns"]
+        self.ids = np.load(os.path.join(directory, "ids.npy"), mmap_mode="r")
+        self._offsets: Dict[str, np.ndarray] = {}
+        self._blobs: Dict[str, np.ndarray] = {}
+        for column in self.columns:
+            self._offsets[column] = np.load(
+                os.path.join(directory, f"{column}.offsets.npy"), mmap_mode="r")
+            blob_path = os.path.join(directory, f"{column}.bin")
+            self._blobs[column] = (np.memmap(blob_path, dtype=np.uint8, mode="r")
+                                   if os.path.getsize(blob_path) else np.zeros(0, dtype=np.uint8))
+
+    @staticmethod
+    def build(df: pd.DataFrame, id_column: str, text_columns: Iterable[str], directory: str,
+              source_fingerprint: Optional[str] = None) -> "TextSideStore":
+        """
+        Écrit les colonnes de texte d'un DataFrame dans un magasin annexe.
+
+        Args:
+            df (pd.DataFrame): Données contenant l'identifiant et les colonnes de texte.
+            id_column (str): Colonne identifiant (par exemple 'id').
+            text_columns (Iterable[str]): Colonnes de texte à externaliser.
+            directory (str): Répertoire du magasin.
+            source_fingerprint (str, optional): Empreinte de la source, pour invalider le magasin.
+
+        Returns:
+            TextSideStore: Le magasin ouvert en lecture.
+        """
+        os.makedirs(directory, exist_ok=True)
+        text_columns = [col for col in text_columns if col in df.columns]
+        order = np.argsort(df[id_column].to_numpy(), kind="stable")
+        np.save(os.path.join(directory, "ids.npy"),
+                df[id_column].to_numpy()[order].astype(np.int64))
+        for column in text_columns:
+            encoded = [("" if pd.isna(value) else str(value)).encode("utf-8")
+                       for value in df[column].to_numpy()[order]]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(chunk) for chunk in encoded], out=offsets[1:])
+            np.save(os.path.join(directory, f"{column}.offsets.npy"), offsets)
+            with open(os.path.join(directory, f"{column}.bin"), "wb") as handle:
+                handle.write(b"".join(encoded))
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as handle:
+            json.dump({"id_column": id_column, "columns": text_columns,
+                       "rows": int(len(df)), "fingerprint": source_fingerprint}, handle)
+        logger.info(f"Magasin de texte écrit dans {directory} ({text_columns}).")
+        return TextSideStore(directory)
+
+    def fetch(self, ids: Iterable[int], columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Récupère les colonnes de texte de quelques identifiants.
+
+        Args:
+            ids (Iterable[int]): Identifiants recherchés.
+            columns (Iterable[str], optional): Colonnes voulues. Par défaut : toutes.
+
+        Returns:
+            pd.DataFrame: Textes indexés par identifiant ; les identifiants inconnus sont ignorés.
+        """
+        columns = self.columns if columns is None else [
+            col for col in columns if col in self.columns]
+        wanted = np.asarray(list(ids), dtype=np.int64)
+        positions = np.searchsorted(self.ids, wanted)
+        positions = np.minimum(positions, max(len(self.ids) - 1, 0))
+        found = (len(self.ids) > 0) & (np.asarray(self.ids)[positions] == wanted)
+        positions, wanted = positions[found], wanted[found]
+        data = {}
+        for column in columns:
+            offsets, blob = self._offsets[column], self._blobs[column]
+            data[column] = [bytes(blob[offsets[p]:offsets[p + 1]]).decode("utf-8")
+                            for p in positions]
+        return pd.DataFrame(data, index=pd.Index(wanted, name=self.meta["id_column"]))
+
+
+class MongoTextSource:
+    """
+    Source de colonnes de texte interrogeant MongoDB uniquement pour les identifiants demandés.
+
+    Args:
+        connector (MongoDBConnector): Connecteur déjà connecté.
+        collection_name (str): Collection contenant les documents complets.
+        id_column (str, optional): Champ identifiant. Par défaut : 'id'.
+    """
+
+    def __init__(self, connector, collection_name: str, id_column: str = 'id'):
+        """
+        Initialise la source MongoDB.
+
+        Args:
+            connector (MongoDBConnector): Connecteur déjà connecté.
+            collection_name (str): Nom de la collection.
+            id_column (str, optional): Champ identifiant.
+        """
+        self.connector = connector
+        self.collection_name = collection_name
+        self.id_column = id_column
+
+    def fetch(self, ids: Iterable[int], columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Récupère les colonnes de texte des identifiants via une requête `$in`.
+
+        Args:
+            ids (Iterable[int]): Identifiants recherchés.
+            columns (Iterable[str], optional): Colonnes voulues. Par défaut : `HEAVY_TEXT_COLUMNS`.
+
+        Returns:
+            pd.DataFrame: Textes indexés par identifiant.
+        """
+        columns = list(columns or HEAVY_TEXT_COLUMNS)
+        df = self.connector.load_documents_by_ids(
+            self.collection_name, ids, id_field=self.id_column, columns=columns)
+        if df.empty:
+            return pd.DataFrame(columns=columns, index=pd.Index([], name=self.id_column))
+        return df.set_index(self.id_column)
+
+
+class LazyDataset:
+    """
+    Poignée sur un jeu de données dont les colonnes de texte sont chargées à la demande.
+
+    Args:
+        data (pd.DataFrame): Colonnes étroites (numériques, dates, listes courtes) chargées en mémoire.
+        text_source: Source des colonnes de texte (`TextSideStore` ou `MongoTextSource`).
+        id_column (str, optional): Colonne identifiant. Par défaut : 'id'.
+
+    Attributes:
+        data (pd.DataFrame): Colonnes chargées en mémoire.
+        text_columns (List[str]): Colonnes disponibles à la demande.
+    """
+
+    def __init__(self, data: pd.DataFrame, text_source, id_column: str = 'id'):
+        """
+        Initialise la poignée.
+
+        Args:
+            data (pd.DataFrame): Colonnes étroites.
+            text_source: Source des colonnes de texte.
+            id_column (str, optional): Colonne identifiant.
+        """
+        self.data = data
+        self.text_source = text_source
+        self.id_column = id_column
+        self.text_columns: List[str] = list(
+            getattr(text_source, "columns", HEAVY_TEXT_COLUMNS))
+
+    def fetch_text(self, ids: Iterable[int], columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Récupère les colonnes de texte de quelques identifiants.
+
+        Args:
+            ids (Iterable[int]): Identifiants recherchés.
+            columns (Iterable[str], optional): Colonnes voulues. Par défaut : toutes.
+
+        Returns:
+            pd.DataFrame: Textes indexés par identifiant.
+        """
+        return self.text_source.fetch(ids, columns)
+
+    def with_text(self, rows: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Complète quelques lignes (cartes, vue de détail) avec leurs colonnes de texte.
+
+        Args:
+            rows (pd.DataFrame): Lignes issues de `data`.
+            columns (Iterable[str], optional): Colonnes de texte voulues. Par défaut : toutes.
+
+        Returns:
+            pd.DataFrame: Les lignes avec les colonnes de texte ajoutées, dans le même ordre ;
+                les colonnes déjà présentes ne sont pas relues.
+        """
+        columns = [col for col in (columns or self.text_columns) if col not in rows.columns]
+        if not columns or rows.empty:
+            return rows
+        texts = self.fetch_text(rows[self.id_column].tolist(), columns)
+        return rows.join(texts, on=self.id_column)
+
+    def memory_usage_mb(self) -> float:
+        """Mémoire occupée par les colonnes chargées, en Mo."""
+        return self.data.memory_usage(deep=True).sum() / 1024 / 1024
+
+    @classmethod
+    def from_csv(cls, csv_path: str, store_dir: str, id_column: str = 'id',
+                 text_columns: Optional[Iterable[str]] = None, dtype: Optional[dict] = None) -> "LazyDataset":
+        """
+        Ouvre un CSV en externalisant ses colonnes de texte dans un magasin annexe.
+
+        Le magasin est réutilisé tant que l'empreinte du CSV est inchangée (voir
+        `open_text_store`) ; seules les colonnes étroites sont chargées en mémoire.
+
+        Args:
+            csv_path (str): Chemin du fichier CSV.
+            store_dir (str): Répertoire du magasin annexe.
+            id_column (str, optional): Colonne identifiant. Par défaut : 'id'.
+            text_columns (Iterable[str], optional): Colonnes à externaliser. Par défaut : `HEAVY_TEXT_COLUMNS`.
+            dtype (dict, optional): Types des colonnes étroites.
+
+        Returns:
+            LazyDataset: La poignée sur le jeu de données.
+        """
+        store = open_text_store(csv_path, store_dir, id_column, text_columns)
+        data = pd.read_csv(csv_path, usecols=narrow_columns(csv_path, text_columns), dtype=dtype)
+        return cls(data, store, id_column)
+
+
+def narrow_columns(csv_path: str, text_columns: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Colonnes d'un CSV hors colonnes de texte volumineuses.
+
+    Args:
+        csv_path (str): Chemin du fichier CSV.
+        text_columns (Iterable[str], optional): Colonnes exclues. Par défaut : `HEAVY_TEXT_COLUMNS`.
+
+    Returns:
+        List[str]: Colonnes à charger en mémoire, dans l'ordre du fichier.
+    """
+    text_columns = list(text_columns or HEAVY_TEXT_COLUMNS)
+    header = pd.read_csv(csv_path, nrows=0).columns
+    return [col for col in header if col not in text_columns]
+
+
+def open_text_store(csv_path: str, store_dir: str = TEXT_STORE_DIR, id_column: str = 'id',
+                    text_columns: Optional[Iterable[str]] = None) -> TextSideStore:
+    """
+    Ouvre le magasin annexe des colonnes de texte d'un CSV, reconstruit si le CSV a changé.
+
+    Le magasin ouvert est conservé en mémoire tant que l'empreinte du CSV est inchangée ;
+    une reconstruction ne lit que l'identifiant et les colonnes de texte du CSV.
+
+    Args:
+        csv_path (str): Chemin du fichier CSV.
+        store_dir (str, optional): Répertoire du magasin. Par défaut : `TEXT_STORE_DIR`.
+        id_column (str, optional): Colonne identifiant. Par défaut : 'id'.
+        text_columns (Iterable[str], optional): Colonnes externalisées. Par défaut : `HEAVY_TEXT_COLUMNS`.
+
+    Returns:
+        TextSideStore: Le magasin ouvert en lecture.
+    """
+    text_columns = list(text_columns or HEAVY_TEXT_COLUMNS)
+    fingerprint = file_fingerprint(csv_path)
+
+    def open_or_build() -> TextSideStore:
+        if os.path.exists(os.path.join(store_dir, "meta.json")):
+            store = TextSideStore(store_dir)
+            if store.meta.get("fingerprint") == fingerprint:
+                return store
+            logger.info(f"Magasin de texte {store_dir} périmé, reconstruction.")
+        header = pd.read_csv(csv_path, nrows=0).columns
+        usecols = [col for col in [id_column, *text_columns] if col in header]
+        return TextSideStore.build(pd.read_csv(csv_path, usecols=usecols), id_column,
+                                   text_columns, store_dir, fingerprint)
+
+    return text_store_cache.get_or_compute(store_dir, fingerprint, open_or_build)
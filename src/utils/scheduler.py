@@ -0,0 +1,78 @@
+"""
+Exécution en parallèle d'analyses indépendantes.
+
+Chaque analyse est une fonction sans argument ; elles sont soumises ensemble à
+un pool de threads et leur durée est mesurée individuellement. Les calculs
+numpy/pandas libèrent en grande partie le GIL, si bien que la durée totale
+tend vers celle de l'analyse la plus longue plutôt que vers leur somme.
+
+Le contexte d'exécution Streamlit du thread appelant est transmis à chaque
+thread du pool : les analyses peuvent lire `st.session_state` comme dans le
+script principal.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+logger = logging.getLogger(__name__)
+
+# Nombre de threads des analyses (0 : un thread par analyse, 1 : exécution séquentielle)
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "0"))
+
+
+def _timed(task: Callable[[], Any], ctx=None) -> Tuple[Any, float]:
+    if ctx is not None:
+        add_script_run_ctx(threading.current_thread(), ctx)
+    start = time.perf_counter()
+    result = task()
+    return result, time.perf_counter() - start
+
+
+def run_parallel(tasks: Dict[str, Callable[[], Any]],
+                 max_workers: Optional[int] = None) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Exécute des analyses indépendantes en parallèle et mesure la durée de chacune.
+
+    Args:
+        tasks (Dict[str, Callable[[], Any]]): Analyses à exécuter, par nom.
+        max_workers (int, optional): Nombre de threads. Par défaut : `ANALYSIS_WORKERS`
+            (0 : un thread par analyse, 1 : exécution séquentielle dans le thread appelant).
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, float]]: Résultat de chaque analyse et durée de
+            chacune en secondes, avec la durée totale sous la clé 'total'.
+
+    Raises:
+        Exception: La première erreur rencontrée, dans l'ordre des analyses, une fois
+            toutes les analyses terminées.
+    """
+    workers = ANALYSIS_WORKERS if max_workers is None else max_workers
+    workers = workers or len(tasks)
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+    if workers <= 1 or len(tasks) <= 1:
+        for name, task in tasks.items():
+            results[name], timings[name] = _timed(task)
+    else:
+        ctx = get_script_run_ctx()
+        with ThreadPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            futures = {name: executor.submit(_timed, task, ctx) for name, task in tasks.items()}
+            errors = []
+            for name, future in futures.items():
+                try:
+                    results[name], timings[name] = future.result()
+                except Exception as e:
+                    logger.error(f"Échec de l'analyse {name} : {e}")
+                    errors.append(e)
+        if errors:
+            raise errors[0]
+    timings['total'] = time.perf_counter() - start
+    logger.info("Analyses terminées en {:.2f} s ({})".format(
+        timings['total'], ", ".join(f"{name} : {timings[name]:.2f} s" for name in tasks)))
+    return results, timings
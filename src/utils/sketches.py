@@ -0,0 +1,325 @@
+"""
+Résumés (sketches) fusionnables pour les statistiques sur des plages de dates.
+
+Chaque résumé a une taille bornée, indépendante du nombre de lignes, et deux
+résumés se fusionnent sans revenir aux données :
+
+- `KLLSketch` : quantiles approchés (erreur de rang de l'ordre de 1/k) ;
+- `HyperLogLog` : nombre de valeurs distinctes (erreur relative ≈ 1.04/√(2^p)) ;
+- `SpaceSaving` : valeurs les plus fréquentes (top-k) avec borne d'erreur ;
+- `Moments` : effectif, somme, minimum et maximum, exacts.
+
+Les valeurs sont hachées avec `pd.util.hash_array` (vectorisé, stable d'une
+exécution à l'autre), ce qui rend les HyperLogLog de mois différents fusionnables.
+"""
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def hash_values(values) -> np.ndarray:
+    """
+    Hache des valeurs en entiers non signés 64 bits.
+
+    Args:
+        values: Tableau ou séquence de valeurs (nombres ou chaînes).
+
+    Returns:
+        np.ndarray: Hachés uint64.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "iu":
+        values = values.astype(np.int64)
+    elif values.dtype.kind != "f":
+        values = values.astype(object)
+    return pd.util.hash_array(values)
+
+
+class Moments:
+    """
+    Effectif, somme, minimum et maximum d'une variable (exacts et fusionnables).
+    """
+
+    def __init__(self, count: int = 0, total: float = 0.0,
+                 minimum: float = np.inf, maximum: float = -np.inf):
+        """
+        Initialise des moments vides ou donnés.
+
+        Args:
+            count (int, optional): Effectif.
+            total (float, optional): Somme.
+            minimum (float, optional): Minimum.
+            maximum (float, optional): Maximum.
+        """
+        self.count = count
+        self.total = total
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> "Moments":
+        """Moments d'un tableau (les NaN sont ignorés)."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return cls()
+        return cls(len(values), float(values.sum()), float(values.min()), float(values.max()))
+
+    def merge(self, other: "Moments") -> "Moments":
+        """Fusionne deux moments dans un nouvel objet."""
+        return Moments(self.count + other.count, self.total + other.total,
+                       min(self.minimum, other.minimum), max(self.maximum, other.maximum))
+
+    @property
+    def mean(self) -> float:
+        """Moyenne (NaN si vide)."""
+        return self.total / self.count if self.count else float("nan")
+
+
+class KLLSketch:
+    """
+    Résumé de quantiles KLL (Karnin, Lang, Liberty) à base de compacteurs NumPy.
+
+    Le niveau h contient des éléments de poids 2^h. Quand un niveau dépasse sa
+    capacité, il est trié et un élément sur deux (décalage aléatoire) est promu
+    au niveau supérieur.
+
+    Args:
+        k (int, optional): Capacité du niveau le plus haut ; l'erreur de rang est d'environ 1.7/k.
+        seed (int, optional): Graine du générateur utilisé pour les compactions.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = 0):
+        """
+        Initialise un résumé vide.
+
+        Args:
+            k (int, optional): Paramètre de précision.
+            seed (int, optional): Graine des compactions.
+        """
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        while True:
+            over = [h for h, items in enumerate(self.levels) if len(items) > self._capacity(h)]
+            if not over:
+                return
+            h = over[0]
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.float64))
+            items = np.sort(self.levels[h])
+            keep = items[-1:] if len(items) % 2 else items[:0]
+            pairs = items[:len(items) - len(keep)]
+            promoted = pairs[self._rng.integers(0, 2)::2]
+            self.levels[h] = keep
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+
+    def update(self, values) -> "KLLSketch":
+        """
+        Ajoute des valeurs (les NaN sont ignorés).
+
+        Args:
+            values: Tableau de valeurs.
+
+        Returns:
+            KLLSketch: Le résumé lui-même.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """
+        Fusionne un autre résumé dans une copie de celui-ci.
+
+        Args:
+            other (KLLSketch): Résumé à fusionner.
+
+        Returns:
+            KLLSketch: Le résumé fusionné.
+        """
+        merged = KLLSketch(self.k, seed=int(self._rng.integers(0, 2 ** 31)))
+        depth = max(len(self.levels), len(other.levels))
+        merged.levels = [np.concatenate([
+            self.levels[h] if h < len(self.levels) else np.empty(0),
+            other.levels[h] if h < len(other.levels) else np.empty(0)]) for h in range(depth)]
+        merged.n = self.n + other.n
+        merged._compress()
+        return merged
+
+    def quantiles(self, qs: Iterable[float]) -> np.ndarray:
+        """
+        Quantiles approchés.
+
+        Args:
+            qs (Iterable[float]): Rangs demandés, entre 0 et 1.
+
+        Returns:
+            np.ndarray: Une valeur par rang (NaN si le résumé est vide).
+        """
+        qs = np.asarray(list(qs), dtype=np.float64)
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items_h), 2 ** h, dtype=np.float64)
+                                  for h, items_h in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, qs * cumulative[-1], side="left")
+        return items[np.minimum(positions, len(items) - 1)]
+
+
+class HyperLogLog:
+    """
+    Estimateur HyperLogLog du nombre de valeurs distinctes.
+
+    Args:
+        p (int, optional): Nombre de bits d'index ; 2^p registres d'un octet.
+    """
+
+    def __init__(self, p: int = 12):
+        """
+        Initialise un estimateur vide.
+
+        Args:
+            p (int, optional): Précision (4 à 16).
+        """
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, values) -> "HyperLogLog":
+        """
+        Ajoute des valeurs.
+
+        Args:
+            values: Tableau de valeurs (nombres ou chaînes).
+
+        Returns:
+            HyperLogLog: L'estimateur lui-même.
+        """
+        hashes = hash_values(values)
+        if len(hashes) == 0:
+            return self
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = hashes << np.uint64(self.p)
+        high = (rest >> np.uint64(32)).astype(np.float64)
+        low = (rest & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        bit_length = np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+        # Rang du premier bit à 1 des 64 - p bits restants (65 - p s'ils sont tous nuls)
+        rank = np.where(bit_length == 0, 65 - self.p, 65 - bit_length).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Fusionne deux estimateurs de même précision dans un nouvel objet."""
+        merged = HyperLogLog(self.p)
+        merged.registers = np.maximum(self.registers, other.registers)
+        return merged
+
+    def estimate(self) -> float:
+        """
+        Estimation du nombre de valeurs distinctes.
+
+        Returns:
+            float: Estimation (correction par comptage linéaire pour les petites cardinalités).
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return m * np.log(m / zeros)
+        return float(raw)
+
+
+class SpaceSaving:
+    """
+    Résumé Space-Saving des valeurs les plus fréquentes.
+
+    Chaque valeur suivie a un compte `count` (borne basse) et une erreur `error` :
+    la fréquence réelle est comprise dans [count, count + error].
+
+    Args:
+        capacity (int, optional): Nombre maximal de valeurs suivies.
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        Initialise un résumé vide.
+
+        Args:
+            capacity (int, optional): Nombre maximal de valeurs suivies.
+        """
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+        self.errors = pd.Series(dtype=np.int64)
+        self.floor = 0
+
+    @classmethod
+    def from_counts(cls, counts: pd.Series, capacity: int = 256) -> "SpaceSaving":
+        """
+        Construit le résumé à partir de comptes exacts (par exemple d'un mois).
+
+        Args:
+            counts (pd.Series): Comptes indexés par valeur.
+            capacity (int, optional): Nombre maximal de valeurs suivies.
+
+        Returns:
+            SpaceSaving: Le résumé, dont le seuil `floor` est le plus grand compte écarté.
+        """
+        summary = cls(capacity)
+        counts = counts.sort_values(ascending=False, kind="stable")
+        summary.counts = counts.iloc[:capacity].astype(np.int64)
+        summary.errors = pd.Series(0, index=summary.counts.index, dtype=np.int64)
+        summary.floor = int(counts.iloc[capacity]) if len(counts) > capacity else 0
+        return summary
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        Fusionne deux résumés (Agarwal et al., « Mergeable Summaries »).
+
+        Une valeur absente d'un résumé peut y avoir eu au plus `floor` occurrences,
+        ce qui s'ajoute à son erreur.
+
+        Args:
+            other (SpaceSaving): Résumé à fusionner.
+
+        Returns:
+            SpaceSaving: Le résumé fusionné, tronqué à `capacity` valeurs.
+        """
+        counts = self.counts.add(other.counts, fill_value=0)
+        errors = self.errors.add(other.errors, fill_value=0)
+        errors = errors.add(pd.Series(other.floor, index=self.counts.index.difference(other.counts.index)),
+                            fill_value=0)
+        errors = errors.add(pd.Series(self.floor, index=other.counts.index.difference(self.counts.index)),
+                            fill_value=0)
+        merged = SpaceSaving(max(self.capacity, other.capacity))
+        counts = counts.sort_values(ascending=False, kind="stable")
+        merged.counts = counts.iloc[:merged.capacity].astype(np.int64)
+        merged.errors = errors.reindex(merged.counts.index).astype(np.int64)
+        dropped = int(counts.iloc[merged.capacity]) if len(counts) > merged.capacity else 0
+        merged.floor = max(self.floor + other.floor, dropped)
+        return merged
+
+    def top(self, n: int) -> Dict:
+        """
+        Les n valeurs les plus fréquentes.
+
+        Args:
+            n (int): Nombre de valeurs.
+
+        Returns:
+            dict: Comptes (bornes basses) indexés par valeur, par ordre décroissant.
+        """
+        return self.counts.head(n).to_dict()
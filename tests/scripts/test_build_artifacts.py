@@ -0,0 +1,137 @@
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.build_artifacts import build_artifacts
+from src.process.collaborative import bayesian_popularity
+from src.process.recommandation import AdvancedRecipeRecommender
+from src.process.recommender_index import get_feature_index
+from src.utils.artifacts import get_artifact_store
+from src.utils.helper_data import load_dataset_from_file
+from src.utils.lazy_dataset import RECIPE_TEXT_COLUMNS, open_text_store
+
+
+@pytest.fixture
+def dataset_dir(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 40
+    ingredients = ['flour', 'sugar', 'egg', 'milk', 'tomato', 'basil', 'cheese', 'rice']
+    recipes = pd.DataFrame({
+        'name': [f'recipe {i}' for i in range(n)],
+        'id': np.arange(1000, 1000 + n)[::-1],
+        'minutes': rng.integers(5, 120, n),
+        'contributor_id': rng.integers(1, 5, n),
+        'submitted': pd.date_range('2001-01-01', periods=n, freq='17D').astype(str)[rng.permutation(n)],
+        'tags': ["['easy']"] * n,
+        'nutrition': [str([float(i), 1.0, 2.0, 3.0, 4.0, 5.0, 6.0]) for i in range(n)],
+        'n_steps': rng.integers(1, 10, n),
+        'steps': ["['mix']"] * n,
+        'description': ['good'] * n,
+        'ingredients': [str(rng.choice(ingredients, 3, replace=False).tolist()) for _ in range(n)],
+        'n_ingredients': [3] * n,
+    })
+    interactions = pd.DataFrame({
+        'user_id': rng.integers(1, 10, 100),
+        'recipe_id': rng.integers(1000, 1000 + n, 100),
+        'date': pd.date_range('2002-01-01', periods=100, freq='5D').astype(str),
+        'rating': rng.integers(0, 6, 100),
+        'review': ['ok'] * 100,
+    })
+    recipes.to_csv(tmp_path / 'RAW_recipes.csv', index=False)
+    interactions.to_csv(tmp_path / 'RAW_interactions.csv', index=False)
+    return tmp_path
+
+
+def test_build_artifacts_and_read_range(dataset_dir, tmp_path):
+    output_dir = str(tmp_path / 'artifacts')
+    manifest = build_artifacts(str(dataset_dir), output_dir)
+    assert set(manifest['sources']) == {'RAW_recipes.csv', 'RAW_interactions.csv'}
+    assert manifest['clusters']['n_clusters'] == 5
+    assert manifest['collaborative']['n_items'] > 0
+
+    store = get_artifact_store(output_dir)
+    assert store.is_fresh(str(dataset_dir / 'RAW_recipes.csv'))
+
+    expected = pd.read_csv(dataset_dir / 'RAW_recipes.csv', parse_dates=['submitted'])
+    start, end = datetime(2001, 3, 1), datetime(2001, 9, 30)
+    expected = expected[(expected['submitted'] >= start) & (expected['submitted'] <= end)]
+    result = store.read_range('recipes', 'submitted', start, end)
+    assert sorted(result['id']) == sorted(expected['id'])
+    assert result['submitted'].is_monotonic_increasing
+    assert store.load_array('nutrition').shape == (40, 7)
+    # Colonnes numériques et dates : vues en lecture seule sur la projection mémoire
+    assert not result['minutes'].to_numpy().flags.writeable
+    assert not result['submitted'].to_numpy().flags.writeable
+    assert not os.path.exists(os.path.join(output_dir, 'recipes_monthly.arrow'))
+    summary = store.load_model('recipes_sketches').query(start, end)
+    assert summary.count == len(expected)
+    assert summary.moments['calories'].maximum == expected['nutrition'].map(eval).str[0].max()
+
+    # Une seconde construction sans changement des sources ne refait rien
+    with patch('scripts.build_artifacts.build_recipes') as mock_build:
+        build_artifacts(str(dataset_dir), output_dir)
+        mock_build.assert_not_called()
+
+
+def test_loader_and_recommender_use_artifacts(dataset_dir, tmp_path):
+    output_dir = str(tmp_path / 'artifacts')
+    build_artifacts(str(dataset_dir), output_dir)
+    store = get_artifact_store(output_dir)
+
+    with patch('src.utils.helper_data.get_artifact_store', return_value=store), \
+            patch('pandas.read_csv') as mock_read_csv:
+        df = load_dataset_from_file(str(dataset_dir / 'RAW_recipes.csv'),
+                                    datetime(2000, 1, 1), datetime(2010, 1, 1))
+        mock_read_csv.assert_not_called()
+    assert len(df) == 40
+    assert get_artifact_store(output_dir) is store
+
+    recommender = AdvancedRecipeRecommender(df, artifacts=store)
+    assert recommender.ingredient_matrix.shape[0] == len(df)
+    assert recommender.numeric_features.shape == (len(df), 3)
+    recommendations = recommender.content_based_recommendations(int(df['id'].iloc[0]), top_n=3)
+    assert len(recommendations) == 3
+    clusters = recommender.recipe_clustering()
+    assert len(clusters) == len(df) and clusters['Cluster'].nunique() <= 5
+    liked = store.load_array('item_neighbors.ids')
+    collaborative = recommender.collaborative_recommendations(int(liked[0]), top_n=3)
+    assert 0 < len(collaborative) <= 3 and int(liked[0]) not in collaborative['id'].tolist()
+    assert get_feature_index(os.path.join(output_dir, 'recommender')).n_recipes == len(df)
+    assert recommender.neighbor_table().n_recipes == store.manifest['content_neighbors']['n_recipes'] > 0
+    seed, hits = int(recommender.neighbor_table().recipe_ids[0]), recommender.neighbor_table().hits
+    assert len(recommender.content_based_recommendations(seed, top_n=3)) == 3
+    assert recommender.neighbor_table().hits == hits + 1
+    # Le magasin de textes construit avec les artefacts est repris tel quel par l'application
+    with patch('src.utils.lazy_dataset.TextSideStore.build') as mock_build:
+        store_dir = os.path.join(output_dir, 'recipe_text')
+        texts = open_text_store(str(dataset_dir / 'RAW_recipes.csv'), store_dir,
+                                text_columns=RECIPE_TEXT_COLUMNS)
+        mock_build.assert_not_called()
+    assert len(texts.ids) == len(df) and texts.fetch([int(df['id'].iloc[0])]).iloc[0]['description'] == 'good'
+
+
+def test_recommender_reads_precomputed_popularity(dataset_dir, tmp_path):
+    output_dir = str(tmp_path / 'artifacts')
+    build_artifacts(str(dataset_dir), output_dir)
+    store = get_artifact_store(output_dir)
+    recipes = pd.read_csv(dataset_dir / 'RAW_recipes.csv')
+    interactions = pd.read_csv(dataset_dir / 'RAW_interactions.csv')
+    expected, prior = bayesian_popularity(interactions, recipes['id'])
+
+    with patch.object(store, 'read_table') as mock_read_table:
+        popularity = AdvancedRecipeRecommender(recipes, artifacts=store)._popularity()
+        mock_read_table.assert_not_called()
+    np.testing.assert_allclose(popularity, expected)
+    # Une recette absente des artefacts reçoit la note moyenne
+    extra = recipes.iloc[:1].assign(id=1)
+    popularity = AdvancedRecipeRecommender(pd.concat([recipes, extra], ignore_index=True),
+                                           artifacts=store)._popularity()
+    np.testing.assert_allclose(popularity, np.append(expected, prior / 5))
+
+
+def test_get_artifact_store_missing(tmp_path):
+    assert get_artifact_store(str(tmp_path / 'absent')) is None
@@ -3,6 +3,7 @@ from unittest.mock import patch, MagicMock
 import pandas as pd
 from sklearn.cluster import KMeans
 from src.pages.Nutrition import NutritionPage
+from src.process.search_index import BM25Index
 import matplotlib.pyplot as plt
 import plotly.graph_objs as go
 from typing import Optional, Tuple
@@ -24,7 +25,7 @@ class TestNutritionPage(unittest.TestCase):
             'Graisse_saturées': [3, 5, 4],
             'Moyenne des notes': [4.5, 3.8, 4.2],
             'Nombre de notes': [50, 30, 60],
-        })
+        }, index=pd.Index([11, 22, 33], name='id'))
 
         self.nutrition_page = NutritionPage(data_directory='./data')
         self.nutrition_page.nutrition_df = self.nutrition_data
@@ -147,6 +148,23 @@ class TestNutritionPage(unittest.TestCase):
         self.assertEqual(
             len(self.nutrition_page.clean_nutrition_df['Cluster'].unique()), 3)
 
+    @patch('src.pages.Nutrition.load_search_index')
+    def test_search_filtered_recipes_joins_on_id(self, mock_load_search_index):
+        recipes = pd.DataFrame({
+            'id': [11, 22, 33, 44],
+            'name': ['Recipe 1', 'Recipe 2', 'Recipe 3', 'Recipe 1'],
+            'description': ['chocolate', 'chocolate chocolate', 'soup', 'chocolate cake'],
+            'steps': ['', '', '', ''],
+        })
+        mock_load_search_index.return_value = BM25Index.build(recipes)
+
+        matched = self.nutrition_page.search_filtered_recipes(self.nutrition_data, 'chocolate', top_k=1)
+
+        # La recherche est restreinte aux recettes filtrées : 44 (même nom que 11) est exclue
+        self.assertEqual(matched.index.tolist(), [22])
+        matched = self.nutrition_page.search_filtered_recipes(self.nutrition_data, 'chocolate')
+        self.assertEqual(matched.index.tolist(), [22, 11])
+
     # Test de la matrice de corrélation
     def test_correlation_matrix(self):
         # Calculer la matrice de corrélation
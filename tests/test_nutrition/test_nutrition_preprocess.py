@@ -1,7 +1,9 @@
 import unittest
 from unittest.mock import patch
 import pandas as pd
-from src.process.nutrition_preprocess import load_data, clean_data
+from src.process.nutrition_preprocess import load_data, clean_data, aggregate_ratings, build_nutrition_frame
+from scripts.benchmark_nutrition import (legacy_build_nutrition_frame, legacy_clean_data, rated_ids,
+                                        synthetic_data)
 
 
 class TestDataProcessing(unittest.TestCase):
@@ -52,6 +54,22 @@ class TestDataProcessing(unittest.TestCase):
         self.assertEqual(len(cleaned_df), 1)  # Recipe2 doit être supprimé
         self.assertTrue(all(cleaned_df['Graisses'] <= 100))
 
+    def test_aggregate_ratings_single_groupby(self):
+        interactions = pd.DataFrame({'recipe_id': [1, 1, 2, 1], 'rating': [5, 4, 3, 4]})
+        ratings = aggregate_ratings(interactions)
+        self.assertEqual(ratings.loc[1, 'Moyenne des notes'], 4.33)
+        self.assertEqual(ratings['Nombre de notes'].tolist(), [3, 1])
+
+    def test_pipeline_matches_previous_implementation(self):
+        recipes, interactions = synthetic_data(n_recipes=500, n_interactions=3000)
+        recipes = pd.concat([recipes, recipes.iloc[:3]], ignore_index=True)
+        expected = legacy_build_nutrition_frame(recipes, interactions)
+        result = build_nutrition_frame(recipes, interactions)
+        # Mêmes colonnes et valeurs, l'identifiant des recettes servant d'index
+        expected.index = rated_ids(recipes, interactions)
+        pd.testing.assert_frame_equal(result, expected)
+        pd.testing.assert_frame_equal(clean_data(result), legacy_clean_data(expected))
+
 
 if __name__ == '__main__':
     unittest.main()
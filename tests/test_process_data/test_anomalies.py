@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from src.process.anomalies import anomaly_cache, cached_anomaly_report, compute_anomaly_report
+from src.utils.coded_columns import CodedListColumn, get_coded_column
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    n = 300
+    return pd.DataFrame({
+        'minutes': np.r_[rng.normal(30, 5, n - 2), 900, 1200],
+        'n_steps': rng.integers(1, 12, n),
+        'rating': np.where(rng.random(n) < 0.05, np.nan, rng.normal(4, 0.5, n)),
+        'tags': [['easy', 'quick'] if i % 2 else ['dessert'] for i in range(n)],
+        'name': [f'recipe {i % 40}' for i in range(n)],
+    })
+
+
+def test_report_matches_pandas_and_scipy(df):
+    report = compute_anomaly_report(df, std_threshold=3.0, z_score_threshold=2.0)
+
+    missing = report['missing_values']
+    assert list(missing.index) == ['rating']
+    assert missing.loc['rating', 'Missing Count'] == df['rating'].isnull().sum()
+
+    std_outliers = report['std_outliers'].set_index('Column')
+    mean, std = df['minutes'].mean(), df['minutes'].std()
+    assert std_outliers.loc['minutes', 'Mean'] == pytest.approx(mean)
+    assert std_outliers.loc['minutes', 'Standard Deviation'] == pytest.approx(std)
+    assert std_outliers.loc['minutes', 'Outlier Count'] == (np.abs(df['minutes'] - mean) > 3 * std).sum()
+
+    z_outliers = report['z_score_outliers'].set_index('Column')
+    for col in ['minutes', 'n_steps']:
+        expected = (np.abs(stats.zscore(df[col])) > 2.0).sum()
+        assert z_outliers['Outlier Count'].get(col, 0) == expected
+    # Comme scipy, une colonne avec des valeurs manquantes n'a pas d'aberration au sens du score Z
+    assert 'rating' not in z_outliers.index
+
+
+def test_distinct_counts_on_list_columns(df):
+    info = compute_anomaly_report(df)['column_info']
+    assert info.loc['tags', 'Unique Count'] == 3
+    assert info.loc['name', 'Unique Count'] == 40
+    assert info.loc['name', 'Unique Percentage'] == round(40 / len(df) * 100, 2)
+
+
+def test_report_cached_by_fingerprint_and_thresholds(df):
+    anomaly_cache.invalidate()
+    first = cached_anomaly_report(df, 'fp', 3.0, 3.0)
+    assert cached_anomaly_report(df, 'fp', 3.0, 3.0) is first
+    assert cached_anomaly_report(df, 'fp', 2.0, 3.0) is not first
+    assert cached_anomaly_report(df, 'other', 3.0, 3.0) is not first
+
+
+def test_list_columns_reuse_encoded_column(df):
+    coded = get_coded_column(df, 'tags', 'fp-coded')
+    with patch.object(CodedListColumn, 'from_lists', side_effect=AssertionError("encodée deux fois")):
+        info = compute_anomaly_report(df, fingerprint='fp-coded')['column_info']
+    assert info.loc['tags', 'Unique Count'] == coded.n_distinct == 3
@@ -323,3 +323,65 @@ def test_recipe_selection(sample_recipes_df_3):
 # Exécution des tests
 if __name__ == '__main__':
     pytest.main([__file__])
+
+
+def test_collaborative_recommendations():
+    recipes = create_sample_recipes_df()
+    interactions = pd.DataFrame({
+        'user_id': [10, 10, 11, 11, 12, 12, 12],
+        'recipe_id': [1, 2, 1, 2, 1, 3, 99],
+        'rating': [5, 5, 4, 5, 5, 5, 5],
+    })
+    recommender = AdvancedRecipeRecommender(recipes, interactions_df=interactions)
+
+    recommendations = recommender.collaborative_recommendations(1, top_n=3)
+    # La recette 99 n'est pas parmi les recettes chargées
+    assert recommendations['id'].tolist() == [2, 3]
+    assert recommendations['similarity'].is_monotonic_decreasing
+    assert recommender.collaborative_recommendations(4).empty
+
+
+def test_collaborative_recommendations_without_interactions(recommender):
+    assert recommender.collaborative_recommendations(1).empty
+
+
+def test_hybrid_recommendations_ingredients_only_matches_content(recommender):
+    # Avec le seul poids des ingrédients, le score est le cosinus TF-IDF
+    weights = {'ingredients': 1.0, 'numeric': 0.0, 'popularity': 0.0, 'nutrition': 0.0}
+    hybrid = recommender.hybrid_recommendations(1, top_n=2, weights=weights)
+    content = recommender.content_based_recommendations(1, top_n=2)
+
+    assert hybrid['id'].tolist() == content['id'].tolist()
+    assert list(hybrid.filter(like='score_').columns) == ['score_ingredients']
+    assert 1 not in hybrid['id'].tolist()
+
+
+def test_hybrid_recommendations_candidates_share_ingredients(recommender):
+    # 'Soup' ne partage aucun ingrédient avec 'Pasta' : elle n'est pas candidate
+    recommendations = recommender.hybrid_recommendations(1, top_n=10)
+    assert set(recommendations['id']) == {2, 3}
+    assert recommendations['score'].is_monotonic_decreasing
+
+
+def test_hybrid_recommendations_popularity_and_nutrition():
+    recipes = create_sample_recipes_df().assign(nutrition=[
+        "[100.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0]",
+        "[900.0, 50.0, 50.0, 50.0, 50.0, 50.0, 50.0]",
+        "[110.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0]",
+        "[500.0, 5.0, 5.0, 5.0, 5.0, 5.0, 5.0]",
+        "[100.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0]",
+    ])
+    interactions = pd.DataFrame({'user_id': range(40), 'recipe_id': [2] * 20 + [3] * 20,
+                                 'rating': [5] * 20 + [2] * 20})
+    recommender = AdvancedRecipeRecommender(recipes, interactions_df=interactions)
+
+    popular = recommender.hybrid_recommendations(1, top_n=2, weights={'ingredients': 0, 'numeric': 0, 'popularity': 1})
+    nutritious = recommender.hybrid_recommendations(1, top_n=2, weights={'ingredients': 0, 'numeric': 0,
+                                                                          'popularity': 0, 'nutrition': 1})
+    assert popular['id'].iloc[0] == 2
+    assert nutritious['id'].iloc[0] == 3
+
+
+def test_hybrid_recommendations_unknown_recipe(recommender):
+    with pytest.raises(KeyError):
+        recommender.hybrid_recommendations(999)
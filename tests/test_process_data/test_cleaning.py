@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.process.cleaning import compute_bounds, outlier_mask
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    values = rng.normal(50, 5, 200)
+    values[:3] = [500, -400, np.nan]
+    return pd.DataFrame({'minutes': values, 'n_steps': rng.integers(1, 10, 200), 'name': ['x'] * 200})
+
+
+def test_std_bounds_computed_on_full_frame(df):
+    mask = outlier_mask(df, 'std', 3.0)
+    mean, std = df['minutes'].mean(), df['minutes'].std()
+    expected = df['minutes'].between(mean - 3 * std, mean + 3 * std).to_numpy()
+    expected &= df['n_steps'].between(df['n_steps'].mean() - 3 * df['n_steps'].std(),
+                                      df['n_steps'].mean() + 3 * df['n_steps'].std()).to_numpy()
+    assert np.array_equal(mask, expected)
+    # Le résultat ne dépend pas de l'ordre des colonnes
+    assert np.array_equal(mask, outlier_mask(df[['n_steps', 'minutes', 'name']], 'std', 3.0))
+
+
+@pytest.mark.parametrize("method,threshold", [('iqr', 1.5), ('mad', 3.5), ('quantile', 0.01), ('zscore', 3.0)])
+def test_robust_methods_remove_extremes(df, method, threshold):
+    mask = outlier_mask(df, method, threshold)
+    assert mask.dtype == bool and len(mask) == len(df)
+    assert not mask[:3].any()
+    assert mask.sum() > 150
+
+
+def test_bounds_values():
+    values = np.array([[1.0], [2.0], [3.0], [4.0], [100.0]])
+    lower, upper = compute_bounds(values, 'iqr', 1.5)
+    assert lower[0] == pytest.approx(2 - 1.5 * 2) and upper[0] == pytest.approx(4 + 1.5 * 2)
+    lower, upper = compute_bounds(values, 'mad', 1.0)
+    assert lower[0] == pytest.approx(3 - 1.4826) and upper[0] == pytest.approx(3 + 1.4826)
+    with pytest.raises(ValueError):
+        compute_bounds(values, 'quantile', 0.7)
+    with pytest.raises(ValueError):
+        compute_bounds(values, 'unknown')
+
+
+def test_dropna_columns(df):
+    df = df.assign(description=['ok'] * 199 + [None])
+    mask = outlier_mask(df, 'std', 3.0, dropna_columns=['description'])
+    assert not mask[-1]
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+
+from src.process.clustering import CLUSTER_FEATURES, KMeansSweep, get_kmeans_sweep
+
+
+def make_frame(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(0, 100, (3, len(CLUSTER_FEATURES)))
+    values = centers[rng.integers(0, 3, n)] + rng.normal(0, 2, (n, len(CLUSTER_FEATURES)))
+    return pd.DataFrame(values, columns=list(CLUSTER_FEATURES))
+
+
+def test_sweep_matches_individual_fits():
+    df = make_frame()
+    sweep = KMeansSweep.fit(df, max_clusters=5, n_jobs=2)
+    assert sweep.ks == [1, 2, 3, 4, 5]
+    for k in (1, 3, 5):
+        model = KMeans(n_clusters=k, random_state=42).fit(df[list(CLUSTER_FEATURES)])
+        assert np.isclose(sweep.inertias[k], model.inertia_)
+        assert np.array_equal(sweep.labels[k], model.labels_)
+    assert sweep.centroid_frame(3).shape == (3, len(CLUSTER_FEATURES))
+    inertias = [sweep.inertias[k] for k in sweep.ks]
+    assert all(a >= b for a, b in zip(inertias, inertias[1:]))
+
+
+def test_sweep_labels_every_row():
+    df = make_frame(60)
+    sweep = get_kmeans_sweep(df, max_clusters=3)
+    assert all(len(sweep.labels[k]) == len(df) for k in sweep.labels)
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.process.collaborative import ItemSimilarity, get_item_similarity
+
+
+@pytest.fixture
+def interactions():
+    rng = np.random.default_rng(0)
+    n = 3000
+    return pd.DataFrame({
+        'user_id': rng.integers(0, 300, n),
+        'recipe_id': rng.integers(0, 200, n) * 7,
+        'rating': rng.integers(0, 6, n),
+    })
+
+
+def dense_cosine(interactions):
+    liked = interactions[interactions['rating'] >= 4]
+    matrix = pd.crosstab(liked['recipe_id'], liked['user_id']).clip(upper=1)
+    values = matrix.to_numpy(dtype=float)
+    values /= np.linalg.norm(values, axis=1, keepdims=True)
+    similarity = values @ values.T
+    np.fill_diagonal(similarity, 0)
+    return matrix.index.to_numpy(), similarity
+
+
+def test_build_matches_dense_cosine(interactions):
+    # Des blocs de taille quelconque donnent les mêmes voisins qu'un calcul dense
+    similarity = ItemSimilarity.build(interactions, k=10, block_size=37, shrinkage=0)
+    ids, expected = dense_cosine(interactions)
+
+    assert np.array_equal(similarity.item_ids, ids)
+    for row, recipe_id in enumerate(ids):
+        neighbor_ids, scores = similarity.similar_items(recipe_id)
+        top = np.sort(expected[row][expected[row] > 0])[::-1][:10]
+        assert np.allclose(scores, top, atol=1e-5)
+        assert recipe_id not in neighbor_ids
+        positions = np.searchsorted(ids, neighbor_ids)
+        assert np.allclose(expected[row, positions], scores, atol=1e-5)
+
+
+def test_shrinkage_favors_shared_users():
+    # 1 et 2 n'ont qu'un utilisateur commun, 1 et 3 en ont trois
+    users = {1: [0, 1, 2, 3], 2: [0], 3: [1, 2, 3] + list(range(5, 14))}
+    interactions = pd.DataFrame(
+        [(user, recipe) for recipe, likers in users.items() for user in likers],
+        columns=['user_id', 'recipe_id']).assign(rating=5)
+    raw = ItemSimilarity.build(interactions, shrinkage=0)
+    shrunk = ItemSimilarity.build(interactions, shrinkage=2)
+
+    assert list(raw.similar_items(1)[0]) == [2, 3]
+    assert list(shrunk.similar_items(1)[0]) == [3, 2]
+
+
+def test_low_ratings_ignored():
+    interactions = pd.DataFrame({'user_id': [0, 0, 1, 1], 'recipe_id': [1, 2, 1, 3], 'rating': [5, 5, 5, 2]})
+    similarity = ItemSimilarity.build(interactions)
+
+    assert list(similarity.similar_items(1)[0]) == [2]
+    assert len(similarity.similar_items(3)[0]) == 0
+    assert len(similarity.similar_items(999)[0]) == 0
+
+
+def test_save_and_load(tmp_path, interactions):
+    class Store:
+        manifest = {}
+
+        def load_array(self, name):
+            return np.load(tmp_path / f"{name}.npy", mmap_mode="r")
+
+    similarity = ItemSimilarity.build(interactions, k=5)
+    store = Store()
+    assert ItemSimilarity.from_artifacts(store) is None
+    store.manifest = similarity.save(str(tmp_path))
+    loaded = get_item_similarity(artifacts=store)
+
+    assert store.manifest['collaborative'] == {'n_items': similarity.n_items, 'k': 5}
+    for recipe_id in similarity.item_ids[:20]:
+        assert np.array_equal(loaded.similar_items(recipe_id, 3)[0], similarity.similar_items(recipe_id, 3)[0])
+
+
+def test_get_item_similarity_without_artifacts(interactions):
+    assert get_item_similarity(interactions).n_items == ItemSimilarity.build(interactions).n_items
+    assert get_item_similarity() is None
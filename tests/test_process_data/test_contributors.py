@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from src.process.contributors import ContributorActivity, contributor_cache, get_contributor_activity
+
+
+def make_frame(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'contributor_id': rng.zipf(1.8, n) % 300,
+        'submitted': pd.to_datetime('2000-01-01') + pd.to_timedelta(rng.integers(0, 5000, n), unit='D'),
+    })
+    df.loc[5, 'submitted'] = pd.NaT
+    return df
+
+
+def test_summary_matches_value_counts():
+    df = make_frame()
+    summary = ContributorActivity.from_frame(df).summary(top_k=10)
+    counts = df['contributor_id'].value_counts()
+    assert summary['total_contributors'] == df['contributor_id'].nunique()
+    assert summary['contributions_per_user'] == {
+        'mean': counts.mean(), 'median': counts.median(), 'max': counts.max()}
+    assert summary['top_contributors'] == counts.head(10).to_dict()
+
+
+def test_activity_spans_ignore_missing_dates():
+    df = pd.DataFrame({
+        'contributor_id': [1, 2, 1, 1, 2, 3],
+        'submitted': pd.to_datetime(['2001-05-01', '2002-01-01', '2000-01-01', None, '2002-01-03', None]),
+    })
+    top = ContributorActivity.from_frame(df).top(3)
+    assert top['ID Utilisateur'].tolist() == [1, 2, 3]
+    assert top['Nombre de contributions'].tolist() == [3, 2, 1]
+    assert top['Première recette'].iloc[0] == pd.Timestamp('2000-01-01')
+    assert top['Dernière recette'].iloc[0] == pd.Timestamp('2001-05-01')
+    assert top["Jours d'activité"].iloc[:2].tolist() == [486, 2]
+    assert pd.isna(top['Première recette'].iloc[2])
+
+
+def test_concentration_measures():
+    equal = ContributorActivity(np.arange(4), np.array([5, 5, 5, 5]))
+    assert equal.gini() == 0.0
+    assert equal.lorenz()['Part des recettes'].tolist() == [0, 0.25, 0.5, 0.75, 1.0]
+    skewed = ContributorActivity(np.arange(4), np.array([0, 0, 0, 8]))
+    assert np.isclose(skewed.gini(), 0.75)
+    assert skewed.top_share(0.25) == 1.0
+    assert skewed.count_histogram().to_dict() == {0: 3, 8: 1}
+    assert len(ContributorActivity.from_frame(make_frame()).lorenz(points=50)) == 50
+
+
+def test_switching_back_to_a_range_reuses_its_activity():
+    df = make_frame()
+    first = get_contributor_activity(df.iloc[:1000], 'fp-first-half')
+    get_contributor_activity(df.iloc[1000:], 'fp-second-half')
+    hits = contributor_cache.hits
+    assert get_contributor_activity(df.iloc[:1000], 'fp-first-half') is first
+    assert contributor_cache.hits == hits + 1
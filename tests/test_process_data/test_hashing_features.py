@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.process.hashing_features import HashingTfidf
+from src.process.recommandation import AdvancedRecipeRecommender
+
+
+@pytest.fixture
+def texts():
+    rng = np.random.default_rng(0)
+    words = np.array(['flour', 'sugar', 'egg', 'milk', 'tomato', 'basil', 'cheese', 'rice',
+                      'butter', 'salt', 'pepper', 'onion', 'garlic', 'chicken', 'beef'])
+    return pd.Series([" ".join(rng.choice(words, rng.integers(2, 8))) for _ in range(300)])
+
+
+def test_same_cosine_as_tfidf_vectorizer(texts):
+    # Sans collision de hachage, les similarités sont celles du TF-IDF par vocabulaire
+    hashed = HashingTfidf().fit_transform(texts)
+    expected = TfidfVectorizer(stop_words='english').fit_transform(texts)
+
+    assert np.allclose((hashed @ hashed.T).toarray(), (expected @ expected.T).toarray())
+
+
+def test_chunked_fit_matches_single_fit(texts):
+    single = HashingTfidf().fit_transform(texts)
+    chunked = HashingTfidf().fit_transform(texts, chunk_size=7)
+
+    assert np.allclose(single.toarray(), chunked.toarray())
+
+
+def test_partial_fit_adds_recipes(texts):
+    incremental = HashingTfidf()
+    incremental.fit_transform(texts[:200])
+    incremental.partial_fit(texts[200:])
+    reference = HashingTfidf()
+    reference.fit_transform(texts)
+
+    assert incremental.n_documents == len(texts)
+    assert np.array_equal(incremental.document_frequency, reference.document_frequency)
+    assert np.allclose(incremental.transform(texts[:5]).toarray(), reference.transform(texts[:5]).toarray())
+
+
+def test_memory_independent_of_vocabulary():
+    small = HashingTfidf(n_features=2 ** 10)
+    small.fit_transform([f"term{i}" for i in range(5000)])
+
+    assert small.document_frequency.shape == (2 ** 10,)
+    assert small.document_frequency.sum() == 5000
+
+
+def test_recommender_hashing_featurizer():
+    recipes = pd.DataFrame({
+        'id': [1, 2, 3, 4, 5],
+        'name': ['Pasta', 'Pizza', 'Salad', 'Burger', 'Soup'],
+        'ingredients': ["['tomato', 'pasta', 'cheese']", "['cheese', 'tomato', 'dough']",
+                        "['lettuce', 'cucumber', 'tomato']", "['beef', 'bun', 'lettuce']",
+                        "['carrot', 'onion', 'potato']"],
+        'minutes': [20, 30, 15, 25, 40],
+        'n_ingredients': [3, 3, 3, 3, 3],
+        'n_steps': [4, 5, 3, 4, 5],
+    })
+    hashing = AdvancedRecipeRecommender(recipes.copy(), featurizer='hashing')
+    tfidf = AdvancedRecipeRecommender(recipes.copy())
+
+    assert isinstance(hashing.tfidf, HashingTfidf)
+    assert (hashing.content_based_recommendations(1, top_n=2)['id'].tolist()
+            == tfidf.content_based_recommendations(1, top_n=2)['id'].tolist())
+    assert len(hashing.recipe_clustering(n_clusters=2)) == len(recipes)
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from src.process.ingredients import ingredient_cache, ingredient_counts, wordcloud_payload
+
+
+def make_frame():
+    return pd.DataFrame({'ingredients': [
+        "['Salt', 'butter', 'flour']",
+        "['salt', 'sugar']",
+        "['salt', 'Butter']",
+        "[]",
+    ]})
+
+
+def test_ingredient_counts_fold_case_and_sort():
+    counts = ingredient_counts(make_frame())
+    assert counts.to_dict() == {'salt': 3, 'butter': 2, 'flour': 1, 'sugar': 1}
+    assert counts.index.tolist()[:2] == ['salt', 'butter']
+    assert counts.dtype == np.int64
+
+
+def test_ingredient_counts_kept_per_range():
+    df = make_frame()
+    hits = ingredient_cache.hits
+    whole = ingredient_counts(df, 'fp-ingredients')
+    assert ingredient_counts(df.iloc[:1], 'fp-ingredients-first').sum() == 3
+    assert ingredient_cache.hits == hits
+    # Retour à la première période : comptes repris du cache
+    assert ingredient_counts(df, 'fp-ingredients') is whole
+    assert ingredient_cache.hits == hits + 1
+
+
+def test_wordcloud_payload_is_bounded():
+    counts = pd.Series([5, 4, 2, 1], index=['a', 'b', 'c', 'd'])
+    data, tail = wordcloud_payload(counts, top_k=2)
+    assert data == [{'name': 'a', 'value': 5}, {'name': 'b', 'value': 4}]
+    assert tail == {'count': 2, 'value': 3}
+    data, tail = wordcloud_payload(counts, top_k=10)
+    assert len(data) == 4 and tail == {'count': 0, 'value': 0}
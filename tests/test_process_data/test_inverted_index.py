@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.process.inverted_index import FacetIndex, PostingLists, get_facet_index, index_cache
+from src.utils.coded_columns import CodedListColumn
+
+
+@pytest.fixture
+def recipes():
+    return pd.DataFrame({
+        'submitted': pd.to_datetime(['2010-04-01', '2010-01-01', '2010-03-01', '2010-02-01', '2010-05-01']),
+        'tags': ["['vegetarian', '30-minutes-or-less']", "['vegetarian']",
+                 "['vegetarian', '30-minutes-or-less']", "['30-minutes-or-less', 'meat']",
+                 "['vegetarian', '30-minutes-or-less', 'vegetarian']"],
+        'ingredients': ["['rice', 'walnuts']", "['rice']", "['pasta', 'basil']",
+                        "['beef']", "['rice', 'basil']"],
+    })
+
+
+def test_posting_lists_are_sorted_and_deduplicated():
+    coded = CodedListColumn.from_lists([['a', 'b'], ['b', 'b'], [], ['a']])
+    postings = PostingLists.from_coded(coded)
+    assert postings.postings('a').tolist() == [0, 3]
+    assert postings.postings('b').tolist() == [0, 1]
+    assert postings.postings('b', lo=1).tolist() == [1]
+    assert postings.postings('missing').tolist() == []
+
+
+def test_boolean_query_matches_row_scan(recipes):
+    index = FacetIndex.from_frame(recipes)
+    rows = index.query(all_of={'tags': ['vegetarian', '30-minutes-or-less']},
+                       none_of={'ingredients': ['walnuts']})
+    tags, ingredients = recipes['tags'].map(eval), recipes['ingredients'].map(eval)
+    expected = [i for i in range(len(recipes))
+                if {'vegetarian', '30-minutes-or-less'} <= set(tags[i]) and 'walnuts' not in ingredients[i]]
+    assert sorted(rows.tolist()) == expected
+    # Résultats dans l'ordre des dates
+    assert rows.tolist() == [2, 4]
+
+    either = index.query(any_of={'ingredients': ['pasta', 'beef']})
+    assert sorted(either.tolist()) == [2, 3]
+    assert index.query(all_of={'tags': ['unknown']}).tolist() == []
+    assert len(index.query()) == len(recipes)
+
+
+def test_query_restricted_to_date_range(recipes):
+    index = FacetIndex.from_frame(recipes)
+    rows = index.query(all_of={'tags': ['vegetarian']}, date_start='2010-02-15', date_end='2010-04-30')
+    assert rows.tolist() == [2, 0]
+    assert index.query(date_start='2011-01-01').tolist() == []
+
+
+def test_facet_values_are_sorted(recipes):
+    assert list(get_facet_index(recipes).values('tags')) == ['30-minutes-or-less', 'meat', 'vegetarian']
+
+
+def test_switching_back_to_a_range_reuses_its_index(recipes):
+    spring, winter = recipes.iloc[[0, 2, 4]], recipes.iloc[[1, 3]]
+    first = get_facet_index(spring, 'fp-spring')
+    get_facet_index(winter, 'fp-winter')
+    hits = index_cache.hits
+    assert get_facet_index(spring, 'fp-spring') is first
+    assert index_cache.hits == hits + 1
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from src.process.name_index import NameIndex, get_name_index, normalize, trigram_keys
+
+
+def make_index():
+    names = ['Chocolate Cake', 'chocolate chip cookies', 'Chicken  Curry', 'easy chicken curry',
+             'lemon chicken', 'tomato soup', None]
+    return NameIndex(np.arange(100, 100 + len(names)), np.array(names, dtype=object))
+
+
+def test_normalize_and_trigrams():
+    assert normalize('  Chicken   CURRY ') == 'chicken curry'
+    assert normalize(None) == ''
+    keys, rows = trigram_keys(['ab', 'ab'])
+    # "  ab " : "  a", " ab", "ab " ; une fois par nom
+    assert rows.tolist() == [0, 1, 0, 1, 0, 1]
+    assert len(np.unique(keys)) == 3
+
+
+def test_prefix_matches_shortest_first():
+    index = make_index()
+    results = index.complete('choc', top_k=2)
+    assert results['name'].tolist() == ['Chocolate Cake', 'chocolate chip cookies']
+    assert (results['score'] == 1.0).all()
+    assert index.prefix_matches('zzz').tolist() == []
+
+
+def test_fuzzy_matches_tolerate_typos_and_word_order():
+    index = make_index()
+    assert index.complete('chiken cury', top_k=1)['id'].tolist() == [102]
+    assert 102 in index.complete('curry chicken', top_k=3)['id'].tolist()
+    assert index.complete('', top_k=3).empty
+
+
+def test_complete_has_no_duplicates():
+    df = pd.DataFrame({'id': [1, 2, 3], 'name': ['pasta', 'pasta salad', 'pesto pasta']})
+    results = get_name_index(df).complete('pasta', top_k=5)
+    assert results['id'].tolist()[:2] == [1, 2]
+    assert results['id'].is_unique and 3 in results['id'].tolist()
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from src.process.nutrition_index import REGIMES, NutritionIndex
+
+
+def make_frame(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'name': [f'recipe {i}' for i in range(n)],
+        'Calories': rng.uniform(0, 800, n),
+        'Graisses': rng.uniform(0, 100, n),
+        'Graisse_saturées': rng.uniform(0, 100, n),
+        'Sucre': rng.uniform(0, 100, n),
+        'Sodium': rng.uniform(0, 100, n),
+        'Protéines': rng.uniform(0, 100, n),
+        'Glucides': rng.uniform(0, 100, n),
+        'Moyenne des notes': rng.uniform(0, 5, n),
+        'Nombre de notes': rng.integers(5, 200, n),
+    })
+    df.loc[3, 'Glucides'] = np.nan
+    return df
+
+
+def brute_force(df, constraints):
+    mask = np.ones(len(df), dtype=bool)
+    for column, (low, high) in constraints.items():
+        if low is not None:
+            mask &= df[column].to_numpy() >= low
+        if high is not None:
+            mask &= df[column].to_numpy() <= high
+    return np.flatnonzero(mask)
+
+
+def test_query_matches_brute_force():
+    df = make_frame()
+    index = NutritionIndex(df)
+    for constraints in [
+        {'Glucides': (None, 30), 'Protéines': (40, None)},
+        {'Calories': (100, 300), 'Moyenne des notes': (4, 5), 'Nombre de notes': (None, 50)},
+        {'Sucre': (10, 10)},
+        *REGIMES.values(),
+    ]:
+        assert index.query(constraints).tolist() == brute_force(df, constraints).tolist()
+    assert index.query({}).tolist() == list(range(len(df)))
+    assert index.query({'Glucides': (None, None)}).tolist() == list(range(len(df)))
+
+
+def test_search_sorts_and_paginates():
+    df = make_frame()
+    index = NutritionIndex(df)
+    constraints = {'Glucides': (None, 50)}
+    expected = df.iloc[brute_force(df, constraints)].sort_values(
+        'Moyenne des notes', ascending=False, kind='stable')
+    page, total = index.search(constraints, sort_by='Moyenne des notes', page=1, page_size=20)
+    assert total == len(expected)
+    assert page.index.tolist() == expected.index[20:40].tolist()
+    assert index.search(constraints, page=10_000)[0].empty
+
+
+def test_bounds_ignore_missing_values():
+    df = make_frame()
+    index = NutritionIndex(df)
+    assert index.bounds('Glucides') == (df['Glucides'].min(), df['Glucides'].max())
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from src.process.nutrition_index import NUTRIENT_COLUMNS
+from src.process.nutrition_neighbors import NutritionNeighbors
+
+
+def make_frame(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.uniform(0, 100, (n, len(NUTRIENT_COLUMNS))), columns=list(NUTRIENT_COLUMNS))
+    df.insert(0, 'name', [f'recipe {i}' for i in range(n)])
+    df.loc[7, 'Sodium'] = np.nan
+    return df
+
+
+def brute_force(df, profile, k):
+    values = df[list(NUTRIENT_COLUMNS)].to_numpy(dtype=float)
+    complete = np.isfinite(values).all(axis=1)
+    mean, std = values[complete].mean(axis=0), values[complete].std(axis=0)
+    distances = np.linalg.norm((values - mean) / std - (profile - mean) / std, axis=1)
+    distances[~complete] = np.inf
+    return np.argsort(distances, kind='stable')[:k]
+
+
+def test_kneighbors_matches_brute_force_in_batch():
+    df = make_frame()
+    neighbors = NutritionNeighbors(df)
+    profiles = df[list(NUTRIENT_COLUMNS)].iloc[[0, 10, 20]].to_numpy()
+    distances, positions = neighbors.kneighbors(profiles, k=4)
+    assert positions.shape == distances.shape == (3, 4)
+    for profile, row in zip(profiles, positions):
+        assert row.tolist() == brute_force(df, profile, 4).tolist()
+    assert np.all(np.diff(distances, axis=1) >= 0)
+    assert 7 not in positions
+    assert neighbors.kneighbors(np.full(len(NUTRIENT_COLUMNS), np.nan), k=2)[1].shape == (1, 2)
+
+
+def test_similar_recipes_excludes_reference_and_records_latency():
+    df = make_frame()
+    neighbors = NutritionNeighbors(df)
+    similar = neighbors.similar_recipes(df.iloc[3], k=5, exclude_name='recipe 3')
+    assert len(similar) == 5
+    assert 'recipe 3' not in similar['name'].tolist()
+    assert 'Distance' in similar.columns
+    report = neighbors.latency_report()
+    assert report['calls'] == 1 and report['queries'] == 1
+    assert report['max_ms'] >= report['mean_ms_per_call'] > 0
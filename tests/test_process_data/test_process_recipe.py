@@ -266,6 +266,17 @@ def test_analyze_recipe_dataset_2(recipes_df):
     assert 'contributor_analysis' in analysis
 
 
+# Test pour vérifier la durée reportée de chaque analyse exécutée en parallèle
+def test_analyze_recipe_dataset_timings(recipes_df):
+    recipe = Recipe()
+    recipe.st.session_state.data = recipes_df
+    analysis = recipe.analyze_recipe_dataset()
+    timings = analysis['timings']
+    assert set(timings) == {'general_stats', 'temporal_analysis', 'complexity_analysis',
+                            'nutrition_analysis', 'tag_analysis', 'contributor_analysis', 'total'}
+    assert analysis['general_stats']['total_recipes'] == len(recipes_df)
+
+
 # Test pour vérifier la détection des anomalies
 def test_detect_dataframe_anomalies(recipes_df):
     recipe = Recipe()
@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.process.range_stats import (build_recipe_sketches, exact_range_stats, recipe_range_summary,
+                                     sketch_cache, summarize)
+from src.utils.artifacts import NUTRITION_COLUMNS
+from src.utils.coded_columns import encode_list_column
+
+
+@pytest.fixture
+def recipes():
+    rng = np.random.default_rng(0)
+    n = 3_000
+    tags = np.array(['easy', 'vegan', 'dessert', 'low-fat', 'quick', 'holiday'], dtype=object)
+    return pd.DataFrame({
+        'submitted': pd.Timestamp('2010-01-01') + pd.to_timedelta(rng.integers(0, 720, n), unit='D'),
+        'contributor_id': rng.zipf(1.6, n) % 400,
+        'tags': [str(list(rng.choice(tags, rng.integers(1, 5), replace=False))) for _ in range(n)],
+        'nutrition': [str([float(x) for x in rng.gamma(2, 100, 7).round(1)]) for _ in range(n)],
+    })
+
+
+def test_sketch_matches_exact_mode(recipes):
+    sketches = build_recipe_sketches(recipes)
+    stats = summarize(sketches.query('2010-03-15', '2011-02-01'))
+    nutrition = np.array([eval(x) for x in recipes['nutrition']])
+    exact = exact_range_stats(recipes, 'submitted', '2010-03-15', '2011-02-01',
+                              numeric={col: nutrition[:, i] for i, col in enumerate(NUTRITION_COLUMNS)},
+                              distinct_columns=['contributor_id'],
+                              list_columns={'tags': encode_list_column(recipes, 'tags')})
+    for col in NUTRITION_COLUMNS:
+        assert stats[col]['mean'] == pytest.approx(exact[col]['mean'])
+        assert stats[col]['max'] == exact[col]['max']
+        assert stats[col]['median'] == pytest.approx(exact[col]['median'], rel=0.1)
+    assert stats['contributor_id']['distinct'] == pytest.approx(exact['contributor_id']['distinct'], rel=0.05)
+    assert stats['tags']['distinct'] == exact['tags']['distinct'] == 6
+    assert stats['tags']['top'] == exact['tags']['top']
+    assert stats['tags_length']['max'] == exact['tags_length']['max'] == 4
+
+
+def test_query_extends_to_whole_months(recipes):
+    sketches = build_recipe_sketches(recipes)
+    months = recipes['submitted'].dt.to_period('M')
+    expected = months.between(pd.Period('2010-05', 'M'), pd.Period('2010-07', 'M')).sum()
+    assert sketches.query('2010-05-20', '2010-07-02').count == expected
+    assert sketches.query('2030-01-01', '2030-12-31').count == 0
+
+
+def test_session_sketches_shared_across_ranges(recipes):
+    first = recipe_range_summary(recipes, 'fp-range-stats', '2010-01-01', '2011-12-31')
+    assert first.count == len(recipes)
+    hits = sketch_cache.hits
+    assert recipe_range_summary(recipes, 'fp-range-stats', '2010-06-01', '2010-06-30').count < len(recipes)
+    assert sketch_cache.hits == hits + 1
+
+
+def test_source_sketches_built_once_for_every_range(recipes, tmp_path):
+    path = str(tmp_path / 'RAW_recipes.csv')
+    recipes.to_csv(path, index=False)
+    with patch('src.process.range_stats.build_recipe_sketches', wraps=build_recipe_sketches) as mock_build:
+        june = recipe_range_summary(recipes.iloc[:10], 'fp-june', '2010-06-01', '2010-06-30', source_path=path)
+        year = recipe_range_summary(recipes.iloc[:20], 'fp-2011', '2011-01-01', '2011-12-31', source_path=path)
+    assert mock_build.call_count == 1
+    # Les résumés portent sur tout le CSV, pas sur les lignes de la session
+    submitted = recipes['submitted']
+    assert june.count == submitted.between('2010-06-01', '2010-06-30 23:59:59').sum()
+    assert year.count == (submitted.dt.year == 2011).sum()
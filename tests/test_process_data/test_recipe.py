@@ -322,8 +322,8 @@ def test_analyze_contributors_exception():
     recipe = Recipe()
     df = pd.DataFrame({'contributor_id': [1,2,3]})
     recipe.st.session_state.data = df
-    # Patch de la méthode value_counts de la série contributor_id pour lever une exception
-    with patch('pandas.core.series.Series.value_counts', side_effect=Exception("Contributors error")):
+    # Patch du calcul des comptes par contributeur pour lever une exception
+    with patch('src.process.recipes.get_contributor_activity', side_effect=Exception("Contributors error")):
         with pytest.raises(Exception, match="Contributors error"):
             recipe.analyze_contributors()
 
@@ -349,5 +349,65 @@ def test_fetch_data_from_mongodb_exception():
         assert df.empty
 
 
+def test_fetch_data_from_mongodb_cached_by_collection_fingerprint():
+    import mongomock
+    from src.process import recipes as recipes_module
+
+    client = mongomock.MongoClient()
+    client.close = lambda: None
+    collection = client['db']['col']
+    collection.insert_many([{'id': i, 'submitted': datetime(2005, 1, 1 + i)} for i in range(3)])
+    recipe = Recipe.__new__(Recipe)
+    recipes_module.mongo_cache.invalidate()
+    misses = recipes_module.mongo_cache.misses
+
+    with patch('src.process.recipes.MongoClient', return_value=client):
+        first = recipe.fetch_data_from_mongodb("conn", "db", "col", datetime(2005, 1, 1), datetime(2005, 12, 31))
+        second = recipe.fetch_data_from_mongodb("conn", "db", "col", datetime(2005, 1, 1), datetime(2005, 12, 31))
+        collection.insert_one({'id': 3, 'submitted': datetime(2005, 6, 1)})
+        third = recipe.fetch_data_from_mongodb("conn", "db", "col", datetime(2005, 1, 1), datetime(2005, 12, 31))
+
+    assert len(first) == len(second) == 3 and len(third) == 4
+    assert recipes_module.mongo_cache.misses - misses == 2
+    # Les données chargées portent l'empreinte de la collection, sans échantillonnage
+    recipe.st = MagicMock()
+    recipe.st.session_state.data = third
+    with patch('src.process.recipes.dataframe_fingerprint') as sampled:
+        assert recipe.get_fingerprint() is not None
+        sampled.assert_not_called()
+    recipe.st.session_state.data = None
+    assert recipe.get_fingerprint() is None
+
+
+def test_with_text_reads_recipe_texts_by_id(tmp_path, monkeypatch):
+    pd.DataFrame({'id': [1, 2, 3], 'name': ['a', 'b', 'c'], 'steps': ["['mix']", "['boil']", "['bake']"],
+                  'description': ['one', 'two', 'three']}).to_csv(tmp_path / 'RAW_recipes.csv', index=False)
+    monkeypatch.setenv('DIR_DATASET', str(tmp_path))
+    monkeypatch.setattr('src.process.recipes.TEXT_STORE_DIR', str(tmp_path / 'recipe_text'))
+    recipe = Recipe.__new__(Recipe)
+    recipe.st = MagicMock()
+    recipe.st.session_state.data = pd.DataFrame({'id': [1, 2, 3], 'name': ['a', 'b', 'c']})
+
+    rows = recipe.with_text(recipe.st.session_state.data.iloc[[2, 0]])
+
+    assert rows[['id', 'description', 'steps']].values.tolist() == [[3, 'three', "['bake']"], [1, 'one', "['mix']"]]
+    assert 'description' not in recipe.st.session_state.data.columns
+
+
+def test_search_recipes_restricted_to_ids(tmp_path, monkeypatch):
+    pd.DataFrame({'id': [1, 2, 3], 'name': ['tomato soup', 'tomato salad', 'rice'],
+                  'description': ['warm', 'fresh', 'plain'], 'steps': ["['boil']", "['cut']", "['cook']"]}
+                 ).to_csv(tmp_path / 'RAW_recipes.csv', index=False)
+    monkeypatch.setenv('DIR_DATASET', str(tmp_path))
+    monkeypatch.setattr('src.process.recipes.TEXT_STORE_DIR', str(tmp_path / 'recipe_text'))
+    monkeypatch.setattr('src.process.search_index.ARTIFACTS_DIR', str(tmp_path))
+    recipe = Recipe.__new__(Recipe)
+    recipe.st = MagicMock()
+    recipe.st.session_state.data = pd.DataFrame({'id': [1, 2, 3], 'name': ['tomato soup', 'tomato salad', 'rice']})
+
+    assert sorted(recipe.search_recipes('tomato')['id']) == [1, 2]
+    assert recipe.search_recipes('tomato', ids=[2, 3])['id'].tolist() == [2]
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
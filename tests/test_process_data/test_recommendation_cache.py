@@ -0,0 +1,112 @@
+import ast
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.process.recommandation import AdvancedRecipeRecommender
+from src.process.recommendation_cache import NeighborTable, recommendation_cache, recommendation_cache_stats
+
+
+@pytest.fixture
+def recipes():
+    rng = np.random.default_rng(0)
+    words = ['flour', 'sugar', 'egg', 'milk', 'tomato', 'basil', 'cheese', 'rice',
+             'butter', 'salt', 'pepper', 'onion', 'garlic', 'chicken', 'beef']
+    n = 200
+    return pd.DataFrame({
+        'id': rng.permutation(np.arange(n) * 3 + 1),
+        'name': [f"recipe {i}" for i in range(n)],
+        'ingredients': [str([str(w) for w in rng.choice(words, rng.integers(2, 8), replace=False)])
+                        for _ in range(n)],
+        'minutes': rng.integers(5, 120, n),
+        'n_ingredients': rng.integers(2, 8, n),
+        'n_steps': rng.integers(1, 12, n),
+    })
+
+
+@pytest.fixture
+def matrix(recipes):
+    texts = recipes['ingredients'].map(lambda x: ' '.join(ast.literal_eval(x)))
+    return TfidfVectorizer(stop_words='english').fit_transform(texts).tocsr()
+
+
+def test_build_matches_brute_force(recipes, matrix):
+    ids = recipes['id'].to_numpy()
+    seeds = ids[:50]
+    table = NeighborTable.build(ids, matrix, seeds, k=5, block_size=7)
+    similarity = (matrix @ matrix.T).toarray()
+    np.fill_diagonal(similarity, -1)
+
+    assert table.neighbors.dtype == np.int32 and table.scores.dtype == np.float16
+    assert np.array_equal(table.recipe_ids, np.sort(seeds))
+    for recipe_id in seeds:
+        row = int(np.flatnonzero(ids == recipe_id)[0])
+        neighbor_ids, scores = table.similar_items(recipe_id)
+        expected = np.sort(similarity[row])[::-1][:5]
+        assert np.allclose(scores, expected[expected > 0], atol=1e-3)
+        positions = pd.Index(ids).get_indexer(neighbor_ids)
+        assert np.allclose(similarity[row, positions], scores, atol=1e-3)
+    assert table.similar_items(ids[60]) is None
+    assert table.hits == 50 and table.misses == 1
+
+
+def test_save_and_load(tmp_path, recipes, matrix):
+    class Store:
+        manifest = {}
+
+        def load_array(self, name):
+            return np.load(tmp_path / f"{name}.npy", mmap_mode="r")
+
+    table = NeighborTable.build(recipes['id'].to_numpy(), matrix, k=4)
+    store = Store()
+    assert NeighborTable.from_artifacts(store) is None
+    store.manifest = table.save(str(tmp_path))
+    loaded = NeighborTable.from_artifacts(store)
+
+    assert store.manifest['content_neighbors'] == {'n_recipes': 200, 'k': 4}
+    for recipe_id in recipes['id'][:20]:
+        assert np.array_equal(loaded.similar_items(recipe_id)[0], table.similar_items(recipe_id)[0])
+
+
+def test_content_recommendations_from_table(recipes):
+    recommender = AdvancedRecipeRecommender(recipes.copy())
+    recipe_id = int(recipes['id'].iloc[0])
+    computed = recommender.content_based_recommendations(recipe_id, top_n=3)
+    table = NeighborTable.build(recipes['id'].to_numpy(), recommender.ingredient_matrix, k=10)
+    recommender._neighbor_table = table
+
+    from_table = recommender.content_based_recommendations(recipe_id, top_n=3)
+
+    # Mêmes similarités (l'ordre des ex aequo peut différer)
+    reference = recommender.ingredient_matrix[0].T
+    assert table.hits == 1
+    assert np.allclose(np.sort((recommender.ingredient_matrix[computed.index] @ reference).toarray().ravel()),
+                       np.sort((recommender.ingredient_matrix[from_table.index] @ reference).toarray().ravel()))
+
+
+def test_cached_recommendations(recipes):
+    recommendation_cache.invalidate()
+    recommender = AdvancedRecipeRecommender(recipes.iloc[:150].copy())
+    recipe_id = int(recipes['id'].iloc[0])
+    before = recommendation_cache_stats()
+
+    first = recommender.cached_recommendations(recipe_id, top_n=3)
+    first['name'] = None
+    second = recommender.cached_recommendations(recipe_id, top_n=3)
+    recommender.cached_recommendations(recipe_id, top_n=3, mode='hybrid', weights={'popularity': 0.0})
+    recommender.cached_recommendations(recipe_id, top_n=3, mode='hybrid', weights={'numeric': 0.5})
+    stats = recommendation_cache_stats()
+
+    assert second['name'].notna().all()
+    assert second['id'].tolist() == recommender.content_based_recommendations(recipe_id, top_n=3)['id'].tolist()
+    assert stats['hits'] - before['hits'] == 1 and stats['misses'] - before['misses'] == 3
+    assert stats['size'] == 3
+
+    # L'ajout de recettes change l'empreinte du modèle : les entrées sont recalculées
+    fingerprint = recommender.model_fingerprint()
+    recommender.add_recipes(recipes.iloc[150:].copy())
+    assert recommender.model_fingerprint() != fingerprint
+    recommender.cached_recommendations(recipe_id, top_n=3)
+    assert recommendation_cache_stats()['misses'] - stats['misses'] == 1
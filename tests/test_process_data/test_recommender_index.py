@@ -0,0 +1,140 @@
+import ast
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.process.hashing_features import HashingTfidf
+from src.process.recommandation import AdvancedRecipeRecommender
+from src.process import recommender_index
+from src.process.recommender_index import (RecipeFeatureIndex, get_feature_index, ingredients_text,
+                                           update_feature_index)
+
+
+def make_recipes(ids, seed=0):
+    rng = np.random.default_rng(seed)
+    words = ['flour', 'sugar', 'egg', 'milk', 'tomato', 'basil', 'cheese', 'rice',
+             'butter', 'salt', 'pepper', 'onion', 'garlic', 'chicken', 'beef']
+    return pd.DataFrame({
+        'id': ids,
+        'name': [f"recipe {i}" for i in ids],
+        'ingredients': [str([str(w) for w in rng.choice(words, rng.integers(2, 8))]) for _ in ids],
+        'minutes': rng.integers(5, 120, len(ids)),
+        'n_ingredients': rng.integers(2, 8, len(ids)),
+        'n_steps': rng.integers(1, 12, len(ids)),
+    })
+
+
+def reference_matrix(recipes):
+    texts = recipes['ingredients'].map(lambda x: ' '.join(ast.literal_eval(x)).lower())
+    return HashingTfidf().fit_transform(texts.reset_index(drop=True))
+
+
+def test_upsert_only_vectorizes_new_recipes(tmp_path):
+    recipes = make_recipes(range(100))
+    index = RecipeFeatureIndex(str(tmp_path))
+    assert index.upsert(recipes) == {"added": 100, "updated": 0, "unchanged": 0}
+
+    stats = index.upsert(pd.concat([recipes.iloc[90:], make_recipes(range(100, 120), seed=1)]))
+
+    assert stats == {"added": 20, "updated": 0, "unchanged": 10}
+    assert index.n_recipes == 120
+    assert len(index.segments) == 2
+
+
+def test_updated_recipe_replaces_previous_version(tmp_path):
+    recipes = make_recipes(range(50))
+    index = RecipeFeatureIndex(str(tmp_path))
+    index.upsert(recipes)
+    changed = recipes.iloc[[3]].assign(ingredients="['saffron', 'rice']")
+
+    assert index.upsert(changed)["updated"] == 1
+    current = pd.concat([recipes.drop(index=3), changed])
+    expected = HashingTfidf()
+    expected.fit_transform(current['ingredients'].map(lambda x: ' '.join(ast.literal_eval(x))).reset_index(drop=True))
+    assert index.n_recipes == 50
+    assert np.array_equal(index.featurizer.document_frequency, expected.document_frequency)
+    assert index.ids[index.rows([3])[0]] == 3
+    assert index.rows([3])[0] == 50
+
+
+def test_reopen_and_compact(tmp_path):
+    index = RecipeFeatureIndex(str(tmp_path))
+    index.upsert(make_recipes(range(40)))
+    index.upsert(make_recipes(range(20, 60), seed=2))
+    recipes = pd.concat([make_recipes(range(20)), make_recipes(range(20, 60), seed=2)])
+    expected = reference_matrix(recipes)
+
+    reopened = get_feature_index(str(tmp_path))
+    assert np.allclose(reopened.matrix()[reopened.rows(range(60))].toarray(), expected.toarray())
+    reopened.compact()
+    compacted = RecipeFeatureIndex(str(tmp_path))
+
+    assert len(compacted.segments) == 1
+    assert len(compacted.ids) == compacted.n_recipes == 60
+    assert np.allclose(compacted.matrix()[compacted.rows(range(60))].toarray(), expected.toarray())
+    assert get_feature_index(str(tmp_path / "missing")) is None
+
+
+def test_opened_index_reused_until_it_changes(tmp_path):
+    update_feature_index(make_recipes(range(30)), str(tmp_path), reset=True)
+    index = get_feature_index(str(tmp_path))
+    assert get_feature_index(str(tmp_path)) is index
+
+    index.upsert(make_recipes(range(30, 40), seed=1))
+    reopened = get_feature_index(str(tmp_path))
+    assert reopened is not index and reopened.n_recipes == 40
+
+
+def test_ingredients_text_parses_each_value_by_type():
+    ingredients = pd.Series(["['Flour', 'egg']", ['Milk', 'sugar'], None])
+    assert ingredients_text(ingredients).tolist() == ['flour egg', 'milk sugar', '']
+    with pytest.raises(ValueError):
+        ingredients_text(pd.Series(["__import__('os').getcwd()"]))
+
+
+def test_idf_refreshed_lazily(tmp_path, monkeypatch):
+    monkeypatch.setattr(recommender_index, "IDF_REFRESH_RATIO", 0.5)
+    index = RecipeFeatureIndex(str(tmp_path))
+    index.upsert(make_recipes(range(100)))
+    first = index.matrix()[:100].toarray()
+
+    # 20 % de recettes en plus : les lignes existantes gardent leur pondération
+    index.upsert(make_recipes(range(100, 120), seed=1))
+    assert np.array_equal(index.matrix()[:100].toarray(), first)
+    assert index.matrix().shape[0] == 120
+
+    # Au-delà du seuil, toutes les lignes sont pondérées avec l'idf courant
+    index.upsert(make_recipes(range(120, 200), seed=2))
+    recipes = pd.concat([make_recipes(range(100)), make_recipes(range(100, 120), seed=1),
+                         make_recipes(range(120, 200), seed=2)])
+    assert np.allclose(index.matrix().toarray(), reference_matrix(recipes).toarray())
+
+
+@pytest.mark.parametrize("featurizer", ["tfidf", "hashing"])
+def test_recommender_add_recipes(featurizer):
+    recipes = make_recipes(range(60))
+    recommender = AdvancedRecipeRecommender(recipes.iloc[:50].copy(), featurizer=featurizer)
+    recommender.add_recipes(recipes.iloc[50:].copy())
+
+    assert recommender.recipes_df['id'].tolist() == list(range(60))
+    assert recommender.ingredient_matrix.shape[0] == recommender.numeric_features.shape[0] == 60
+    recommendations = recommender.content_based_recommendations(55, top_n=3)
+    assert len(recommendations) == 3 and 55 not in recommendations['id'].tolist()
+
+
+def test_recommender_uses_feature_index(tmp_path):
+    recipes = make_recipes(range(60))
+    update_feature_index(recipes.iloc[:50], str(tmp_path), reset=True)
+    index = get_feature_index(str(tmp_path))
+    recommender = AdvancedRecipeRecommender(recipes.iloc[:50].copy(), featurizer='hashing', feature_index=index)
+
+    assert recommender.tfidf is index.featurizer
+    changed = recipes.iloc[50:].copy()
+    changed.loc[changed.index[0], 'id'] = 3
+    recommender.add_recipes(changed)
+
+    assert recommender.recipes_df['id'].tolist() == [i for i in range(50) if i != 3] + [3] + list(range(51, 60))
+    assert RecipeFeatureIndex(str(tmp_path)).n_recipes == 59
+    expected = reference_matrix(recommender.recipes_df)
+    assert np.allclose(recommender.ingredient_matrix.toarray(), expected.toarray())
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.process.search_index import BM25Index, analyze, get_search_index, load_search_index, update_search_index
+
+
+@pytest.fixture
+def recipes():
+    return pd.DataFrame({
+        'id': [10, 20, 30, 40],
+        'name': ['chocolate cake', 'tomato soup', 'chicken curry', 'lemon chicken'],
+        'description': ['a rich dessert', 'warm and easy', 'spicy indian dish', None],
+        'steps': ["['melt the chocolate', 'bake']", "['chop tomato', 'simmer']",
+                  "['brown the chicken', 'add curry paste']", "['zest lemon', 'roast chicken']"],
+    })
+
+
+def bm25_reference(recipes, query, weights={'name': 3.0, 'description': 1.0, 'steps': 1.0}, k1=1.2, b=0.75):
+    docs = []
+    for _, row in recipes.iterrows():
+        counts = {}
+        for field, weight in weights.items():
+            for term in analyze(str(row[field]) if pd.notna(row[field]) else ''):
+                counts[term] = counts.get(term, 0) + weight
+        docs.append(counts)
+    lengths = np.array([sum(d.values()) for d in docs])
+    scores = np.zeros(len(docs))
+    for term in set(analyze(query)):
+        df = sum(term in d for d in docs)
+        idf = np.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+        for i, d in enumerate(docs):
+            tf = d.get(term, 0)
+            scores[i] += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[i] / lengths.mean()))
+    return scores
+
+
+def test_scores_match_reference_bm25(recipes):
+    index = BM25Index.build(recipes)
+    results = index.search('chicken curry', top_k=10)
+    expected = bm25_reference(recipes, 'chicken curry')
+    assert results['id'].tolist() == [30, 40]
+    assert results['score'].to_numpy() == pytest.approx(expected[[2, 3]], rel=1e-5)
+    assert results['name'].iloc[0] == 'chicken curry'
+    assert index.search('the and', top_k=5).empty
+    assert index.search('chicken', top_k=5, ids=[40])['id'].tolist() == [40]
+
+
+def test_incremental_update_equals_full_build(recipes):
+    partial = BM25Index.build(recipes.iloc[:2])
+    updated = partial.update(recipes)
+    assert updated.n_documents == 4
+    assert updated.update(recipes) is updated
+    full = BM25Index.build(recipes)
+    for query in ['chicken', 'tomato soup', 'chocolate dessert']:
+        a, b = updated.search(query), full.search(query)
+        assert a['id'].tolist() == b['id'].tolist()
+        assert a['score'].to_numpy() == pytest.approx(b['score'].to_numpy(), rel=1e-5)
+
+
+def test_persisted_index_is_reused_and_extended(recipes, tmp_path):
+    path = str(tmp_path / 'search_index.npz')
+    BM25Index.build(recipes.iloc[:3]).save(path)
+    loaded = load_search_index(path)
+    assert loaded.n_documents == 3 and loaded.names[0] == 'chocolate cake'
+
+    index = get_search_index(recipes, path=path)
+    assert index.n_documents == 4
+    # Les pages complètent l'index en mémoire ; seule l'ingestion réécrit le fichier
+    assert BM25Index.load(path).n_documents == 3
+    update_search_index(recipes, path=path)
+    assert BM25Index.load(path).n_documents == 4
+    assert load_search_index(str(tmp_path / 'missing.npz')) is None
+
+
+def test_text_fetched_only_for_recipes_to_index(recipes, tmp_path):
+    path = str(tmp_path / 'search_index.npz')
+    BM25Index.build(recipes.iloc[:3]).save(path)
+    fetched = []
+
+    def fetch_text(rows):
+        fetched.append(rows['id'].tolist())
+        return rows.join(recipes.set_index('id')[['description', 'steps']], on='id')
+
+    index = get_search_index(recipes[['id', 'name']], path=path, fetch_text=fetch_text)
+
+    assert fetched == [[40]]
+    assert index.search('lemon', top_k=5)['id'].tolist() == [40]
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.process.tag_analytics import TagMatrix
+
+
+@pytest.fixture
+def recipes():
+    return pd.DataFrame({
+        'submitted': pd.to_datetime(['2010-03-01', '2010-01-01', '2010-02-01', '2010-04-01', '2010-05-01']),
+        'tags': ["['easy', 'vegan']", "['easy', 'dessert']", "['vegan', 'easy', 'quick']",
+                 "['dessert']", "['easy', 'vegan', 'vegan']"],
+    })
+
+
+def test_frequencies_match_flattened_counts(recipes):
+    matrix = TagMatrix.from_frame(recipes)
+    flattened = pd.Series([tag for tags in recipes['tags'].map(eval) for tag in set(tags)]).value_counts()
+    assert matrix.frequencies().to_dict() == flattened.to_dict()
+    assert list(matrix.frequencies().index[:2]) == ['easy', 'vegan']
+
+
+def test_cooccurrence_and_associations(recipes):
+    matrix = TagMatrix.from_frame(recipes)
+    co = matrix.cooccurrence()
+    vocabulary = list(matrix.vocabulary)
+    easy, vegan = vocabulary.index('easy'), vocabulary.index('vegan')
+    assert co[easy, vegan] == co[vegan, easy] == 3
+    assert co[easy, easy] == 4
+
+    pairs = matrix.associations(min_count=1, top_n=None)
+    row = pairs[(pairs['Tag A'] == 'easy') & (pairs['Tag B'] == 'vegan')].iloc[0]
+    assert row['Lift'] == pytest.approx(3 * 5 / (4 * 3))
+    assert row['PMI'] == pytest.approx(np.log2(3 * 5 / (4 * 3)))
+    assert row['Support'] == pytest.approx(3 / 5)
+    assert pairs['Lift'].is_monotonic_decreasing
+    assert len(matrix.associations(min_count=3)) == 1
+
+
+def test_range_counts_use_row_slices(recipes):
+    matrix = TagMatrix.from_frame(recipes)
+    rows = matrix.rows_between('2010-01-15', '2010-03-31')
+    assert rows == slice(1, 3)
+    assert matrix.frequencies(rows).to_dict() == {'easy': 2, 'vegan': 2, 'quick': 1}
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from src.process.temporal import TemporalHistogram
+
+
+def reference(dates, start, end):
+    df = pd.DataFrame({'submitted': dates})
+    df = df[(df['submitted'] >= start) & (df['submitted'] <= end)]
+    return {
+        'date_min': df['submitted'].min(),
+        'date_max': df['submitted'].max(),
+        'total_days': (df['submitted'].max() - df['submitted'].min()).days,
+        'submissions_per_year': df.groupby(df['submitted'].dt.year).size().to_dict(),
+        'submissions_per_month': df.groupby(df['submitted'].dt.month).size().to_dict(),
+        'submissions_per_weekday': df.groupby(df['submitted'].dt.dayofweek).size().to_dict(),
+    }
+
+
+def random_dates(n=5000, seed=0, with_time=False):
+    rng = np.random.default_rng(seed)
+    days = pd.to_datetime('1999-01-01') + pd.to_timedelta(rng.integers(0, 7000, n), unit='D')
+    if with_time:
+        days = days + pd.to_timedelta(rng.integers(0, 86400, n), unit='s')
+    return pd.Series(days).where(rng.random(n) > 0.01)
+
+
+def test_distribution_matches_groupby():
+    for with_time in (False, True):
+        dates = random_dates(with_time=with_time)
+        histogram = TemporalHistogram.from_series(dates)
+        day = pd.Timestamp(dates.dropna().iloc[0].date())
+        for start, end in [('1999-01-01', '2018-12-31'), (day, day.replace(hour=23)),
+                           ('2005-06-01', '2010-03-15 12:00')]:
+            stats = histogram.distribution(pd.Timestamp(start), pd.Timestamp(end))
+            expected = reference(dates, pd.Timestamp(start), pd.Timestamp(end))
+            for key, value in expected.items():
+                assert stats[key] == value, (with_time, start, key)
+
+
+def test_day_and_week_series():
+    dates = pd.Series(pd.to_datetime(['2020-01-01', '2020-01-01', '2020-01-03', '2020-01-06', '2020-01-13']))
+    stats = TemporalHistogram.from_series(dates).distribution()
+    assert stats['submissions_per_day'].tolist() == [2, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 1]
+    week = stats['submissions_per_week']
+    # 2020-01-01 est un mercredi : les semaines commencent les lundis 30/12, 06/01 et 13/01
+    assert week.index.strftime('%Y-%m-%d').tolist() == ['2019-12-30', '2020-01-06', '2020-01-13']
+    assert week.tolist() == [3, 1, 1]
+
+
+def test_empty_window():
+    dates = random_dates(100)
+    stats = TemporalHistogram.from_series(dates).distribution('1980-01-01', '1980-12-31')
+    assert pd.isna(stats['date_min']) and stats['submissions_per_year'] == {}
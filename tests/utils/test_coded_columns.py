@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.coded_columns import CodedListColumn, encode_list_column, is_list_column
+
+
+def test_encode_string_and_list_columns():
+    df = pd.DataFrame({'tags': ["['b', 'a']", "[]", "['a', 'c', 'a']"]})
+    coded = encode_list_column(df, 'tags')
+    assert list(coded.vocabulary) == ['a', 'b', 'c']
+    assert coded.indptr.tolist() == [0, 2, 2, 5]
+    assert coded.lengths().tolist() == [2, 0, 3]
+    assert coded.value_counts().to_dict() == {'a': 3, 'b': 1, 'c': 1}
+
+    df['tags_list'] = [['x'], [], ['y']]
+    assert list(encode_list_column(df, 'tags').vocabulary) == ['x', 'y']
+    assert is_list_column(df['tags_list']) and not is_list_column(df['tags'])
+
+
+def test_take_counts_and_csr():
+    coded = CodedListColumn.from_lists([['a', 'b'], ['b'], ['c', 'a', 'a']])
+    subset = coded.take(np.array([0, 2]))
+    assert subset.indptr.tolist() == [0, 2, 5]
+    assert coded.counts(np.array([False, True, True])).tolist() == [2, 1, 1]
+
+    matrix = coded.to_csr()
+    assert matrix.shape == (3, 3)
+    assert matrix.toarray().tolist() == [[1, 1, 0], [0, 1, 0], [1, 0, 1]]
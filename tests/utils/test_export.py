@@ -0,0 +1,128 @@
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import pytest
+
+from src.utils.export import cached_export, export_dataframe
+
+
+@pytest.fixture
+def recipes():
+    df = pd.DataFrame({
+        'name': ['a', 'b', 'c', 'd', 'e'],
+        'minutes': [10, 20, 30, 40, 50],
+        'submitted': pd.to_datetime(['2010-01-01'] * 5),
+        'tags': ["['x']", "['y', 'z']", "[]", "['x']", "['w']"],
+    })
+    df['tags_list'] = df['tags'].apply(eval)
+    return df
+
+
+def test_export_csv_in_chunks(recipes, tmp_path):
+    path = export_dataframe(recipes, "CSV", str(tmp_path / "out.csv"), chunk_rows=2)
+    result = pd.read_csv(path)
+    assert list(result.columns) == ['name', 'minutes', 'submitted', 'tags']
+    assert result['minutes'].tolist() == [10, 20, 30, 40, 50]
+
+
+def test_export_json_uses_parsed_lists(recipes, tmp_path):
+    path = export_dataframe(recipes, "JSON", str(tmp_path / "out.json"), chunk_rows=2)
+    with open(path) as handle:
+        records = json.load(handle)
+    assert len(records) == 5
+    assert records[1]['tags'] == ['y', 'z']
+    assert 'tags_list' not in records[0]
+
+
+@pytest.mark.parametrize("export_format,reader", [
+    ("Parquet", lambda p: pq.read_table(p).to_pandas()),
+    ("Arrow", lambda p: feather.read_table(p).to_pandas()),
+])
+def test_export_typed_formats(recipes, export_format, reader):
+    path = export_dataframe(recipes, export_format, chunk_rows=2)
+    try:
+        result = reader(path)
+    finally:
+        os.remove(path)
+    assert len(result) == 5
+    assert list(result.loc[1, 'tags']) == ['y', 'z']
+    assert result['minutes'].dtype == recipes['minutes'].dtype
+
+
+def test_export_empty_and_unknown_format(recipes, tmp_path):
+    path = export_dataframe(recipes.iloc[:0], "JSON", str(tmp_path / "empty.json"))
+    with open(path) as handle:
+        assert json.load(handle) == []
+    with pytest.raises(ValueError):
+        export_dataframe(recipes, "XML")
+
+
+@pytest.mark.parametrize("export_format", ["Parquet", "Arrow"])
+def test_schema_derived_from_whole_frame(export_format, tmp_path):
+    # Le premier bloc ne contient que des valeurs manquantes et des listes vides
+    df = pd.DataFrame({
+        'description': [None, None, 'tasty', 'good'],
+        'tags_list': [[], [], ['x'], ['y', 'z']],
+        'tags': ['[]', '[]', "['x']", "['y', 'z']"],
+    })
+    path = export_dataframe(df, export_format, str(tmp_path / f"out.{export_format}"), chunk_rows=2)
+    result = pq.read_table(path) if export_format == "Parquet" else feather.read_table(path)
+    assert result.schema.field('description').type == pa.string()
+    assert pa.types.is_list(result.schema.field('tags').type)
+    assert result.schema.field('tags').type.value_type == pa.string()
+    assert result.column('tags').to_pylist()[3] == ['y', 'z']
+
+
+def test_cached_export_written_once(recipes, tmp_path):
+    calls = []
+
+    def load():
+        calls.append(1)
+        return recipes
+
+    first = cached_export("abc", "CSV", load, str(tmp_path))
+    second = cached_export("abc", "CSV", load, str(tmp_path))
+    other = cached_export("def", "CSV", load, str(tmp_path))
+
+    assert first == second != other
+    assert len(calls) == 2
+    assert pd.read_csv(first)['minutes'].tolist() == [10, 20, 30, 40, 50]
+    assert sorted(os.listdir(tmp_path)) == ['abc.csv', 'def.csv']
+    with pytest.raises(ValueError):
+        cached_export(None, "CSV", load, str(tmp_path))
+
+
+@pytest.mark.parametrize("export_format", ["CSV", "Parquet"])
+def test_texts_fetched_per_chunk(recipes, export_format, tmp_path):
+    recipes = recipes.drop(columns='tags_list').assign(id=range(5))
+    texts = pd.Series([None, None, 'tasty', 'good', 'fine'], name='description')
+    fetched = []
+
+    def fetch_text(rows):
+        fetched.append(len(rows))
+        return rows.join(texts, on='id')
+
+    path = export_dataframe(recipes, export_format, str(tmp_path / f"out.{export_format}"),
+                            chunk_rows=2, fetch_text=fetch_text)
+    result = pd.read_csv(path) if export_format == "CSV" else pq.read_table(path).to_pandas()
+    assert result['description'].tolist()[2:] == ['tasty', 'good', 'fine']
+    # Un échantillon pour le schéma des formats typés, puis un bloc à la fois
+    assert fetched[-3:] == [2, 2, 1]
+
+
+def test_failed_export_leaves_no_partial_file(recipes, tmp_path):
+    def load():
+        raise RuntimeError("données indisponibles")
+
+    def fetch_text(rows):
+        raise RuntimeError("magasin de textes indisponible")
+
+    with pytest.raises(RuntimeError):
+        cached_export("abc", "CSV", load, str(tmp_path))
+    with pytest.raises(RuntimeError):
+        cached_export("abc", "CSV", lambda: recipes, str(tmp_path), fetch_text=fetch_text)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,139 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import mongomock
+import pandas as pd
+import pytest
+from src.utils.fingerprint import (
+    FingerprintCache,
+    collection_fingerprint,
+    compute_file_fingerprint,
+    dataframe_fingerprint,
+    file_fingerprint,
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "recipes.csv"
+    pd.DataFrame({'id': range(2000), 'name': [f"r{i}" for i in range(2000)]}).to_csv(path, index=False)
+    return str(path)
+
+
+def test_file_fingerprint_stable(csv_file):
+    assert file_fingerprint(csv_file) == file_fingerprint(csv_file)
+
+
+def test_file_fingerprint_changes_on_append(csv_file):
+    before = compute_file_fingerprint(csv_file)
+    digest_before = file_fingerprint(csv_file)
+    with open(csv_file, "a") as handle:
+        handle.write("2000,r2000\n")
+
+    assert file_fingerprint(csv_file) != digest_before
+    assert compute_file_fingerprint(csv_file)['size'] > before['size']
+
+
+def test_file_fingerprint_missing_file(tmp_path):
+    assert file_fingerprint(os.path.join(tmp_path, "absent.csv")) is None
+
+
+def test_collection_fingerprint_changes_on_insert():
+    collection = mongomock.MongoClient()['db']['recipes']
+    collection.insert_many([{'id': 1, 'submitted': pd.Timestamp('2010-01-01')}])
+    before = collection_fingerprint(collection, 'submitted')
+    assert before == collection_fingerprint(collection, 'submitted')
+
+    collection.insert_one({'id': 2, 'submitted': pd.Timestamp('2011-01-01')})
+    assert collection_fingerprint(collection, 'submitted') != before
+
+
+def test_dataframe_fingerprint_with_list_columns():
+    df = pd.DataFrame({'id': [1, 2], 'tags': [['a'], ['b']]})
+    same = pd.DataFrame({'id': [1, 2], 'tags': [['a'], ['b']]})
+    other = pd.DataFrame({'id': [1, 2], 'tags': [['a'], ['c']]})
+
+    assert dataframe_fingerprint(df) == dataframe_fingerprint(same)
+    assert dataframe_fingerprint(df) != dataframe_fingerprint(other)
+
+
+def test_fingerprint_cache_invalidation(tmp_path):
+    cache = FingerprintCache("test", persist_dir=str(tmp_path))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_compute("stats", "fp1", compute) == 1
+    assert cache.get_or_compute("stats", "fp1", compute) == 1
+    assert cache.get_or_compute("stats", "fp2", compute) == 2
+    assert cache.hits == 1 and cache.misses == 2
+
+    # Un nouveau cache relit l'entrée persistée
+    reloaded = FingerprintCache("test", persist_dir=str(tmp_path))
+    assert reloaded.get("stats", "fp2") == 2
+    assert reloaded.get("stats", "fp1") is None
+
+
+def test_get_or_compute_shares_value_and_skips_cache_without_fingerprint():
+    cache = FingerprintCache("test")
+    first = cache.get_or_compute("index", "fp", object)
+    assert cache.get_or_compute("index", "fp", object) is first
+
+    hits, misses = cache.hits, cache.misses
+    assert cache.get_or_compute("index", None, object) is not first
+    assert (cache.hits, cache.misses, len(cache)) == (hits, misses, 1)
+
+
+def test_get_or_compute_computes_once_under_concurrent_misses():
+    cache = FingerprintCache("test")
+    started = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return len(calls)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        first = pool.submit(cache.get_or_compute, "summary", "fp", compute)
+        started.wait()
+        others = [pool.submit(cache.get_or_compute, "summary", "fp", compute) for _ in range(3)]
+        results = [first.result()] + [future.result() for future in others]
+
+    assert results == [1, 1, 1, 1] and len(calls) == 1
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_fingerprint_cache_evicts_least_recently_used():
+    cache = FingerprintCache("test", max_entries=2)
+    cache.set("a", "fp", 1)
+    cache.set("b", "fp", 2)
+    assert cache.get("a", "fp") == 1
+
+    cache.set("c", "fp", 3)
+
+    assert len(cache) == 2
+    assert cache.get("a", "fp") == 1
+    assert cache.get("b", "fp") is None
+
+
+def test_fingerprint_cache_invalidate_removes_persisted_entries(tmp_path):
+    FingerprintCache("test", persist_dir=str(tmp_path)).invalidate()
+    cache = FingerprintCache("test", persist_dir=str(tmp_path))
+    for key in ("a", "b", "c"):
+        cache.set(key, "fp", key)
+    FingerprintCache("other", persist_dir=str(tmp_path)).set("a", "fp", "kept")
+
+    cache.invalidate("a")
+    assert FingerprintCache("test", persist_dir=str(tmp_path)).get("a", "fp") is None
+    # Un nouveau cache, sans entrée en mémoire, supprime aussi les entrées persistées
+    FingerprintCache("test", persist_dir=str(tmp_path)).invalidate()
+
+    reloaded = FingerprintCache("test", persist_dir=str(tmp_path))
+    assert reloaded.get("b", "fp") is None and reloaded.get("c", "fp") is None
+    assert FingerprintCache("other", persist_dir=str(tmp_path)).get("a", "fp") == "kept"
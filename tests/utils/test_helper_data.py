@@ -24,7 +24,7 @@ def test_load_dataset_all_contents():
         mock_read_csv.side_effect = [pd.DataFrame({'col': [1, 2, 3]})] * 2
 
         # Appel de la fonction à tester
-        result = load_dataset('test_dir', all_contents=True)
+        result = load_dataset('test_dir', all_contents=True, engine=None)
 
         # Assertions
         assert len(result) == 2
@@ -76,7 +76,7 @@ def test_load_dataset_from_file(mock_read_csv):
     # Le "df" est un itérable de chunks
     mock_read_csv.return_value = [chunk1, chunk2]
 
-    df_filtered = load_dataset_from_file("fake_path.csv", date_start, date_end)
+    df_filtered = load_dataset_from_file("fake_path.csv", date_start, date_end, engine=None)
 
     # Vérifier que read_csv a été appelé avec les bons arguments
     mock_read_csv.assert_called_once_with(
@@ -122,10 +122,12 @@ def test_load_dataset_different_column_structures():
         # Simuler la liste des fichiers CSV dans le répertoire
         mock_listdir.return_value = ['file1.csv', 'file2.csv']
         # Simuler des DataFrames avec différentes structures de colonnes
-        mock_read_csv.side_effect = [
-            pd.DataFrame({'col1': [1, 2], 'col2': [3, 4]}),
-            pd.DataFrame({'col3': [5, 6], 'col4': [7, 8]})
-        ]
+        # (les fichiers sont lus en parallèle : le retour dépend du chemin, pas de l'ordre d'appel)
+        frames = {
+            os.path.join('test_dir', 'file1.csv'): pd.DataFrame({'col1': [1, 2], 'col2': [3, 4]}),
+            os.path.join('test_dir', 'file2.csv'): pd.DataFrame({'col3': [5, 6], 'col4': [7, 8]})
+        }
+        mock_read_csv.side_effect = lambda path, **kwargs: frames[path]
 
         # Appel de la fonction à tester
         result = load_dataset('test_dir', all_contents=True)
@@ -139,6 +141,42 @@ def test_load_dataset_different_column_structures():
         pd.testing.assert_frame_equal(
             result['file2'], pd.DataFrame({'col3': [5, 6], 'col4': [7, 8]}))
 
+def test_load_dataset_projection_and_report(tmp_path):
+    pd.DataFrame({
+        'id': [1, 2],
+        'nutrition': ['[1.0]', '[2.0]'],
+        'steps': ['long text', 'long text']
+    }).to_csv(tmp_path / 'RAW_recipes.csv', index=False)
+    pd.DataFrame({'user_id': [1], 'review': ['text']}).to_csv(
+        tmp_path / 'RAW_interactions.csv', index=False)
+
+    result, report = load_dataset(str(tmp_path), columns=['id', 'nutrition'],
+                                  dtype={'id': 'int32'}, with_report=True)
+
+    # Seules les colonnes demandées sont chargées, un fichier sans ces colonnes est ignoré
+    assert list(result) == ['RAW_recipes']
+    assert list(result['RAW_recipes'].columns) == ['id', 'nutrition']
+    assert result['RAW_recipes']['id'].dtype == 'int32'
+    assert report['RAW_recipes']['rows'] == 2
+    assert report['RAW_interactions']['rows'] == 0
+
+
+@patch("pandas.read_csv")
+def test_load_dataset_from_file_projection(mock_read_csv):
+    mock_read_csv.return_value = [pd.DataFrame({
+        'recipe_id': [1], 'rating': [5], 'date': [pd.Timestamp('2020-01-02')]})]
+
+    load_dataset_from_file("fake_path.csv", pd.Timestamp(2020, 1, 1), pd.Timestamp(2020, 1, 10),
+                           True, columns=['recipe_id', 'rating'], engine=None)
+
+    mock_read_csv.assert_called_once_with(
+        "fake_path.csv",
+        parse_dates=['date'],
+        chunksize=1000,
+        usecols=['recipe_id', 'rating', 'date']
+    )
+
+
 def test_load_dataset_from_file_date_parsing():
     @st.cache_data
     def mock_cached_load_dataset_from_file(file_path, start_date, end_date):
@@ -197,3 +235,20 @@ def test_load_dataset_from_file_invalid_dates():
     pd.testing.assert_frame_equal(result, expected_df)
     assert pd.api.types.is_datetime64_any_dtype(result['submitted'])
     assert len(result) == 1  # Une seule date valide
+
+
+def test_load_dataset_from_file_parallel_engine(tmp_path):
+    path = tmp_path / 'RAW_interactions.csv'
+    pd.DataFrame({
+        'recipe_id': [1, 2, 3],
+        'rating': [5, 4, 3],
+        'date': ['2020-01-01', '2020-01-05', '2020-02-01'],
+        'review': ['a', 'b', 'c']
+    }).to_csv(path, index=False)
+    args = (str(path), pd.Timestamp(2020, 1, 1), pd.Timestamp(2020, 1, 10), True)
+
+    parallel = load_dataset_from_file(*args, columns=['recipe_id', 'rating'], engine='pyarrow')
+    chunked = load_dataset_from_file(*args, columns=['recipe_id', 'rating'], engine=None)
+
+    assert parallel['recipe_id'].tolist() == [1, 2]
+    pd.testing.assert_frame_equal(parallel, chunked, check_dtype=False)
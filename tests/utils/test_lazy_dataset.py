@@ -0,0 +1,79 @@
+import mongomock
+import pandas as pd
+import pytest
+
+from src.utils.MongoDBConnector import MongoDBConnector
+from src.utils.lazy_dataset import (RECIPE_TEXT_COLUMNS, LazyDataset, MongoTextSource, TextSideStore,
+                                    narrow_columns, open_text_store)
+
+
+@pytest.fixture
+def recipes():
+    return pd.DataFrame({
+        'id': [30, 10, 20],
+        'minutes': [15, 40, 5],
+        'steps': ["['mix', 'bake']", "['boil']", None],
+        'description': ['crème brûlée', 'pasta', 'salad'],
+    })
+
+
+def test_side_store_fetch_by_id(recipes, tmp_path):
+    store = TextSideStore.build(recipes, 'id', ['steps', 'description'], str(tmp_path))
+    reopened = TextSideStore(str(tmp_path))
+    texts = reopened.fetch([20, 30, 99])
+    assert list(texts.index) == [20, 30]
+    assert texts.loc[30, 'description'] == 'crème brûlée'
+    assert texts.loc[20, 'steps'] == ''
+    assert list(store.fetch([10], ['steps']).columns) == ['steps']
+
+
+def test_lazy_dataset_from_csv_reuses_store(recipes, tmp_path):
+    csv_path = tmp_path / 'recipes.csv'
+    recipes.to_csv(csv_path, index=False)
+    store_dir = str(tmp_path / 'store')
+
+    first = LazyDataset.from_csv(str(csv_path), store_dir)
+    assert list(first.data.columns) == ['id', 'minutes']
+    second = LazyDataset.from_csv(str(csv_path), store_dir)
+    assert second.text_source.meta['fingerprint'] == first.text_source.meta['fingerprint']
+
+    rows = second.data[second.data['minutes'] > 10]
+    enriched = second.with_text(rows, ['description'])
+    assert enriched['description'].tolist() == ['crème brûlée', 'pasta']
+
+    recipes.assign(description='changed').to_csv(csv_path, index=False)
+    third = LazyDataset.from_csv(str(csv_path), store_dir)
+    assert third.fetch_text([10]).loc[10, 'description'] == 'changed'
+
+
+def test_mongo_text_source_in_query(recipes):
+    connector = MongoDBConnector('mongodb://localhost:27017', 'test_db')
+    connector.db = mongomock.MongoClient()['test_db']
+    connector.db['recipes'].insert_many(recipes.where(recipes.notna(), None).to_dict('records'))
+
+    source = MongoTextSource(connector, 'recipes')
+    texts = source.fetch([10, 30], ['description'])
+    assert sorted(texts.index) == [10, 30]
+    assert list(texts.columns) == ['description']
+    assert source.fetch([], ['description']).empty
+
+
+def test_open_text_store_reused_until_csv_changes(recipes, tmp_path):
+    csv_path = tmp_path / 'recipes.csv'
+    recipes.to_csv(csv_path, index=False)
+    store_dir = str(tmp_path / 'store')
+
+    assert narrow_columns(str(csv_path), RECIPE_TEXT_COLUMNS) == ['id', 'minutes']
+    store = open_text_store(str(csv_path), store_dir, text_columns=RECIPE_TEXT_COLUMNS)
+    assert open_text_store(str(csv_path), store_dir, text_columns=RECIPE_TEXT_COLUMNS) is store
+
+    dataset = LazyDataset(pd.read_csv(csv_path, usecols=['id', 'minutes']), store)
+    rows = dataset.with_text(dataset.data.iloc[[1]])
+    assert rows[['id', 'description']].values.tolist() == [[10, 'pasta']]
+    # Les colonnes déjà présentes ne sont pas relues
+    assert dataset.with_text(rows) is rows
+
+    recipes.assign(description='changed').to_csv(csv_path, index=False)
+    reopened = open_text_store(str(csv_path), store_dir, text_columns=RECIPE_TEXT_COLUMNS)
+    assert reopened is not store
+    assert reopened.fetch([10]).loc[10, 'description'] == 'changed'
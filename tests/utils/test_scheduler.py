@@ -0,0 +1,51 @@
+import threading
+import time
+
+import pytest
+
+from src.utils.scheduler import run_parallel
+
+
+def test_run_parallel_results_and_timings():
+    results, timings = run_parallel({'a': lambda: 1, 'b': lambda: 'deux'})
+
+    assert results == {'a': 1, 'b': 'deux'}
+    assert set(timings) == {'a', 'b', 'total'}
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+def test_run_parallel_overlaps_tasks():
+    barrier = threading.Barrier(3, timeout=5)
+
+    # Chaque tâche attend les deux autres : l'appel n'aboutit que si elles tournent ensemble
+    results, _ = run_parallel({name: barrier.wait for name in ('a', 'b', 'c')})
+
+    assert sorted(results.values()) == [0, 1, 2]
+
+
+def test_run_parallel_total_close_to_slowest():
+    results, timings = run_parallel({f"t{i}": lambda: time.sleep(0.2) for i in range(4)})
+
+    assert len(results) == 4
+    assert timings['total'] < 0.6
+
+
+def test_run_parallel_sequential():
+    caller = threading.current_thread()
+    results, _ = run_parallel({'a': threading.current_thread,
+                               'b': threading.current_thread}, max_workers=1)
+
+    assert results == {'a': caller, 'b': caller}
+
+
+def test_run_parallel_reraises_first_error_in_task_order():
+    def fail(message):
+        def task():
+            raise ValueError(message)
+        return task
+
+    finished = []
+    with pytest.raises(ValueError, match="premier"):
+        run_parallel({'ok': lambda: finished.append(True),
+                      'premier': fail("premier"), 'second': fail("second")})
+    assert finished == [True]
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.sketches import HyperLogLog, KLLSketch, Moments, SpaceSaving
+
+
+def test_kll_quantiles_after_merge():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(5, 1, 60_000)
+    merged = KLLSketch(200)
+    for i, part in enumerate(np.array_split(values, 12)):
+        merged = merged.merge(KLLSketch(200, seed=i).update(part))
+    assert merged.n == len(values)
+    estimates = merged.quantiles([0.25, 0.5, 0.75])
+    ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+    assert np.allclose(ranks, [0.25, 0.5, 0.75], atol=0.02)
+    assert np.isnan(KLLSketch().quantiles([0.5])).all()
+
+
+def test_hyperloglog_estimate_and_merge():
+    a = HyperLogLog(12).update(np.arange(0, 30_000))
+    b = HyperLogLog(12).update(np.arange(20_000, 50_000))
+    assert a.merge(b).estimate() == pytest.approx(50_000, rel=0.05)
+    assert HyperLogLog().update(np.array(['low-fat', 'vegan', 'vegan', 'easy'], dtype=object)).estimate() \
+        == pytest.approx(3, abs=0.1)
+
+
+def test_space_saving_merge_keeps_heavy_hitters():
+    rng = np.random.default_rng(1)
+    values = rng.zipf(1.5, 40_000) % 5_000
+    merged = SpaceSaving(64)
+    for part in np.array_split(values, 8):
+        merged = merged.merge(SpaceSaving.from_counts(pd.Series(part).value_counts(), 64))
+    exact = pd.Series(values).value_counts()
+    assert list(merged.top(5)) == list(exact.head(5).index)
+    for value, count in merged.top(5).items():
+        assert count <= exact[value] <= count + merged.errors[value]
+
+
+def test_moments_merge():
+    merged = Moments.from_values(np.array([1.0, np.nan, 3.0])).merge(Moments.from_values(np.array([8.0])))
+    assert (merged.count, merged.minimum, merged.maximum) == (3, 1.0, 8.0)
+    assert merged.mean == pytest.approx(4.0)